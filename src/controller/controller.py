@@ -80,6 +80,7 @@ class Controller(IController):
 
         event_manager = EventManager()
         self._event_handler_consumers.append(event_manager)
+        command_manager.set_event_manager(event_manager)
 
         request_manager = InputRequestManager()
         self._user_input_facade_consumers.append(request_manager)
@@ -97,6 +98,7 @@ class Controller(IController):
 
         database_manager = DatabaseManager()
         self._file_facade_consumers.append(database_manager)
+        self._analysis_facade_consumers.append(database_manager)
         self._dataset_facade_consumers.append(database_manager)
         self._data_facade_consumers.append(database_manager)
         self._abstract_managers.append(database_manager)
@@ -1,4 +1,5 @@
 from abc import ABC
+from contextlib import contextmanager
 from typing import List
 from typing import Optional
 
@@ -25,6 +26,18 @@ class AbstractManager(ABC):
         self.events.clear()
         self._event_manager.send_events(events=events)
 
+    @contextmanager
+    def transaction(self):
+        """
+        Collects the events sent inside the with block and notifies them at once when the block is left, so
+        duplicate refresh events of several changes are only handled once.
+        """
+        self._event_manager.begin_transaction()
+        try:
+            yield
+        finally:
+            self._event_manager.end_transaction()
+
     def handle_error(self, error_origins: List[IErrorHandler], meta_info: str = ""):
         """
         The default way of handling an error. The errors are queried from the possible origins. The meta-info
@@ -1,6 +1,8 @@
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import Future
 from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Optional
 from uuid import UUID
@@ -31,6 +33,24 @@ class IAnalysisManager(ABC):
         """
         pass
 
+    @abstractmethod
+    def set_analysis_cache_path(self, path: str) -> bool:
+        """
+        Sets the path the results of the analyses are persisted to, so they are reused in the next session
+
+        :param path: The path of the cache directory
+
+        :return: whether the path was set
+        """
+        pass
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """
+        Cancels the running analyses and stops the worker processes, called when the application exits
+        """
+        pass
+
     @abstractmethod
     def edit_analysis_settings(self, uuid: UUID, analysis_record: AnalysisRecord) -> bool:
         """
@@ -114,6 +134,35 @@ class IAnalysisGetter(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_analysis_data_async(self, uuid: UUID) -> Future:
+        """
+        starts the analysis with the given id in the background and gets the future of its analysis data record
+        """
+        pass
+
+    @abstractmethod
+    def get_analysis_data_batch_async(self, uuids: List[UUID]) -> Dict[UUID, Future]:
+        """
+        starts the analyses with the given ids in the background with one query of their data and gets the futures
+        of their analysis data records
+        """
+        pass
+
+    @abstractmethod
+    def get_analysis_progress(self, uuid: UUID) -> Optional[float]:
+        """
+        gets the done part of the running analysis with the given id or None if it is not known
+        """
+        pass
+
+    @abstractmethod
+    def cancel_analysis(self, uuid: UUID) -> bool:
+        """
+        cancels the running analysis with the given id and gets whether it was running
+        """
+        pass
+
     @abstractmethod
     def get_analysis_settings(self, uuid: UUID) -> AnalysisRecord:
         """
@@ -184,16 +233,25 @@ class AnalysisManager(IAnalysisGetter, AbstractManager,
         self.update_imported_analyses()
         return True
 
+    @type_check(str)
+    def set_analysis_cache_path(self, path: str) -> bool:
+        self._analysis_facade.set_analysis_cache_directory(path)
+        return True
+
+    def shutdown(self) -> None:
+        self._analysis_facade.shutdown_analyses()
+
     def update_imported_analyses(self) -> bool:
         loaded_analysis_constructors: List[
             Callable[[], object]] = self.file_facade.get_analysis_types_from_standard_path()
-        for loaded_constructor in loaded_analysis_constructors:
-            analysis_type = self._analysis_facade.register_analysis_type(loaded_constructor)
-            if analysis_type is None:
-                self.handle_error([self.analysis_facade])
-                return False
-            self.events.append(AnalysisImported(analysis_type))
-            self.handle_event()
+        with self.transaction():
+            for loaded_constructor in loaded_analysis_constructors:
+                analysis_type = self._analysis_facade.register_analysis_type(loaded_constructor)
+                if analysis_type is None:
+                    self.handle_error([self.analysis_facade])
+                    return False
+                self.events.append(AnalysisImported(analysis_type))
+                self.handle_event()
         return True
 
     @type_check(UUID, AnalysisRecord)
@@ -228,3 +286,19 @@ class AnalysisManager(IAnalysisGetter, AbstractManager,
             self.handle_error([self.analysis_facade])
             return None
         return analysis_data
+
+    @type_check(UUID)
+    def get_analysis_data_async(self, uuid: UUID) -> Future:
+        return self._analysis_facade.get_analysed_data_async(uuid)
+
+    @type_check(List)
+    def get_analysis_data_batch_async(self, uuids: List[UUID]) -> Dict[UUID, Future]:
+        return self._analysis_facade.get_analysed_data_batch_async(uuids)
+
+    @type_check(UUID)
+    def get_analysis_progress(self, uuid: UUID) -> Optional[float]:
+        return self._analysis_facade.get_analysis_progress(uuid)
+
+    @type_check(UUID)
+    def cancel_analysis(self, uuid: UUID) -> bool:
+        return self._analysis_facade.cancel_analysis(uuid)
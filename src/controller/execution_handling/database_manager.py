@@ -1,11 +1,15 @@
 from abc import ABC
 from abc import abstractmethod
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from uuid import UUID
 
+import pandas as pd
+
 from src.controller.execution_handling.abstract_manager import AbstractManager
+from src.controller.facade_consumer.analysis_facade_consumer import AnalysisFacadeConsumer
 from src.controller.facade_consumer.data_facade_consumer import DataFacadeConsumer
 from src.controller.facade_consumer.dataset_facade_consumer import DatasetFacadeConsumer
 from src.controller.facade_consumer.file_facade_consumer import FileFacadeConsumer
@@ -22,9 +26,12 @@ from src.data_transfer.exception import InvalidUUID
 from src.data_transfer.record import DataRecord
 from src.data_transfer.record import DatasetRecord
 from src.data_transfer.record import ErrorRecord
+from src.data_transfer.record import PositionRecord
 from src.data_transfer.record import SelectionRecord
 from src.data_transfer.record import SettingContext
 from src.data_transfer.record import SettingRecord
+from src.data_transfer.record import TablePageQueryRecord
+from src.data_transfer.record import TablePageRecord
 from src.data_transfer.selection import BoolDiscreteOption
 from src.data_transfer.selection import DateIntervalOption
 from src.data_transfer.selection import NumberIntervalOption
@@ -169,9 +176,56 @@ class IDatabaseGetter(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_rawdata_chunks(self, selected_column: List[Column]) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        gets the raw data of the selected columns in chunks, so it does not have to fit into memory at once
+        :param selected_column: the selected columns
+        :return:                an iterator over the chunks of the raw data
+        """
+        pass
+
+    @abstractmethod
+    def get_rawdata_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        """
+        gets a page of the raw data, the page starts after the key of the last row of the previous page
+        :param page_query:      the columns, order, filter and start of the page
+        :return:                the rows of the page indexed by their keys
+        """
+        pass
+
+    @abstractmethod
+    def get_data_key(self) -> Optional[str]:
+        """
+        gets a key of the current dataset and filters that is the same in every session
+        :return:                the key or None if no dataset is opened
+        """
+        pass
+
+    @abstractmethod
+    def cancel_queries(self, thread_id: int) -> None:
+        """
+        cancels the queries of the raw data that are running on the given background thread
+        :param thread_id:       the identifier of the thread as given by threading.get_ident
+        """
+        pass
+
+    @abstractmethod
+    def get_density_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                         value_column: Optional[Column] = None) -> Optional[DataRecord]:
+        """
+        gets the number of filtered datapoints in the OSM tiles of the bin zoom level inside the given bounds
+        :param bin_zoom:        the zoom level whose tiles are the bins
+        :param upper_left:      the north-west corner of the bounds
+        :param lower_right:     the south-east corner of the bounds
+        :param value_column:    optionally a column whose mean value is calculated for every bin
+        :return:                the bins with the columns bin_x, bin_y, point_count and value
+        """
+        pass
+
 
 class DatabaseManager(AbstractManager, DatasetFacadeConsumer, DataFacadeConsumer, FileFacadeConsumer,
-                      IDatabaseGetter, IDatabaseManager):
+                      AnalysisFacadeConsumer, IDatabaseGetter, IDatabaseManager):
 
     @type_check(str)
     def initialize_datasets(self, data_set_dict_path: str) -> bool:
@@ -350,6 +404,8 @@ class DatabaseManager(AbstractManager, DatasetFacadeConsumer, DataFacadeConsumer
             self.handle_error([self.dataset_facade], " at importing dataset in manager")
             return False
 
+        # the data of an overwritten or appended dataset changed, so its analysis results are outdated
+        self.analysis_facade.invalidate_analysis_cache(self.dataset_facade.get_dataset_key(uuid))
         if not mask_msg:
             self.request_manager.send_messages(["Import successful"])
         self.events.append(DatasetAdded(uuid))
@@ -372,10 +428,13 @@ class DatabaseManager(AbstractManager, DatasetFacadeConsumer, DataFacadeConsumer
     @type_check(UUID)
     def delete_dataset(self, uuid: UUID) -> bool:
 
+        # the key of the dataset is removed with it
+        dataset_key = self.dataset_facade.get_dataset_key(uuid)
         if not self.dataset_facade.delete_dataset(uuid):
             self.handle_error([self.dataset_facade], " at deleting dataset in manager")
             return False
 
+        self.analysis_facade.invalidate_analysis_cache(dataset_key)
         self.request_manager.send_messages(["Deletion successful"])
 
         self.events.append(DatasetDeleted(uuid))
@@ -420,3 +479,40 @@ class DatabaseManager(AbstractManager, DatasetFacadeConsumer, DataFacadeConsumer
             return None
 
         return raw_data
+
+    @type_check(List)
+    def get_rawdata_chunks(self, selected_column: List[Column]) -> Optional[Iterator[pd.DataFrame]]:
+        if selected_column is None:
+            raise InvalidInput("Cannot select values from None column.")
+
+        chunks = self._data_facade.get_data_chunks(selected_column)
+        if chunks is None:
+            self.handle_error([self._data_facade], " at getting rawdata chunks in manager")
+            return None
+
+        return chunks
+
+    @type_check(TablePageQueryRecord)
+    def get_rawdata_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        page = self._data_facade.get_data_page(page_query)
+        if page is None:
+            self.handle_error([self._data_facade], " at getting a page of the rawdata in manager")
+            return None
+
+        return page
+
+    def get_data_key(self) -> Optional[str]:
+        return self._data_facade.get_data_key()
+
+    def cancel_queries(self, thread_id: int) -> None:
+        self._data_facade.cancel_queries(thread_id)
+
+    @type_check(int, PositionRecord, PositionRecord)
+    def get_density_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                         value_column: Optional[Column] = None) -> Optional[DataRecord]:
+        binned_data = self._data_facade.get_binned_data(bin_zoom, upper_left, lower_right, value_column)
+        if binned_data is None:
+            self.handle_error([self._data_facade], " at getting density data in manager")
+            return None
+
+        return binned_data
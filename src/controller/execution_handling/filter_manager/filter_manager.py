@@ -19,6 +19,7 @@ from src.controller.output_handling.event import RefreshTrajectoryData
 from src.data_transfer.content import type_check
 from src.data_transfer.record import FilterGroupRecord
 from src.data_transfer.record import FilterRecord
+from src.data_transfer.record import MatchCountRecord
 
 
 class IFilterManager(ABC):
@@ -131,6 +132,8 @@ class FilterManager(IFilterManager, AbstractManager,
 
     USE_FILTER: bool = True
     NEGATE_FILTER: bool = False
+    # time in seconds a match count may take before it is estimated from a sample
+    MATCH_COUNT_TIME_BUDGET: float = 0.5
 
     @type_check(UUID, FilterRecord)
     def add_filter(self, parent_id: UUID, parameters: FilterRecord) -> bool:
@@ -264,18 +267,23 @@ class FilterManager(IFilterManager, AbstractManager,
         return True
 
     def update_data_filter(self) -> bool:
-
+        # the versions let the data facade skip filters that did not change since they were last set
+        # the predicates let data facades evaluate the filters without sql
+        version = self.filter_facade.get_point_filter_version()
         sql_string = self.filter_facade.get_point_sql_request()
         if sql_string is not None:
-            self.data_facade.set_point_filter(sql_string, self.USE_FILTER, self.NEGATE_FILTER)
+            self.data_facade.set_point_filter(sql_string, self.USE_FILTER, self.NEGATE_FILTER, version,
+                                              self.filter_facade.get_point_predicate())
         else:
-            self.data_facade.set_point_filter("", False, self.NEGATE_FILTER)
+            self.data_facade.set_point_filter("", False, self.NEGATE_FILTER, version)
 
+        version = self.filter_facade.get_trajectory_filter_version()
         sql_string = self.filter_facade.get_trajectory_sql_request()
         if sql_string is not None:
-            self.data_facade.set_trajectory_filter(sql_string, self.USE_FILTER)
+            self.data_facade.set_trajectory_filter(sql_string, self.USE_FILTER, version,
+                                                   self.filter_facade.get_trajectory_predicate())
         else:
-            self.data_facade.set_trajectory_filter("", False)
+            self.data_facade.set_trajectory_filter("", False, version)
 
         return True
 
@@ -320,6 +328,19 @@ class FilterManager(IFilterManager, AbstractManager,
 
         return types
 
+    def get_match_count(self, filter_record: FilterRecord, parent_id: Optional[UUID] = None,
+                        filter_id: Optional[UUID] = None) -> Optional[MatchCountRecord]:
+        predicates = self.filter_facade.get_preview_predicates(filter_record, parent_id, filter_id)
+        if predicates is None:
+            self.handle_error([self.filter_facade])
+            return None
+
+        match_count = self.data_facade.get_match_count(predicates[0], predicates[1], self.MATCH_COUNT_TIME_BUDGET)
+        if match_count is None:
+            self.handle_error([self.data_facade], " at counting the matches of a filter")
+            return None
+        return match_count
+
     def get_point_filters_root(self) -> Optional[UUID]:
         """
         gets the uuid of the root group of the point filters
@@ -22,6 +22,7 @@ from src.data_transfer.content.settings_enum import SettingsEnum
 from src.data_transfer.record import DataPointRecord
 from src.data_transfer.record import FilterGroupRecord
 from src.data_transfer.record import FilterRecord
+from src.data_transfer.record import MatchCountRecord
 from src.data_transfer.record import PositionRecord
 from src.data_transfer.record import TrajectoryRecord
 from src.model.setting_structure.setting_type import Color
@@ -107,6 +108,20 @@ class IFilterGetter(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_match_count(self, filter_record: FilterRecord, parent_id: Optional[UUID] = None,
+                        filter_id: Optional[UUID] = None) -> Optional[MatchCountRecord]:
+        """
+        counts the datapoints and trajectories that would pass the filters if the filter was added to the group with
+        the parent id or if the filter with the filter id was changed to the filter record. Large datasets are not
+        counted exactly, but estimated within a time budget.
+        :param filter_record:   the previewed filter
+        :param parent_id:       the id of the group the filter would be added to
+        :param filter_id:       the id of the filter that would be changed, if the filter is not added
+        :return:                the counts
+        """
+        pass
+
     @abstractmethod
     def get_point_filters_root(self) -> Optional[UUID]:
         """
@@ -155,6 +170,10 @@ class Filterer(IFilterer, DataFacadeConsumer, DatasetFacadeConsumer, SettingFaca
         self.current_data = None
         self.old_data = None
 
+        # the visible trajectories of the last query and the data version they were queried for
+        self.visible_trajectories: Optional[List[uuid.UUID]] = None
+        self.visible_trajectories_version: Optional[int] = None
+
     def get_filtered_trajectories(self) -> [TrajectoryRecord]:
         """
         Gets all trajectories that pass all filters from the model layer.
@@ -405,7 +424,12 @@ class Filterer(IFilterer, DataFacadeConsumer, DatasetFacadeConsumer, SettingFaca
     def get_visible_trajectories(self) -> Optional[List[uuid.UUID]]:
         """
         Gets all trajectories which contain at least one visible data point.
+        The result is reused as long as neither the dataset nor the filters change.
         """
+        data_version = self.data_facade.get_data_version()
+        if self.visible_trajectories is not None and data_version == self.visible_trajectories_version:
+            return list(self.visible_trajectories)
+
         data = self.data_facade.get_data([Column.TRAJECTORY_ID, Column.ID])
         if data is None:
             self.handle_error([self._data_facade, self._dataset_facade])
@@ -422,7 +446,9 @@ class Filterer(IFilterer, DataFacadeConsumer, DatasetFacadeConsumer, SettingFaca
         trajectories = trajectories.data[Column.TRAJECTORY_ID.value]
         joined_trajectories = np.intersect1d(trajectories, data_point_trajectories)
 
-        return [uuid.UUID(x) for x in joined_trajectories]
+        self.visible_trajectories = [uuid.UUID(x) for x in joined_trajectories]
+        self.visible_trajectories_version = data_version
+        return list(self.visible_trajectories)
 
     def reset_rgb(self, rgb: int, visible: bool) -> int:
         """
@@ -1,8 +1,14 @@
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import Future
+from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 from uuid import UUID
 
+import pandas as pd
+
 from src.data_transfer.content import Column
 from src.data_transfer.content import FilterType
 from src.data_transfer.content.logger import logging
@@ -13,8 +19,12 @@ from src.data_transfer.record import DataRecord
 from src.data_transfer.record import DatasetRecord
 from src.data_transfer.record import FilterGroupRecord
 from src.data_transfer.record import FilterRecord
+from src.data_transfer.record import MatchCountRecord
 from src.data_transfer.record import PolygonRecord
+from src.data_transfer.record import PositionRecord
 from src.data_transfer.record import SettingsRecord
+from src.data_transfer.record import TablePageQueryRecord
+from src.data_transfer.record import TablePageRecord
 from src.data_transfer.record import TrajectoryRecord
 
 
@@ -45,6 +55,52 @@ class IDataRequestFacade(ABC):
         """
         pass
 
+    @logging
+    @abstractmethod
+    def get_rawdata_chunks(self, selected_column: [Column]) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        Gets specific columns of the datasets in chunks, so the data does not have to fit into memory at once
+
+        :param selected_column: the columns type to return
+
+        :return: An iterator over the chunks of the data
+        """
+        pass
+
+    @logging
+    @abstractmethod
+    def get_rawdata_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        """
+        Gets a page of the data, the page starts after the key of the last row of the previous page, so large
+        tables can be shown without reading them
+
+        :param page_query: the columns, order, filter and start of the page
+
+        :return: The rows of the page indexed by their keys
+        """
+        pass
+
+    @logging
+    @abstractmethod
+    def get_data_key(self) -> Optional[str]:
+        """
+        Gets a key of the current dataset and filters that is the same in every session, so results computed on the
+        filtered data can be reused as long as the key does not change
+
+        :return: The key or None if no dataset is opened
+        """
+        pass
+
+    @logging
+    @abstractmethod
+    def cancel_queries(self, thread_id: int) -> None:
+        """
+        Cancels the queries of the data that are running on the given background thread, the cancelled queries return
+        no data. Queries of other threads keep running.
+        :param thread_id:   the identifier of the thread as given by threading.get_ident
+        """
+        pass
+
     @logging
     @abstractmethod
     def get_rawdata_datapoint(self, datapoint: UUID) -> DataRecord:
@@ -64,6 +120,20 @@ class IDataRequestFacade(ABC):
         """
         pass
 
+    @logging
+    @abstractmethod
+    def get_density_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                         value_column: Optional[Column] = None) -> DataRecord:
+        """
+        gets the number of filtered datapoints in the OSM tiles of the bin zoom level inside the given bounds
+        :param bin_zoom:        the zoom level whose tiles are the bins
+        :param upper_left:      the north-west corner of the bounds
+        :param lower_right:     the south-east corner of the bounds
+        :param value_column:    optionally a column whose mean value is calculated for every bin
+        :return:                the bins with the columns bin_x, bin_y, point_count and value
+        """
+        pass
+
     @logging
     @abstractmethod
     def get_polygon(self, polygon: UUID) -> PolygonRecord:
@@ -93,6 +163,20 @@ class IDataRequestFacade(ABC):
         """
         pass
 
+    @logging
+    @abstractmethod
+    def get_match_count(self, filter_record: FilterRecord, parent_id: Optional[UUID] = None,
+                        filter_id: Optional[UUID] = None) -> MatchCountRecord:
+        """
+        counts the datapoints and trajectories that would pass the filters if the filter was added to the group with
+        the parent id or if the filter with the filter id was changed to the filter record
+        :param filter_record:   the previewed filter
+        :param parent_id:       the id of the group the filter would be added to
+        :param filter_id:       the id of the filter that would be changed, if the filter is not added
+        :return:                the exact or estimated counts
+        """
+        pass
+
     @logging
     @abstractmethod
     def get_filter_types(self) -> List[FilterType]:
@@ -150,6 +234,46 @@ class IDataRequestFacade(ABC):
         """
         pass
 
+    @logging
+    @abstractmethod
+    def get_analysis_data_async(self, analysis_id: UUID) -> Future:
+        """
+        starts an analysis in the background, so several analyses run at the same time
+        :param analysis_id:     the id of the analysis
+        :return:                the future of the analyzed data
+        """
+        pass
+
+    @logging
+    @abstractmethod
+    def get_analysis_data_batch_async(self, analysis_ids: List[UUID]) -> Dict[UUID, Future]:
+        """
+        starts several analyses in the background, their data is queried only once
+        :param analysis_ids:    the ids of the analyses
+        :return:                the futures of the analyzed data by the ids of the analyses
+        """
+        pass
+
+    @logging
+    @abstractmethod
+    def get_analysis_progress(self, analysis_id: UUID) -> Optional[float]:
+        """
+        gets the progress of a running analysis
+        :param analysis_id:     the id of the analysis
+        :return:                the done part of the analysis between 0 and 1 or None if it is not known
+        """
+        pass
+
+    @logging
+    @abstractmethod
+    def cancel_analysis(self, analysis_id: UUID) -> bool:
+        """
+        cancels a running analysis, its future fails with AnalysisCancelled
+        :param analysis_id:     the id of the analysis
+        :return:                whether the analysis was running
+        """
+        pass
+
     @logging
     @abstractmethod
     def get_settings(self) -> SettingsRecord:
@@ -1,3 +1,6 @@
+import os
+import sys
+
 from src.controller.application_facade import ApplicationFacade
 from src.controller.execution_handling.analysis_manager import IAnalysisManager
 from src.controller.execution_handling.database_manager import IDatabaseManager
@@ -15,6 +18,19 @@ STANDARD_DICTIONARY_PATH = "dictionary"
 STANDARD_DATA_SET_DICT = "datasets"
 STANDARD_SQL_CONNECTION = "sql_connection"
 STANDARD_SETTING_DICT = "setting"
+STANDARD_ANALYSIS_CACHE_PATH = "analysis_cache"
+APPLICATION_DIRECTORY = "trajectory_analysis_tool"
+
+
+def get_user_cache_path() -> str:
+    """
+    gets the directory for the cached files of the current user of the operating system
+    """
+    if sys.platform == "win32":
+        return os.environ.get("LOCALAPPDATA", os.path.join(os.path.expanduser("~"), "AppData", "Local"))
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    return os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
 
 
 class ApplicationManager(ApplicationFacade, ExecutionComponentConsumer, FileFacadeConsumer,
@@ -38,6 +54,7 @@ class ApplicationManager(ApplicationFacade, ExecutionComponentConsumer, FileFaca
         Loads different files and initializes the settings
         """
         self.set_paths()
+        self.set_analysis_cache_path()
         self.set_sql_connection()
         self.load_datasets()
         self.load_settings()
@@ -57,8 +74,10 @@ class ApplicationManager(ApplicationFacade, ExecutionComponentConsumer, FileFaca
 
     def stop(self):
         """
-        Stops the application and saves to files
+        Stops the application and saves to files, the running analyses are cancelled first, so their worker processes
+        do not keep the application alive
         """
+        self._analysis_manager.shutdown()
         self.save()
 
     def _start_other_components(self):
@@ -74,6 +93,14 @@ class ApplicationManager(ApplicationFacade, ExecutionComponentConsumer, FileFaca
         if not self._dataset_manager.set_standard_paths(STANDARD_DICTIONARY_PATH, STANDARD_ANALYSIS_PATH):
             raise StandardPathNotExisting("The standard path for the datasets is not existing")
 
+    def set_analysis_cache_path(self):
+        """
+        Sets the path the analysis results are persisted to. The results are unpickled when they are loaded, so they
+        are kept in the cache directory of the user instead of the working directory, which others might write to
+        """
+        self._analysis_manager.set_analysis_cache_path(os.path.join(get_user_cache_path(), APPLICATION_DIRECTORY,
+                                                                    STANDARD_ANALYSIS_CACHE_PATH))
+
     def set_sql_connection(self):
         """
         Sets the sql connection on start based on the standard path
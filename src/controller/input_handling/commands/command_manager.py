@@ -1,8 +1,11 @@
 from abc import ABC
 from abc import abstractmethod
+from contextlib import contextmanager
+from typing import Optional
 
 from src.controller.input_handling.commands.command import Command
 from src.controller.input_handling.commands.command_history import CommandHistory
+from src.controller.output_handling.event_manager import IEventManager
 
 
 class ICommandManager(ABC):
@@ -31,10 +34,29 @@ class CommandManager(ICommandManager):
 
     def __init__(self):
         self._history = CommandHistory()
+        self._event_manager: Optional[IEventManager] = None
+
+    def set_event_manager(self, event_manager: IEventManager):
+        """sets the event manager, so the events of a command are notified at once after the command finished
+        :param event_manager:   the event manager of the controller"""
+        self._event_manager = event_manager
+
+    @contextmanager
+    def _transaction(self):
+        """collects the events sent while a command is executed and notifies them without duplicates"""
+        if self._event_manager is None:
+            yield
+            return
+        self._event_manager.begin_transaction()
+        try:
+            yield
+        finally:
+            self._event_manager.end_transaction()
 
     def process_command(self, command: Command):
         """executes the command_structure and updates the command_structure history"""
-        command.execute()
+        with self._transaction():
+            command.execute()
         if command.was_successful():
             command.update_command_history(self._history)
 
@@ -42,7 +64,8 @@ class CommandManager(ICommandManager):
         """undoes the last undoable command_structure"""
         command = self._history.get_undo()
         if command is not None:
-            command.undo()
+            with self._transaction():
+                command.undo()
             return True
         return False
 
@@ -50,6 +73,7 @@ class CommandManager(ICommandManager):
         """redoes the last undone command_structure"""
         command = self._history.get_redo()
         if command is not None:
-            command.execute()
+            with self._transaction():
+                command.execute()
             return True
         return False
@@ -1,6 +1,12 @@
+from concurrent.futures import Future
+from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 from uuid import UUID
 
+import pandas as pd
+
 from src.controller.execution_handling.analysis_manager import IAnalysisGetter
 from src.controller.execution_handling.database_manager import IDatabaseGetter
 from src.controller.execution_handling.filter_manager.filter_manager import IFilterGetter
@@ -18,9 +24,13 @@ from src.data_transfer.record import DataRecord
 from src.data_transfer.record import DatasetRecord
 from src.data_transfer.record import FilterGroupRecord
 from src.data_transfer.record import FilterRecord
+from src.data_transfer.record import MatchCountRecord
 from src.data_transfer.record import PolygonRecord
+from src.data_transfer.record import PositionRecord
 from src.data_transfer.record import SettingRecord
 from src.data_transfer.record import SettingsRecord
+from src.data_transfer.record import TablePageQueryRecord
+from src.data_transfer.record import TablePageRecord
 from src.data_transfer.record import TrajectoryRecord
 
 
@@ -78,6 +88,46 @@ class RequestDistributor(IDataRequestFacade, FileFacadeConsumer):
         """
         return self._data_getter.get_rawdata(selected_column)
 
+    @logging
+    def get_rawdata_chunks(self, selected_column: List[Column]) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        Gets specific columns of the datasets in chunks, so the data does not have to fit into memory at once
+
+        :param selected_column: the columns type to return
+
+        :return: An iterator over the chunks of the data
+        """
+        return self._data_getter.get_rawdata_chunks(selected_column)
+
+    @logging
+    def get_rawdata_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        """
+        Gets a page of the data, the page starts after the key of the last row of the previous page, so large
+        tables can be shown without reading them
+
+        :param page_query: the columns, order, filter and start of the page
+
+        :return: The rows of the page indexed by their keys
+        """
+        return self._data_getter.get_rawdata_page(page_query)
+
+    @logging
+    def get_data_key(self) -> Optional[str]:
+        """
+        Gets a key of the current dataset and filters that is the same in every session
+
+        :return: The key or None if no dataset is opened
+        """
+        return self._data_getter.get_data_key()
+
+    @logging
+    def cancel_queries(self, thread_id: int) -> None:
+        """
+        Cancels the queries of the data that are running on the given background thread
+        :param thread_id:   the identifier of the thread
+        """
+        self._data_getter.cancel_queries(thread_id)
+
     @logging
     def get_rawdata_datapoint(self, datapoint: UUID) -> DataRecord:
         """
@@ -95,6 +145,19 @@ class RequestDistributor(IDataRequestFacade, FileFacadeConsumer):
         """
         return self._filterer.get_filtered_trajectories()
 
+    @logging
+    def get_density_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                         value_column: Optional[Column] = None) -> DataRecord:
+        """
+        gets the number of filtered datapoints in the OSM tiles of the bin zoom level inside the given bounds
+        :param bin_zoom:        the zoom level whose tiles are the bins
+        :param upper_left:      the north-west corner of the bounds
+        :param lower_right:     the south-east corner of the bounds
+        :param value_column:    optionally a column whose mean value is calculated for every bin
+        :return:                the bins with the columns bin_x, bin_y, point_count and value
+        """
+        return self._data_getter.get_density_data(bin_zoom, upper_left, lower_right, value_column=value_column)
+
     @logging
     def get_polygon(self, polygon: UUID) -> PolygonRecord:
         """
@@ -121,6 +184,19 @@ class RequestDistributor(IDataRequestFacade, FileFacadeConsumer):
         """
         return self._filter_getter.get_filter_record(filter_id)
 
+    @logging
+    def get_match_count(self, filter_record: FilterRecord, parent_id: Optional[UUID] = None,
+                        filter_id: Optional[UUID] = None) -> MatchCountRecord:
+        """
+        counts the datapoints and trajectories that would pass the filters if the filter was added to the group with
+        the parent id or if the filter with the filter id was changed to the filter record
+        :param filter_record:   the previewed filter
+        :param parent_id:       the id of the group the filter would be added to
+        :param filter_id:       the id of the filter that would be changed, if the filter is not added
+        :return:                the exact or estimated counts
+        """
+        return self._filter_getter.get_match_count(filter_record, parent_id, filter_id)
+
     @logging
     def get_filter_group(self, filter_group: UUID) -> FilterGroupRecord:
         """
@@ -197,6 +273,42 @@ class RequestDistributor(IDataRequestFacade, FileFacadeConsumer):
         """
         return self._analysis_getter.get_analysis_data(analysis_id)
 
+    @logging
+    def get_analysis_data_async(self, analysis_id: UUID) -> Future:
+        """
+        starts an analysis in the background, so several analyses run at the same time
+        :param analysis_id:     the id of the analysis
+        :return:                the future of the analyzed data
+        """
+        return self._analysis_getter.get_analysis_data_async(analysis_id)
+
+    @logging
+    def get_analysis_data_batch_async(self, analysis_ids: List[UUID]) -> Dict[UUID, Future]:
+        """
+        starts several analyses in the background, their data is queried only once
+        :param analysis_ids:    the ids of the analyses
+        :return:                the futures of the analyzed data by the ids of the analyses
+        """
+        return self._analysis_getter.get_analysis_data_batch_async(analysis_ids)
+
+    @logging
+    def get_analysis_progress(self, analysis_id: UUID) -> Optional[float]:
+        """
+        gets the progress of a running analysis
+        :param analysis_id:     the id of the analysis
+        :return:                the done part of the analysis between 0 and 1 or None if it is not known
+        """
+        return self._analysis_getter.get_analysis_progress(analysis_id)
+
+    @logging
+    def cancel_analysis(self, analysis_id: UUID) -> bool:
+        """
+        cancels a running analysis, its future fails with AnalysisCancelled
+        :param analysis_id:     the id of the analysis
+        :return:                whether the analysis was running
+        """
+        return self._analysis_getter.cancel_analysis(analysis_id)
+
     @logging
     def get_settings(self) -> SettingsRecord:
         """
@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from typing import List
 
 from src.controller.facade_consumer import (EventHandlerConsumer)
 from src.data_transfer.content.logger import logging
@@ -26,14 +27,59 @@ class IEventManager(ABC):
         """
         pass
 
+    @abstractmethod
+    def begin_transaction(self) -> None:
+        """
+        Starts a transaction. Until the transaction ends, the sent events are collected instead of notified.
+        Transactions can be nested, the events are notified when the outermost transaction ends.
+        """
+        pass
+
+    @abstractmethod
+    def end_transaction(self) -> None:
+        """
+        Ends a transaction. If it was the outermost transaction, the collected events are notified at once.
+        """
+        pass
+
+
+def coalesce_events(events: list) -> List:
+    """
+    Removes duplicate events, so every refresh is only done once. Of equal events only the last one is kept, because
+    it is the one that reflects the final state.
+    :param events: List of events
+    :return: The events without duplicates in the order of their last occurrence
+    """
+    return list(reversed(dict.fromkeys(reversed(events))))
+
 
 class EventManager(IEventManager, EventHandlerConsumer):
     """
     EventManager is a class that manages the list of events handlers and notify the events to them.
     """
 
+    def __init__(self):
+        super().__init__()
+        self._transaction_depth = 0
+        self._pending_events: List = []
+
     def send_events(self, events: list) -> None:
-        self.notify(events)
+        if self._transaction_depth > 0:
+            self._pending_events.extend(events)
+            return
+        self.notify(coalesce_events(events))
+
+    def begin_transaction(self) -> None:
+        self._transaction_depth += 1
+
+    def end_transaction(self) -> None:
+        if self._transaction_depth == 0:
+            return
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0 and self._pending_events:
+            events = self._pending_events
+            self._pending_events = []
+            self.notify(coalesce_events(events))
 
     def notify(self, events: list) -> None:
 
@@ -3,6 +3,7 @@ from src.data_transfer.content.column import Column
 from src.data_transfer.content.filter_type import FilterType
 from src.data_transfer.content.global_constants import FilterHandlerNames
 from src.data_transfer.content.settings_enum import SettingsEnum
+from src.data_transfer.content.trajectory_metric import TrajectoryMetric
 from src.data_transfer.content.type_check import list_empty_check
 from src.data_transfer.content.type_check import type_check
 from src.data_transfer.content.type_check import type_check_assert
@@ -11,6 +12,7 @@ __all__ = ['Column',
            'FilterType',
            'COLUM_TO_VALUE_RANGE',
            'FilterHandlerNames',
+           'TrajectoryMetric',
            "type_check", "type_check_assert",
            "SettingsEnum"
            "list_empty_check"]
@@ -10,3 +10,5 @@ class FilterType(Enum):
     AREA = "polygon filter"
     DISCRETE = "discrete filter"
     INTERVAL = "interval filter"
+    AGGREGATE = "aggregate filter"
+    SEQUENCE = "sequence filter"
@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class RenderMode(Enum):
+    """
+    holds all available modes to render the trajectories on the map
+    """
+
+    SINGLE_ITEMS = "Single items"
+    BATCHED = "Batched"
+    RASTER = "Raster overlay"
+    DENSITY = "Density layer"
+    MEAN_SPEED = "Mean speed layer"
+
+    def __repr__(self):
+        return self.value
@@ -22,6 +22,7 @@ class SettingsEnum(Enum):
     TRAJECTORY_SAMPLE_SIZE = "trajectory_view_sample"
     TRAJECTORY_STEP_SIZE = "trajectory_view_step_size"
     SHOW_LINE_SEGMENTS = "show_line_segments"
+    RENDER_MODE = "render_mode"
     COLOR_SETTINGS = "color_settings"
     TRAJECTORY_UNI_COLOR = "trajectory_uni_color"
     TRAJECTORY_PARAM_COLOR = "trajectory_param_color"
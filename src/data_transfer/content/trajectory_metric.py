@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class TrajectoryMetric(Enum):
+    """
+    holds all metrics that summarize a whole trajectory and can be used by aggregate filters
+    """
+
+    DURATION = "duration"
+    LENGTH = "length"
+    MEAN_SPEED = "mean speed"
+    POINT_COUNT = "point count"
+
+    def __str__(self):
+        return self.value
+
+    def __repr__(self):
+        return self.__str__()
@@ -1,7 +1,9 @@
+from src.data_transfer.exception.custom_exception import AnalysisCancelled
 from src.data_transfer.exception.custom_exception import ExecutionFlowError
 from src.data_transfer.exception.custom_exception import InvalidInput
 from src.data_transfer.exception.custom_exception import InvalidUUID
 from src.data_transfer.exception.custom_exception import ModelException
 from src.data_transfer.exception.custom_exception import ObjectInUse
 
-__all__ = ["ModelException", "InvalidInput", "InvalidUUID", "ObjectInUse", "ExecutionFlowError"]
+__all__ = ["ModelException", "InvalidInput", "InvalidUUID", "ObjectInUse", "ExecutionFlowError",
+           "AnalysisCancelled"]
@@ -37,6 +37,10 @@ class ExecutionFlowError(ModelException):
     """Raised if a method is getting called that does not fit in the prior execution history"""
 
 
+class AnalysisCancelled(ModelException):
+    """Raised if an analysis was cancelled before it finished"""
+
+
 class UnexpectedArgumentError(ModelException):
     """Raised if an unexpected argument is passed to a method in the model"""
 
@@ -64,6 +68,10 @@ class DatabaseConnectionError(DatabaseException):
     """Raised if the database connection is not working"""
 
 
+class QueryCancelled(DatabaseException):
+    """Raised if a query was cancelled or ran into its timeout before it finished"""
+
+
 class ExceptionMessages(Enum):
     """
     Enum class for all the exception messages
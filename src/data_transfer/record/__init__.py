@@ -8,11 +8,14 @@ from src.data_transfer.record.error_record import ErrorRecord
 from src.data_transfer.record.file_record import FileRecord
 from src.data_transfer.record.filter_group_record import FilterGroupRecord
 from src.data_transfer.record.filter_record import FilterRecord
+from src.data_transfer.record.match_count_record import MatchCountRecord
 from src.data_transfer.record.polygon_record import PolygonRecord
 from src.data_transfer.record.position_record import PositionRecord
 from src.data_transfer.record.selection_record import SelectionRecord
 from src.data_transfer.record.setting_context import SettingContext
 from src.data_transfer.record.setting_record import SettingRecord
+from src.data_transfer.record.table_page_record import TablePageQueryRecord
+from src.data_transfer.record.table_page_record import TablePageRecord
 from src.data_transfer.record.settings_record import PageRecord
 from src.data_transfer.record.settings_record import SegmentRecord
 from src.data_transfer.record.settings_record import SettingsRecord
@@ -27,6 +30,7 @@ __all__ = ['AnalysisRecord',
            'FileRecord',
            'FilterGroupRecord',
            'FilterRecord',
+           'MatchCountRecord',
            'PolygonRecord',
            'PositionRecord',
            'SettingContext',
@@ -35,5 +39,7 @@ __all__ = ['AnalysisRecord',
            'SegmentRecord',
            'SettingsRecord',
            'SettingRecord',
+           'TablePageQueryRecord',
+           'TablePageRecord',
            'ErrorRecord',
            'SelectionRecord']
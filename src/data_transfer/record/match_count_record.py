@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class MatchCountRecord:
+    """
+    record containing the number of datapoints and trajectories that pass the filters
+    """
+
+    _point_count: int
+    _trajectory_count: int
+    _exact: bool
+
+    @property
+    def point_count(self) -> int:
+        """
+        the number of datapoints that pass the filters
+        """
+        return self._point_count
+
+    @property
+    def trajectory_count(self) -> int:
+        """
+        the number of trajectories that pass the filters
+        """
+        return self._trajectory_count
+
+    @property
+    def exact(self) -> bool:
+        """
+        whether the counts are exact or estimated from a sample of the dataset
+        """
+        return self._exact
@@ -33,5 +33,4 @@ class PositionRecord:
         return [self.latitude, self.longitude]
 
     def __str__(self):
-        # Needed in : _create_polygon_filter_strs of filter_visitor class, very practical
         return str(self._latitude) + " " + str(self._longitude)
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pandas as pd
+
+from src.data_transfer.content import Column
+
+# the number of rows of a page of a table
+PAGE_SIZE = 100
+# the columns the rows are ordered by if no other columns are selected, the datasets are indexed by them and the id
+DEFAULT_SORT_COLUMNS = (Column.TRAJECTORY_ID, Column.ORDER)
+
+
+def get_last_key(page: pd.DataFrame) -> Optional[Tuple]:
+    """
+    gets the key of the last row of a page, the rows of a page are indexed by their keys
+    :param page: the rows of the page
+    :return: the key or None if the page is empty
+    """
+    if len(page) == 0:
+        return None
+    key = page.index[-1]
+    return key if isinstance(key, tuple) else (key,)
+
+
+@dataclass(frozen=True)
+class TablePageQueryRecord:
+    """
+    record describing a page of the filtered data. The rows are ordered by the sort columns and the id, so a page
+    starts right after the key of the last row of the previous page instead of at an offset.
+    """
+
+    _columns: Tuple[Column, ...]
+    _sort_columns: Tuple[Column, ...] = DEFAULT_SORT_COLUMNS
+    _descending: bool = False
+    _after: Optional[Tuple] = None
+    _page_size: int = PAGE_SIZE
+    _filter_column: Optional[Column] = None
+    _filter_values: Tuple = ()
+
+    @property
+    def columns(self) -> List[Column]:
+        """
+        the columns of the page
+        """
+        return list(self._columns)
+
+    @property
+    def sort_columns(self) -> List[Column]:
+        """
+        the columns the rows are ordered by, the id is added to order rows with equal values
+        """
+        return list(self._sort_columns)
+
+    @property
+    def key_columns(self) -> List[Column]:
+        """
+        the columns whose values are the key of a row
+        """
+        return [column for column in self._sort_columns if column != Column.ID] + [Column.ID]
+
+    @property
+    def descending(self) -> bool:
+        """
+        whether the rows are ordered descending
+        """
+        return self._descending
+
+    @property
+    def after(self) -> Optional[Tuple]:
+        """
+        the key of the last row of the previous page or None for the first page
+        """
+        return self._after
+
+    @property
+    def page_size(self) -> int:
+        """
+        the maximal number of rows of the page
+        """
+        return self._page_size
+
+    @property
+    def filter_column(self) -> Optional[Column]:
+        """
+        the column whose values are filtered or None if the rows are not filtered by a column
+        """
+        return self._filter_column
+
+    @property
+    def filter_values(self) -> List:
+        """
+        the values of the filter column the rows are restricted to, no values do not filter the rows
+        """
+        return list(self._filter_values)
+
+
+@dataclass(frozen=True)
+class TablePageRecord:
+    """
+    record containing a page of the filtered data, the rows are indexed by their keys
+    """
+
+    _data: pd.DataFrame
+    _has_next: bool
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """
+        the rows of the page with the requested columns, indexed by the key columns
+        """
+        return self._data
+
+    @property
+    def last_key(self) -> Optional[Tuple]:
+        """
+        the key of the last row of the page or None if the page is empty
+        """
+        return get_last_key(self._data)
+
+    @property
+    def has_next(self) -> bool:
+        """
+        whether there are rows after the page
+        """
+        return self._has_next
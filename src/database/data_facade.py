@@ -1,10 +1,22 @@
+import hashlib
 from abc import abstractmethod
+from typing import Iterator
 from typing import List
 from typing import Optional
 
+import pandas as pd
+
 from src.data_transfer.content import Column
 from src.data_transfer.record import DataRecord
+from src.data_transfer.record import MatchCountRecord
+from src.data_transfer.record import PositionRecord
+from src.data_transfer.record import TablePageQueryRecord
+from src.data_transfer.record import TablePageRecord
 from src.model.error_handler import ErrorHandler
+from src.model.filter_structure.predicate import Predicate
+
+# number of rows of the data that are read at once when the data is read in chunks
+CHUNK_SIZE = 100000
 
 
 class DataFacade(ErrorHandler):
@@ -13,20 +25,45 @@ class DataFacade(ErrorHandler):
     """
 
     @abstractmethod
-    def set_point_filter(self, filter_str: str, use_filter: bool, negate_filter: bool) -> None:
+    def set_point_filter(self, filter_str: str, use_filter: bool, negate_filter: bool,
+                         version: Optional[int] = None, predicate: Optional[Predicate] = None) -> None:
         """
         Sets a point filter for the data points.
         :param filter_str: String representation of the filter.
         :param use_filter: Boolean indicating if the filter should be used.
         :param negate_filter: Boolean indicating if the filter should be _negated.
+        :param version: The version of the filter structure the filter was compiled from.
+        :param predicate: The predicate tree the filter string was generated from.
         """
 
     @abstractmethod
-    def set_trajectory_filter(self, filter_str: str, use_filter: bool) -> None:
+    def set_trajectory_filter(self, filter_str: str, use_filter: bool, version: Optional[int] = None,
+                              predicate: Optional[Predicate] = None) -> None:
         """
         Sets a filter for the trajectorys.
         :param filter_str: String representation of the filter.
         :param use_filter: Boolean indicating if the filter should be used.
+        :param version: The version of the filter structure the filter was compiled from.
+        :param predicate: The predicate tree the filter string was generated from.
+        """
+        pass
+
+    @abstractmethod
+    def get_data_version(self) -> int:
+        """
+        Gets the version of the filtered data. The version changes whenever the dataset or one of the filters
+        changes, so results of earlier queries can be reused as long as the version is the same.
+        :return: the version of the filtered data.
+        """
+        pass
+
+    @abstractmethod
+    def get_data_key(self) -> Optional[str]:
+        """
+        Gets a key of the current dataset and filters. Unlike the data version, the key is the same in every session,
+        so results can be persisted by it. It starts with the key of the dataset, but it does not change if data is
+        appended to the dataset.
+        :return: the key or None if no dataset is opened.
         """
         pass
 
@@ -39,6 +76,36 @@ class DataFacade(ErrorHandler):
         """
         pass
 
+    @abstractmethod
+    def get_data_chunks(self, returned_columns: List[Column],
+                        chunk_size: int = CHUNK_SIZE) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        Gets the data with specified columns in chunks, so only one chunk has to be in memory at once.
+        :param returned_columns: List of Column objects specifying the columns to return.
+        :param chunk_size: The number of rows of a chunk.
+        :return: An iterator over the chunks of the requested data.
+        """
+        pass
+
+    @abstractmethod
+    def get_data_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        """
+        Gets a page of the data. The page starts after the key of the last row of the previous page instead of at an
+        offset, so a page is found without reading the rows before it.
+        :param page_query: The columns, order, filter and start of the page.
+        :return: TablePageRecord with the rows of the page indexed by their keys.
+        """
+        pass
+
+    @abstractmethod
+    def cancel_queries(self, thread_id: int) -> None:
+        """
+        Cancels the queries of the data that are running on another thread. A cancelled query fails, so the data it
+        was reading is not returned. The queries of other threads, e.g. of the map, keep running.
+        :param thread_id: The identifier of the thread as given by threading.get_ident.
+        """
+        pass
+
     @abstractmethod
     def get_distinct_data_from_column(self, returned_column: Column) -> DataRecord:
         """
@@ -67,3 +134,63 @@ class DataFacade(ErrorHandler):
         :return: all UUIDs in the Dataset.
         """
         pass
+
+    @abstractmethod
+    def get_binned_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                        value_column: Optional[Column] = None) -> Optional[DataRecord]:
+        """
+        Counts the datapoints that pass the point filter in the bins of a grid inside the given bounds. The bins
+        are the OSM tiles of the bin zoom level, so only one row per non-empty bin is returned.
+        :param bin_zoom: the zoom level whose tiles are the bins
+        :param upper_left: the north-west corner of the bounds
+        :param lower_right: the south-east corner of the bounds
+        :param value_column: optionally a column whose mean value is calculated for every bin
+        :return: DataRecord with the columns bin_x, bin_y, point_count and value.
+        """
+        pass
+
+    @abstractmethod
+    def get_match_count(self, point_predicate: Optional[Predicate], trajectory_predicate: Optional[Predicate],
+                        time_budget: Optional[float] = None) -> Optional[MatchCountRecord]:
+        """
+        Counts the datapoints and trajectories that pass the given filters instead of the current filters. The
+        datapoints are only counted if their trajectory passes the trajectory filter and the trajectories are only
+        counted if one of their datapoints is counted.
+        :param point_predicate: the predicate of the point filter or None if there is no point filter
+        :param trajectory_predicate: the predicate of the trajectory filter or None if there is no trajectory filter
+        :param time_budget: the time in seconds the counting should take at most. If counting the whole dataset
+        takes longer, the counts are estimated from a sample. If the count still takes too long, it is cancelled
+        and None is returned without an error.
+        :return: MatchCountRecord with the counts.
+        """
+        pass
+
+
+def to_page(data: pd.DataFrame, page_query: TablePageQueryRecord) -> TablePageRecord:
+    """
+    creates a page from the ordered rows after the start of the page
+    :param data: the ordered rows with the requested and the key columns, one row more than a page is used to find
+    out whether there are rows after the page
+    :param page_query: the query of the page
+    :return: the page with the requested columns indexed by the key columns
+    """
+    page = data.iloc[:page_query.page_size]
+    page = page.set_index(pd.MultiIndex.from_frame(page[[column.value for column in page_query.key_columns]]))
+    return TablePageRecord(page[[column.value for column in page_query.columns]],
+                           len(data) > page_query.page_size)
+
+
+def get_page_columns(page_query: TablePageQueryRecord) -> List[Column]:
+    """
+    gets the requested columns and the key columns of a page
+    """
+    return page_query.columns + [column for column in page_query.key_columns if column not in page_query.columns]
+
+
+def get_filter_digest(*filters) -> str:
+    """
+    creates a digest of the filters that is the same in every session
+    :param filters: the filter strings and the flags of their usage
+    :return: the digest
+    """
+    return hashlib.sha256(repr(filters).encode()).hexdigest()[:16]
@@ -1,3 +1,5 @@
+import threading
+from typing import Dict
 from typing import Optional
 
 import sqlalchemy.exc
@@ -9,6 +11,11 @@ from src.database.query_logging import log_query
 
 
 class DatabaseConnection:
+    """
+    The connection to the database. Analyses query the data on a background thread, so every thread uses its own
+    connection. The connections of running queries are kept with the thread that runs them, so the statements of one
+    thread can be cancelled without those of the other threads.
+    """
 
     def __init__(self, host: str, user: str, password: str, database: str, port: str):
         """
@@ -27,10 +34,51 @@ class DatabaseConnection:
         # create engine with the given parameters.
         self.engine = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{database}', echo=False,
                                     pool_size=20, max_overflow=30)
-        # check if the engine is valid.
-        self.connection: Optional[Connection] = None
+        # the connection of each thread
+        self._local = threading.local()
+        self._running: Dict[Connection, int] = {}
+        self._lock = threading.Lock()
 
+    @property
+    def connection(self) -> Optional[Connection]:
+        """
+        the connection of the current thread
+        """
+        return getattr(self._local, "connection", None)
+
+    @connection.setter
+    def connection(self, connection: Optional[Connection]):
+        self._local.connection = connection
+
+    def track(self, connection: Connection):
+        """
+        keeps the connection while its query runs on the current thread, so the query can be cancelled
+        """
+        with self._lock:
+            self._running[connection] = threading.get_ident()
 
+    def untrack(self, connection: Connection):
+        """
+        forgets the connection after its query finished
+        """
+        with self._lock:
+            self._running.pop(connection, None)
+
+    def cancel_queries(self, thread_id: int):
+        """
+        Cancels the statements that are running on the connections of a thread, like pg_cancel_backend does. The
+        connections stay open, the cancelled queries fail with an error.
+        :param thread_id: the identifier of the thread as given by threading.get_ident
+        """
+        with self._lock:
+            running = [connection for connection, owner in self._running.items() if owner == thread_id]
+        for connection in running:
+            try:
+                connection.connection.dbapi_connection.cancel()
+                log_query("Query cancelled.")
+            except Exception:
+                # the query finished in the meantime or the driver can not cancel it
+                pass
 
     def get_connection(self) -> Connection:
         """
@@ -48,6 +96,7 @@ class DatabaseConnection:
             log_query("Connection established.")
         else:
             log_query("Connection already established.")
+        self.track(self.connection)
         return self.connection
 
     def post_connection(self):
@@ -59,6 +108,7 @@ class DatabaseConnection:
             log_query("Connection still open.")
         else:
             log_query("Connection closed.")"""
+        self.untrack(self.connection)
         self.connection.commit()
         self.connection.close()
         log_query("Connection closed.")
@@ -67,6 +117,7 @@ class DatabaseConnection:
         """
         Recovers the connection to the database.
         """
+        self.untrack(self.connection)
         self.connection.rollback()
         self.connection.commit()
         self.connection.close()
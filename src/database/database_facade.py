@@ -1,15 +1,28 @@
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from uuid import UUID
 
+import pandas as pd
+
 from src.data_transfer.content import Column
 from src.data_transfer.record.data_record import DataRecord
 from src.data_transfer.record.data_set_record import DatasetRecord
+from src.data_transfer.record.match_count_record import MatchCountRecord
+from src.data_transfer.record.position_record import PositionRecord
+from src.data_transfer.record.table_page_record import TablePageQueryRecord
+from src.data_transfer.record.table_page_record import TablePageRecord
+from src.database.data_facade import CHUNK_SIZE
 from src.database.data_facade import DataFacade
 from src.database.dataset_facade import DatasetFacade
+from src.database.in_memory_data_facade import InMemoryDataFacade
 from src.database.postgre_sql_data_facade import PostgreSQLDataFacade
 from src.database.postgre_sql_dataset_facade import PostgreSQLDatasetFacade
+from src.model.filter_structure.predicate import Predicate
+
+# datasets up to this size in megabytes are cached in memory, so their filters are evaluated without the database
+IN_MEMORY_SIZE_LIMIT = 512
 
 
 class DatabaseFacade(DatasetFacade, DataFacade):
@@ -24,8 +37,34 @@ class DatabaseFacade(DatasetFacade, DataFacade):
         super().__init__()
         self.data_facade = PostgreSQLDataFacade()
         self.dataset_facade = PostgreSQLDatasetFacade(self.data_facade)
+        self.in_memory_data_facade = InMemoryDataFacade()
         self.add_error_handler(self.data_facade)
         self.add_error_handler(self.dataset_facade)
+        self.add_error_handler(self.in_memory_data_facade)
+
+    def _get_reading_facade(self) -> DataFacade:
+        """
+        gets the data facade that answers the data requests, which is the in memory facade if the current dataset
+        is cached and its filters can be evaluated in memory
+        """
+        if self.in_memory_data_facade.can_evaluate():
+            return self.in_memory_data_facade
+        return self.data_facade
+
+    def _cache_current_dataset(self) -> None:
+        """
+        caches the current dataset in memory if it is small enough
+        """
+        table_adapter = self.data_facade.table_adapter
+        if table_adapter is None or table_adapter.size is None or table_adapter.size > IN_MEMORY_SIZE_LIMIT:
+            self.in_memory_data_facade.set_data(None)
+            return
+
+        data = self.data_facade.get_data(Column.list(), usefilter=False)
+        if data is None:
+            # the dataset is still accessible through the database, so failing to cache it is no error
+            self.data_facade.get_errors()
+        self.in_memory_data_facade.set_data(data)
 
     def get_data_sets_as_dict(self) -> Dict[str, int]:
         return self.dataset_facade.get_data_sets_as_dict()
@@ -33,11 +72,21 @@ class DatabaseFacade(DatasetFacade, DataFacade):
     def set_data_sets_as_dict(self):
         return self.dataset_facade.set_data_sets_as_dict()
 
-    def set_trajectory_filter(self, filter_str: str, use_filter: bool) -> None:
-        self.data_facade.set_trajectory_filter(filter_str, use_filter)
+    def set_trajectory_filter(self, filter_str: str, use_filter: bool, version: Optional[int] = None,
+                              predicate: Optional[Predicate] = None) -> None:
+        self.data_facade.set_trajectory_filter(filter_str, use_filter, version, predicate)
+        self.in_memory_data_facade.set_trajectory_filter(filter_str, use_filter, version, predicate)
+
+    def set_point_filter(self, filter_str: str, use_filter: bool, negate_filter: bool,
+                         version: Optional[int] = None, predicate: Optional[Predicate] = None) -> None:
+        self.data_facade.set_point_filter(filter_str, use_filter, negate_filter, version, predicate)
+        self.in_memory_data_facade.set_point_filter(filter_str, use_filter, negate_filter, version, predicate)
 
-    def set_point_filter(self, filter_str: str, use_filter: bool, negate_filter: bool) -> None:
-        self.data_facade.set_point_filter(filter_str, use_filter, negate_filter)
+    def get_data_version(self) -> int:
+        return self.data_facade.get_data_version()
+
+    def get_data_key(self) -> Optional[str]:
+        return self.data_facade.get_data_key()
 
     def set_connection(self, connection: Dict[str, str]) -> bool:
         return self.dataset_facade.set_connection(connection)
@@ -45,28 +94,65 @@ class DatabaseFacade(DatasetFacade, DataFacade):
     def get_data_set_meta(self, dataset_uuid: UUID) -> Optional[DatasetRecord]:
         return self.dataset_facade.get_data_set_meta(dataset_uuid)
 
+    def get_dataset_key(self, dataset_uuid: UUID) -> Optional[str]:
+        return self.dataset_facade.get_dataset_key(dataset_uuid)
+
     def delete_dataset(self, dataset_uuid: UUID) -> bool:
-        return self.dataset_facade.delete_dataset(dataset_uuid)
+        if not self.dataset_facade.delete_dataset(dataset_uuid):
+            return False
+        table_adapter = self.data_facade.table_adapter
+        if table_adapter is not None and table_adapter.get_uuid() == dataset_uuid:
+            self.in_memory_data_facade.set_data(None)
+        return True
 
     def set_current_dataset(self, dataset_uuid: UUID) -> bool:
-        return self.dataset_facade.set_current_dataset(dataset_uuid)
+        if not self.dataset_facade.set_current_dataset(dataset_uuid):
+            return False
+        self._cache_current_dataset()
+        return True
 
     def add_dataset(self, data: DataRecord, append: bool = False) -> Optional[UUID]:
-        return self.dataset_facade.add_dataset(data, append)
+        dataset_uuid = self.dataset_facade.add_dataset(data, append)
+        table_adapter = self.data_facade.table_adapter
+        if dataset_uuid is not None and table_adapter is not None and table_adapter.get_uuid() == dataset_uuid:
+            # the current dataset was changed, so the cached dataset is outdated
+            self._cache_current_dataset()
+        return dataset_uuid
 
     def get_data(self, returned_columns: List[Column]) -> Optional[DataRecord]:
-        return self.data_facade.get_data(returned_columns)
+        return self._get_reading_facade().get_data(returned_columns)
+
+    def get_data_chunks(self, returned_columns: List[Column],
+                        chunk_size: int = CHUNK_SIZE) -> Optional[Iterator[pd.DataFrame]]:
+        return self._get_reading_facade().get_data_chunks(returned_columns, chunk_size)
+
+    def get_data_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        return self._get_reading_facade().get_data_page(page_query)
+
+    def cancel_queries(self, thread_id: int) -> None:
+        self._get_reading_facade().cancel_queries(thread_id)
 
     def get_distinct_data_from_column(self, returned_column: Column) -> Optional[DataRecord]:
-        return self.data_facade.get_distinct_data_from_column(returned_column)
+        return self._get_reading_facade().get_distinct_data_from_column(returned_column)
 
     def get_data_of_column_selection(self, returned_columns: List[Column], chosen_elements: List,
                                      chosen_column: Column, usefilter: bool = True) -> Optional[DataRecord]:
-        return self.data_facade.get_data_of_column_selection(returned_columns, chosen_elements,
-                                                             chosen_column, usefilter)
+        return self._get_reading_facade().get_data_of_column_selection(returned_columns, chosen_elements,
+                                                                       chosen_column, usefilter)
 
     def get_trajectory_ids(self) -> DataRecord:
-        return self.data_facade.get_trajectory_ids()
+        return self._get_reading_facade().get_trajectory_ids()
+
+    def get_binned_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                        value_column: Optional[Column] = None) -> Optional[DataRecord]:
+        return self._get_reading_facade().get_binned_data(bin_zoom, upper_left, lower_right, value_column)
+
+    def get_match_count(self, point_predicate: Optional[Predicate], trajectory_predicate: Optional[Predicate],
+                        time_budget: Optional[float] = None) -> Optional[MatchCountRecord]:
+        # the predicates are given, so a cached dataset can count them regardless of the current filters
+        if self.in_memory_data_facade.is_cached():
+            return self.in_memory_data_facade.get_match_count(point_predicate, trajectory_predicate, time_budget)
+        return self.data_facade.get_match_count(point_predicate, trajectory_predicate, time_budget)
 
     def table_exists(self, table_name: str) -> bool:
         return self.dataset_facade.table_exists(table_name)
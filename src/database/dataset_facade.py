@@ -50,6 +50,15 @@ class DatasetFacade(ErrorHandler):
         """
         pass
 
+    @abstractmethod
+    def get_dataset_key(self, dataset_uuid: UUID) -> Optional[str]:
+        """
+        Getter for the key of a dataset. Unlike its uuid, the key is the same in every session.
+        :param dataset_uuid: The uuid of the dataset.
+        :return: The key of the dataset or None if the dataset does not exist.
+        """
+        pass
+
     @abstractmethod
     def delete_dataset(self, dataset_uuid: UUID) -> bool:
         """
@@ -0,0 +1,276 @@
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_transfer.content.column import Column
+from src.data_transfer.content.error import ErrorMessage
+from src.data_transfer.exception import InvalidInput
+from src.data_transfer.record import DataRecord
+from src.data_transfer.record import MatchCountRecord
+from src.data_transfer.record import PositionRecord
+from src.data_transfer.record import TablePageQueryRecord
+from src.data_transfer.record import TablePageRecord
+from src.database.data_facade import CHUNK_SIZE
+from src.database.data_facade import DataFacade
+from src.database.data_facade import get_filter_digest
+from src.database.data_facade import get_page_columns
+from src.database.data_facade import to_page
+from src.database.numpy_filter_evaluator import NumpyFilterEvaluator
+from src.database.postgre_sql_data_facade import BIN_COLUMNS
+from src.model.filter_structure.predicate import InPredicate
+from src.model.filter_structure.predicate import Predicate
+
+
+class InMemoryDataFacade(DataFacade):
+    """
+    Data facade for a dataset that is cached in memory. Instead of sending queries to the database, the filters are
+    evaluated with numpy on the cached dataframe, so changing a filter does not need a round trip to the database.
+    The filters can only be evaluated if their predicate trees are given.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.data: Optional[DataRecord] = None
+        self.evaluator: Optional[NumpyFilterEvaluator] = None
+        self.filter: Optional[Predicate] = None
+        self.negate_filter = False
+        self.use_filter = None
+        self.trajectory_filter: Optional[Predicate] = None
+        self.use_trajectory_filter = None
+        self.point_mask: Optional[np.ndarray] = None
+        self.trajectory_mask: Optional[np.ndarray] = None
+        self.point_filter_evaluable = True
+        self.trajectory_filter_evaluable = True
+        self.point_filter_version = None
+        self.trajectory_filter_version = None
+        self.data_version = 0
+        # the order of the rows of the last paged table and what it was ordered by
+        self.page_order: Optional[Tuple[Tuple, np.ndarray]] = None
+
+    def set_data(self, data: Optional[DataRecord]) -> None:
+        """
+        sets the cached dataset and evaluates the current filters on it
+        :param data: the whole dataset or None if no dataset is cached
+        """
+        self.data = data
+        self.data_version += 1
+        if data is None:
+            self.evaluator = None
+            self.point_mask = None
+            self.trajectory_mask = None
+            return
+        self.evaluator = NumpyFilterEvaluator(data.data)
+        self._evaluate_point_filter()
+        self._evaluate_trajectory_filter()
+
+    def is_cached(self) -> bool:
+        """
+        checks whether a dataset is cached
+        :return: whether a dataset is cached
+        """
+        return self.data is not None
+
+    def can_evaluate(self) -> bool:
+        """
+        checks whether a dataset is cached and the current filters can be evaluated on it
+        :return: whether the requests can be answered from memory
+        """
+        return self.is_cached() and self.point_filter_evaluable and self.trajectory_filter_evaluable
+
+    def set_point_filter(self, filter_str: str, use_filter: bool, negate_filter: bool,
+                         version: Optional[int] = None, predicate: Optional[Predicate] = None) -> None:
+        if version is not None and version == self.point_filter_version:
+            return None
+        self.point_filter_version = version
+
+        if filter_str is None or filter_str == "":
+            self.filter = None
+            self.point_filter_evaluable = True
+        else:
+            self.filter = predicate
+            self.negate_filter = negate_filter
+            self.use_filter = use_filter
+            self.point_filter_evaluable = predicate is not None
+        self.data_version += 1
+        self._evaluate_point_filter()
+
+    def set_trajectory_filter(self, filter_str: str, use_filter: bool, version: Optional[int] = None,
+                              predicate: Optional[Predicate] = None) -> None:
+        if version is not None and version == self.trajectory_filter_version:
+            return None
+        self.trajectory_filter_version = version
+
+        if filter_str is None or filter_str == "":
+            self.trajectory_filter = None
+            self.trajectory_filter_evaluable = True
+        else:
+            self.trajectory_filter = predicate
+            self.use_trajectory_filter = use_filter
+            self.trajectory_filter_evaluable = predicate is not None
+        self.data_version += 1
+        self._evaluate_trajectory_filter()
+
+    def _evaluate_point_filter(self) -> None:
+        self.point_mask = None
+        if self.evaluator is None or self.filter is None:
+            return
+        self.point_mask = self.evaluator.evaluate(self.filter)
+        if self.negate_filter:
+            self.point_mask = ~self.point_mask
+
+    def _evaluate_trajectory_filter(self) -> None:
+        self.trajectory_mask = None
+        if self.evaluator is None or self.trajectory_filter is None:
+            return
+        self.trajectory_mask = self.evaluator.evaluate(self.trajectory_filter)
+
+    def get_data_version(self) -> int:
+        return self.data_version
+
+    def get_data_key(self) -> Optional[str]:
+        if self.data is None:
+            return None
+        # the cached dataset is named by the key of its table, so the key is the same as the one of the database
+        return f"{self.data.name}_" + get_filter_digest(
+            None if self.filter is None else self.filter.to_sql(), self.negate_filter, self.use_filter,
+            None if self.trajectory_filter is None else self.trajectory_filter.to_sql(), self.use_trajectory_filter)
+
+    def check_data(self):
+        """
+        checks whether a dataset is cached
+        """
+        if self.data is None:
+            raise RuntimeError("Dataset can't be accessed before caching an Dataset.")
+
+    def _to_record(self, frame: pd.DataFrame, columns: List[Column]) -> DataRecord:
+        return DataRecord(self.data.name, tuple([column.value for column in Column]),
+                          frame[[column.value for column in columns]].reset_index(drop=True))
+
+    def get_data(self, returned_columns: List[Column], usefilter: bool = True) -> Optional[DataRecord]:
+        self.check_data()
+        frame = self.data.data
+        if usefilter is True and self.point_mask is not None:
+            frame = frame[self.point_mask]
+        return self._to_record(frame, returned_columns)
+
+    def get_data_chunks(self, returned_columns: List[Column],
+                        chunk_size: int = CHUNK_SIZE) -> Optional[Iterator[pd.DataFrame]]:
+        self.check_data()
+        frame = self.data.data
+        if self.point_mask is not None:
+            frame = frame[self.point_mask]
+        frame = frame[[column.value for column in returned_columns]]
+        return (frame.iloc[start:start + chunk_size].reset_index(drop=True)
+                for start in range(0, len(frame), chunk_size))
+
+    def get_data_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        self.check_data()
+        order = self._get_page_order(page_query)
+        start = 0
+        if page_query.after is not None:
+            # the id is the last value of a key and unique, so the page starts after the row of the key. If the row is
+            # filtered out, the pages start again at the first row.
+            positions = np.flatnonzero(self.data.data[Column.ID.value].to_numpy()[order] == page_query.after[-1])
+            start = positions[0] + 1 if len(positions) > 0 else 0
+        rows = self.data.data.iloc[order[start:start + page_query.page_size + 1]]
+        return to_page(rows[[column.value for column in get_page_columns(page_query)]], page_query)
+
+    def _get_page_order(self, page_query: TablePageQueryRecord) -> np.ndarray:
+        """
+        orders the filtered rows by the key columns of the page, the order is kept until the data or the order changes
+        :return: the positions of the rows in their order
+        """
+        order_key = (self.data_version, tuple(page_query.key_columns), page_query.descending,
+                     page_query.filter_column, tuple(page_query.filter_values))
+        if self.page_order is not None and self.page_order[0] == order_key:
+            return self.page_order[1]
+
+        mask = np.ones(len(self.data.data), dtype=bool)
+        if self.point_mask is not None:
+            mask &= self.point_mask
+        if page_query.filter_column is not None and len(page_query.filter_values) > 0:
+            mask &= self.evaluator.evaluate(InPredicate(page_query.filter_column.value,
+                                                        tuple("'" + value.__str__() + "'"
+                                                              for value in page_query.filter_values)))
+        rows = np.flatnonzero(mask)
+        keys = self.data.data.iloc[rows][[column.value for column in page_query.key_columns]].reset_index(drop=True)
+        keys = keys.sort_values(by=list(keys.columns), ascending=not page_query.descending, na_position="last")
+        order = rows[keys.index.to_numpy()]
+        self.page_order = (order_key, order)
+        return order
+
+    def cancel_queries(self, thread_id: int) -> None:
+        # the data is read from memory, so a chunked read is stopped between its chunks by the reader
+        pass
+
+    def get_distinct_data_from_column(self, returned_column: Column) -> Optional[DataRecord]:
+        self.check_data()
+        return self._to_record(self.data.data.drop_duplicates(returned_column.value), [returned_column])
+
+    def get_data_of_column_selection(self, returned_columns: List[Column], chosen_elements: List,
+                                     chosen_column: Column, usefilter: bool = True) -> Optional[DataRecord]:
+        if len(chosen_elements) == 0 or chosen_column is None:
+            raise InvalidInput("No elements selected")
+
+        self.check_data()
+        mask = self.evaluator.evaluate(InPredicate(chosen_column.value,
+                                                   tuple("'" + value.__str__() + "'" for value in chosen_elements)))
+        if usefilter is True and self.point_mask is not None:
+            mask = mask & self.point_mask
+
+        data = self._to_record(self.data.data[mask], returned_columns)
+        if len(data.data) == 0:
+            self.throw_error(ErrorMessage.TRAJECTORY_NOT_EXISTING, msg="No trajectory selected")
+            return None
+        return data
+
+    def get_trajectory_ids(self) -> Optional[DataRecord]:
+        self.check_data()
+        frame = self.data.data
+        if self.use_trajectory_filter and self.trajectory_mask is not None:
+            frame = frame[self.trajectory_mask]
+        return self._to_record(frame.drop_duplicates(Column.TRAJECTORY_ID.value), [Column.TRAJECTORY_ID])
+
+    def get_binned_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                        value_column: Optional[Column] = None) -> Optional[DataRecord]:
+        self.check_data()
+        scale = 2 ** bin_zoom
+        frame = self.data.data
+        latitudes = pd.to_numeric(frame[Column.LATITUDE.value], errors="coerce").to_numpy()
+        longitudes = pd.to_numeric(frame[Column.LONGITUDE.value], errors="coerce").to_numpy()
+
+        mask = (latitudes >= lower_right.latitude) & (latitudes <= upper_left.latitude) \
+            & (longitudes >= upper_left.longitude) & (longitudes <= lower_right.longitude)
+        if self.point_mask is not None:
+            mask &= self.point_mask
+        latitudes = np.radians(latitudes[mask])
+        longitudes = longitudes[mask]
+
+        # integer OSM tile coordinates of the datapoints, like the TILE_X and TILE_Y queries
+        bins = pd.DataFrame({
+            "bin_x": np.floor((longitudes + 180.0) / 360.0 * scale).astype(np.int64),
+            "bin_y": np.floor((1.0 - np.log(np.tan(latitudes) + 1.0 / np.cos(latitudes)) / np.pi) / 2.0 * scale)
+            .astype(np.int64),
+            "value": np.nan if value_column is None
+            else pd.to_numeric(frame[value_column.value], errors="coerce").to_numpy()[mask]
+        })
+        grouped = bins.groupby(["bin_x", "bin_y"], sort=False)["value"]
+        binned = pd.DataFrame({"point_count": grouped.size(), "value": grouped.mean()}).reset_index()
+        return DataRecord(self.data.name, BIN_COLUMNS, binned[list(BIN_COLUMNS)])
+
+    def get_match_count(self, point_predicate: Optional[Predicate], trajectory_predicate: Optional[Predicate],
+                        time_budget: Optional[float] = None) -> Optional[MatchCountRecord]:
+        self.check_data()
+        # the cached dataset is small enough to always be counted exactly
+        mask = np.ones(len(self.data.data), dtype=bool)
+        if trajectory_predicate is not None:
+            mask = self.evaluator.evaluate(trajectory_predicate)
+        if point_predicate is not None:
+            mask = mask & self.evaluator.evaluate(point_predicate)
+        # like the datapoints, the trajectories are only counted if one of their datapoints passes both filters
+        trajectory_count = self.data.data[Column.TRAJECTORY_ID.value][mask].nunique()
+        return MatchCountRecord(int(mask.sum()), int(trajectory_count), True)
@@ -0,0 +1,248 @@
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_transfer.content import Column
+from src.data_transfer.content import TrajectoryMetric
+from src.data_transfer.content.logical_operator import LogicalOperator
+from src.model.filter_structure.predicate import AggregatePredicate
+from src.model.filter_structure.predicate import ConstantPredicate
+from src.model.filter_structure.predicate import ExistsAllPredicate
+from src.model.filter_structure.predicate import ExistsPredicate
+from src.model.filter_structure.predicate import GroupPredicate
+from src.model.filter_structure.predicate import InPredicate
+from src.model.filter_structure.predicate import IntervalPredicate
+from src.model.filter_structure.predicate import NotPredicate
+from src.model.filter_structure.predicate import PolygonPredicate
+from src.model.filter_structure.predicate import Predicate
+from src.model.filter_structure.predicate import SequencePredicate
+from src.model.polygon_structure.polygon_geometry import points_in_polygon
+from src.model.trajectory_kinematics import get_distances
+from src.model.trajectory_kinematics import trajectory_starts
+
+DATE_FORMAT = "%d.%m.%Y"
+TIMESTAMP_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+# the rows for which a predicate is true and the rows for which it is false, rows in neither are NULL
+Masks = Tuple[np.ndarray, np.ndarray]
+
+
+class NumpyFilterEvaluator:
+    """
+    Evaluates the predicate tree of a filter structure on a dataframe with numpy instead of sql. The predicates are
+    evaluated with the three-valued logic of sql, so the evaluator selects the same rows as the sql condition of the
+    predicate: intervals become range masks, discrete selections isin masks and polygons vectorized point in
+    polygon tests. The converted columns are cached, so only the first filter on a column pays for the conversion.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        creates an evaluator for the given dataframe
+        :param frame: the dataframe containing the dataset
+        """
+        self._frame = frame.reset_index(drop=True)
+        self._size = len(frame)
+        self._columns: Dict[Tuple[str, str], pd.Series] = {}
+        self._trajectory_order: Optional[np.ndarray] = None
+
+    def evaluate(self, predicate: Predicate) -> np.ndarray:
+        """
+        evaluates the predicate on every row of the dataframe
+        :param predicate: the predicate tree
+        :return: a boolean array that is true for every row that fulfills the predicate
+        """
+        return self._evaluate(predicate)[0]
+
+    def _evaluate(self, predicate: Predicate) -> Masks:
+        if isinstance(predicate, ConstantPredicate):
+            return self._constant(predicate.value)
+        if isinstance(predicate, NotPredicate):
+            true, false = self._evaluate(predicate.child)
+            return false, true
+        if isinstance(predicate, GroupPredicate):
+            return self._evaluate_group(predicate)
+        if isinstance(predicate, IntervalPredicate):
+            return self._evaluate_interval(predicate)
+        if isinstance(predicate, InPredicate):
+            return self._evaluate_in(predicate)
+        if isinstance(predicate, PolygonPredicate):
+            return self._evaluate_polygon(predicate)
+        if isinstance(predicate, ExistsPredicate):
+            return self._trajectories_with(self.evaluate(predicate.condition))
+        if isinstance(predicate, ExistsAllPredicate):
+            return self._evaluate_group(GroupPredicate(LogicalOperator.AND, tuple(
+                ExistsPredicate(condition) for condition in predicate.conditions)))
+        if isinstance(predicate, AggregatePredicate):
+            return self._evaluate_aggregate(predicate)
+        if isinstance(predicate, SequencePredicate):
+            return self._evaluate_sequence(predicate)
+        raise TypeError(f"The predicate {type(predicate).__name__} can't be evaluated in memory.")
+
+    def _constant(self, value: bool) -> Masks:
+        return np.full(self._size, value), np.full(self._size, not value)
+
+    def _evaluate_group(self, predicate: GroupPredicate) -> Masks:
+        is_and = predicate.operator == LogicalOperator.AND
+        true, false = self._constant(is_and)
+        for child in predicate.children:
+            child_true, child_false = self._evaluate(child)
+            if is_and:
+                true &= child_true
+                false |= child_false
+            else:
+                true |= child_true
+                false &= child_false
+        return true, false
+
+    def _split(self, values: pd.Series, known: np.ndarray) -> Masks:
+        """
+        splits a condition into the rows where it is true and where it is false, the unknown rows are neither
+        """
+        values = values.to_numpy(dtype=bool)
+        return values & known, ~values & known
+
+    def _evaluate_interval(self, predicate: IntervalPredicate) -> Masks:
+        bounds = predicate.numeric_bounds()
+        if bounds is not None:
+            values = self._get_column(predicate.column, "number")
+        elif predicate.column == Column.DATE.value:
+            values = self._get_column(predicate.column, "date")
+            bounds = (pd.Timestamp(_unquote(predicate.start)), pd.Timestamp(_unquote(predicate.end)))
+        else:
+            values = self._get_column(predicate.column, "text")
+            bounds = (_unquote(predicate.start), _unquote(predicate.end))
+        known = values.notna().to_numpy()
+        return self._split(values.between(bounds[0], bounds[1]), known)
+
+    def _evaluate_in(self, predicate: InPredicate) -> Masks:
+        values = self._get_column(predicate.column, "raw")
+        known = values.notna().to_numpy()
+        selection = [_unquote(value) for value in predicate.values]
+        if pd.api.types.is_bool_dtype(values):
+            values = values.map({True: "true", False: "false"})
+        elif pd.api.types.is_numeric_dtype(values):
+            selection = [number for number in pd.to_numeric(pd.Series(selection, dtype=object), errors="coerce")
+                         if not pd.isna(number)]
+        else:
+            values = self._get_column(predicate.column, "text")
+        return self._split(values.isin(selection), known)
+
+    def _evaluate_polygon(self, predicate: PolygonPredicate) -> Masks:
+        latitudes = self._get_column(Column.LATITUDE.value, "number")
+        longitudes = self._get_column(Column.LONGITUDE.value, "number")
+        known = (latitudes.notna() & longitudes.notna()).to_numpy()
+        inside = points_in_polygon(latitudes.to_numpy(), longitudes.to_numpy(), predicate.polygon)
+        return inside & known, ~inside & known
+
+    def _evaluate_aggregate(self, predicate: AggregatePredicate) -> Masks:
+        metric = self._get_metric(predicate.metric)
+        selected = metric[metric.between(float(predicate.start), float(predicate.end))].index
+        true = self._get_column(Column.TRAJECTORY_ID.value, "raw").isin(selected).to_numpy()
+        return true, ~true
+
+    def _evaluate_sequence(self, predicate: SequencePredicate) -> Masks:
+        if len(predicate.polygons) == 0 or self._size == 0:
+            return self._constant(False)
+        order = self._get_trajectory_order()
+        trajectory_ids = self._get_column(Column.TRAJECTORY_ID.value, "raw").to_numpy()[order]
+        first_points = np.r_[True, trajectory_ids[1:] != trajectory_ids[:-1]]
+        groups = np.cumsum(first_points) - 1
+
+        reached = self.evaluate(PolygonPredicate(predicate.polygons[0]))[order]
+        for polygon in predicate.polygons[1:]:
+            # whether the trajectory reached the previous step strictly before the datapoint
+            reached_so_far = np.maximum.accumulate(2 * groups + reached) == 2 * groups + 1
+            after = np.r_[False, reached_so_far[:-1]] & ~first_points
+            reached = self.evaluate(PolygonPredicate(polygon))[order] & after
+
+        visited = np.zeros(self._size, dtype=bool)
+        visited[order] = reached
+        return self._trajectories_with(visited)
+
+    def _trajectories_with(self, rows: np.ndarray) -> Masks:
+        """
+        selects the rows of every trajectory that contains at least one of the given rows
+        """
+        trajectory_ids = self._get_column(Column.TRAJECTORY_ID.value, "raw")
+        true = trajectory_ids.isin(trajectory_ids[rows].unique()).to_numpy()
+        return true, ~true
+
+    def _get_metric(self, metric: TrajectoryMetric) -> pd.Series:
+        """
+        calculates the metric of every trajectory
+        :return: the metric indexed by the trajectory id
+        """
+        key = ("metric", metric.value)
+        if key in self._columns:
+            return self._columns[key]
+
+        order = self._get_trajectory_order()
+        trajectories = self._frame.iloc[order]
+        grouped = trajectories.groupby(Column.TRAJECTORY_ID.value, sort=False)
+        if metric == TrajectoryMetric.POINT_COUNT:
+            values = grouped.size().astype(float)
+        elif metric == TrajectoryMetric.MEAN_SPEED:
+            values = pd.to_numeric(trajectories[Column.SPEED.value], errors="coerce") \
+                .groupby(trajectories[Column.TRAJECTORY_ID.value], sort=False).mean()
+        elif metric == TrajectoryMetric.DURATION:
+            timestamps = pd.to_datetime(trajectories[Column.DATE.value].astype(str) + " "
+                                        + trajectories[Column.TIME.value].astype(str),
+                                        format=TIMESTAMP_FORMAT, errors="coerce")
+            grouped_timestamps = timestamps.groupby(trajectories[Column.TRAJECTORY_ID.value], sort=False)
+            values = (grouped_timestamps.max() - grouped_timestamps.min()).dt.total_seconds()
+        else:
+            values = self._get_distances(trajectories).groupby(trajectories[Column.TRAJECTORY_ID.value],
+                                                                sort=False).sum()
+        self._columns[key] = values
+        return values
+
+    def _get_distances(self, trajectories: pd.DataFrame) -> pd.Series:
+        """
+        calculates the haversine distance of every datapoint to the previous datapoint of its trajectory in meters
+        """
+        distances = get_distances(pd.to_numeric(trajectories[Column.LATITUDE.value], errors="coerce"),
+                                  pd.to_numeric(trajectories[Column.LONGITUDE.value], errors="coerce"),
+                                  trajectory_starts(trajectories[Column.TRAJECTORY_ID.value]))
+        return pd.Series(distances, index=trajectories.index)
+
+    def _get_trajectory_order(self) -> np.ndarray:
+        """
+        gets the positions of the rows sorted by trajectory and by the original order inside the trajectories
+        """
+        if self._trajectory_order is None:
+            self._trajectory_order = np.lexsort((
+                self._get_column(Column.ORDER.value, "number").to_numpy(),
+                self._get_column(Column.TRAJECTORY_ID.value, "raw").to_numpy()
+            ))
+        return self._trajectory_order
+
+    def _get_column(self, column: str, kind: str) -> pd.Series:
+        """
+        gets a column of the dataframe converted to the given kind
+        :param column: the name of the column
+        :param kind: raw, number, date or text
+        :return: the converted column
+        """
+        key = (column, kind)
+        if key not in self._columns:
+            values = self._frame[column]
+            if kind == "number":
+                values = pd.to_numeric(values, errors="coerce")
+            elif kind == "date":
+                values = pd.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+            elif kind == "text":
+                values = values.where(values.isna(), values.astype(str))
+            self._columns[key] = values.reset_index(drop=True)
+        return self._columns[key]
+
+
+def _unquote(value: str) -> str:
+    """
+    removes the quotes of a sql string literal
+    """
+    if len(value) >= 2 and value[0] == "'" and value[-1] == "'":
+        return value[1:-1]
+    return value
@@ -1,13 +1,50 @@
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
 
 from src.data_transfer.content.column import Column
 from src.data_transfer.content.error import ErrorMessage
 from src.data_transfer.exception import InvalidInput
 from src.data_transfer.record import DataRecord
+from src.data_transfer.record import MatchCountRecord
+from src.data_transfer.record import PositionRecord
+from src.data_transfer.record import TablePageQueryRecord
+from src.data_transfer.record import TablePageRecord
+from src.database.data_facade import CHUNK_SIZE
 from src.database.data_facade import DataFacade
+from src.database.data_facade import get_filter_digest
+from src.database.data_facade import get_page_columns
+from src.database.data_facade import to_page
 from src.database.sql_querys import SQLQueries
 from src.database.table_adapter import TableAdapter
+from src.model.filter_structure.predicate import Predicate
+
+BIN_COLUMNS = ("bin_x", "bin_y", "point_count", "value")
+# estimated megabytes of a table the database scans per second, used to fit a count into its time budget
+SCAN_RATE = 100
+# smallest share of a table in percent that is sampled to estimate a count
+MIN_SAMPLE_PERCENT = 0.1
+# the scan rate is only estimated, so a count is cancelled after this multiple of its time budget
+TIME_BUDGET_TIMEOUT_FACTOR = 2
+
+
+def to_sql_literal(value) -> str:
+    """
+    converts a value to an sql literal, strings are quoted and the braces are escaped for the table name formatting
+    :param value: the value
+    :return: the literal
+    """
+    if pd.isna(value):
+        return "NULL"
+    if isinstance(value, (bool, np.bool_)):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float, np.number)):
+        return repr(value.item() if isinstance(value, np.generic) else value)
+    return "'" + str(value).replace("'", "''").replace("{", "{{").replace("}", "}}") + "'"
 
 
 class PostgreSQLDataFacade(DataFacade):
@@ -23,6 +60,9 @@ class PostgreSQLDataFacade(DataFacade):
         self.use_filter = None
         self.filter = None
         self.table_adapter = None
+        self.point_filter_version = None
+        self.trajectory_filter_version = None
+        self.data_version = 0
 
     def set_table_adapter(self, table_adapter: TableAdapter):
         """
@@ -30,6 +70,7 @@ class PostgreSQLDataFacade(DataFacade):
         :param table_adapter: the table adapter
         """
         self.table_adapter = table_adapter
+        self.data_version += 1
 
     def check_table_adapter(self):
         """
@@ -38,28 +79,71 @@ class PostgreSQLDataFacade(DataFacade):
         if self.table_adapter is None:
             raise RuntimeError("Dataset can't be accessed before opening an Dataset.")
 
-    def set_point_filter(self, filter_str: str, use_filter: bool, negate_filter: bool) -> None:
+    def set_point_filter(self, filter_str: str, use_filter: bool, negate_filter: bool,
+                         version: Optional[int] = None, predicate: Optional[Predicate] = None) -> None:
         self.check_table_adapter()
-        if filter_str is None or filter_str == "":
-            self.filter = None
+        if version is not None and version == self.point_filter_version:
             return None
+        self.point_filter_version = version
+        old_filter = (self.filter, self.use_filter)
 
-        if negate_filter:
-            self.filter = SQLQueries.NOT.value.format(filter=filter_str)
+        if filter_str is None or filter_str == "":
+            self.filter = None
         else:
-            self.filter = filter_str
-        self.use_filter = use_filter
+            if negate_filter:
+                self.filter = SQLQueries.NOT.value.format(filter=filter_str)
+            else:
+                self.filter = filter_str
+            self.use_filter = use_filter
+
+        if (self.filter, self.use_filter) != old_filter:
+            self.data_version += 1
+
+    def set_trajectory_filter(self, filter_str: str, use_filter: bool, version: Optional[int] = None,
+                              predicate: Optional[Predicate] = None) -> None:
+        if version is not None and version == self.trajectory_filter_version:
+            return None
+        old_filter = (self.trajecotry_filter, self.use_trajectory_filter)
 
-    def set_trajectory_filter(self, filter_str: str, use_filter: bool) -> None:
         if filter_str is None or filter_str == "":
             self.trajecotry_filter = None
+        else:
+            self.check_table_adapter()
+            self.trajecotry_filter = filter_str
+            self.use_trajectory_filter = use_filter
+        self.trajectory_filter_version = version
+
+        if (self.trajecotry_filter, self.use_trajectory_filter) != old_filter:
+            self.data_version += 1
+
+    def get_data_version(self) -> int:
+        return self.data_version
+
+    def get_data_key(self) -> Optional[str]:
+        if self.table_adapter is None:
             return None
-        self.check_table_adapter()
-        self.trajecotry_filter = filter_str
-        self.use_trajectory_filter = use_filter
+        # the uuid of the table adapter is created in every session, the key of the table is stored with the table
+        return f"{self.table_adapter.key}_" + get_filter_digest(self.filter, self.use_filter, self.trajecotry_filter,
+                                                                self.use_trajectory_filter)
 
     def get_data(self, returned_columns: List[Column], usefilter: bool = True) -> Optional[DataRecord]:
         self.check_table_adapter()
+        data = self.table_adapter.query_sql(self._get_data_query(returned_columns, usefilter))
+        if data is None:
+            for error in self.table_adapter.get_errors():
+                self.throw_error(error.error_type, error.args)
+            return None
+        return data
+
+    def get_data_chunks(self, returned_columns: List[Column],
+                        chunk_size: int = CHUNK_SIZE) -> Optional[Iterator[pd.DataFrame]]:
+        self.check_table_adapter()
+        return self.table_adapter.query_sql_chunks(self._get_data_query(returned_columns, True), chunk_size)
+
+    def _get_data_query(self, returned_columns: List[Column], usefilter: bool) -> str:
+        """
+        creates the query of the data with the given columns
+        """
         str_columns: List[str] = list()
 
         for column in returned_columns:
@@ -70,13 +154,86 @@ class PostgreSQLDataFacade(DataFacade):
 
         if usefilter is True and self.filter is not None:
             query += SQLQueries.WHERE.value.format(filter=self.filter)
+        return query
+
+    def get_data_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        self.check_table_adapter()
+        conditions: List[str] = []
+        if self.filter is not None:
+            conditions.append("(" + self.filter + ")")
+        if page_query.filter_column is not None and len(page_query.filter_values) > 0:
+            conditions.append(SQLQueries.IN.value.format(
+                column=page_query.filter_column.value,
+                values=", ".join(to_sql_literal(value) for value in page_query.filter_values)))
+
+        if page_query.after is None:
+            query = self._get_page_query(page_query, conditions)
+        else:
+            # every range is read up to the size of the page, the first rows of all of them are the page
+            query = SQLQueries.UNION_ALL.value.join(
+                SQLQueries.KEY_RANGE.value.format(query=self._get_page_query(page_query, conditions + [key_range]))
+                for key_range in self._get_key_ranges(page_query))
+            query += self._get_page_order(page_query)
 
         data = self.table_adapter.query_sql(query)
         if data is None:
             for error in self.table_adapter.get_errors():
                 self.throw_error(error.error_type, error.args)
             return None
-        return data
+        return to_page(data.data, page_query)
+
+    @classmethod
+    def _get_page_query(cls, page_query: TablePageQueryRecord, conditions: List[str]) -> str:
+        """
+        creates the query of the first rows of a page that fulfill the conditions
+        """
+        query = SQLQueries.SELECT.value.format(columns=", ".join(column.value
+                                                                 for column in get_page_columns(page_query)))
+        query += SQLQueries.FROM.value
+        if len(conditions) > 0:
+            query += SQLQueries.WHERE.value.format(filter=" AND ".join(conditions))
+        return query + cls._get_page_order(page_query)
+
+    @staticmethod
+    def _get_page_order(page_query: TablePageQueryRecord) -> str:
+        """
+        orders the rows by their key and limits them to the size of the page
+        """
+        order = SQLQueries.ORDER_DESCENDING if page_query.descending else SQLQueries.ORDER_ASCENDING
+        query = SQLQueries.ORDER_BY.value.format(columns=", ".join(order.value.format(column=column.value)
+                                                                   for column in page_query.key_columns))
+        # one more row tells whether there is a next page
+        return query + SQLQueries.LIMIT.value.format(limit=page_query.page_size + 1)
+
+    @staticmethod
+    def _get_key_ranges(page_query: TablePageQueryRecord) -> List[str]:
+        """
+        creates the conditions of the ranges of the rows that are ordered after the key the page starts after, in
+        their order. The rows after a key are those that equal the key up to a column and come after it in that
+        column, either with a value after the one of the key or with NULL, which is ordered last. Each of these
+        conditions is a range of an index over the key columns, while their disjunction would scan the table.
+        """
+        comparison = "<" if page_query.descending else ">"
+        ranges = []
+        equal: List[str] = []
+        for column, value in zip(page_query.key_columns, page_query.after):
+            if pd.isna(value):
+                # no value is ordered after NULL
+                equal.append(SQLQueries.IS_NULL.value.format(column=column.value))
+                continue
+            column_ranges = [equal + [SQLQueries.KEY_AFTER.value.format(column=column.value, comparison=comparison,
+                                                                        value=to_sql_literal(value))]]
+            if column != Column.ID:
+                # the id is never NULL
+                column_ranges.append(equal + [SQLQueries.IS_NULL.value.format(column=column.value)])
+            # the rows that equal the key in more columns come first
+            ranges = column_ranges + ranges
+            equal = equal + [SQLQueries.EQUAL.value.format(column=column.value, value=to_sql_literal(value))]
+        return [" AND ".join(key_range) for key_range in ranges]
+
+    def cancel_queries(self, thread_id: int) -> None:
+        if self.table_adapter is not None:
+            self.table_adapter.cancel_queries(thread_id)
 
     def get_distinct_data_from_column(self, returned_column: Column) -> Optional[DataRecord]:
 
@@ -139,3 +296,93 @@ class PostgreSQLDataFacade(DataFacade):
                 self.throw_error(error.error_type, error.args)
             return None
         return trajectory_ids
+
+    def get_binned_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                        value_column: Optional[Column] = None) -> Optional[DataRecord]:
+        self.check_table_adapter()
+        scale = 2 ** bin_zoom
+        str_columns: List[str] = [SQLQueries.TILE_X.value.format(scale=scale) + " AS bin_x",
+                                  SQLQueries.TILE_Y.value.format(scale=scale) + " AS bin_y"]
+        aggregate = "NULL"
+        if value_column is not None:
+            str_columns.append(value_column.value + " AS value")
+            aggregate = "AVG(value)"
+
+        conditions: List[str] = [
+            SQLQueries.BETWEEN.value.format(column=Column.LATITUDE.value, minimum=lower_right.latitude,
+                                            maximum=upper_left.latitude),
+            SQLQueries.BETWEEN.value.format(column=Column.LONGITUDE.value, minimum=upper_left.longitude,
+                                            maximum=lower_right.longitude)]
+        if self.filter is not None:
+            conditions.append("(" + self.filter + ")")
+
+        points = SQLQueries.SELECT.value.format(columns=", ".join(str_columns))
+        points += SQLQueries.FROM.value
+        points += SQLQueries.WHERE.value.format(filter=" AND ".join(conditions))
+        query = SQLQueries.BINNED.value.format(aggregate=aggregate, points=points)
+
+        data = self.table_adapter.query_sql(query)
+        if data is None:
+            for error in self.table_adapter.get_errors():
+                self.throw_error(error.error_type, error.args)
+            return None
+        return DataRecord(data.name, BIN_COLUMNS, data.data)
+
+    def get_match_count(self, point_predicate: Optional[Predicate], trajectory_predicate: Optional[Predicate],
+                        time_budget: Optional[float] = None) -> Optional[MatchCountRecord]:
+        self.check_table_adapter()
+        percent = 100.0
+        if time_budget is not None and self.table_adapter.size:
+            percent = max(MIN_SAMPLE_PERCENT, 100.0 * time_budget * SCAN_RATE / self.table_adapter.size)
+
+        query = SQLQueries.SELECT.value.format(columns=SQLQueries.MATCH_COUNT.value.format(
+            point_filter="TRUE" if point_predicate is None else point_predicate.to_sql(),
+            trajectory_filter="TRUE" if trajectory_predicate is None else trajectory_predicate.to_sql()))
+        query += SQLQueries.FROM.value
+        if percent < 100.0:
+            query += SQLQueries.TABLESAMPLE.value.format(percent=percent)
+
+        timeout = None if time_budget is None else time_budget * TIME_BUDGET_TIMEOUT_FACTOR
+        data = self.table_adapter.query_sql(query, timeout=timeout)
+        if data is None:
+            # a count that ran into its timeout has no errors
+            for error in self.table_adapter.get_errors():
+                self.throw_error(error.error_type, error.args)
+            return None
+        counts = data.data.iloc[0]
+        if percent >= 100.0:
+            return MatchCountRecord(int(counts["point_count"]), int(counts["trajectory_count"]), True)
+
+        statistics = self.table_adapter.query_sql(SQLQueries.TABLE_STATISTICS.value)
+        if statistics is None:
+            for error in self.table_adapter.get_errors():
+                self.throw_error(error.error_type, error.args)
+            return None
+        row_total, trajectory_total = self._estimate_totals(statistics.data, counts, percent)
+
+        # the share of the sampled datapoints and trajectories that pass the filters is scaled to the whole table
+        point_count = 0
+        if counts["row_count"] > 0:
+            point_count = round(counts["point_count"] / counts["row_count"] * row_total)
+        trajectory_count = 0
+        if counts["trajectory_total"] > 0:
+            trajectory_count = round(counts["trajectory_count"] / counts["trajectory_total"] * trajectory_total)
+        return MatchCountRecord(int(point_count), int(trajectory_count), False)
+
+    def _estimate_totals(self, statistics: pd.DataFrame, counts: pd.Series, percent: float) -> Tuple[float, float]:
+        """
+        estimates the number of rows and trajectories of the table from the planner statistics. If the table was
+        not analyzed yet, the totals of the sample are scaled up instead.
+        """
+        row_total = counts["row_count"] * 100.0 / percent
+        trajectory_total = counts["trajectory_total"] * 100.0 / percent
+        if len(statistics) == 0:
+            return row_total, trajectory_total
+
+        if not pd.isna(statistics["row_count"][0]) and statistics["row_count"][0] > 0:
+            row_total = float(statistics["row_count"][0])
+        n_distinct = statistics["trajectory_count"][0]
+        if not pd.isna(n_distinct) and n_distinct != 0:
+            # a negative number of distinct values is the negated share of distinct values among the rows
+            trajectory_total = float(n_distinct) if n_distinct > 0 else -float(n_distinct) * row_total
+        return row_total, trajectory_total
@@ -10,11 +10,13 @@ from uuid import uuid4
 import pandas as pd
 from sqlalchemy.sql import text
 
+from src.data_transfer.content import Column
 from src.data_transfer.content.error import ErrorMessage
 from src.data_transfer.exception import InvalidUUID
 from src.data_transfer.exception.custom_exception import DatabaseConnectionError
 from src.data_transfer.record import DataRecord
 from src.data_transfer.record import DatasetRecord
+from src.data_transfer.record.table_page_record import DEFAULT_SORT_COLUMNS
 from src.database.database_connection import DatabaseConnection
 from src.database.dataset_facade import DatasetFacade
 from src.database.postgre_sql_data_facade import PostgreSQLDataFacade
@@ -31,6 +33,7 @@ PORT: str = "port"
 TABLES_TABLE: str = "initial_table"
 PANDAS_TABLE: pd.DataFrame = pd.DataFrame({"table_name": [], "table_uuid": [], "table_size": []})
 INVALID_PREFIX: str = "Other Dataset: "
+PAGE_KEY_INDEX: str = "page_key"
 
 
 class PostgreSQLDatasetFacade(DatasetFacade):
@@ -71,6 +74,10 @@ class PostgreSQLDatasetFacade(DatasetFacade):
             return None
         return data
 
+    def get_dataset_key(self, dataset_uuid: UUID) -> Optional[str]:
+        table_adapter = self.table_adapters.get(dataset_uuid)
+        return None if table_adapter is None else table_adapter.key
+
     def delete_dataset(self, dataset_uuid: UUID) -> bool:
         if not (dataset_uuid in self.table_adapters.keys()):
             self.throw_error(ErrorMessage.DATASET_NOT_EXISTING, "This UUID is not existing.")
@@ -121,6 +128,12 @@ class PostgreSQLDatasetFacade(DatasetFacade):
             for error in table_adapter.get_errors():
                 self.throw_error(error.error_type, error.args)
             return None
+        # the pages of the table are read in the order of their key, without the index every page scans the table. The
+        # dataset can be used without it, so a failure is only reported
+        if not table_adapter.create_index(PAGE_KEY_INDEX, [column.value for column in DEFAULT_SORT_COLUMNS]
+                                          + [Column.ID.value]):
+            for error in table_adapter.get_errors():
+                self.throw_error(error.error_type, error.args)
 
         if not already_existing:
             self.table_adapters[table_adapter.uuid] = table_adapter
@@ -13,12 +13,45 @@ class SQLQueries(Enum):
     WHERE = " WHERE {filter}"
     SELECT_FROM = "SELECT {columns} FROM {tablename}"
     SELECTFILTERED = "SELECT {columns} FROM {tablename} WHERE {filter}"
-    NOT = "NOT({filter})"
+    NOT = "NOT COALESCE({filter}, false)"
     SELECTGROUPEDFILTERED = "SELECT {data} FROM {tablename} WHERE {filter} GROUP BY {data}"
     GROUPED = " GROUP BY {columns}"
     WHEREIN = " WHERE {column} IN ({values})"
+    IN = "{column} IN ({values})"
+    ORDER_BY = " ORDER BY {columns}"
+    ORDER_ASCENDING = "{column} ASC NULLS LAST"
+    ORDER_DESCENDING = "{column} DESC NULLS LAST"
+    LIMIT = " LIMIT {limit}"
+    IS_NULL = "{column} IS NULL"
+    EQUAL = "{column} = {value}"
+    # the rows with a value of a key column after the given one, the NULL values ordered last are a range of their own
+    KEY_AFTER = "{column} {comparison} {value}"
+    # the ordered ranges of the rows after a key are read separately, so each of them is a range of the key index
+    KEY_RANGE = "({query})"
+    UNION_ALL = " UNION ALL "
+    CREATE_INDEX = "CREATE INDEX IF NOT EXISTS {index} ON {tablename} ({columns})"
     SELECTINFILTERED = "SELECT {columns} FROM {tablename} WHERE {data} IN ({values}) AND {filter}"
     INSERT = "INSERT INTO {tablename} VALUES {values}"
+    BETWEEN = "{column} BETWEEN {minimum} AND {maximum}"
+    # integer OSM tile coordinates of the datapoints at the zoom level 2^zoom = scale
+    TILE_X = "CAST(FLOOR((longitude + 180.0) / 360.0 * {scale}) AS BIGINT)"
+    TILE_Y = "CAST(FLOOR((1.0 - LN(TAN(RADIANS(latitude)) + 1.0 / COS(RADIANS(latitude))) / PI()) / 2.0 * {scale}) " \
+             "AS BIGINT)"
+    BINNED = "SELECT bin_x, bin_y, COUNT(*) AS point_count, {aggregate} AS value FROM ({points}) AS b " \
+             "GROUP BY bin_x, bin_y"
+    # the datapoints that pass both filters and the trajectories with such a datapoint, the totals are needed to scale
+    # the counts of a sample to the whole dataset
+    MATCH_COUNT = "COUNT(*) AS row_count, COUNT(*) FILTER (WHERE ({trajectory_filter}) AND ({point_filter})) " \
+                  "AS point_count, COUNT(DISTINCT trajectory_id) AS trajectory_total, " \
+                  "COUNT(DISTINCT trajectory_id) FILTER (WHERE ({trajectory_filter}) AND ({point_filter})) " \
+                  "AS trajectory_count"
+    # cancels the statement of the current transaction after the given time
+    STATEMENT_TIMEOUT = "SET LOCAL statement_timeout = {milliseconds}; "
+    TABLESAMPLE = " TABLESAMPLE SYSTEM ({percent})"
+    # the number of rows and distinct trajectories the planner statistics estimate for the table
+    TABLE_STATISTICS = "SELECT c.reltuples AS row_count, s.n_distinct AS trajectory_count FROM pg_class AS c " \
+                       "LEFT JOIN pg_stats AS s ON s.tablename = c.relname AND s.attname = 'trajectory_id' " \
+                       "WHERE c.relname = '{tablename}'"
     GET_COLUMNS = "SELECT column_name FROM information_schema.columns WHERE table_name = '{tablename}'"
     GET_TABLES_WITH_SIZE = """
                             SELECT 
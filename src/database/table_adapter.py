@@ -1,15 +1,19 @@
 from re import compile
 from re import match
+from typing import Iterator
+from typing import List
 from typing import Optional
 from uuid import UUID
 
 import pandas
+from psycopg2 import errorcodes
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import text
 
 from src.data_transfer.content.column import Column
 from src.data_transfer.content.error import ErrorMessage
 from src.data_transfer.exception.custom_exception import DatabaseConnectionError
+from src.data_transfer.exception.custom_exception import QueryCancelled
 from src.data_transfer.record.data_record import DataRecord
 from src.data_transfer.record.data_set_record import DatasetRecord
 from src.database.query_logging import log_query
@@ -23,6 +27,15 @@ SQL_SUFFIX = ";"
 APPEND: dict = {True: "append", False: "replace"}
 
 
+def is_query_cancelled(error: SQLAlchemyError) -> bool:
+    """
+    checks whether the statement failed because it was cancelled or ran into its statement timeout
+    :param error:   the error of the statement
+    :return whether the statement was cancelled
+    """
+    return getattr(getattr(error, "orig", None), "pgcode", None) == errorcodes.QUERY_CANCELED
+
+
 class TableAdapter(ErrorHandler):
     """
     represents an adapter for a table containing a dataset
@@ -105,6 +118,30 @@ class TableAdapter(ErrorHandler):
 
         return True
 
+    def create_index(self, name: str, columns: List[str]) -> bool:
+        """
+        creates an index of the table over the columns, if it does not exist yet
+        :param name:    the name of the index, it is prefixed with the name of the table
+        :param columns: the indexed columns
+        :return whether the index exists
+        """
+        try:
+            connection = self.database_connection.get_connection()
+        except DatabaseConnectionError as e:
+            self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(e))
+            return False
+        query = SQLQueries.CREATE_INDEX.value.format(index=self.key + "_" + name, tablename=self.key,
+                                                     columns=", ".join(columns)) + SQL_SUFFIX
+        log_query(query)
+        try:
+            connection.execute(text(query))
+            self.database_connection.post_connection()
+        except SQLAlchemyError as e:
+            self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(e))
+            self.database_connection.recover()
+            return False
+        return True
+
     def delete_table(self) -> bool:
         """
         deletes this table
@@ -134,10 +171,12 @@ class TableAdapter(ErrorHandler):
         """
         return DatasetRecord(self.name, self.size)
 
-    def query_sql(self, query: str, pandas_query: bool = True) -> Optional[DataRecord]:
+    def query_sql(self, query: str, pandas_query: bool = True, timeout: Optional[float] = None) -> Optional[DataRecord]:
         """
-        gets the by the query filtered data
+        gets the by the query filtered data. A query that is cancelled or runs into its timeout returns None without
+        an error, because it was stopped on purpose.
         :param query:   the sql query
+        :param timeout: the time in seconds after which the query is cancelled or None to not cancel it
         :return the data
         """
         try:
@@ -146,6 +185,8 @@ class TableAdapter(ErrorHandler):
             self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(e))
             return None
         query = query.format(tablename=self.key) + SQL_SUFFIX
+        if timeout is not None:
+            query = SQLQueries.STATEMENT_TIMEOUT.value.format(milliseconds=max(1, round(timeout * 1000))) + query
         log_query(query)
         query = text(query)
         try:
@@ -156,7 +197,8 @@ class TableAdapter(ErrorHandler):
                 result = None
             self.database_connection.post_connection()
         except SQLAlchemyError as err:
-            self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(err))
+            if not is_query_cancelled(err):
+                self.throw_error(ErrorMessage.DATABASE_CONNECTION_IMPOSSIBLE, str(err))
             self.database_connection.recover()
             return None
 
@@ -174,6 +216,42 @@ class TableAdapter(ErrorHandler):
 
         return DataRecord(self.key, tuple([column.value for column in Column]), result)
 
+    def query_sql_chunks(self, query: str, chunk_size: int) -> Iterator[pandas.DataFrame]:
+        """
+        gets the by the query filtered data in chunks. The rows are fetched through a server side cursor, so only
+        one chunk is held in memory at once. The connection is only used by the iterator and closed at its end.
+        :param query:       the sql query
+        :param chunk_size:  the number of rows of a chunk
+        :return an iterator over the chunks of the data
+        :raises QueryCancelled if the query was cancelled
+        :raises DatabaseConnectionError if the data could not be read completely
+        """
+        query = query.format(tablename=self.key) + SQL_SUFFIX
+        log_query(query)
+        try:
+            connection = self.database_connection.engine.connect()
+        except SQLAlchemyError as err:
+            raise DatabaseConnectionError(str(err))
+        self.database_connection.track(connection)
+        try:
+            streaming_connection = connection.execution_options(stream_results=True)
+            yield from pandas.read_sql_query(text(query), streaming_connection, chunksize=chunk_size)
+        except SQLAlchemyError as err:
+            # a partial result would be wrong, so the error ends the iteration
+            if is_query_cancelled(err):
+                raise QueryCancelled(str(err))
+            raise DatabaseConnectionError(str(err))
+        finally:
+            self.database_connection.untrack(connection)
+            connection.close()
+
+    def cancel_queries(self, thread_id: int):
+        """
+        cancels the queries that are running on the database for the given thread
+        :param thread_id:   the identifier of the thread
+        """
+        self.database_connection.cancel_queries(thread_id)
+
     def get_uuid(self) -> UUID:
         """
         the uuid of the table
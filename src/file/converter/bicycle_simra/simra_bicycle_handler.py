@@ -9,7 +9,8 @@ from uuid import uuid4
 from src.file.converter.bicycle_simra.simra_bicycle_columns import SimraColumn
 from src.file.converter.fcd_ui_handler.fcd_ui_handler import AbstractColumnCalculator
 from src.data_transfer.content import Column
-from src.file.converter.util.data_util import repair_number_column, find_numeric_rows, DistanceCalculator
+from src.file.converter.util.data_util import repair_number_column, find_numeric_rows
+from src.model.trajectory_kinematics import SPEED, get_kinematics
 
 
 class IDCalculator(AbstractColumnCalculator):
@@ -180,15 +181,11 @@ class SpeedCalculator(AbstractColumnCalculator):
 
     def calculate_column(self, source_df: DataFrame, result_df: DataFrame) -> bool:
         # calculate the speed from the differences in the latitude and longitude columns and the time stamp
-        temp_df: pd.DataFrame = source_df[[SimraColumn.LATITUDE.value, SimraColumn.LONGITUDE.value,
-                                           SimraColumn.TIME_STAMP.value]]
-        distance_calculator = DistanceCalculator(lat_col=SimraColumn.LATITUDE.value, long_col=SimraColumn.LONGITUDE.value)
-        temp_df["distance"] = distance_calculator.get_distance(temp_df)
-        temp_df[SimraColumn.TIME_STAMP.value] = temp_df[SimraColumn.TIME_STAMP.value].diff()
-        temp_df[SimraColumn.TIME_STAMP.value] = temp_df[SimraColumn.TIME_STAMP.value] / 1000
-        temp_df["distance"] = temp_df["distance"] / temp_df[SimraColumn.TIME_STAMP.value]
-        temp_df["distance"] = temp_df["distance"] * 3.6
-        result_df[Column.SPEED.value] = temp_df["distance"]
+        # the time stamps are given in milliseconds
+        kinematics = get_kinematics(source_df, source_df[SimraColumn.TIME_STAMP.value] / 1000,
+                                    latitude_column=SimraColumn.LATITUDE.value,
+                                    longitude_column=SimraColumn.LONGITUDE.value, trajectory_column=None)
+        result_df[Column.SPEED.value] = kinematics[SPEED] * 3.6
         # add value for first row
         result_df[Column.SPEED.value].iloc[0] = 0
 
@@ -12,11 +12,12 @@ from pandas import Series
 from src.data_transfer.content import Column
 from src.data_transfer.content.road_type import VehicleType
 from src.file.converter.fcd_ui_handler.fcd_columns import FcdColumn
-from src.file.converter.util.data_util import DistanceCalculator
 from src.file.converter.util.data_util import find_non_date_rows
 from src.file.converter.util.data_util import find_non_numeric_rows
 from src.file.converter.util.data_util import repair_number_column
 from src.file.converter.util.data_util import repair_string_column
+from src.model.trajectory_kinematics import SPEED
+from src.model.trajectory_kinematics import get_kinematics
 
 ms_to_kmh = 3.6
 
@@ -291,16 +292,13 @@ class SpeedCalculator(AbstractColumnCalculator):
         temp_df = DataFrame()
         GpsCoordinateCalculator().calculate_column(source_df, temp_df)
         temp_df['id'] = source_df[FcdColumn.TRIP.value]
-        distance_calculator = DistanceCalculator(lat_col=Column.LATITUDE.value, long_col=Column.LONGITUDE.value)
-        temp_df['distance'] = temp_df.groupby('id').apply(distance_calculator.get_distance).transpose()
-
-        temp_df['time_diff'] = pd.to_datetime(source_df[FcdColumn.DATE_TIME.value]).diff()
+        kinematics = get_kinematics(temp_df, pd.to_datetime(source_df[FcdColumn.DATE_TIME.value]),
+                                    trajectory_column='id')
         if FcdColumn.SPEED.value not in source_df.columns:
             source_df[FcdColumn.SPEED.value] = [None] * source_df.shape[0]
         # calculate the speed via distance / delta_time
         source_df[FcdColumn.SPEED.value] = np.where(source_df[FcdColumn.SPEED.value].isna(),
-                                                    1 / ((temp_df['time_diff']) / temp_df['distance']
-                                                         / pd.Timedelta(seconds=1)),
+                                                    kinematics[SPEED],
                                                     source_df[FcdColumn.SPEED.value])
         # convert the speed to km/h
         source_df[FcdColumn.SPEED.value] = source_df[FcdColumn.SPEED.value] * ms_to_kmh
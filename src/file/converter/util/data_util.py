@@ -318,33 +318,3 @@ def calculate_drection(x_column: pd.DataFrame, y_column: pd.DataFrame, head: flo
     """
     temporary = np.rad2deg(np.arctan2(y_column, x_column)) + head
     return temporary
-
-
-class DistanceCalculator:
-    """
-    calculates the distance
-    """
-
-    def __init__(self, lat_col: str, long_col: str):
-        self.lat_col = lat_col
-        self.long_col = long_col
-
-    def get_distance(self, row: pd.DataFrame):
-        """
-        Calculates the distance between two coordinates in vectorized form.
-        :param  row:    A given row as a series to calculate the distances with.
-        :return:        The data containing the distances
-        """
-        radius_earth = 6378160.0
-        lat1 = np.radians(row[self.lat_col])
-        long1 = np.radians(row[self.long_col])
-        lat2 = np.radians(row[self.lat_col].shift())
-        long2 = np.radians(row[self.long_col].shift())
-
-        longitude_difference = np.abs(long2 - long1)
-        latitude_difference = np.abs(lat2 - lat1)
-
-        a = np.sin(latitude_difference / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(
-            longitude_difference / 2.0) ** 2
-        distance = radius_earth * 2 * np.arcsin(np.sqrt(a))
-        return distance
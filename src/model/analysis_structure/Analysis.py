@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -14,9 +15,11 @@ from src.data_transfer.exception import InvalidInput
 from src.data_transfer.record import AnalysisDataRecord
 from src.data_transfer.record import AnalysisRecord
 from src.data_transfer.record import DataRecord
+from src.data_transfer.record import TablePageQueryRecord
 from src.data_transfer.record.selection_record import SelectionRecord
 from src.data_transfer.record.setting_record import SettingRecord
 from src.data_transfer.selection.discrete_option import DiscreteOption
+from src.model.analysis_structure.analysis_progress import AnalysisProgress
 
 
 class Analysis(ABC):
@@ -26,6 +29,8 @@ class Analysis(ABC):
     In addition, only the Analysis class and classes from the data_transfer module should be used.
     It includes the following methods:
     """
+    # the progress of the current run, analyses that run in a worker process have none
+    _progress: Optional[AnalysisProgress] = None
 
     def __init__(self):
         self._required_parameters: List[str] = Column.val_list()
@@ -97,11 +102,9 @@ class Analysis(ABC):
         :param data: The data to be analysed as a DataRecord.
         :return: The DataRecord containing the data unique value pairs.
         """
-        # Create a dataframe from the input data
-        data_df = data.copy()
-
-        # Select only the parameters that are selected for analysis and round them if necessary to one decimal place
-        data_df = data_df.round(precision)
+        # Select only the parameters that are selected for analysis and round them if necessary to one decimal place,
+        # rounding already creates a new dataframe
+        data_df = data.round(precision)
         # Initialize a dictionary to store the results
         result = {}
         # For each parameter, count the number of unique values
@@ -118,8 +121,8 @@ class Analysis(ABC):
         :param data: The data to be analysed as a DataRecord.
         :return: The DataRecord containing the data average/mode pairs.
         """
-        # Create a dataframe from the input data
-        data_df = data.copy()
+        # The data is only read, so it is not copied
+        data_df = data
         # Store the dtype of each parameter
         param_types: Dict[str, dtype] = {param: data_df[param].dtype for param in data_df.columns}
         # Calculate the mean of the numeric columns
@@ -145,11 +148,33 @@ class Analysis(ABC):
         data_df = pd.DataFrame(data)
         # Count the number of occurrences of each value
         value_counts = data_df[column].value_counts()
-        # Transpose the Data, so it matches the expected data format of the histogram analysis
-        result_df = value_counts.to_frame().reset_index().rename(columns={'index': column,
-                                                                          column: 'Occurrence'})
         # Return the data
-        return result_df
+        return cls.counts_to_histogram(value_counts, column)
+
+    @classmethod
+    def counts_to_histogram(cls, value_counts: pd.Series, column) -> pd.DataFrame:
+        """
+        Converts the occurrences of each value into the data format of the histogram analysis.
+        :param value_counts: The occurrences indexed by the values, sorted by the occurrences.
+        :param column: The column the values are from.
+        :return: The DataRecord containing the value occurrence pairs.
+        """
+        # Transpose the Data, so it matches the expected data format of the histogram analysis
+        return value_counts.rename(column).to_frame().reset_index().rename(columns={'index': column,
+                                                                                    column: 'Occurrence'})
+
+    @classmethod
+    def merge_counts(cls, counts: List[pd.Series]) -> pd.Series:
+        """
+        Adds up counts or sums that are indexed by the same values, e.g. the value counts of consecutive chunks.
+        :param counts: The counts or sums to add up.
+        :return: The added up counts indexed by all values of the given counts.
+        """
+        counts = [count for count in counts if len(count) > 0]
+        if len(counts) == 0:
+            return pd.Series(dtype="int64")
+        merged = pd.concat(counts)
+        return merged.groupby(level=list(range(merged.index.nlevels)), sort=False).sum()
 
     @property
     def histogram_view(self):
@@ -239,6 +264,15 @@ class Analysis(ABC):
                                                         possible_selection_range=possible_selection_range),
                              _context=name)
 
+    @classmethod
+    def create_bool_setting(cls, name: str) -> SettingRecord:
+        """
+        Creates a setting the user can switch on or off, it is off by default.
+        :param name: the name of the setting by which it will be identified.
+        :return: a SettingRecord with False selected.
+        """
+        return SettingRecord(_selection=SelectionRecord.bool(), _context=name)
+
     @classmethod
     def create_analysis_record(cls, settings: List[SettingRecord]) -> AnalysisRecord:
         """
@@ -288,6 +322,30 @@ class Analysis(ABC):
         """
         self._required_parameters = [Column.get_column_from_str(column_str).value for column_str in column_names]
 
+    def set_progress(self, progress: Optional[AnalysisProgress]) -> None:
+        """
+        Sets the progress of the current run of the analysis.
+        :param progress: The progress the analysis reports to or None if the run is not observed.
+        """
+        self._progress = progress
+
+    def report_progress(self, done: int, total: int) -> None:
+        """
+        Reports how many steps of the analysis, for example trajectory groups, are done.
+        :param done: The number of finished steps.
+        :param total: The number of all steps.
+        """
+        if self._progress is not None:
+            self._progress.report(done, total)
+
+    def check_cancelled(self) -> None:
+        """
+        Stops the analysis if its run was cancelled, long analyses call it between their steps.
+        :raises AnalysisCancelled: If the run was cancelled.
+        """
+        if self._progress is not None:
+            self._progress.check_cancelled()
+
     @classmethod
     def to_view_analysis(cls, analysed_data: pd.DataFrame, view_type: AnalysisViewEnum,
                          name: str = "analysed data") -> AnalysisDataRecord:
@@ -313,4 +371,70 @@ class Analysis(ABC):
         return AnalysisDataRecord(_plot=plot)
 
 
+class ChunkedAnalysis(Analysis, ABC):
+    """
+    An analysis that can also be fed the data in chunks, so the filtered dataset does not have to fit into memory at
+    once. The chunks are consumed into states, which are merged and finalized into the same result analyse returns.
+    Analyses that only implement analyse are given the whole data at once.
+    """
+
+    def analyse(self, data_df: pd.DataFrame) -> AnalysisDataRecord:
+        """
+        Analyzes the given data as a single chunk.
+        """
+        return self.finalize(self.consume_chunk(self.init_state(), data_df))
+
+    @abstractmethod
+    def init_state(self) -> Any:
+        """
+        Creates the state of the analysis before any data was consumed.
+        :return: The empty state.
+        """
+        pass
+
+    @abstractmethod
+    def consume_chunk(self, state: Any, chunk: pd.DataFrame) -> Any:
+        """
+        Adds the next chunk of the data to the state. The chunks are consumed in the order of the data, either one
+        after the other into the same state or each into an empty state, whose states are merged afterwards.
+        :param state: The state of the previous chunks or an empty state.
+        :param chunk: The chunk of the data with the required columns.
+        :return: The state including the chunk.
+        """
+        pass
+
+    @abstractmethod
+    def merge(self, states: List[Any]) -> Any:
+        """
+        Merges the states of consecutive parts of the data.
+        :param states: The states in the order of the data.
+        :return: The state of all the parts.
+        """
+        pass
+
+    @abstractmethod
+    def finalize(self, state: Any) -> AnalysisDataRecord:
+        """
+        Creates the result of the analysis from the state of the whole data.
+        :param state: The state of the whole data.
+        :return: The same result analyse returns for the whole data.
+        """
+        pass
+
+
+class PagedAnalysis(Analysis, ABC):
+    """
+    An analysis that displays the filtered data page by page, so the data is never queried as a whole. The analysis
+    is given only the first page of its page query, the view requests the next pages itself.
+    """
+
+    def get_page_query(self) -> TablePageQueryRecord:
+        """
+        Creates the query of the first page of the data the analysis is given.
+        :return: The query of the first page with the required columns, ordered by trajectory and order.
+        """
+        return TablePageQueryRecord(_columns=tuple(Column.get_column_from_str(col_str)
+                                                   for col_str in self.get_required_columns()))
+
+
 CONSTRUCTOR = Analysis
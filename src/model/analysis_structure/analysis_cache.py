@@ -0,0 +1,217 @@
+import hashlib
+import os
+import pickle
+import sys
+from collections import OrderedDict
+from threading import RLock
+from typing import Optional
+from typing import Tuple
+
+from src.data_transfer.record import AnalysisDataRecord
+
+# the results of at most this many bytes are kept in memory
+MAX_CACHE_SIZE = 128 * 1024 * 1024
+# the results of at most this many bytes are kept in the directory
+MAX_DIRECTORY_SIZE = 1024 * 1024 * 1024
+CACHE_FILE_SUFFIX = ".pickle"
+
+# the key of the data the analysis ran on and the digest of the analysis and its parameters
+CacheKey = Tuple[str, str]
+
+
+def get_code_digest(analysis_type: type) -> Optional[str]:
+    """
+    creates a digest of the source files of the modules that define the analysis type and its base classes, so the
+    results of an analysis script are not reused after the script was edited
+    :param analysis_type: the type of the analysis
+    :return: the digest or None if a source file can not be read
+    """
+    digest = hashlib.sha256()
+    for module_name in sorted({cls.__module__ for cls in analysis_type.__mro__ if cls is not object}):
+        path = getattr(sys.modules.get(module_name), "__file__", None)
+        if path is None:
+            # built in modules do not change between sessions
+            digest.update(module_name.encode())
+            continue
+        try:
+            with open(path, "rb") as file:
+                digest.update(file.read())
+        except OSError:
+            return None
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Caches the results of analyses, so an analysis only runs again if its data or its parameters changed. The results
+    are kept pickled, which bounds the memory by their size and returns an independent copy on every hit, so a view
+    that changes the data or the plot of a result does not change the cached result. The least recently used results
+    are evicted first. If a directory is set, the results are also written to it, so they survive the session. The
+    directory is bounded the same way, the least recently used files are removed first. The persisted results are
+    unpickled when they are loaded, so the directory is created to be only accessible by the user and should lie in a
+    directory of the user.
+    Results of analyses running in the background are added from other threads, so the cache is thread safe.
+    """
+
+    def __init__(self, max_size: int = MAX_CACHE_SIZE, directory: Optional[str] = None,
+                 max_directory_size: int = MAX_DIRECTORY_SIZE):
+        """
+        creates an empty cache
+        :param max_size: the number of bytes of pickled results that are kept in memory
+        :param directory: the directory the results are persisted to or None if they are only kept in memory
+        :param max_directory_size: the number of bytes of pickled results that are kept in the directory
+        """
+        self._max_size = max_size
+        self._max_directory_size = max_directory_size
+        self._directory: Optional[str] = None
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = RLock()
+        self.set_directory(directory)
+
+    def set_directory(self, directory: Optional[str]) -> None:
+        """
+        sets the directory the results are persisted to
+        :param directory: the directory or None if the results are only kept in memory
+        """
+        if directory is not None:
+            try:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            except OSError:
+                # the cache works without persisting the results
+                directory = None
+        self._directory = directory
+        self._prune()
+
+    def get(self, key: CacheKey) -> Optional[AnalysisDataRecord]:
+        """
+        gets the cached result of the key from the memory or from the directory
+        :param key: the key of the result
+        :return: a copy of the result or None if it is not cached
+        """
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            else:
+                content = self._read(key)
+                if content is None:
+                    return None
+                self._keep(key, content)
+
+            try:
+                return pickle.loads(content)
+            except (pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+                self._remove(key)
+                return None
+
+    def put(self, key: CacheKey, record: AnalysisDataRecord) -> None:
+        """
+        caches the result of an analysis, results that can not be pickled are not cached
+        :param key: the key of the result
+        :param record: the result
+        """
+        with self._lock:
+            try:
+                content = pickle.dumps(record)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                return
+            self._keep(key, content)
+            self._write(key, content)
+
+    def invalidate(self, dataset_key: Optional[str] = None) -> None:
+        """
+        removes the cached results of a dataset from the memory and the directory
+        :param dataset_key: the key of the dataset the data keys start with or None to remove all results
+        """
+        with self._lock:
+            prefix = "" if dataset_key is None else f"{dataset_key}_"
+            for key in [key for key in self._entries if key[0].startswith(prefix)]:
+                self._size -= len(self._entries.pop(key))
+
+            if self._directory is None:
+                return
+            for file_name in os.listdir(self._directory):
+                if file_name.startswith(prefix) and file_name.endswith(CACHE_FILE_SUFFIX):
+                    try:
+                        os.remove(os.path.join(self._directory, file_name))
+                    except OSError:
+                        pass
+
+    def _keep(self, key: CacheKey, content: bytes) -> None:
+        """
+        keeps the pickled result in memory and evicts the least recently used results if the cache is too large
+        """
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(content) > self._max_size:
+            return
+        self._entries[key] = content
+        self._size += len(content)
+        while self._size > self._max_size:
+            self._size -= len(self._entries.popitem(last=False)[1])
+
+    def _remove(self, key: CacheKey) -> None:
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        path = self._get_path(key)
+        if path is not None and os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _get_path(self, key: CacheKey) -> Optional[str]:
+        if self._directory is None:
+            return None
+        return os.path.join(self._directory, f"{key[0]}_{key[1]}{CACHE_FILE_SUFFIX}")
+
+    def _read(self, key: CacheKey) -> Optional[bytes]:
+        path = self._get_path(key)
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            # the modification time orders the files by their last use when the directory is pruned
+            os.utime(path)
+            return content
+        except OSError:
+            return None
+
+    def _write(self, key: CacheKey, content: bytes) -> None:
+        path = self._get_path(key)
+        if path is None:
+            return
+        try:
+            with open(path, "wb") as file:
+                file.write(content)
+        except OSError:
+            # the result is still cached in memory
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        """
+        removes the least recently used files until the results in the directory are not too large
+        """
+        if self._directory is None:
+            return
+        files = []
+        try:
+            for entry in os.scandir(self._directory):
+                if entry.is_file() and entry.name.endswith(CACHE_FILE_SUFFIX):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self._max_directory_size:
+                return
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= file_size
@@ -0,0 +1,347 @@
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from threading import Lock
+from types import FunctionType
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import pandas as pd
+import pyarrow as pa
+
+from src.data_transfer.record import AnalysisDataRecord
+from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import ChunkedAnalysis
+from src.model.analysis_structure.analysis_progress import AnalysisProgress
+
+# the module the class of an analysis is imported from or the file of its script, and the qualified name of the class
+ClassReference = Tuple[Optional[str], Optional[str], str]
+
+# the scripts a worker already loaded by their path
+_script_modules: Dict[str, object] = {}
+
+# chunks that are sent to the workers but not consumed yet, per worker
+PENDING_CHUNKS_PER_WORKER = 2
+
+
+class AnalysisExecutor:
+    """
+    Runs analyses concurrently in a pool of worker processes, so independent analyses use more than one core. The
+    input columns are sent to the workers as an Arrow IPC stream instead of a pickled dataframe, and the analysis is
+    sent as a reference to its class and its pickled attributes. Built-in analyses are imported by their module in
+    the workers, scripts loaded from the analysis path are loaded from their file again. Analyses that can not be
+    sent to a worker run on the calling thread. Chunked analyses consume their chunks in parallel. Several analyses
+    can share one frame, which is converted to Arrow once and projected to the columns of every analysis. The
+    progress of chunked analyses is counted in consumed chunks, the progress an analysis reports itself is only seen
+    if it runs on the calling thread.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        creates an executor, the worker processes are started with the first analysis
+        :param max_workers: the number of worker processes or None for one per core
+        """
+        self._max_workers = max_workers
+        self._max_pending = PENDING_CHUNKS_PER_WORKER * (max_workers or os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, analysis: Analysis, data: pd.DataFrame) -> Future:
+        """
+        starts an analysis on the given data
+        :param analysis: the analysis with its parameters set
+        :param data: the input columns of the analysis
+        :return: the future of the analysed data
+        """
+        return self.submit_batch({0: (analysis, None)}, data)[0]
+
+    def submit_batch(self, analyses: Dict[Hashable, Tuple[Analysis, Optional[List[str]]]],
+                     data: pd.DataFrame) -> Dict[Hashable, Future]:
+        """
+        starts several analyses on a shared frame. The frame is converted to Arrow once and every analysis is sent
+        only its columns, which are selected from the Arrow table without copying them.
+        :param analyses: the analyses with their parameters set and their columns of the frame by their keys, None
+        selects all columns
+        :param data: the shared frame with the columns of all analyses
+        :return: the futures of the analysed data by the keys of the analyses
+        """
+        table = _to_table(data)
+        return {key: self._submit(_create_task(analysis), _run_analysis, analysis.analyse, data, table, columns)
+                for key, (analysis, columns) in analyses.items()}
+
+    def submit_chunks(self, analysis: ChunkedAnalysis, chunks: Iterable[pd.DataFrame],
+                      progress: Optional[AnalysisProgress] = None) -> Future:
+        """
+        starts a chunked analysis, every chunk is consumed by a worker into an empty state and the states are merged
+        in the order of the chunks
+        :param analysis: the analysis with its parameters set
+        :param chunks: the chunks of the input columns
+        :param progress: the progress the consumed chunks are counted in or None
+        :return: the future of the analysed data
+        """
+        return self.submit_chunks_batch({0: (analysis, None)}, chunks,
+                                        None if progress is None else {0: progress})[0]
+
+    def submit_chunks_batch(self, analyses: Dict[Hashable, Tuple[ChunkedAnalysis, Optional[List[str]]]],
+                            chunks: Iterable[pd.DataFrame],
+                            progresses: Optional[Dict[Hashable, AnalysisProgress]] = None) -> Dict[Hashable, Future]:
+        """
+        starts several chunked analyses on shared chunks. The chunks are read on the calling thread while the
+        workers consume the previous chunks, at most a few chunks per worker wait in the pool. Cancelled analyses
+        are not given further chunks, the chunks are no longer read once all analyses are cancelled.
+        :param analyses: the analyses with their parameters set and their columns of the chunks by their keys, None
+        selects all columns
+        :param chunks: the shared chunks with the columns of all analyses
+        :param progresses: the progresses of the analyses by their keys or None
+        :return: the futures of the analysed data by the keys of the analyses
+        """
+        progresses = progresses or {}
+        tasks = {key: _create_task(analysis) for key, (analysis, _) in analyses.items()}
+        states: Dict[Hashable, List[Future]] = {key: [] for key in analyses}
+        pending: List[Future] = []
+        for key, progress in progresses.items():
+            progress.add_cancel_callback(partial(_cancel_all, states[key]))
+        for chunk in chunks:
+            table = _to_table(chunk)
+            for key, (analysis, columns) in analyses.items():
+                progress = progresses.get(key)
+                if progress is not None and progress.is_cancelled():
+                    continue
+                future = self._submit(tasks[key], _consume_chunk, partial(_consume_locally, analysis), chunk, table,
+                                      columns)
+                if progress is not None:
+                    progress.add_steps()
+                    future.add_done_callback(lambda _, done=progress: done.finish_steps())
+                states[key].append(future)
+                pending.append(future)
+            if len(progresses) == len(analyses) and all(progress.is_cancelled() for progress in progresses.values()):
+                _close(chunks)
+                break
+            pending = [future for future in pending if not future.done()]
+            if len(pending) > self._max_pending:
+                wait(pending, return_when=FIRST_COMPLETED)
+        for progress in progresses.values():
+            progress.close_steps()
+        return {key: _merge_states(analysis, states[key]) for key, (analysis, _) in analyses.items()}
+
+    def shutdown(self) -> None:
+        """
+        stops the worker processes, analyses that did not start yet are cancelled
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _submit(self, task: Optional[Tuple[ClassReference, bytes]], function: Callable,
+                local_function: Callable[[pd.DataFrame], Any], data: pd.DataFrame, table: Optional[pa.Table],
+                columns: Optional[List[str]]) -> Future:
+        """
+        sends the task and its columns of the frame to a worker, the task runs locally if it can not be sent
+        """
+        if task is not None:
+            if table is None:
+                columns_data = data if columns is None else data[columns]
+            else:
+                columns_data = _to_ipc(table if columns is None else table.select(columns))
+            for _ in range(2):
+                try:
+                    return self._get_pool().submit(function, task[0], task[1], columns_data)
+                except BrokenProcessPool:
+                    # a worker died, so the next attempt starts a new pool
+                    self._pool = None
+        return _run_locally(local_function, data if columns is None else data[columns])
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # forking would copy the threads and connections of the application into the workers
+            self._pool = ProcessPoolExecutor(max_workers=self._max_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+
+def _create_task(analysis: Analysis) -> Optional[Tuple[ClassReference, bytes]]:
+    """
+    creates the reference to the class of the analysis and pickles its attributes
+    :return: the reference and the attributes or None if the analysis can not be sent to a worker
+    """
+    reference = _get_class_reference(type(analysis))
+    if reference is None:
+        return None
+    try:
+        # the progress of the run stays in the calling process
+        return reference, pickle.dumps({name: value for name, value in analysis.__dict__.items()
+                                        if name != "_progress"})
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def _get_class_reference(cls: type) -> Optional[ClassReference]:
+    """
+    finds out how a worker can load the class of an analysis
+    """
+    module = sys.modules.get(cls.__module__)
+    if module is not None and _get_attribute(module, cls.__qualname__) is cls:
+        return cls.__module__, None, cls.__qualname__
+
+    # scripts are loaded without registering their module, so the file is found through the globals of the methods
+    for attribute in vars(cls).values():
+        if isinstance(attribute, FunctionType):
+            path = attribute.__globals__.get("__file__")
+            if path is not None:
+                return None, path, cls.__qualname__
+    return None
+
+
+def _get_attribute(owner: object, qualified_name: str) -> Optional[object]:
+    for name in qualified_name.split("."):
+        owner = getattr(owner, name, None)
+    return owner
+
+
+def _to_table(data: pd.DataFrame) -> Optional[pa.Table]:
+    """
+    converts the dataframe to an Arrow table
+    :return: the table or None if the columns can not be converted to Arrow
+    """
+    try:
+        return pa.Table.from_pandas(data, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return None
+
+
+def _to_ipc(table: pa.Table) -> bytes:
+    """
+    writes the table as an Arrow IPC stream
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _run_locally(function: Callable, *args) -> Future:
+    future = Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as error:
+        future.set_exception(error)
+    return future
+
+
+def _cancel_all(futures: List[Future]) -> None:
+    """
+    cancels the futures that did not start yet
+    """
+    for future in list(futures):
+        future.cancel()
+
+
+def _close(chunks: Iterable[pd.DataFrame]) -> None:
+    """
+    stops reading the chunks, so a query that reads them ends and its connection is closed
+    """
+    close = getattr(chunks, "close", None)
+    if close is not None:
+        close()
+
+
+def _consume_locally(analysis: ChunkedAnalysis, chunk: pd.DataFrame) -> Any:
+    """
+    consumes a chunk into an empty state on the calling thread
+    """
+    return analysis.consume_chunk(analysis.init_state(), chunk)
+
+
+def _merge_states(analysis: ChunkedAnalysis, states: List[Future]) -> Future:
+    """
+    merges the states of the chunks and finalizes the analysis as soon as all chunks are consumed
+    :param analysis: the analysis
+    :param states: the futures of the states of the chunks in the order of the chunks
+    :return: the future of the analysed data
+    """
+    if len(states) == 0:
+        return _run_locally(lambda: analysis.finalize(analysis.init_state()))
+
+    result = Future()
+    remaining = [len(states)]
+    lock = Lock()
+
+    def on_done(_: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] > 0:
+                return
+        try:
+            result.set_result(analysis.finalize(analysis.merge([state.result() for state in states])))
+        except Exception as error:
+            result.set_exception(error)
+
+    for state in states:
+        state.add_done_callback(on_done)
+    return result
+
+
+def _run_analysis(reference: ClassReference, attributes: bytes,
+                  columns: Union[bytes, pd.DataFrame]) -> AnalysisDataRecord:
+    """
+    runs an analysis in a worker process
+    :param reference: the reference to the class of the analysis
+    :param attributes: the pickled attributes of the analysis
+    :param columns: the input columns as Arrow IPC stream or as dataframe if they could not be converted
+    :return: the analysed data
+    """
+    return _load_analysis(reference, attributes).analyse(_read_columns(columns))
+
+
+def _consume_chunk(reference: ClassReference, attributes: bytes, columns: Union[bytes, pd.DataFrame]) -> Any:
+    """
+    consumes a chunk into an empty state in a worker process
+    :param reference: the reference to the class of the analysis
+    :param attributes: the pickled attributes of the analysis
+    :param columns: the chunk as Arrow IPC stream or as dataframe if it could not be converted
+    :return: the state of the chunk
+    """
+    analysis = _load_analysis(reference, attributes)
+    return analysis.consume_chunk(analysis.init_state(), _read_columns(columns))
+
+
+def _load_analysis(reference: ClassReference, attributes: bytes) -> Analysis:
+    """
+    creates the analysis from the reference to its class and its pickled attributes
+    """
+    module_name, path, qualified_name = reference
+    if path is None:
+        module = importlib.import_module(module_name)
+    else:
+        module = _script_modules.get(path)
+        if module is None:
+            spec = importlib.util.spec_from_file_location("module", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _script_modules[path] = module
+
+    cls = _get_attribute(module, qualified_name)
+    analysis = cls.__new__(cls)
+    analysis.__dict__.update(pickle.loads(attributes))
+    return analysis
+
+
+def _read_columns(columns: Union[bytes, pd.DataFrame]) -> pd.DataFrame:
+    if isinstance(columns, bytes):
+        return pa.ipc.open_stream(columns).read_all().to_pandas()
+    return columns
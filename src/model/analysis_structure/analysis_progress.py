@@ -0,0 +1,110 @@
+from threading import Event
+from threading import Lock
+from typing import Callable
+from typing import List
+from typing import Optional
+
+from src.data_transfer.exception import AnalysisCancelled
+
+
+class AnalysisProgress:
+    """
+    The progress of a run of an analysis and the token to cancel it. The work of the run is counted in steps, for
+    example chunks or trajectory groups, whose number may only be known after all of them were started. Cancelling
+    is cooperative: the analysis and the reader of its data check the token between their steps and stop, and the
+    callbacks added to the token stop what can be stopped from outside. The progress is changed from the threads
+    the analysis runs on and read from the main thread, so it is thread safe.
+    """
+
+    def __init__(self):
+        """
+        creates the progress of a run that did not do any work yet
+        """
+        self._lock = Lock()
+        self._cancelled = Event()
+        self._done = 0
+        self._total = 0
+        self._is_total_known = False
+        self._cancel_callbacks: List[Callable[[], None]] = []
+
+    def report(self, done: int, total: int) -> None:
+        """
+        sets the progress of the run
+        :param done: the number of finished steps
+        :param total: the number of all steps
+        """
+        with self._lock:
+            self._done = done
+            self._total = total
+            self._is_total_known = True
+
+    def add_steps(self, count: int = 1) -> None:
+        """
+        adds steps whose number was not known before
+        :param count: the number of the added steps
+        """
+        with self._lock:
+            self._total += count
+
+    def finish_steps(self, count: int = 1) -> None:
+        """
+        counts finished steps
+        :param count: the number of the finished steps
+        """
+        with self._lock:
+            self._done += count
+
+    def close_steps(self) -> None:
+        """
+        marks that no more steps are added, so the number of all steps is known
+        """
+        with self._lock:
+            self._is_total_known = True
+
+    def get_fraction(self) -> Optional[float]:
+        """
+        :return: the finished part of the run between 0 and 1 or None if the number of all steps is not known
+        """
+        with self._lock:
+            if not self._is_total_known:
+                return None
+            if self._total == 0:
+                return 1.0
+            return min(self._done / self._total, 1.0)
+
+    def cancel(self) -> None:
+        """
+        cancels the run and calls the cancel callbacks
+        """
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._cancelled.set()
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def is_cancelled(self) -> bool:
+        """
+        :return: whether the run was cancelled
+        """
+        return self._cancelled.is_set()
+
+    def check_cancelled(self) -> None:
+        """
+        stops the run if it was cancelled
+        :raises AnalysisCancelled: if the run was cancelled
+        """
+        if self._cancelled.is_set():
+            raise AnalysisCancelled("The analysis was cancelled")
+
+    def add_cancel_callback(self, callback: Callable[[], None]) -> None:
+        """
+        adds a callback that is called when the run is cancelled, it is called right away if the run already was
+        :param callback: the callback
+        """
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._cancel_callbacks.append(callback)
+                return
+        callback()
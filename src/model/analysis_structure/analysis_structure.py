@@ -1,3 +1,13 @@
+import hashlib
+import pickle
+from concurrent.futures import Future
+from concurrent.futures import InvalidStateError
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from threading import get_ident
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -5,16 +15,28 @@ from typing import Type
 from uuid import UUID
 from uuid import uuid4
 
+from src.controller.idata_request_facade import IDataRequestFacade
 from src.data_transfer.content import Column
 from src.data_transfer.content.error import ErrorMessage
+from src.data_transfer.exception import AnalysisCancelled
 from src.data_transfer.exception import ExecutionFlowError
 from src.data_transfer.exception import InvalidUUID
+from src.data_transfer.exception.custom_exception import QueryCancelled
 from src.data_transfer.record import AnalysisDataRecord
 from src.data_transfer.record import AnalysisRecord
 from src.data_transfer.record import AnalysisTypeRecord
 from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import ChunkedAnalysis
+from src.model.analysis_structure.Analysis import PagedAnalysis
+from src.model.analysis_structure.analysis_cache import AnalysisCache
+from src.model.analysis_structure.analysis_cache import CacheKey
+from src.model.analysis_structure.analysis_cache import get_code_digest
+from src.model.analysis_structure.analysis_executor import AnalysisExecutor
 from src.model.analysis_structure.analysis_factory import AnalysisFactory
+from src.model.analysis_structure.analysis_progress import AnalysisProgress
 from src.model.analysis_structure.ianalysis_structure import IAnalysisStructure
+from src.model.analysis_structure.refresh_plan import RefreshPlan
+from src.model.analysis_structure.spatial_analysis.origin_destination_analysis import OriginDestinationAnalysis
 from src.model.analysis_structure.spatial_analysis.path_daytime_analysis import PathDaytimeAnalysis
 from src.model.analysis_structure.spatial_analysis.path_time_analysis import PathTimeAnalysis
 from src.model.analysis_structure.spatial_analysis.polygon_consumer_analysis import PolygonFacadeConsumer
@@ -30,6 +52,11 @@ class AnalysisStructure(ErrorHandler, DataRequestConsumer, IAnalysisStructure):
     It contains a map of all the analyses that have been created,
     a list of all the analysis types that have been registered,
     as well as a factory for creating new analyses and the current analysis type being created.
+    The results of the analyses are cached by the data they ran on and their parameters.
+    Analyses can also run concurrently in worker processes, their results are then returned as futures.
+    Analyses that are refreshed together share one query of the union of their required columns.
+    The data of the analyses that run in the background is queried on a background thread, so a running analysis
+    can be cancelled and its progress can be polled.
     """
 
     def __init__(self):
@@ -42,9 +69,16 @@ class AnalysisStructure(ErrorHandler, DataRequestConsumer, IAnalysisStructure):
         self._analysis_type_list: [AnalysisTypeRecord] = []
         self._factory: AnalysisFactory = AnalysisFactory()
         self.__polygon_structure: Optional[IPolygonStructure] = None
+        self._cache: AnalysisCache = AnalysisCache()
+        self._executor: AnalysisExecutor = AnalysisExecutor()
+        # the data of the analyses is queried one after the other, so the queries do not compete for the database
+        self._starter: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis_start")
+        # the progresses of the running analyses by their ids
+        self._progresses: Dict[UUID, AnalysisProgress] = {}
         self.register_analysis_type(constructor=PathTimeAnalysis)
         self.register_analysis_type(constructor=SourceDestinationAnalysis)
         self.register_analysis_type(constructor=PathDaytimeAnalysis)
+        self.register_analysis_type(constructor=OriginDestinationAnalysis)
 
     def set_polygon_structure(self, polygon_structure: IPolygonStructure) -> None:
         """
@@ -98,6 +132,7 @@ class AnalysisStructure(ErrorHandler, DataRequestConsumer, IAnalysisStructure):
         """
         if analysis_id not in self._analysis_map:
             raise InvalidUUID("Invalid analysis_id")
+        self.cancel_analysis(analysis_id)
         del self._analysis_map[analysis_id]
         return True
 
@@ -155,7 +190,8 @@ class AnalysisStructure(ErrorHandler, DataRequestConsumer, IAnalysisStructure):
 
     def get_analysed_data(self, analysis_id: UUID) -> AnalysisDataRecord:
         """
-        Runs the by the id specified analysis.
+        Runs the by the id specified analysis. If the analysis already ran with the same parameters on the same
+        dataset and filters, the cached result is returned instead.
         :param analysis_id: The id of the to be run analysis
         :return: An AnalysisDataRecord containing all the analysed data prepared for the also specified view
         type to be displayed as.
@@ -163,8 +199,325 @@ class AnalysisStructure(ErrorHandler, DataRequestConsumer, IAnalysisStructure):
         analysis = self._analysis_map.get(analysis_id)
         if analysis is None:
             raise InvalidUUID("Invalid analysis_id")
-        return analysis.analyse(self.data_request.get_rawdata([Column.get_column_from_str(col_str)
-                                                               for col_str in analysis.get_required_columns()]).data)
+
+        key = self._get_cache_key(analysis)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        progress = self._start_progress(analysis_id)
+        analysis.set_progress(progress)
+        try:
+            columns = [Column.get_column_from_str(col_str) for col_str in analysis.get_required_columns()]
+            if isinstance(analysis, PagedAnalysis):
+                result = self._analyse_page(analysis)
+            elif isinstance(analysis, ChunkedAnalysis):
+                result = self._analyse_chunks(analysis, columns, progress)
+            else:
+                result = analysis.analyse(self.data_request.get_rawdata(columns).data)
+        finally:
+            self._end_progress(analysis_id, progress)
+        if key is not None and result is not None:
+            self._cache.put(key, result)
+        return result
+
+    def get_analysed_data_async(self, analysis_id: UUID) -> Future:
+        """
+        Starts the by the id specified analysis in a worker process, so multiple analyses run at the same time. The
+        input data is requested on a background thread, so the caller is not blocked by the query, and a cached
+        result is returned as an already finished future. A running analysis can be cancelled by its id.
+        :param analysis_id: The id of the to be run analysis
+        :return: A future of the AnalysisDataRecord containing all the analysed data.
+        """
+        analysis = self._analysis_map.get(analysis_id)
+        if analysis is None:
+            raise InvalidUUID("Invalid analysis_id")
+
+        key = self._get_cache_key(analysis)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+                return future
+
+        progress = self._start_progress(analysis_id)
+        return self._start({analysis_id: progress}, {analysis_id: key},
+                           lambda: {analysis_id: self._submit(analysis, progress)})[analysis_id]
+
+    def get_analysed_data_batch_async(self, analysis_ids: List[UUID]) -> Dict[UUID, Future]:
+        """
+        Starts the by the ids specified analyses in worker processes. The data of all analyses that are not cached is
+        queried once with the union of their required columns, or read once in chunks if all of them are chunked, and
+        every analysis is given its columns of the shared data. The data is queried on a background thread.
+        :param analysis_ids: The ids of the to be run analyses
+        :return: The futures of the AnalysisDataRecords by the ids of the analyses.
+        """
+        futures: Dict[UUID, Future] = {}
+        analyses: Dict[UUID, Analysis] = {}
+        keys: Dict[UUID, Optional[CacheKey]] = {}
+        for analysis_id in analysis_ids:
+            analysis = self._analysis_map.get(analysis_id)
+            if analysis is None:
+                raise InvalidUUID("Invalid analysis_id")
+            keys[analysis_id] = self._get_cache_key(analysis)
+            cached = None if keys[analysis_id] is None else self._cache.get(keys[analysis_id])
+            if cached is not None:
+                futures[analysis_id] = Future()
+                futures[analysis_id].set_result(cached)
+            elif isinstance(analysis, PagedAnalysis):
+                # a page is queried on its own, so it does not load the whole data of the shared query
+                futures[analysis_id] = self.get_analysed_data_async(analysis_id)
+            else:
+                analyses[analysis_id] = analysis
+        if len(analyses) == 0:
+            return futures
+
+        progresses = {analysis_id: self._start_progress(analysis_id) for analysis_id in analyses}
+        futures.update(self._start(progresses, keys, lambda: self._submit_batch(analyses, progresses)))
+        return futures
+
+    def get_analysis_progress(self, analysis_id: UUID) -> Optional[float]:
+        """
+        Gets the progress of the running analysis. The progress of chunked analyses is counted in consumed chunks,
+        other analyses running in a worker process have no known progress.
+        :param analysis_id: The id of the analysis.
+        :return: The done part of the analysis between 0 and 1 or None if it is not known or the analysis does not
+        run.
+        """
+        progress = self._progresses.get(analysis_id)
+        if progress is None:
+            return None
+        return progress.get_fraction()
+
+    def cancel_analysis(self, analysis_id: UUID) -> bool:
+        """
+        Cancels the running analysis. Its future fails with AnalysisCancelled right away, chunks that were not
+        consumed yet are dropped and the query of its data is cancelled if no other analysis shares it. A worker
+        process can not be interrupted, so an analysis or a chunk that a worker already started runs to its end and
+        its result is dropped.
+        :param analysis_id: The id of the analysis.
+        :return: Whether the analysis was running.
+        """
+        progress = self._progresses.get(analysis_id)
+        if progress is None or progress.is_cancelled():
+            return False
+        progress.cancel()
+        return True
+
+    def shutdown(self) -> None:
+        """
+        Cancels the running analyses and stops the worker processes, e.g. when the application exits. Analyses that
+        did not start yet are dropped.
+        """
+        for progress in list(self._progresses.values()):
+            progress.cancel()
+        self._starter.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown()
+
+    def _start_progress(self, analysis_id: UUID) -> AnalysisProgress:
+        """
+        Creates the progress of a new run of an analysis, a previous run that still runs is cancelled, because its
+        result would be outdated.
+        """
+        previous = self._progresses.get(analysis_id)
+        if previous is not None:
+            previous.cancel()
+        progress = AnalysisProgress()
+        self._progresses[analysis_id] = progress
+        return progress
+
+    def _end_progress(self, analysis_id: UUID, progress: AnalysisProgress) -> None:
+        """
+        Forgets the progress of a finished run, unless the analysis was started again in the meantime.
+        """
+        if self._progresses.get(analysis_id) is progress:
+            del self._progresses[analysis_id]
+
+    def _start(self, progresses: Dict[UUID, AnalysisProgress], keys: Dict[UUID, Optional[CacheKey]],
+               submit: Callable[[], Optional[Dict[UUID, Future]]]) -> Dict[UUID, Future]:
+        """
+        Queries the data of analyses and submits them on the background thread.
+        :param progresses: The progresses of the runs by the ids of the analyses.
+        :param keys: The cache keys of the analyses by their ids.
+        :param submit: Queries the data and submits the analyses, it returns the futures of their results by their
+        ids or None if the data could not be read.
+        :return: The futures of the results by the ids of the analyses, they fail with AnalysisCancelled as soon as
+        their run is cancelled.
+        """
+        results = {analysis_id: Future() for analysis_id in progresses}
+        reading = _Reading()
+        for analysis_id, progress in progresses.items():
+            results[analysis_id].add_done_callback(partial(self._on_finished, analysis_id, progress))
+            progress.add_cancel_callback(partial(_set_cancelled, results[analysis_id]))
+            progress.add_cancel_callback(partial(self._cancel_reading, progresses, reading))
+
+        def run() -> None:
+            if all(progress.is_cancelled() for progress in progresses.values()):
+                return
+            reading.start()
+            try:
+                started = submit()
+            except QueryCancelled:
+                # the query was stopped on purpose, so it is not reported as an error
+                for result in results.values():
+                    _set_cancelled(result)
+                return
+            except Exception as error:
+                for result in results.values():
+                    _set_outcome(result, exception=error)
+                return
+            finally:
+                reading.stop()
+
+            for analysis_id, result in results.items():
+                if started is None:
+                    _set_outcome(result, value=None)
+                    continue
+                future = started[analysis_id]
+                progresses[analysis_id].add_cancel_callback(future.cancel)
+                if keys.get(analysis_id) is not None:
+                    future.add_done_callback(partial(self._cache_result, keys[analysis_id]))
+                future.add_done_callback(partial(_forward, result))
+
+        self._starter.submit(run)
+        return results
+
+    def _cancel_reading(self, progresses: Dict[UUID, AnalysisProgress], reading: "_Reading") -> None:
+        """
+        Cancels the query of the data of a run, once all analyses that share the query are cancelled. Only the query
+        of the run is cancelled, the queries of other threads like those of the map keep running.
+        """
+        if all(progress.is_cancelled() for progress in progresses.values()):
+            reading.cancel(self.data_request)
+
+    def _on_finished(self, analysis_id: UUID, progress: AnalysisProgress, _: Future) -> None:
+        self._end_progress(analysis_id, progress)
+
+    def _submit(self, analysis: Analysis, progress: AnalysisProgress) -> Optional[Future]:
+        """
+        Queries the data of an analysis and submits it to the executor.
+        :return: The future of its result or None if the data could not be read.
+        """
+        analysis.set_progress(progress)
+        columns = [Column.get_column_from_str(col_str) for col_str in analysis.get_required_columns()]
+        if isinstance(analysis, PagedAnalysis):
+            # a page is small, so it is analysed right away instead of being sent to a worker
+            future = Future()
+            future.set_result(self._analyse_page(analysis))
+            return future
+        if isinstance(analysis, ChunkedAnalysis):
+            chunks = self.data_request.get_rawdata_chunks(columns)
+            if chunks is None:
+                return None
+            return self._executor.submit_chunks(analysis, chunks, progress)
+        data = self.data_request.get_rawdata(columns)
+        if data is None:
+            return None
+        progress.check_cancelled()
+        return self._executor.submit(analysis, data.data)
+
+    def _submit_batch(self, analyses: Dict[UUID, Analysis],
+                      progresses: Dict[UUID, AnalysisProgress]) -> Optional[Dict[UUID, Future]]:
+        """
+        Queries the shared data of analyses once and submits them to the executor.
+        :return: The futures of their results by their ids or None if the data could not be read.
+        """
+        for analysis_id, analysis in analyses.items():
+            analysis.set_progress(progresses[analysis_id])
+        plan = RefreshPlan(analyses)
+        tasks = {analysis_id: (analysis, plan.projections[analysis_id]) for analysis_id, analysis in analyses.items()}
+        if plan.is_chunked:
+            chunks = self.data_request.get_rawdata_chunks(plan.columns)
+            if chunks is None:
+                return None
+            return self._executor.submit_chunks_batch(tasks, plan.track(chunks), progresses)
+
+        data = self.data_request.get_rawdata(plan.columns)
+        if data is None:
+            return None
+        plan.count(data.data)
+        started = self._executor.submit_batch(tasks, data.data)
+        plan.log()
+        return started
+
+    def _analyse_page(self, analysis: PagedAnalysis) -> Optional[AnalysisDataRecord]:
+        """
+        Runs an analysis that is given only the first page of the data.
+        :param analysis: The analysis.
+        :return: The analysed page or None if the page could not be read.
+        """
+        page = self.data_request.get_rawdata_page(analysis.get_page_query())
+        if page is None:
+            return None
+        return analysis.analyse(page.data)
+
+    def _analyse_chunks(self, analysis: ChunkedAnalysis, columns: List[Column],
+                        progress: AnalysisProgress) -> Optional[AnalysisDataRecord]:
+        """
+        Runs an analysis that supports chunks by consuming the chunks of the data one after the other, so only one
+        chunk of the data is in memory at once.
+        :param analysis: The analysis.
+        :param columns: The required columns of the analysis.
+        :param progress: The progress the consumed chunks are counted in.
+        :return: The analysed data or None if the data could not be read.
+        :raises AnalysisCancelled: If the analysis was cancelled between two chunks.
+        """
+        chunks = self.data_request.get_rawdata_chunks(columns)
+        if chunks is None:
+            return None
+        state = analysis.init_state()
+        for chunk in chunks:
+            progress.add_steps()
+            state = analysis.consume_chunk(state, chunk)
+            progress.finish_steps()
+            progress.check_cancelled()
+        progress.close_steps()
+        return analysis.finalize(state)
+
+    def _cache_result(self, key: CacheKey, future: Future) -> None:
+        """
+        Caches the result of a finished analysis, failed and cancelled analyses are not cached.
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if result is not None:
+            self._cache.put(key, result)
+
+    def _get_cache_key(self, analysis: Analysis) -> Optional[CacheKey]:
+        """
+        Creates the cache key of an analysis from the current dataset and filters, the type of the analysis, the code
+        that defines it and its parameters.
+        :param analysis: The analysis.
+        :return: The key or None if the result of the analysis can not be cached.
+        """
+        data_key = self.data_request.get_data_key()
+        code_digest = get_code_digest(type(analysis))
+        if data_key is None or code_digest is None:
+            return None
+        try:
+            parameters = pickle.dumps((type(analysis).__module__, type(analysis).__qualname__, code_digest,
+                                       analysis.get_required_analysis_parameter()))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # the parameters of imported analyses might not be serializable
+            return None
+        return data_key, hashlib.sha256(parameters).hexdigest()
+
+    def set_cache_directory(self, directory: Optional[str]) -> None:
+        """
+        Sets the directory the results of the analyses are persisted to.
+        :param directory: The directory or None if the results are only cached in memory.
+        """
+        self._cache.set_directory(directory)
+
+    def invalidate_cache(self, dataset_key: Optional[str] = None) -> None:
+        """
+        Removes the cached results of a dataset, e.g. after its data changed.
+        :param dataset_key: The key of the dataset or None to remove the results of all datasets.
+        """
+        self._cache.invalidate(dataset_key)
 
     def refresh(self, analysis_id: UUID) -> AnalysisDataRecord:
         """
@@ -174,3 +527,57 @@ class AnalysisStructure(ErrorHandler, DataRequestConsumer, IAnalysisStructure):
         type to be displayed as.
         """
         return self.get_analysed_data(analysis_id)
+
+
+class _Reading:
+    """
+    The thread that reads the data of a run while it reads it. The runs read their data one after the other on the
+    same thread, so the thread is only cancelled while it reads the data of the run.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._thread_id: Optional[int] = None
+
+    def start(self) -> None:
+        with self._lock:
+            self._thread_id = get_ident()
+
+    def stop(self) -> None:
+        # waits for a running cancel, so it does not cancel the query of the next run
+        with self._lock:
+            self._thread_id = None
+
+    def cancel(self, data_request: IDataRequestFacade) -> None:
+        with self._lock:
+            if self._thread_id is not None:
+                data_request.cancel_queries(self._thread_id)
+
+
+def _set_outcome(result: Future, value: Any = None, exception: Optional[BaseException] = None) -> None:
+    """
+    sets the outcome of a future, the outcome of a future that is already cancelled is dropped
+    """
+    try:
+        if exception is not None:
+            result.set_exception(exception)
+        else:
+            result.set_result(value)
+    except InvalidStateError:
+        pass
+
+
+def _set_cancelled(result: Future) -> None:
+    _set_outcome(result, exception=AnalysisCancelled("The analysis was cancelled"))
+
+
+def _forward(result: Future, done: Future) -> None:
+    """
+    passes the outcome of the future of the executor on to the future that was returned to the caller
+    """
+    if done.cancelled():
+        _set_cancelled(result)
+    elif done.exception() is not None:
+        _set_outcome(result, exception=done.exception())
+    else:
+        _set_outcome(result, value=done.result())
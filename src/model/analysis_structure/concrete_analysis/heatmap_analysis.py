@@ -1,16 +1,53 @@
+from typing import List
+from typing import Tuple
+
+import numpy as np
 import pandas as pd
 
+from src.data_transfer.content import Column
+from src.data_transfer.record.selection_record import SelectionRecord
+from src.data_transfer.record.setting_record import SettingRecord
+from src.data_transfer.selection.interval_value_option import IntervalValueOption
 from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import ChunkedAnalysis
+
+# the kinds of axes, the values of categories are not binned
+CATEGORY = "category"
+INTEGER = "integer"
+NUMBER = "number"
+TIMESTAMP = "timestamp"
+DAYTIME = "daytime"
+
+# the finest bins of numbers are thousandths
+ROUND_TO = 3
+# the bins of integers of a step are the bins of numbers of this many steps later, whose width is one
+INTEGER_STEP_OFFSET = 2 * ROUND_TO
+# the widths of the bins of times in seconds, each of them divides the next one
+TIME_WIDTHS = [1, 5, 10, 30, 60, 300, 600, 1800, 3600, 21600, 43200, 86400, 604800]
 
+DEFAULT_BINS = 50
+# the bins are anchored at zero, so values on both sides of zero fall into at least two bins
+MIN_BINS = 2
+MAX_BINS = 500
 
-class HeatmapAnalysis(Analysis):
+
+class HeatmapAnalysis(ChunkedAnalysis):
     """A heatmap analysis class to represent a heatmap visualization.
 
+    The x and y attributes are binned, so the size of the heatmap is bounded by the selected number of bins and not by
+    the number of distinct values. The bins have the smallest width of 1, 5, 10, 50, ... thousandths for numbers and
+    of 1 second, 5 seconds, ..., 1 hour, ..., 1 day, 1 week for times, with which the values of an axis fall into at
+    most the selected number of bins. Every width divides the next one, so a chunk that is binned finer than the whole
+    data can be binned coarser without the values of the chunk. Attributes with fewer distinct values than bins keep
+    their values.
+
     Attributes:
         _view_id (view enum): The view id for heatmap visualization.
         _x_attribute (str): The name of the setting that selects the x attribute.
         _y_attribute (str): The name of the setting that selects the y attribute.
         _color_attribute (str): The name of the setting that selects the color attribute.
+        _x_bins (str): The name of the setting that selects the maximal number of bins of the x attribute.
+        _y_bins (str): The name of the setting that selects the maximal number of bins of the y attribute.
         _name (str): The _name of the heatmap analysis.
     """
     _view_id = Analysis.heatmap_view
@@ -21,6 +58,8 @@ class HeatmapAnalysis(Analysis):
         self._x_attribute = "x axis attribute"
         self._y_attribute = "y axis attribute"
         self._color_attribute = "color attribute"
+        self._x_bins = "x axis bins"
+        self._y_bins = "y axis bins"
         self._set_analysis_record(
             self.create_analysis_record(
                 [self.create_setting(name=self._x_attribute,
@@ -34,11 +73,24 @@ class HeatmapAnalysis(Analysis):
                  self.create_setting(name=self._color_attribute,
                                      default_selected=[self.get_column(column_name='speed')],
                                      options=self.get_all_columns()
-                                     )
+                                     ),
+                 self.create_bins_setting(name=self._x_bins),
+                 self.create_bins_setting(name=self._y_bins)
                  ]
             ))
         self._name = "heatmap"
 
+    @classmethod
+    def create_bins_setting(cls, name: str) -> SettingRecord:
+        """
+        Creates a setting for the maximal number of bins of an axis.
+        :param name: the name of the setting by which it will be identified.
+        :return: a SettingRecord with the default number of bins selected.
+        """
+        return SettingRecord(_selection=SelectionRecord(selected=[DEFAULT_BINS],
+                                                        option=IntervalValueOption(MIN_BINS, MAX_BINS)),
+                             _context=name)
+
     def set_analysis_parameters(self, record):
         """
         This method sets the specified attributes to be plotted in the heatmap.
@@ -51,29 +103,189 @@ class HeatmapAnalysis(Analysis):
 
         return True
 
-    def analyse(self, data_df: pd.DataFrame):
+    def init_state(self) -> dict:
+        """
+        The state are the sums and counts of the color attribute in each cell of the heatmap, the cells are indexed
+        by the bins of the y and x attribute. The kinds of the axes are known with the first chunk.
+        """
+        return {"kinds": None, "steps": (0, 0),
+                "sums": pd.Series(dtype="float64"), "counts": pd.Series(dtype="int64")}
+
+    def consume_chunk(self, state: dict, chunk: pd.DataFrame) -> dict:
         """
-        This method takes a `DataFrame` object as input and returns an `AnalysisDataRecord` object
-        as output.
-        :param: data_record: The `DataRecord` object is used to conduct the analysis.
+        Bins the x and y attribute of the chunk and adds the sums and counts of the color attribute in the cells.
         """
-        round_to = 3
         x_column = self.get_columns_from_setting(self._x_attribute)[0]
         y_column = self.get_columns_from_setting(self._y_attribute)[0]
         color_column = self.get_columns_from_setting(self._color_attribute)[0]
-        data: pd.DataFrame = data_df[[x_column, y_column, color_column]].round(round_to)
-        if color_column in self.get_numeric_columns():
-            data = data.pivot_table(index=y_column,
-                                    columns=x_column,
-                                    values=color_column)
+        if len(chunk) == 0:
+            return state
+
+        kinds = (self._get_kind(y_column, chunk[y_column]), self._get_kind(x_column, chunk[x_column]))
+        keys = [self._to_keys(kinds[0], chunk[y_column]), self._to_keys(kinds[1], chunk[x_column])]
+        steps = tuple(self._fit_step(kind, level_keys.unique(), 0, bins)
+                      for kind, level_keys, bins in zip(kinds, keys, self._get_bins()))
+        keys = [pd.Series(self._rescale(kind, level_keys, 0, step), index=chunk.index, name=column)
+                for kind, level_keys, step, column in zip(kinds, keys, steps, [y_column, x_column])]
+
+        cells = chunk[color_column].groupby(keys)
+        sums = cells.sum() if color_column in self.get_numeric_columns() else pd.Series(dtype="float64")
+        return self.merge([state, {"kinds": kinds, "steps": steps, "sums": sums, "counts": cells.count()}])
+
+    def merge(self, states) -> dict:
+        """
+        Bins the cells of the states with the coarsest bins of the states, bins them coarser if the cells together
+        have too many bins and adds up their sums and counts. An integer column with missing values is read as
+        floats, so the states of an axis that has integers in some chunks and numbers in others are binned as numbers.
+        """
+        states = [state for state in states if len(state["counts"]) > 0]
+        if len(states) == 0:
+            return self.init_state()
+
+        kinds = tuple(NUMBER if {state["kinds"][level] for state in states} == {INTEGER, NUMBER}
+                      else states[0]["kinds"][level] for level in range(2))
+        states = [self._to_kinds(state, kinds) for state in states]
+        steps = tuple(max(state["steps"][level] for state in states) for level in range(2))
+        counts = pd.concat([self._rebin(state["counts"], kinds, state["steps"], steps) for state in states])
+        sums = pd.concat([self._rebin(state["sums"], kinds, state["steps"], steps) for state in states])
+        fitted = tuple(self._fit_step(kind, counts.index.get_level_values(level).unique(), step, bins)
+                       for level, (kind, step, bins) in enumerate(zip(kinds, steps, self._get_bins())))
+        return {"kinds": kinds, "steps": fitted,
+                "sums": self._rebin(sums, kinds, steps, fitted, force=True),
+                "counts": self._rebin(counts, kinds, steps, fitted, force=True)}
+
+    @classmethod
+    def _to_kinds(cls, state: dict, kinds: Tuple[str, str]) -> dict:
+        """
+        Converts a state whose axes are integers to a state whose axes are numbers. The keys of the bins of integers
+        are the keys of the bins of numbers that are wider by the finest bins of integers, so only the steps change.
+        """
+        steps = tuple(step + INTEGER_STEP_OFFSET if (old_kind, new_kind) == (INTEGER, NUMBER) else step
+                      for old_kind, new_kind, step in zip(state["kinds"], kinds, state["steps"]))
+        return dict(state, kinds=kinds, steps=steps)
+
+    def finalize(self, state: dict):
+        """
+        Creates the heatmap of the mean or the count of the color attribute in each cell, the cells are labeled with
+        the start of their bins.
+        """
+        counts = state["counts"]
+        if len(counts) == 0:
+            return self.to_view_analysis(analysed_data=pd.DataFrame(), view_type=self._view_id, name=self._name)
+        if self.get_columns_from_setting(self._color_attribute)[0] in self.get_numeric_columns():
+            # cells without any color value are left out like in the pivot table
+            cells = (state["sums"].reindex(counts.index) / counts).dropna()
         else:
-            data = data.pivot_table(index=y_column,
-                                    columns=x_column,
-                                    values=color_column,
-                                    aggfunc='count')
-        data = data.fillna(value=0)
+            cells = counts
+        data = cells.unstack(level=1).sort_index().sort_index(axis=1).fillna(value=0)
+        kinds, steps = state["kinds"], state["steps"]
+        data.index = pd.Index(self._to_labels(kinds[0], steps[0], data.index), name=data.index.name)
+        data.columns = pd.Index(self._to_labels(kinds[1], steps[1], data.columns), name=data.columns.name)
 
         return self.to_view_analysis(analysed_data=data, view_type=self._view_id, name=self._name)
 
+    def _get_bins(self) -> Tuple[int, int]:
+        """
+        :returns: the maximal numbers of bins of the y and x attribute in the order of the levels of the cells.
+        """
+        return (int(self.get_setting_selected(setting_name=self._y_bins)[0]),
+                int(self.get_setting_selected(setting_name=self._x_bins)[0]))
+
+    @classmethod
+    def _get_kind(cls, column: str, values: pd.Series) -> str:
+        """
+        :returns: how the values of the column are binned.
+        """
+        if pd.api.types.is_bool_dtype(values):
+            return CATEGORY
+        if pd.api.types.is_integer_dtype(values):
+            return INTEGER
+        if pd.api.types.is_numeric_dtype(values):
+            return NUMBER
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return TIMESTAMP
+        if column in [column.value for column in Column.get_time_interval_columns()]:
+            return DAYTIME
+        if column in [column.value for column in Column.get_date_interval_columns()]:
+            return TIMESTAMP
+        return CATEGORY
+
+    @classmethod
+    def _to_keys(cls, kind: str, values: pd.Series) -> pd.Series:
+        """
+        Converts the values to the keys of their finest bins, values that can not be converted are left out.
+        """
+        if kind == INTEGER:
+            return values.astype("float64")
+        if kind == NUMBER:
+            return np.round(values * 10 ** ROUND_TO)
+        if kind == TIMESTAMP:
+            return np.floor((pd.to_datetime(values, errors="coerce") - pd.Timestamp(0)).dt.total_seconds())
+        if kind == DAYTIME:
+            return np.floor(pd.to_timedelta(values.astype(str), errors="coerce").dt.total_seconds())
+        return values
+
+    @classmethod
+    def _get_width(cls, kind: str, step: int) -> int:
+        """
+        :returns: the width of the bins of the step in units of the finest bins.
+        """
+        if kind in [TIMESTAMP, DAYTIME]:
+            if step < len(TIME_WIDTHS):
+                return TIME_WIDTHS[step]
+            return TIME_WIDTHS[-1] * 2 ** (step - len(TIME_WIDTHS) + 1)
+        return 10 ** (step // 2) * (5 if step % 2 == 1 else 1)
+
+    @classmethod
+    def _rescale(cls, kind: str, keys, old_step: int, new_step: int):
+        """
+        Converts the keys of bins of the old step to the keys of the bins of the new step.
+        """
+        if kind == CATEGORY or old_step == new_step:
+            return keys
+        return np.floor(keys / (cls._get_width(kind, new_step) // cls._get_width(kind, old_step)))
+
+    @classmethod
+    def _fit_step(cls, kind: str, keys, step: int, bins: int) -> int:
+        """
+        Finds the first step from the given one on, with which the keys fall into at most the given number of bins.
+        """
+        if kind == CATEGORY:
+            return step
+        keys = pd.Index(keys).dropna()
+        fitted = step
+        while len(np.unique(cls._rescale(kind, keys, step, fitted))) > bins:
+            fitted += 1
+        return fitted
+
+    @classmethod
+    def _rebin(cls, cells: pd.Series, kinds: Tuple[str, str], old_steps: Tuple[int, int],
+               new_steps: Tuple[int, int], force: bool = False) -> pd.Series:
+        """
+        Bins the cells with the bins of the new steps and adds up the cells that fall into the same bin.
+        :param force: whether cells with the same bins are added up, even if the steps do not change
+        """
+        if len(cells) == 0 or (old_steps == new_steps and not force):
+            return cells
+        levels: List = [cls._rescale(kind, cells.index.get_level_values(level), old_step, new_step)
+                        for level, (kind, old_step, new_step) in enumerate(zip(kinds, old_steps, new_steps))]
+        return cells.groupby(levels, sort=False).sum().rename_axis(cells.index.names)
+
+    @classmethod
+    def _to_labels(cls, kind: str, step: int, keys: pd.Index):
+        """
+        Converts the keys of the bins to the start of the bins.
+        """
+        if kind == CATEGORY:
+            return keys
+        starts = keys * cls._get_width(kind, step)
+        if kind == INTEGER:
+            return starts.astype("int64")
+        if kind == NUMBER:
+            return np.round(starts / 10 ** ROUND_TO, ROUND_TO)
+        if kind == TIMESTAMP:
+            return pd.to_datetime(starts, unit="s")
+        return pd.to_datetime(starts, unit="s").time
+
 
 CONSTRUCTOR = HeatmapAnalysis
@@ -1,9 +1,10 @@
 import pandas as pd
 
 from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import ChunkedAnalysis
 
 
-class HistogramAnalysis(Analysis):
+class HistogramAnalysis(ChunkedAnalysis):
     """
     Analysis to create histograms for columns.
     """
@@ -45,5 +46,33 @@ class HistogramAnalysis(Analysis):
             view_type=self._view_id,
             name=self._name)
 
+    def init_state(self) -> pd.Series:
+        """
+        The state of the histogram are the occurrences of the values consumed so far.
+        """
+        return pd.Series(dtype="int64")
+
+    def consume_chunk(self, state: pd.Series, chunk: pd.DataFrame) -> pd.Series:
+        """
+        Adds the occurrences of the values in the chunk.
+        """
+        return self.merge([state, chunk[self.get_columns_from_setting(self.setting_name)[0]].value_counts()])
+
+    def merge(self, states) -> pd.Series:
+        """
+        Adds up the occurrences of the values of the states.
+        """
+        return self.merge_counts(states)
+
+    def finalize(self, state: pd.Series):
+        """
+        Creates the histogram from the occurrences of the values.
+        """
+        return self.to_view_analysis(
+            analysed_data=self.counts_to_histogram(state.sort_values(ascending=False, kind="stable"),
+                                                   self.get_columns_from_setting(self.setting_name)[0]),
+            view_type=self._view_id,
+            name=self._name)
+
 
 CONSTRUCTOR = HistogramAnalysis
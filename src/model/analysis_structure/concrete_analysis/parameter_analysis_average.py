@@ -1,13 +1,27 @@
 import pandas as pd
 
 from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import ChunkedAnalysis
+from src.model.analysis_structure.sketches import CountMinSketch
+from src.model.analysis_structure.sketches import TDigest
 
 
-class AverageParameterAnalysis(Analysis):
+class AverageParameterAnalysis(ChunkedAnalysis):
     """
-    Analysis to calculate the average of numeric columns and mode of non-numeric columns.
+    Analysis to calculate the average of numeric columns and mode of non-numeric columns. If approximate is selected,
+    the modes are estimated with count-min sketches, which keep the most frequent values instead of all of them, and
+    the medians of numeric columns are estimated with t-digests. The averages stay exact. The table shows how many
+    occurrences of a mode may be overcounted and by how much of the data the rank of a median may be off.
     """
 
+    # the rows of the table if approximate is selected and the column that names them
+    STATISTIC_COLUMN = "statistic"
+    VALUE_ROW = "value"
+    OCCURRENCES_ROW = "occurrences"
+    OCCURRENCES_ERROR_ROW = "occurrences error"
+    MEDIAN_ROW = "median"
+    MEDIAN_ERROR_ROW = "median rank error"
+
     _view_id = Analysis.table_view
 
     def __init__(self):
@@ -16,12 +30,14 @@ class AverageParameterAnalysis(Analysis):
         """
         super().__init__()
         self.setting_name: str = "column"
+        self.approximate_setting_name: str = "approximate"
         self._set_analysis_record(
             self.create_analysis_record(
                 [self.create_setting(name=self.setting_name,
                                      default_selected=[self.get_column("speed")],
                                      options=self.get_all_columns(),
-                                     possible_selection_range=range(1, len(self.get_all_columns()) + 1))]
+                                     possible_selection_range=range(1, len(self.get_all_columns()) + 1)),
+                 self.create_bool_setting(name=self.approximate_setting_name)]
             ))
         self._name = "parameter average"
 
@@ -44,9 +60,113 @@ class AverageParameterAnalysis(Analysis):
         :return: AnalysisDataRecord containing the results of the analysis
         :rtype: AnalysisDataRecord
         """
+        if self._is_approximate():
+            return super().analyse(data)
         return self.to_view_analysis(analysed_data=self.calculate_average_mode(data),
                                      view_type=self._view_id,
                                      name=self._name)
 
+    def init_state(self) -> dict:
+        """
+        The state are the sums and counts of the numeric columns and the occurrences of the values of the
+        non-numeric columns. If approximate is selected, the occurrences are replaced by count-min sketches and the
+        numeric columns also have t-digests.
+        """
+        if self._is_approximate():
+            return {"sums": {}, "counts": {}, "digests": {}, "sketches": {}}
+        return {"sums": {}, "counts": {}, "occurrences": {}}
+
+    def consume_chunk(self, state: dict, chunk: pd.DataFrame) -> dict:
+        """
+        Adds the sums, counts and occurrences or sketches of the chunk.
+        """
+        chunk_state = self.init_state()
+        is_approximate = self._is_approximate()
+        for column in chunk.columns:
+            if chunk[column].dtype in ['float64', 'int64']:
+                chunk_state["sums"][column] = chunk[column].sum()
+                chunk_state["counts"][column] = chunk[column].count()
+                if is_approximate:
+                    chunk_state["digests"][column] = TDigest()
+                    chunk_state["digests"][column].add(chunk[column])
+            elif chunk[column].dtype == 'object':
+                if is_approximate:
+                    chunk_state["sketches"][column] = CountMinSketch()
+                    chunk_state["sketches"][column].add(chunk[column])
+                else:
+                    chunk_state["occurrences"][column] = chunk[column].value_counts()
+        return self.merge([state, chunk_state])
+
+    def merge(self, states) -> dict:
+        """
+        Adds up the sums, counts and occurrences of the states and merges their sketches.
+        """
+        merged = self.init_state()
+        for state in states:
+            for column, value in state["sums"].items():
+                merged["sums"][column] = merged["sums"].get(column, 0) + value
+                merged["counts"][column] = merged["counts"].get(column, 0) + state["counts"][column]
+            if "occurrences" not in state:
+                continue
+            for column, occurrences in state["occurrences"].items():
+                merged["occurrences"][column] = self.merge_counts([merged["occurrences"].get(column, occurrences[:0]),
+                                                                   occurrences])
+        if self._is_approximate():
+            for key, sketch_type in [("digests", TDigest), ("sketches", CountMinSketch)]:
+                columns = {column for state in states for column in state[key]}
+                merged[key] = {column: sketch_type.merge([state[key][column] for state in states
+                                                          if column in state[key]])
+                               for column in columns}
+        return merged
+
+    def finalize(self, state: dict):
+        """
+        Calculates the averages of the numeric columns and the modes of the non-numeric columns.
+        """
+        if self._is_approximate():
+            return self._finalize_approximate(state)
+        result = {column: state["sums"][column] / state["counts"][column] if state["counts"][column] > 0
+                  else float("nan") for column in state["sums"]}
+        for column, occurrences in state["occurrences"].items():
+            if column not in result and len(occurrences) > 0:
+                # like the mode, the smallest of the most frequent values is chosen
+                result[column] = occurrences[occurrences == occurrences.max()].index.sort_values()[0]
+        return self.to_view_analysis(analysed_data=pd.DataFrame(result, index=[0]),
+                                     view_type=self._view_id,
+                                     name=self._name)
+
+    def _finalize_approximate(self, state: dict):
+        """
+        Creates the table of the averages and estimated medians of the numeric columns and the estimated modes of the
+        non-numeric columns with their errors, the first column names the rows.
+        """
+        result = {}
+        for column in state["sums"]:
+            digest = state["digests"][column]
+            result[column] = {self.VALUE_ROW: state["sums"][column] / state["counts"][column]
+                              if state["counts"][column] > 0 else float("nan"),
+                              self.MEDIAN_ROW: digest.quantile(0.5),
+                              self.MEDIAN_ERROR_ROW: digest.rank_error(0.5)}
+        for column, sketch in state["sketches"].items():
+            if column not in result and sketch.total > 0:
+                mode, occurrences = sketch.mode()
+                result[column] = {self.VALUE_ROW: mode,
+                                  self.OCCURRENCES_ROW: occurrences,
+                                  self.OCCURRENCES_ERROR_ROW: round(sketch.error_bound())}
+        rows = pd.Index([self.VALUE_ROW, self.OCCURRENCES_ROW, self.OCCURRENCES_ERROR_ROW, self.MEDIAN_ROW,
+                         self.MEDIAN_ERROR_ROW], name=self.STATISTIC_COLUMN)
+        data = pd.DataFrame(result, index=rows)
+        # the table does not show the index, so the names of the rows are a column
+        data = data.reset_index()
+        return self.to_view_analysis(analysed_data=data,
+                                     view_type=self._view_id,
+                                     name=self._name)
+
+    def _is_approximate(self) -> bool:
+        """
+        :return: whether the modes and medians are estimated
+        """
+        return bool(self.get_setting_selected(setting_name=self.approximate_setting_name)[0])
+
 
 CONSTRUCTOR = AverageParameterAnalysis
@@ -1,15 +1,21 @@
 import pandas as pd
 
 from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import ChunkedAnalysis
+from src.model.analysis_structure.sketches import HyperLogLog
 
 
-class TotalParameterAnalysis(Analysis):
+class TotalParameterAnalysis(ChunkedAnalysis):
     """
     Analysis to calculate the number of unique values in non-numeric columns. For numeric columns it rounds
-    to one place after the period and then counts unique values.
+    to one place after the period and then counts unique values. If approximate is selected, the unique values are
+    estimated with a HyperLogLog sketch of each column, whose memory does not grow with the number of unique values,
+    and the standard error of each estimate is shown below it.
     """
 
     _view_id = Analysis.table_view
+    # the column that names the rows if approximate is selected
+    STATISTIC_COLUMN = "statistic"
 
     def __init__(self):
         """
@@ -17,12 +23,14 @@ class TotalParameterAnalysis(Analysis):
         """
         super().__init__()
         self.setting_name: str = "column"
+        self.approximate_setting_name: str = "approximate"
         self._set_analysis_record(
             self.create_analysis_record(
                 [self.create_setting(name=self.setting_name,
                                      default_selected=[self.get_column("speed")],
                                      options=self.get_all_columns(),
-                                     possible_selection_range=range(1, len(self.get_all_columns()) + 1))]
+                                     possible_selection_range=range(1, len(self.get_all_columns()) + 1)),
+                 self.create_bool_setting(name=self.approximate_setting_name)]
             ))
         self._name: str = "total parameter"
 
@@ -43,9 +51,69 @@ class TotalParameterAnalysis(Analysis):
         :param data: DataFrame containing the data to be analyzed
         :return: AnalysisDataRecord containing the results of the analysis
         """
+        if self._is_approximate():
+            return super().analyse(data)
         return self.to_view_analysis(analysed_data=self.find_unique_values(data, 1),
                                      view_type=self._view_id,
                                      name=self._name)
 
+    def init_state(self) -> dict:
+        """
+        The state are the rounded values of each column consumed so far or their sketches if approximate is selected.
+        """
+        return {}
+
+    def consume_chunk(self, state: dict, chunk: pd.DataFrame) -> dict:
+        """
+        Adds the unique rounded values of each column of the chunk.
+        """
+        rounded = chunk.round(1)
+        if self._is_approximate():
+            chunk_state = {column: HyperLogLog() for column in rounded.columns}
+            for column, sketch in chunk_state.items():
+                sketch.add(rounded[column])
+            return self.merge([state, chunk_state])
+        return self.merge([state, {column: set(rounded[column].dropna().unique()) for column in rounded.columns}])
+
+    def merge(self, states) -> dict:
+        """
+        Unites the values or merges the sketches of each column of the states.
+        """
+        if self._is_approximate():
+            sketches = {}
+            for state in states:
+                for column, sketch in state.items():
+                    sketches.setdefault(column, []).append(sketch)
+            return {column: HyperLogLog.merge(column_sketches) for column, column_sketches in sketches.items()}
+        merged = {}
+        for state in states:
+            for column, values in state.items():
+                merged.setdefault(column, set()).update(values)
+        return merged
+
+    def finalize(self, state: dict):
+        """
+        Counts the unique values of each column, the estimates are rounded and shown with their standard error in a
+        second row.
+        """
+        if self._is_approximate():
+            counts = {column: sketch.count() for column, sketch in state.items()}
+            data = pd.DataFrame({column: [round(counts[column]), round(counts[column] * sketch.relative_error())]
+                                 for column, sketch in state.items()},
+                                index=pd.Index(["Total", "Error"], name=self.STATISTIC_COLUMN))
+            # the table does not show the index, so the names of the rows are a column
+            data = data.reset_index()
+        else:
+            data = pd.DataFrame({column: len(values) for column, values in state.items()}, index=["Total"])
+        return self.to_view_analysis(analysed_data=data,
+                                     view_type=self._view_id,
+                                     name=self._name)
+
+    def _is_approximate(self) -> bool:
+        """
+        :return: whether the unique values are estimated
+        """
+        return bool(self.get_setting_selected(setting_name=self.approximate_setting_name)[0])
+
 
 CONSTRUCTOR = TotalParameterAnalysis
@@ -2,11 +2,13 @@ import pandas as pd
 
 from src.data_transfer.record import AnalysisDataRecord
 from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import PagedAnalysis
 
 
-class TableAnalysis(Analysis):
+class TableAnalysis(PagedAnalysis):
     """
-    Analysis to display selected columns in a table view.
+    Analysis to display selected columns in a table view. The table is given only its first page, ordered by
+    trajectory and order, the view pages through the rest of the data.
     """
     _view_id = Analysis.table_view
 
@@ -40,7 +42,7 @@ class TableAnalysis(Analysis):
 
     def analyse(self, data: pd.DataFrame):
         """
-        Analyze the input data and return an AnalysisDataRecord containing the results
+        Analyze the input data and return an AnalysisDataRecord containing the results, the index of the rows is kept
 
         :param data: DataFrame containing the data to be analyzed
         :type data: DataFrame
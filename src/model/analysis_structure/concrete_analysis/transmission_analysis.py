@@ -1,9 +1,10 @@
 import pandas as pd
 
 from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import ChunkedAnalysis
 
 
-class TransmissionFrequencyAnalysis(Analysis):
+class TransmissionFrequencyAnalysis(ChunkedAnalysis):
     """
     This class is used to analyze the transmission frequency of a given dataset.
     It takes in a DataRecord and returns an AnalysisDataRecord with the average
@@ -61,5 +62,81 @@ class TransmissionFrequencyAnalysis(Analysis):
                                          view_type=self._view_id,
                                          name=self._name)
 
+    def init_state(self) -> dict:
+        """
+        The state are the sums and counts of the time differences of each vehicle, the occurrences of the time
+        differences and the first and last timestamp of each vehicle, so the time difference between the last
+        datapoint of a chunk and the first datapoint of the next chunk can be added when the chunks are merged.
+        """
+        timestamps = pd.Series(dtype="datetime64[ns]")
+        return {"sums": pd.Series(dtype="float64"), "counts": pd.Series(dtype="int64"),
+                "occurrences": pd.Series(dtype="int64"), "first": timestamps, "last": timestamps}
+
+    def consume_chunk(self, state: dict, chunk: pd.DataFrame) -> dict:
+        """
+        Adds the time differences between the datapoints of each vehicle in the chunk.
+        """
+        time_column = self.get_column('time')
+        trajectory_id_column = self.get_column('trajectory_id')
+        date_column = self.get_column('date')
+
+        data_df = chunk[[trajectory_id_column]].assign(
+            timestamp=pd.to_datetime(chunk[date_column] + ' ' + chunk[time_column], format='%d.%m.%Y %H:%M:%S'))
+        time_diffs = data_df.groupby(trajectory_id_column)['timestamp'].diff().dt.total_seconds()
+        vehicles = data_df.set_index(trajectory_id_column)['timestamp']
+        return self.merge([state, self._create_state(time_diffs.groupby(data_df[trajectory_id_column]), time_diffs,
+                                                     vehicles[~vehicles.index.duplicated(keep='first')],
+                                                     vehicles[~vehicles.index.duplicated(keep='last')])])
+
+    def merge(self, states) -> dict:
+        """
+        Adds up the states and the time differences between consecutive states.
+        """
+        merged = self.init_state()
+        for state in states:
+            # the vehicles of both states continue from the last timestamp of the merged states
+            common = merged["last"].index.intersection(state["first"].index)
+            time_diffs = (state["first"][common] - merged["last"][common]).dt.total_seconds()
+            boundary = self._create_state(time_diffs.groupby(level=0), time_diffs, merged["first"][:0],
+                                          merged["last"][:0])
+            merged = {
+                "sums": self.merge_counts([merged["sums"], state["sums"], boundary["sums"]]),
+                "counts": self.merge_counts([merged["counts"], state["counts"], boundary["counts"]]),
+                "occurrences": self.merge_counts([merged["occurrences"], state["occurrences"],
+                                                  boundary["occurrences"]]),
+                "first": pd.concat([merged["first"], state["first"].drop(merged["first"].index, errors='ignore')]),
+                "last": pd.concat([merged["last"].drop(state["last"].index, errors='ignore'), state["last"]])
+            }
+        return merged
+
+    def finalize(self, state: dict):
+        """
+        Creates the average or the distribution of the time differences.
+        """
+        trajectory_id_column = self.get_column('trajectory_id')
+        analysis_type = self.get_setting_selected(self.setting_name)[0]
+        if analysis_type == self._analysis_types[0]:
+            averages = (state["sums"] / state["counts"]).sort_index().rename('time_diff')
+            averages.index.name = trajectory_id_column
+            return self.to_view_analysis(analysed_data=averages.to_frame().reset_index().round(1),
+                                         view_type=self._view_id,
+                                         name=self._name)
+
+        elif analysis_type == self._analysis_types[1]:
+            occurrences = state["occurrences"].sort_values(ascending=False, kind="stable")
+            return self.to_view_analysis(analysed_data=self.counts_to_histogram(occurrences, 'time_diff').round(1),
+                                         view_type=self._view_id,
+                                         name=self._name)
+
+    def _create_state(self, vehicle_time_diffs, time_diffs: pd.Series, first: pd.Series, last: pd.Series) -> dict:
+        """
+        creates the state of the time differences, only the values the selected analysis type needs are kept
+        """
+        if self.get_setting_selected(self.setting_name)[0] == self._analysis_types[0]:
+            return {"sums": vehicle_time_diffs.sum(), "counts": vehicle_time_diffs.count(),
+                    "occurrences": pd.Series(dtype="int64"), "first": first, "last": last}
+        return {"sums": pd.Series(dtype="float64"), "counts": pd.Series(dtype="int64"),
+                "occurrences": time_diffs.value_counts(), "first": first, "last": last}
+
 
 CONSTRUCTOR = TransmissionFrequencyAnalysis
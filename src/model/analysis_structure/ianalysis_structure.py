@@ -1,5 +1,7 @@
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import Future
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Type
@@ -94,6 +96,49 @@ class IAnalysisStructure(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_analysed_data_async(self, analysis_id: UUID) -> Future:
+        """
+        Starts the by the id specified analysis in the background.
+        :param analysis_id: The id of the to be run analysis
+        :return: A future of the AnalysisDataRecord containing all the analysed data.
+        """
+        pass
+
+    @abstractmethod
+    def get_analysed_data_batch_async(self, analysis_ids: List[UUID]) -> Dict[UUID, Future]:
+        """
+        Starts the by the ids specified analyses in the background, their data is queried only once.
+        :param analysis_ids: The ids of the to be run analyses
+        :return: The futures of the AnalysisDataRecords by the ids of the analyses.
+        """
+        pass
+
+    @abstractmethod
+    def get_analysis_progress(self, analysis_id: UUID) -> Optional[float]:
+        """
+        Gets the progress of the last run of an analysis.
+        :param analysis_id: The id of the analysis.
+        :return: The done part of the analysis between 0 and 1 or None if it is not known.
+        """
+        pass
+
+    @abstractmethod
+    def cancel_analysis(self, analysis_id: UUID) -> bool:
+        """
+        Cancels the running analysis, its future fails with AnalysisCancelled.
+        :param analysis_id: The id of the analysis.
+        :return: Whether the analysis was running.
+        """
+        pass
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """
+        Cancels the running analyses and stops the worker processes, e.g. when the application exits.
+        """
+        pass
+
     @abstractmethod
     def refresh(self, analysis_id: UUID) -> AnalysisDataRecord:
         """
@@ -103,3 +148,19 @@ class IAnalysisStructure(ABC):
         type to be displayed as.
         """
         pass
+
+    @abstractmethod
+    def set_cache_directory(self, directory: Optional[str]) -> None:
+        """
+        Sets the directory the results of the analyses are persisted to.
+        :param directory: The directory or None if the results are only cached in memory.
+        """
+        pass
+
+    @abstractmethod
+    def invalidate_cache(self, dataset_key: Optional[str] = None) -> None:
+        """
+        Removes the cached results of a dataset, e.g. after its data changed.
+        :param dataset_key: The key of the dataset or None to remove the results of all datasets.
+        """
+        pass
@@ -0,0 +1,62 @@
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from uuid import UUID
+
+import pandas as pd
+
+from src.data_transfer.content import Column
+from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.Analysis import ChunkedAnalysis
+
+
+class RefreshPlan:
+    """
+    Plans the refresh of several analyses, so their data is queried only once. The required columns of all analyses
+    are united into one query and every analysis is given its columns of the shared frame. If all analyses are
+    chunked, the shared data is read in chunks. The plan counts the queries and bytes the shared frame saves
+    compared to querying the data of every analysis on its own.
+    """
+
+    def __init__(self, analyses: Dict[UUID, Analysis]):
+        """
+        creates the plan of the given analyses
+        :param analyses: the analyses to refresh by their ids
+        """
+        self.columns: List[Column] = []
+        self.projections: Dict[UUID, List[str]] = {}
+        for analysis_id, analysis in analyses.items():
+            columns = [Column.get_column_from_str(col_str) for col_str in analysis.get_required_columns()]
+            self.projections[analysis_id] = [column.value for column in columns]
+            self.columns.extend(column for column in columns if column not in self.columns)
+        self.is_chunked = all(isinstance(analysis, ChunkedAnalysis) for analysis in analyses.values())
+        self._shared_bytes = 0
+        self._separate_bytes = 0
+
+    def track(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        passes the chunks of the shared data through, counts their bytes and logs the savings after the last chunk
+        :param chunks: the chunks of the shared data
+        :return: the same chunks
+        """
+        for chunk in chunks:
+            self.count(chunk)
+            yield chunk
+        self.log()
+
+    def count(self, data: pd.DataFrame) -> None:
+        """
+        counts the bytes of the shared data and of the columns every analysis would have queried on its own
+        :param data: the shared frame or a chunk of it
+        """
+        column_bytes = data.memory_usage(index=False, deep=True)
+        self._shared_bytes += int(column_bytes.sum())
+        self._separate_bytes += int(sum(column_bytes[columns].sum() for columns in self.projections.values()))
+
+    def log(self) -> None:
+        """
+        logs how many queries and bytes were saved by sharing the data
+        """
+        print(f"Logging: refresh of {len(self.projections)} analyses saved {len(self.projections) - 1} queries "
+              f"and {self._separate_bytes - self._shared_bytes} bytes")
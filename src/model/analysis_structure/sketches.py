@@ -0,0 +1,269 @@
+import math
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# 2 ** 12 registers estimate distinct counts with a standard error of 1.6%
+HLL_PRECISION = 12
+# the overcount of a count-min estimate is at most e / width of all counted values with a probability of
+# 1 - e ** -depth, which is 0.008% of the values with a probability of 98%
+COUNT_MIN_WIDTH = 2 ** 15
+COUNT_MIN_DEPTH = 4
+# the number of most frequent values a count-min sketch keeps as candidates for the mode
+HEAVY_HITTERS = 32
+# the number of centroids of a t-digest is at most about half the compression
+TDIGEST_COMPRESSION = 100
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """
+    hashes the values to 64 bits. The hash does not depend on the process, so sketches of different workers can be
+    merged. Every value is hashed on its own, because finding the distinct values first would cost as much as
+    counting them exactly.
+    :param values: the values without missing values
+    :return: the hashes as unsigned integers
+    """
+    return pd.util.hash_pandas_object(values, index=False, categorize=False).to_numpy(dtype=np.uint64)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    gets the number of significant bits of unsigned 64 bit integers. The halves are converted to floats separately,
+    because a float can not represent every 64 bit integer.
+    """
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """
+    Estimates the number of distinct values. Every value is hashed into one of the registers, which keeps the
+    longest run of leading zeros of the hashes it was given. The registers of sketches of different parts of the data
+    are merged by their maximum, so the estimate of the merged sketch is the estimate of all parts.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        """
+        creates an empty sketch
+        :param precision: the number of bits of a hash that select its register
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values: pd.Series) -> None:
+        """
+        adds the values, missing values are left out
+        """
+        values = values.dropna()
+        if len(values) == 0:
+            return
+        hashes = hash_values(values)
+        registers = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        ranks = np.minimum(64 - _bit_length(hashes << np.uint64(self.precision)) + 1, 64 - self.precision + 1)
+        np.maximum.at(self.registers, registers, ranks.astype(np.uint8))
+
+    @classmethod
+    def merge(cls, sketches: List["HyperLogLog"]) -> "HyperLogLog":
+        """
+        merges sketches of the same precision
+        """
+        merged = cls(sketches[0].precision)
+        for sketch in sketches:
+            np.maximum(merged.registers, sketch.registers, out=merged.registers)
+        return merged
+
+    def count(self) -> float:
+        """
+        :return: the estimated number of distinct values
+        """
+        size = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / size) * size * size / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * size and zeros > 0:
+            # few values are counted more exactly by the registers they did not reach
+            estimate = size * math.log(size / zeros)
+        return float(estimate)
+
+    def relative_error(self) -> float:
+        """
+        :return: the standard error of the estimate relative to the number of distinct values
+        """
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class CountMinSketch:
+    """
+    Estimates how often values occur. Every row of the table counts the values in the cell their hash selects, the
+    estimate of a value is the smallest of its cells, which overcounts it at most by the values sharing its cells.
+    The most frequent values seen so far are kept as candidates for the mode. Sketches of different parts of the data
+    are merged by adding their tables.
+    """
+
+    def __init__(self, width: int = COUNT_MIN_WIDTH, depth: int = COUNT_MIN_DEPTH, heavy_hitters: int = HEAVY_HITTERS):
+        """
+        creates an empty sketch
+        :param width: the number of cells of a row
+        :param depth: the number of rows
+        :param heavy_hitters: the number of candidates for the mode
+        """
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.heavy_hitters = heavy_hitters
+        self.candidates = pd.Index([])
+
+    def _get_cells(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        gets the cell of every hashed value in every row, the rows combine two halves of one hash
+        """
+        first, second = hashes & np.uint64(0xFFFFFFFF), hashes >> np.uint64(32)
+        rows = np.arange(self.table.shape[0], dtype=np.uint64)[:, None]
+        return ((first[None, :] + rows * second[None, :]) % np.uint64(self.table.shape[1])).astype(np.int64)
+
+    def add(self, values: pd.Series) -> None:
+        """
+        counts the values, missing values are left out. Every value is hashed into its cells without counting the
+        values first, the candidates for the mode are the distinct values of the most estimated occurrences.
+        """
+        values = values.dropna()
+        if len(values) == 0:
+            return
+        hashes = hash_values(values)
+        cells = self._get_cells(hashes)
+        depth, width = self.table.shape
+        # counting the cells of all rows at once is the same as adding one to every cell, just faster
+        self.table += np.bincount((cells + np.arange(depth)[:, None] * width).ravel(),
+                                  minlength=depth * width).reshape(depth, width)
+        self.total += len(values)
+
+        # equal values have equal hashes, so only the first occurrence of every hash is estimated
+        firsts = np.flatnonzero(~pd.Series(hashes).duplicated().to_numpy())
+        estimates = np.min(np.take_along_axis(self.table, cells[:, firsts], axis=1), axis=0)
+        if len(firsts) > self.heavy_hitters:
+            firsts = firsts[np.argpartition(-estimates, self.heavy_hitters)[:self.heavy_hitters]]
+        self._keep_heavy_hitters(self.candidates.append(pd.Index(values.iloc[firsts])))
+
+    @classmethod
+    def merge(cls, sketches: List["CountMinSketch"]) -> "CountMinSketch":
+        """
+        merges sketches of the same size
+        """
+        depth, width = sketches[0].table.shape
+        merged = cls(width, depth, sketches[0].heavy_hitters)
+        for sketch in sketches:
+            merged.table += sketch.table
+            merged.total += sketch.total
+        merged._keep_heavy_hitters(pd.Index([]).append([sketch.candidates for sketch in sketches]))
+        return merged
+
+    def estimate(self, values: pd.Index) -> np.ndarray:
+        """
+        :return: the estimated occurrences of the values, they are never lower than the real occurrences
+        """
+        if len(values) == 0:
+            return np.zeros(0, dtype=np.int64)
+        cells = self._get_cells(hash_values(values.to_series()))
+        return np.min(np.take_along_axis(self.table, cells, axis=1), axis=0)
+
+    def mode(self) -> Tuple[Optional[object], int]:
+        """
+        :return: the candidate with the most estimated occurrences and its estimated occurrences, like the mode the
+        smallest of the most frequent values is chosen
+        """
+        if len(self.candidates) == 0:
+            return None, 0
+        estimates = pd.Series(self.estimate(self.candidates), index=self.candidates)
+        return estimates[estimates == estimates.max()].index.sort_values()[0], int(estimates.max())
+
+    def error_bound(self) -> float:
+        """
+        :return: the number of occurrences an estimate is too high at most, with a probability of 1 - e ** -depth
+        """
+        return math.e / self.table.shape[1] * self.total
+
+    def _keep_heavy_hitters(self, candidates: pd.Index) -> None:
+        candidates = candidates.unique()
+        estimates = pd.Series(self.estimate(candidates), index=candidates)
+        self.candidates = estimates.sort_values(ascending=False, kind="mergesort").index[:self.heavy_hitters]
+
+
+class TDigest:
+    """
+    Estimates quantiles from clusters of the sorted values, the centroids. A centroid near the median may hold more
+    values than one in the tails, so the quantiles of the tails are more exact. Digests of different parts of the data
+    are merged by clustering their centroids again.
+    """
+
+    def __init__(self, compression: int = TDIGEST_COMPRESSION):
+        """
+        creates an empty digest
+        :param compression: bounds the number of centroids, more centroids estimate the quantiles more exactly
+        """
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values: pd.Series) -> None:
+        """
+        adds the values, missing values are left out
+        """
+        values = pd.to_numeric(values, errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.min, self.max = min(self.min, values.min()), max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+
+    @classmethod
+    def merge(cls, digests: List["TDigest"]) -> "TDigest":
+        """
+        merges digests of the same compression
+        """
+        merged = cls(digests[0].compression)
+        merged.min = min(digest.min for digest in digests)
+        merged.max = max(digest.max for digest in digests)
+        merged._compress(np.concatenate([digest.means for digest in digests]),
+                         np.concatenate([digest.weights for digest in digests]))
+        return merged
+
+    def quantile(self, q: float) -> float:
+        """
+        :return: the estimated quantile, it is interpolated between the means of the centroids
+        """
+        if len(self.means) == 0:
+            return math.nan
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * total, np.concatenate([[0], centers, [total]]),
+                               np.concatenate([[self.min], self.means, [self.max]])))
+
+    def rank_error(self, q: float) -> float:
+        """
+        :return: how far the rank of the estimated quantile may be off as part of all values, which is the part of
+        the values in the centroid the quantile falls into
+        """
+        if len(self.means) == 0:
+            return math.nan
+        total = self.weights.sum()
+        index = min(int(np.searchsorted(np.cumsum(self.weights), q * total)), len(self.weights) - 1)
+        return float(self.weights[index] / total)
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        """
+        clusters the sorted values into centroids. The quantiles of the values are scaled so that the tails are
+        stretched, and the values whose scaled quantiles fall into the same unit interval form a centroid.
+        """
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        lower_quantiles = (np.cumsum(weights) - weights) / total
+        scaled = self.compression / (2 * math.pi) * np.arcsin(np.clip(2 * lower_quantiles - 1, -1, 1))
+        centroids = np.floor(scaled + self.compression / 4).astype(np.int64)
+        # the centroids are numbered in order of the values, so the numbers only have to be made consecutive
+        centroids = np.unique(centroids, return_inverse=True)[1]
+        self.weights = np.bincount(centroids, weights=weights)
+        self.means = np.bincount(centroids, weights=means * weights) / self.weights
@@ -0,0 +1,215 @@
+from typing import List
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_transfer.content import Column
+from src.data_transfer.record import AnalysisDataRecord
+from src.data_transfer.record import AnalysisRecord
+from src.data_transfer.record import DataRecord
+from src.data_transfer.record import PolygonRecord
+from src.data_transfer.record.selection_record import SelectionRecord
+from src.data_transfer.record.setting_record import SettingRecord
+from src.data_transfer.selection.discrete_option import DiscreteOption
+from src.model.analysis_structure.Analysis import Analysis
+from src.model.analysis_structure.spatial_analysis.polygon_consumer_analysis import PolygonFacadeConsumer
+from src.model.polygon_structure.ipolygon_structure import IPolygonStructure
+from src.model.polygon_structure.polygon_geometry import assign_points_to_polygons
+
+
+class OriginDestinationAnalysis(Analysis, PolygonFacadeConsumer):
+    """
+    This class creates the origin destination matrix of the selected polygons, the zones. Every point is assigned to
+    its zone at once, instead of testing one pair of polygons per analysis. The origin of a trajectory is the first
+    zone it was in and its destination the last one. Its travel time is the time from leaving the origin to arriving
+    at the destination, so the time spent inside of them is not counted. The matrix has a row for every origin and
+    the number of trips and their mean travel time for every destination.
+    """
+
+    _columns = [Column.TRAJECTORY_ID.value, Column.DATE.value, Column.TIME.value, Column.LONGITUDE.value,
+                Column.LATITUDE.value]
+
+    _view_id = Analysis.table_view
+
+    ORIGIN_COLUMN = "origin"
+    TRIPS_SUFFIX = " trips"
+    TRAVEL_TIME_SUFFIX = " travel time"
+
+    def __init__(self):
+        """
+        Initializes the class with default parameters
+        """
+        super().__init__()
+        self._required_parameters = self._columns
+        self._zones: List[PolygonRecord] = []
+        self.__current_record: Optional[AnalysisRecord] = None
+        self._name: str = "origin destination matrix"
+
+    @property
+    def _current_record(self) -> AnalysisRecord:
+        """
+        An internal property to check if the record is set before accessing it.
+        :return: The default record if set.
+        """
+        if self.__current_record is None:
+            raise RuntimeError("The analysis is in an illegal state. The _default_record attribute was attempted to be"
+                               "accessed before it was set.")
+        return self.__current_record
+
+    def set_polygon_structure(self, structure: IPolygonStructure) -> None:
+        """
+        Sets the polygon structure in order for the analysis to access the possible polygons, all of them are selected
+        as zones by default.
+        :param structure: The polygon structure.
+        """
+        polygons = structure.get_all_polygons()
+
+        if len(polygons) == 0:
+            raise ValueError("No Polygons are selectable.")
+
+        self.set_analysis_parameters(
+            AnalysisRecord(
+                _required_data=(
+                    SettingRecord(
+                        _context="zones",
+                        _selection=SelectionRecord(
+                            selected=list(polygons),
+                            option=DiscreteOption(polygons),
+                            possible_selection_range=range(1, len(polygons) + 1)
+                        )
+                    ),
+                ),
+            )
+        )
+
+    def get_required_analysis_parameter(self) -> AnalysisRecord:
+        """
+        Returns the default record of the analysis to be set by the user.
+        :return: default record of the analysis
+        """
+        return self._current_record
+
+    def get_name(self) -> str:
+        """
+        Returns the _name of the analysis
+        :return: _name of the analysis
+        """
+        return self._name
+
+    def set_analysis_parameters(self, record: AnalysisRecord) -> bool:
+        """
+        Set the analysis parameters with the passed record
+        :param record: record with analysis parameters
+        :return: True if the record is valid and parameters are set
+        """
+        if len(record.required_data) != 1:
+            raise ValueError("The record does not contain the correct number of option.")
+        option = record.required_data[0].selection.option
+        selected_polygons = record.required_data[0].selection.selected
+        if len(selected_polygons) == 0 or not all(option.is_valid(polygon) for polygon in selected_polygons):
+            raise ValueError("At least one valid polygon needs to be selected for the origin destination analysis.")
+
+        self._zones = list(selected_polygons)
+        self.__current_record = record
+        return True
+
+    def analyse(self, data: pd.DataFrame) -> AnalysisDataRecord:
+        """
+        Creates the origin destination matrix of the data.
+        :param data: the data to be analysed as a pandas Dataframe
+        :returns the matrix as an AnalysisDataRecord
+        """
+        steps = 3
+        self.report_progress(0, steps)
+        zones = assign_points_to_polygons(pd.to_numeric(data[Column.LATITUDE.value], errors="coerce").to_numpy(),
+                                          pd.to_numeric(data[Column.LONGITUDE.value], errors="coerce").to_numpy(),
+                                          self._zones)
+        self.check_cancelled()
+        self.report_progress(1, steps)
+
+        trips = self._get_trips(data[zones >= 0], zones[zones >= 0])
+        self.check_cancelled()
+        self.report_progress(2, steps)
+
+        data_df = self._to_matrix(trips)
+        self.report_progress(steps, steps)
+        return AnalysisDataRecord(
+            DataRecord(self._name, tuple(data_df.columns), data_df),
+            self._view_id
+        )
+
+    @classmethod
+    def _get_trips(cls, data: pd.DataFrame, zones) -> pd.DataFrame:
+        """
+        Finds the origin, the destination and the travel time of every trajectory that was in a zone.
+        :param data: the points that lie in a zone
+        :param zones: the zone of every point
+        :return: the trips indexed by their trajectories
+        """
+        points = pd.DataFrame({
+            Column.TRAJECTORY_ID.value: data[Column.TRAJECTORY_ID.value].to_numpy(),
+            "zone": zones,
+            "time": pd.to_datetime(data[Column.DATE.value] + ' ' + data[Column.TIME.value],
+                                   format='%d.%m.%Y %H:%M:%S').to_numpy()})
+        points = points.sort_values([Column.TRAJECTORY_ID.value, "time"], kind="mergesort")
+
+        # a visit are the consecutive points of a trajectory in the same zone
+        trajectory_ids = points[Column.TRAJECTORY_ID.value]
+        visits = ((trajectory_ids != trajectory_ids.shift()) | (points["zone"] != points["zone"].shift())).cumsum()
+        visits = points.groupby(visits).agg(trajectory=(Column.TRAJECTORY_ID.value, "first"),
+                                            zone=("zone", "first"),
+                                            arrival=("time", "first"),
+                                            departure=("time", "last"))
+
+        trips = visits.groupby("trajectory").agg(origin=("zone", "first"),
+                                                 destination=("zone", "last"),
+                                                 departure=("departure", "first"),
+                                                 arrival=("arrival", "last"),
+                                                 visits=("zone", "size"))
+        # a trajectory that never left its zone has no travel time
+        trips["travel_time"] = (trips["arrival"] - trips["departure"]).dt.total_seconds() \
+            .where(trips["visits"] > 1)
+        return trips
+
+    def _to_matrix(self, trips: pd.DataFrame) -> pd.DataFrame:
+        """
+        Counts the trips and averages their travel times for every pair of zones.
+        :param trips: the trips of the trajectories
+        :return: the matrix with a row for every origin and two columns for every destination
+        """
+        names = self._get_zone_names()
+        pairs = trips.groupby(["origin", "destination"])["travel_time"]
+        full_index = pd.MultiIndex.from_product([range(len(names)), range(len(names))])
+        counts = pairs.size().reindex(full_index, fill_value=0).unstack()
+        travel_times = pairs.mean().reindex(full_index).unstack()
+
+        data_df = pd.DataFrame({self.ORIGIN_COLUMN: names})
+        for position, name in enumerate(names):
+            data_df[name + self.TRIPS_SUFFIX] = counts[position].to_numpy()
+            data_df[name + self.TRAVEL_TIME_SUFFIX] = self._format_durations(travel_times[position].to_numpy())
+        return data_df
+
+    @classmethod
+    def _format_durations(cls, seconds) -> pd.Series:
+        """
+        Formats durations as hours, minutes and seconds. A trip may take longer than a day, so the hours are not
+        wrapped at 24 like the time of a day.
+        :param seconds: the durations in seconds, missing durations stay missing
+        :return: the formatted durations
+        """
+        durations = pd.Series(seconds, dtype="float64")
+        formatted = np.floor(durations.dropna()).astype("int64") \
+            .map(lambda total: f"{total // 3600:02d}:{total // 60 % 60:02d}:{total % 60:02d}")
+        return formatted.reindex(durations.index)
+
+    def _get_zone_names(self) -> List[str]:
+        """
+        :return: the names of the zones, names that occur several times are numbered
+        """
+        names = [zone.name for zone in self._zones]
+        return [name if names.count(name) == 1 else f"{name} ({names[:position].count(name) + 1})"
+                for position, name in enumerate(names)]
+
+
+CONSTRUCTOR = OriginDestinationAnalysis
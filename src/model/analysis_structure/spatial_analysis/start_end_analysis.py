@@ -4,51 +4,18 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 from pandas import Series
-from shapely.geometry import Point
-from shapely.geometry import Polygon
 
 from src.data_transfer.content import Column
 from src.data_transfer.record import AnalysisRecord
-from src.data_transfer.record import PolygonRecord
 from src.data_transfer.record.selection_record import SelectionRecord
 from src.data_transfer.record.setting_record import SettingRecord
 from src.data_transfer.selection.discrete_option import DiscreteOption
 from src.model.analysis_structure.Analysis import Analysis
 from src.model.analysis_structure.spatial_analysis.polygon_consumer_analysis import PolygonFacadeConsumer
 from src.model.polygon_structure.ipolygon_structure import IPolygonStructure
-
-
-def point_in_polygon(lat: float, long: float, polygon_record: PolygonRecord):
-    """
-    Checks if a given point is inside a polygon. It does not account for the curvature of the earth.
-    :param lat: the latitude as a float of the point
-    :param long: the longitude of the point
-    :param polygon_record: the polygon that might contain the point
-    :return: True if the point is the record and false
-    """
-    polygon = Polygon([Point(corner.to_tuple()) for corner in polygon_record.corners])
-    return polygon.contains(Point(lat, long))
-
-
-def get_distance(row: Series):
-    """
-    Calculates the distance between two coordinates in vectorized form.
-    :param row: The Series of a group derived from the trajectory id group.
-    :return: The data containing the distances
-    """
-    radius_earth = 6378160.0
-    lat1 = np.radians(row[Column.LATITUDE.value])
-    long1 = np.radians(row[Column.LONGITUDE.value])
-    lat2 = np.radians(row[Column.LATITUDE.value].shift())
-    long2 = np.radians(row[Column.LONGITUDE.value].shift())
-
-    longitude_difference = np.abs(long2 - long1)
-    latitude_difference = np.abs(lat2 - lat1)
-
-    a = np.sin(latitude_difference / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(longitude_difference / 2.0) ** 2
-    distance = radius_earth * 2 * np.arcsin(np.sqrt(a))
-
-    return distance
+from src.model.polygon_structure.polygon_geometry import points_in_polygon
+from src.model.trajectory_kinematics import get_distances
+from src.model.trajectory_kinematics import trajectory_starts
 
 
 class StartEndAnalysis(Analysis, PolygonFacadeConsumer, ABC):
@@ -144,38 +111,50 @@ class StartEndAnalysis(Analysis, PolygonFacadeConsumer, ABC):
 
     def _get_distance_time(self, data: pd.DataFrame) -> pd.DataFrame:
         """
-        Analyzes the data by calculating time taken for a given distance.
+        Analyzes the data by calculating time taken for a given distance. The trajectories are processed all at once,
+        so the progress is reported after each of the steps and the analysis can be cancelled between them.
         :param data: data to be analyzed
         :return: result of the analysis as an pandas Dataframe
         """
 
         ns_to_seconds = 1000000000
+        steps = 4
+        self.report_progress(0, steps)
         data_df = data[self._columns]
         # Create the polygon_id data containing the order in which the polygons were passed through.
         polygon_calculator = self.PolygonCalculator(self._start_polygon, self._end_polygon)
-        data_df['polygon_id'] = data_df.apply(polygon_calculator.get_polygon_row, axis=1)
+        data_df['polygon_id'] = polygon_calculator.get_polygon_ids(data_df)
         data_df['polygon_id'] = data_df.groupby(Column.TRAJECTORY_ID.value)['polygon_id'].diff().fillna(0)
+        self.check_cancelled()
+        self.report_progress(1, steps)
 
         # Calculates the time delta between points on a trajectory.
         data_df['time'] = pd.to_datetime(data_df[Column.DATE.value] + ' ' + data_df[Column.TIME.value],
                                          format='%d.%m.%Y %H:%M:%S')
         data_df['time'] = pd.to_numeric(data_df['time'] - data_df.groupby(Column.TRAJECTORY_ID.value)['time']
                                         .transform('first')) / ns_to_seconds
+        self.check_cancelled()
+        self.report_progress(2, steps)
 
         # Calculates the distance between two points in the data and rounds it to two decimal places.
-        data_df['distance'] = data_df.groupby(Column.TRAJECTORY_ID.value).apply(get_distance).reset_index().iloc[:, -1:]
+        data_df['distance'] = get_distances(data_df[Column.LATITUDE.value], data_df[Column.LONGITUDE.value],
+                                            trajectory_starts(data_df[Column.TRAJECTORY_ID.value]))
         data_df['distance'] = data_df.groupby(Column.TRAJECTORY_ID.value)['distance'].cumsum().fillna(0).round(2)
+        self.check_cancelled()
+        self.report_progress(3, steps)
 
         # filter out all the trajectories which do not go from the start to the end polygon.
         data_df = data_df.groupby(Column.TRAJECTORY_ID.value).filter(lambda x: 1 in x['polygon_id'].unique()) \
             .reset_index()
+        self.report_progress(steps, steps)
 
         return data_df
 
     class PolygonCalculator:
         """
         A class responsible for calculating which of the given start and end polygon a point is in. If a point is in
-        no polygon the last polygon is given.
+        no polygon the last polygon of its trajectory is given. The points are tested all at once and the last polygon
+        is carried forward with a groupby over the consecutive rows of a trajectory.
         """
 
         def __init__(self, start_polygon, end_polygon):
@@ -184,24 +163,23 @@ class StartEndAnalysis(Analysis, PolygonFacadeConsumer, ABC):
             :param start_polygon: the start polygon
             :param end_polygon: the end polygon.
             """
-            self.last_trajectory = 0
-            self.last_polygon = 0
             self._start_polygon = start_polygon
             self._end_polygon = end_polygon
 
-        def get_polygon_row(self, row: Series) -> int:
+        def get_polygon_ids(self, data: pd.DataFrame) -> Series:
             """
-            The method that calculates the polygon.
-            :param row: A data of a dataframe as a series.
-            :return: The polygon in which the point lies or the last set polygon.
+            The method that calculates the polygon of every datapoint.
+            :param data: The datapoints in the order of their trajectories.
+            :return: For every datapoint the polygon in which it lies or the last polygon its trajectory was in, 1 for
+                     the start polygon, 2 for the end polygon and 0 if the trajectory was not in a polygon yet.
             """
-            long: float = row[Column.LONGITUDE.value]
-            lat: float = row[Column.LATITUDE.value]
-            if row[Column.TRAJECTORY_ID.value] != self.last_trajectory:
-                self.last_trajectory = row[Column.TRAJECTORY_ID.value]
-                self.last_polygon = 0
-            for polygon_id, polygon in enumerate([self._start_polygon, self._end_polygon]):
-                if point_in_polygon(lat, long, polygon):
-                    self.last_polygon = polygon_id + 1
-                    return polygon_id + 1
-            return self.last_polygon
+            latitudes = pd.to_numeric(data[Column.LATITUDE.value], errors="coerce").to_numpy()
+            longitudes = pd.to_numeric(data[Column.LONGITUDE.value], errors="coerce").to_numpy()
+            # the start polygon is checked first, so it wins if both polygons contain the point
+            polygon_ids = np.where(points_in_polygon(latitudes, longitudes, self._start_polygon), 1.0,
+                                   np.where(points_in_polygon(latitudes, longitudes, self._end_polygon), 2.0, np.nan))
+
+            # a new run starts whenever the trajectory id differs from the previous datapoint
+            trajectory_ids = data[Column.TRAJECTORY_ID.value]
+            runs = (trajectory_ids != trajectory_ids.shift()).cumsum()
+            return pd.Series(polygon_ids, index=data.index).groupby(runs).ffill().fillna(0).astype(int)
@@ -1,6 +1,7 @@
 """
 filter_component.py File contains FilterComponent class.
 """
+from itertools import count
 from typing import List
 from typing import TYPE_CHECKING
 
@@ -13,6 +14,9 @@ from abc import ABC, abstractmethod
 from typing import Optional
 from uuid import UUID
 
+# all filter components draw their versions from one counter, so a new version is larger than every existing one
+_VERSIONS = count(1)
+
 
 class FilterComponent(ABC):
     """
@@ -24,6 +28,21 @@ class FilterComponent(ABC):
         self._negated: bool = negated
         self._enabled: bool = enabled
         self._name: str = name
+        self._version: int = next(_VERSIONS)
+
+    def _bump_version(self):
+        """
+        marks the component as changed by giving it a new version
+        """
+        self._version = next(_VERSIONS)
+
+    def get_version(self) -> int:
+        """
+        gets the structural version of the filter component. The version increases whenever the component or one of
+        its children is changed, added or deleted, so an unchanged version means an unchanged sql request.
+        :return: the version
+        """
+        return self._version
 
     def add(self, component: 'FilterComponent', group_id: UUID) -> bool:
         """
@@ -100,3 +119,4 @@ class FilterComponent(ABC):
         @param filters: the filters which are changed
         """
         self._enabled = enabled
+        self._bump_version()
@@ -76,6 +76,7 @@ class FilterGroup(FilterComponent):
         for filter_component in self._filters:
             if filter_component.get_id() == filter_component_id:
                 self._filters.remove(filter_component)
+                self._bump_version()
                 return self.get_id()
 
         for filter_component in self._filters:
@@ -114,6 +115,7 @@ class FilterGroup(FilterComponent):
             return False
         else:
             self._filters.append(component)
+            self._bump_version()
             return True
 
     def is_polygon_in_use(self, polygon_id: UUID) -> bool:
@@ -137,10 +139,18 @@ class FilterGroup(FilterComponent):
         self._logical_operator = LogicalOperator[group.operator]
         self._name = group.name
         self._negated = group.negated
+        self._bump_version()
         self.change_enabled(group.enabled, filters, filter_goups)
         if not (self._id in filter_goups):
             filter_goups.append(self._id)
 
+    def get_version(self) -> int:
+        """
+        gets the structural version of the group, which is the newest version of itself and all its children
+        :return: the version
+        """
+        return max([self._version] + [filter_component.get_version() for filter_component in self._filters])
+
     def to_record(self, structure_name: str) -> FilterGroupRecord:
         """
         converts itself to a record
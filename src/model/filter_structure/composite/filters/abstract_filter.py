@@ -59,6 +59,7 @@ class Filter(FilterComponent, ABC):
         self._enabled: bool = filter_record.enabled
         self._negated: bool = filter_record.negated
         self._filter_type: str = filter_record.type
+        self._bump_version()
         return True
 
     def check_and_set_column(self, filter_record: FilterRecord) -> bool:
@@ -22,6 +22,7 @@ class PolygonFilter(Filter):
     represents a transit filters
     """
     FILTERTYPE = "polygon filter"
+    POLYGON_CONTEXT = "Polygons for Polygon Filter"
 
     def __init__(self, filter_id: UUID, name: str, polygon_structure: IPolygonStructure = None,
                  polygon_ids: List[UUID] = None):
@@ -125,7 +126,7 @@ class PolygonFilter(Filter):
         )
 
         polygon_setting = SettingRecord(
-            _context="Polygons for Polygon Filter",
+            _context=self.POLYGON_CONTEXT,
             _selection=polygon_selection,
             _identifier=SettingsEnum.POLYGON
         )
@@ -0,0 +1,21 @@
+"""
+sequence_filter.py contains SequenceFilter class.
+"""
+
+from src.model.filter_structure.composite.filters.polygon_filter import PolygonFilter
+from src.model.filter_structure.filter_visitor import IVisitor
+
+
+class SequenceFilter(PolygonFilter):
+    """
+    represents a sequence filter, which selects the trajectories that pass the polygons in the selected order
+    """
+    FILTERTYPE = "sequence filter"
+    POLYGON_CONTEXT = "Polygons for Sequence Filter in the order of passing"
+
+    def _accept_visitor(self, v: IVisitor) -> None:
+        """
+        accepts a visitor
+        :param v: the visitor
+        """
+        v.visit_sequence_filter(self)
@@ -10,9 +10,11 @@ from src.data_transfer.record.filter_group_record import FilterGroupRecord
 from src.data_transfer.record.filter_record import FilterRecord
 from src.model.filter_structure.composite.filter_group import FilterGroup
 from src.model.filter_structure.composite.filters.abstract_filter import Filter
+from src.model.filter_structure.composite.filters.aggregate_filter import AggregateFilter
 from src.model.filter_structure.composite.filters.discrete_filter import DiscreteFilter
 from src.model.filter_structure.composite.filters.interval_filter import IntervalFilter
 from src.model.filter_structure.composite.filters.polygon_filter import PolygonFilter
+from src.model.filter_structure.composite.filters.sequence_filter import SequenceFilter
 from src.model.polygon_structure.ipolygon_structure import IPolygonStructure
 
 
@@ -22,7 +24,9 @@ class FilterFactory:
     """
     FILTER_TYPES = {'discrete filter': DiscreteFilter,
                     'interval filter': IntervalFilter,
-                    'polygon filter': PolygonFilter}
+                    'polygon filter': PolygonFilter,
+                    'aggregate filter': AggregateFilter,
+                    'sequence filter': SequenceFilter}
     _STANDARD_NAME = 'filter'
 
     def __init__(self, polygon_structure: IPolygonStructure):
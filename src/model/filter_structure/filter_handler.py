@@ -124,6 +124,14 @@ class FilterHandler:
         """
         return self._root_group.is_polygon_in_use(uuid)
 
+    def get_version(self) -> int:
+        """
+        gets the structural version of the filter structure, which changes whenever a filter component is changed,
+        added or deleted
+        :return: the version of the root group
+        """
+        return self._root_group.get_version()
+
     def get_root_id(self) -> UUID:
         """
         gets the id of the root group
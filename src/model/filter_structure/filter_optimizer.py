@@ -0,0 +1,219 @@
+"""
+filter_optimizer.py contains FilterOptimizer class.
+"""
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from src.data_transfer.content.logical_operator import LogicalOperator
+from src.model.filter_structure.predicate import ConstantPredicate
+from src.model.filter_structure.predicate import ExistsAllPredicate
+from src.model.filter_structure.predicate import ExistsPredicate
+from src.model.filter_structure.predicate import GroupPredicate
+from src.model.filter_structure.predicate import InPredicate
+from src.model.filter_structure.predicate import IntervalPredicate
+from src.model.filter_structure.predicate import NotPredicate
+from src.model.filter_structure.predicate import Predicate
+
+TRUE = ConstantPredicate(True)
+FALSE = ConstantPredicate(False)
+
+
+class FilterOptimizer:
+    """
+    Simplifies the predicate tree of a filter structure before it is converted to sql. The optimizer flattens nested
+    groups, merges intervals and discrete selections of the same column, merges the subqueries of trajectory filters,
+    folds contradictions and constants and orders the predicates of a group by their estimated selectivity.
+
+    The optimized predicate selects the same rows in a WHERE clause. Inside negations, where NULL and false differ,
+    only transformations that keep the three-valued result are used.
+    """
+
+    def optimize(self, predicate: Predicate) -> Predicate:
+        """
+        optimizes the given predicate tree
+        :param predicate: the predicate tree of a filter structure
+        :return: the optimized predicate tree
+        """
+        return self._optimize(predicate, True)
+
+    def _optimize(self, predicate: Predicate, in_where: bool) -> Predicate:
+        """
+        optimizes a node of the predicate tree
+        :param predicate: the node
+        :param in_where: whether the node is only used as a condition, so NULL can be treated like false
+        :return: the optimized node
+        """
+        if isinstance(predicate, NotPredicate):
+            return self._optimize_not(predicate)
+        if isinstance(predicate, ExistsPredicate):
+            return self._optimize_exists(predicate)
+        if isinstance(predicate, GroupPredicate):
+            return self._optimize_group(predicate, in_where)
+        if isinstance(predicate, InPredicate) and len(predicate.values) == 0:
+            return FALSE
+        return predicate
+
+    def _optimize_not(self, predicate: NotPredicate) -> Predicate:
+        child = self._optimize(predicate.child, False)
+        if isinstance(child, ConstantPredicate):
+            return ConstantPredicate(not child.value)
+        if isinstance(child, NotPredicate):
+            return child.child
+        return NotPredicate(child)
+
+    def _optimize_exists(self, predicate: ExistsPredicate) -> Predicate:
+        # the condition of a subquery is a WHERE clause and EXISTS is never NULL
+        condition = self._optimize(predicate.condition, True)
+        if isinstance(condition, ConstantPredicate):
+            # every trajectory contains at least one datapoint
+            return condition
+        return ExistsPredicate(condition)
+
+    def _optimize_group(self, predicate: GroupPredicate, in_where: bool) -> Predicate:
+        operator = predicate.operator
+        is_and = operator == LogicalOperator.AND
+        children = self._flatten(operator, [self._optimize(child, in_where) for child in predicate.children])
+
+        # constants
+        absorbing = FALSE if is_and else TRUE
+        if absorbing in children:
+            return absorbing
+        children = [child for child in children if not isinstance(child, ConstantPredicate)]
+
+        children = self._merge_intervals(operator, children, in_where)
+        children = self._merge_selections(operator, children, in_where)
+        children = self._merge_exists(operator, children)
+        if absorbing in children:
+            return absorbing
+
+        # a predicate and its negation can not be fulfilled at the same time
+        if is_and and in_where and any(NotPredicate(child) in children for child in children):
+            return FALSE
+
+        children = list(dict.fromkeys(children))
+        children.sort(key=lambda child: child.selectivity(), reverse=not is_and)
+
+        if len(children) == 0:
+            return TRUE if is_and else FALSE
+        if len(children) == 1:
+            return children[0]
+        return GroupPredicate(operator, tuple(children))
+
+    def _flatten(self, operator: LogicalOperator, children: List[Predicate]) -> List[Predicate]:
+        """
+        replaces child groups with the same operator by their children
+        """
+        flat_children = []
+        for child in children:
+            if isinstance(child, GroupPredicate) and child.operator == operator:
+                flat_children.extend(child.children)
+            else:
+                flat_children.append(child)
+        return flat_children
+
+    def _merge_intervals(self, operator: LogicalOperator, children: List[Predicate],
+                         in_where: bool) -> List[Predicate]:
+        """
+        intersects the numeric intervals of the same column in a conjunction and unites the overlapping ones in a
+        disjunction
+        """
+        intervals: Dict[str, List[Tuple[float, float, IntervalPredicate]]] = {}
+        for child in children:
+            if isinstance(child, IntervalPredicate) and child.numeric_bounds() is not None:
+                intervals.setdefault(child.column, []).append((*child.numeric_bounds(), child))
+
+        merged: Dict[str, List[Predicate]] = {}
+        for column, column_intervals in intervals.items():
+            if len(column_intervals) < 2:
+                continue
+            if operator == LogicalOperator.AND:
+                start = max(column_intervals, key=lambda interval: interval[0])
+                end = min(column_intervals, key=lambda interval: interval[1])
+                if start[0] <= end[1]:
+                    merged[column] = [IntervalPredicate(column, start[2].start, end[2].end)]
+                elif in_where:
+                    merged[column] = [FALSE]
+            else:
+                merged[column] = self._unite_intervals(column, column_intervals)
+
+        sources = {column: [interval for _, _, interval in column_intervals]
+                   for column, column_intervals in intervals.items()}
+        return self._replace_merged(children, sources, merged)
+
+    def _unite_intervals(self, column: str,
+                         intervals: List[Tuple[float, float, IntervalPredicate]]) -> List[Predicate]:
+        united: List[Tuple[float, float, str, str]] = []
+        for start, end, interval in sorted(intervals, key=lambda interval: interval[0]):
+            if len(united) != 0 and start <= united[-1][1]:
+                last = united[-1]
+                if end > last[1]:
+                    united[-1] = (last[0], end, last[2], interval.end)
+            else:
+                united.append((start, end, interval.start, interval.end))
+        return [IntervalPredicate(column, start, end) for _, _, start, end in united]
+
+    def _merge_selections(self, operator: LogicalOperator, children: List[Predicate],
+                          in_where: bool) -> List[Predicate]:
+        """
+        unites the discrete selections of the same column in a disjunction, which also folds ORed equalities into one
+        IN, and intersects them in a conjunction
+        """
+        selections: Dict[str, List[InPredicate]] = {}
+        for child in children:
+            if isinstance(child, InPredicate):
+                selections.setdefault(child.column, []).append(child)
+
+        merged: Dict[str, List[Predicate]] = {}
+        for column, column_selections in selections.items():
+            if len(column_selections) < 2:
+                continue
+            if operator == LogicalOperator.OR:
+                values = dict.fromkeys(value for selection in column_selections for value in selection.values)
+                merged[column] = [InPredicate(column, tuple(values))]
+                continue
+            values = [value for value in column_selections[0].values
+                      if all(value in selection.values for selection in column_selections[1:])]
+            if len(values) != 0:
+                merged[column] = [InPredicate(column, tuple(values))]
+            elif in_where:
+                merged[column] = [FALSE]
+
+        return self._replace_merged(children, selections, merged)
+
+    def _replace_merged(self, children: List[Predicate], sources: Dict[str, List[Predicate]],
+                        merged: Dict[str, List[Predicate]]) -> List[Predicate]:
+        """
+        replaces the source predicates of every merged column by the merged predicates
+        """
+        source_columns = {source: column for column in merged for source in sources[column]}
+        new_children = []
+        replaced = set()
+        for child in children:
+            column: Optional[str] = source_columns.get(child)
+            if column is None:
+                new_children.append(child)
+            elif column not in replaced:
+                new_children.extend(merged[column])
+                replaced.add(column)
+        return new_children
+
+    def _merge_exists(self, operator: LogicalOperator, children: List[Predicate]) -> List[Predicate]:
+        """
+        merges the subqueries of trajectory filters, so the datapoints of a trajectory are only searched once
+        """
+        exists = [child for child in children if isinstance(child, ExistsPredicate)]
+        if len(exists) < 2:
+            return children
+
+        others = [child for child in children if not isinstance(child, ExistsPredicate)]
+        conditions = tuple(child.condition for child in exists)
+        if operator == LogicalOperator.OR:
+            # a trajectory contains a datapoint for one of the conditions if it contains one for their disjunction
+            merged = self._optimize_exists(ExistsPredicate(GroupPredicate(LogicalOperator.OR, conditions)))
+        elif len(set(conditions)) == 1:
+            merged = exists[0]
+        else:
+            merged = ExistsAllPredicate(tuple(dict.fromkeys(conditions)))
+        return others + [merged]
@@ -16,8 +16,12 @@ from src.data_transfer.record import FilterRecord
 from src.model.error_handler import ErrorHandler
 from src.model.filter_structure.filter_factory import FilterFactory
 from src.model.filter_structure.filter_handler import FilterHandler
+from src.model.filter_structure.filter_optimizer import FilterOptimizer
+from src.model.filter_structure.filter_visitor import IVisitor
 from src.model.filter_structure.ifilter_structure import IFilterStructure
 from src.model.filter_structure.point_filter_visitor import PointFilterVisitor
+from src.model.filter_structure.predicate import ConstantPredicate
+from src.model.filter_structure.predicate import Predicate
 from src.model.filter_structure.trajectory_filter_visitor import TrajectoryFilterVisitor
 from src.model.polygon_structure.ipolygon_structure import IPolygonStructure
 
@@ -32,6 +36,7 @@ class FilterStructure(IFilterStructure, ErrorHandler):
     def __init__(self, polygon_structure: IPolygonStructure):
         super().__init__()
         self._factory = FilterFactory(polygon_structure)
+        self._optimizer = FilterOptimizer()
         handlers = [FilterHandlerNames.POINT_FILTER_HANDLER, FilterHandlerNames.TRAJECTORY_FILTER_HANDLER]
         self._filter_handlers: Dict[str, FilterHandler] = {}
 
@@ -51,6 +56,9 @@ class FilterStructure(IFilterStructure, ErrorHandler):
 
         self._added_filter_components: List[Tuple[UUID, str]] = list()
         self._deleted_filter_components: List[Tuple[UUID, str]] = list()
+        # the last compiled predicate and sql request of every filter handler together with the version they were
+        # compiled from
+        self._compiled_requests: Dict[str, Tuple[int, Optional[Predicate], str]] = {}
 
     def _get_filter_handler_by_uuid(self, filter_component: UUID) -> Optional[FilterHandler]:
         for filter_handler in self._filter_handlers.values():
@@ -90,23 +98,132 @@ class FilterStructure(IFilterStructure, ErrorHandler):
 
         return found_filter_group.to_record(filter_handler.name)
 
+    def _compile(self, handler_name: str, visitor: IVisitor) -> Tuple[int, Optional[Predicate], str]:
+        """
+        gets the optimized predicate and sql request of the filter handler with the given name. They are only
+        compiled with the visitor if the filter handler changed since the last compilation.
+        :param handler_name: the name of the filter handler
+        :param visitor: the visitor that compiles the predicate
+        :return: the version, the predicate or None if there is no filter and the sql request
+        """
+        filter_handler = self._filter_handlers[handler_name]
+        version = filter_handler.get_version()
+        compiled_request = self._compiled_requests.get(handler_name)
+        if compiled_request is not None and compiled_request[0] == version:
+            return compiled_request
+
+        predicate = self._build_predicate(handler_name, visitor)
+        sql_request = "" if predicate is None else predicate.to_sql()
+        self._compiled_requests[handler_name] = (version, predicate, sql_request)
+        return self._compiled_requests[handler_name]
+
+    def _build_predicate(self, handler_name: str, visitor: IVisitor) -> Optional[Predicate]:
+        """
+        builds the optimized predicate of the filter handler with the given name with the visitor
+        :param handler_name: the name of the filter handler
+        :param visitor: the visitor that builds the predicate
+        :return: the predicate or None if there is no filter
+        """
+        self._filter_handlers[handler_name].accept_visitor(visitor)
+        predicate = visitor.get_predicate()
+        if predicate is None:
+            return None
+        predicate = self._optimizer.optimize(predicate)
+        # a filter that every datapoint fulfills is the same as no filter
+        if predicate == ConstantPredicate(True):
+            return None
+        return predicate
+
+    def _build_predicates(self) -> Tuple[Optional[Predicate], Optional[Predicate]]:
+        return (self._build_predicate('point filters', PointFilterVisitor()),
+                self._build_predicate('trajectory filters', TrajectoryFilterVisitor()))
+
+    def get_preview_predicates(self, parameters: FilterRecord, parent_id: Optional[UUID] = None,
+                               filter_id: Optional[UUID] = None) \
+            -> Optional[Tuple[Optional[Predicate], Optional[Predicate]]]:
+        """
+        gets the predicates the filter structure would have if the filter was added to the group with the parent
+        id or if the filter with the filter id was changed to the parameters. The filter structure is only changed
+        while the predicates are built and the compiled requests are not touched.
+        :param parameters: the parameters of the previewed filter
+        :param parent_id: the id of the group the filter would be added to
+        :param filter_id: the id of the filter that would be changed, if the filter is not added
+        :return: the point and the trajectory predicate, which are None if there is no filter
+        """
+        if filter_id is not None:
+            filter_handler = self._get_filter_handler_by_uuid(filter_id)
+            previewed_filter = None if filter_handler is None else filter_handler.get_filter(filter_id)
+            if previewed_filter is None:
+                self.throw_error(ErrorMessage.FILTER_NOT_EXISTING)
+                return None
+
+            old_parameters = previewed_filter.to_record(filter_handler.name)
+            try:
+                previewed_filter.change(parameters)
+                return self._build_predicates()
+            finally:
+                previewed_filter.change(old_parameters)
+
+        filter_handler = self._filter_handlers.get(parameters.structure_name)
+        if filter_handler is None or parent_id is None:
+            self.throw_error(ErrorMessage.INVALID_NAME)
+            return None
+
+        new_filter = self._factory.create_filter(parameters)
+        if not filter_handler.add(new_filter, parent_id):
+            self.throw_error(ErrorMessage.FILTER_NOT_ADDED)
+            return None
+        try:
+            new_filter.change(parameters)
+            return self._build_predicates()
+        finally:
+            filter_handler.undo_add(new_filter.get_id())
+
+    def _get_sql_request(self, handler_name: str, visitor: IVisitor) -> str:
+        return self._compile(handler_name, visitor)[2]
+
     def get_point_sql_request(self) -> str:
         """
         gets the sql request of the filter and filter groups of the point filter handler
         :return: the sql request
         """
-        visitor = PointFilterVisitor()
-        self._filter_handlers['point filters'].accept_visitor(visitor)
-        return visitor.get_sql_request()
+        return self._get_sql_request('point filters', PointFilterVisitor())
 
     def get_trajectory_sql_request(self) -> str:
         """
         gets the sql request of the filter and filter groups of the trajectory filter handler
         :return: the sql request
         """
-        visitor = TrajectoryFilterVisitor()
-        self._filter_handlers['trajectory filters'].accept_visitor(visitor)
-        return visitor.get_sql_request()
+        return self._get_sql_request('trajectory filters', TrajectoryFilterVisitor())
+
+    def get_point_predicate(self) -> Optional[Predicate]:
+        """
+        gets the optimized predicate tree of the point filter handler, which the point sql request is generated from
+        :return: the predicate tree or None if there is no filter
+        """
+        return self._compile('point filters', PointFilterVisitor())[1]
+
+    def get_trajectory_predicate(self) -> Optional[Predicate]:
+        """
+        gets the optimized predicate tree of the trajectory filter handler, which the trajectory sql request is
+        generated from
+        :return: the predicate tree or None if there is no filter
+        """
+        return self._compile('trajectory filters', TrajectoryFilterVisitor())[1]
+
+    def get_point_filter_version(self) -> int:
+        """
+        gets the structural version of the point filter handler
+        :return: the version
+        """
+        return self._filter_handlers['point filters'].get_version()
+
+    def get_trajectory_filter_version(self) -> int:
+        """
+        gets the structural version of the trajectory filter handler
+        :return: the version
+        """
+        return self._filter_handlers['trajectory filters'].get_version()
 
     def get_filter_types(self) -> List[str]:
         """
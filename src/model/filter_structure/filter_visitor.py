@@ -2,13 +2,24 @@
 filter_visitor.py contains IVisitor class.
 """
 from typing import List
+from typing import Optional
 from typing import TYPE_CHECKING
 
 from src.data_transfer.content import Column
+from src.model.filter_structure.predicate import AggregatePredicate
+from src.model.filter_structure.predicate import GroupPredicate
+from src.model.filter_structure.predicate import InPredicate
+from src.model.filter_structure.predicate import IntervalPredicate
+from src.model.filter_structure.predicate import NotPredicate
+from src.model.filter_structure.predicate import PolygonPredicate
+from src.model.filter_structure.predicate import Predicate
+from src.model.filter_structure.predicate import SequencePredicate
 
 if TYPE_CHECKING:
+    from src.model.filter_structure.composite.filters.aggregate_filter import AggregateFilter
     from src.model.filter_structure.composite.filters.interval_filter import IntervalFilter
     from src.model.filter_structure.composite.filters.polygon_filter import PolygonFilter
+    from src.model.filter_structure.composite.filters.sequence_filter import SequenceFilter
     from src.model.filter_structure.composite.filters.discrete_filter import DiscreteFilter
 
 from abc import ABC, abstractmethod
@@ -20,16 +31,17 @@ from src.data_transfer.record import PolygonRecord
 class IVisitor(ABC):
     """
     This interface represents an interface to iterate through a filters structure, according to the Visitor Pattern.
+    While visiting, it builds the predicate tree of the filter structure.
     """
-    INTERVAL_FILTER = '({column} between {start} and {end})'
-    POLYGON_FILTER = 'ST_Contains(ST_MakePolygon(ST_GeomFromText(\'LINESTRING({positions})\')), ST_POINT(latitude, longitude))'
-    DISCRETE_FILTER = '({column} in ({selection}))'
+    INTERVAL_FILTER = IntervalPredicate.SQL
+    POLYGON_FILTER = PolygonPredicate.SQL
+    DISCRETE_FILTER = InPredicate.SQL
     KOMMA_SEPERATOR = ', '
 
     def __init__(self):
         self._groups: list[tuple[LogicalOperator, bool]] = []
-        self._filters: list[list[str]] = []
-        self._current_filters: list[str] = []
+        self._filters: list[list[Predicate]] = []
+        self._current_filters: list[Predicate] = []
 
     @abstractmethod
     def visit_interval_filter(self, interval_filter: 'IntervalFilter') -> None:
@@ -55,6 +67,27 @@ class IVisitor(ABC):
         """
         pass
 
+    def visit_aggregate_filter(self, aggregate_filter: 'AggregateFilter') -> None:
+        """
+        visits an AggregateFilter. The filter selects whole trajectories, so it is the same for both visitors.
+        :param aggregate_filter:  the aggregate filter to visit
+        """
+        self._current_filters.append(self._negate_filter(
+            AggregatePredicate(aggregate_filter.metric, aggregate_filter.start, aggregate_filter.end),
+            aggregate_filter._negated
+        ))
+
+    def visit_sequence_filter(self, sequence_filter: 'SequenceFilter') -> None:
+        """
+        visits a SequenceFilter. The filter selects whole trajectories, so it is the same for both visitors.
+        :param sequence_filter:  the sequence filter to visit
+        """
+        polygons = sequence_filter.polygons
+        if len(polygons) == 0:
+            return
+        self._current_filters.append(self._negate_filter(SequencePredicate(tuple(polygons)),
+                                                         sequence_filter._negated))
+
     def start_group(self, operator: 'LogicalOperator', negated: bool) -> None:
         """
         enters a group with the given operator
@@ -72,7 +105,7 @@ class IVisitor(ABC):
         operator, negated = self._groups.pop()
 
         if len(self._current_filters) != 0:
-            new_filter = operator.join_requests(self._current_filters)
+            new_filter = GroupPredicate(operator, tuple(self._current_filters))
             new_filter = self._negate_filter(new_filter, negated)
 
             self._current_filters = self._filters.pop()
@@ -85,39 +118,36 @@ class IVisitor(ABC):
         returns the sql-request, created while visiting the filters structure
         :return: the created sql-request
         """
-        if len(self._current_filters) == 0:
+        predicate = self.get_predicate()
+        if predicate is None:
             return ""
+        return predicate.to_sql()
+
+    def get_predicate(self) -> Optional[Predicate]:
+        """
+        returns the predicate tree, created while visiting the filters structure
+        :return: the predicate tree or None if no filter was visited
+        """
+        if len(self._current_filters) == 0:
+            return None
         return self._current_filters[0]
 
-    def _create_polygons_filter_strs(self, polygons: List[PolygonRecord]) -> List[str]:
-        polygon_filters = []
-        for polygon in polygons:
-            filter_str = self._create_polygon_filter_str(polygon)
-            polygon_filters.append(filter_str)
-        return polygon_filters
-
-    def _create_polygon_filter_str(self, polygon) -> str:
-        corners_strs = []
-        for corner in polygon.corners:
-            corners_strs.append(str(corner))
-        corners_strs.append(str(polygon.corners[0]))
-        positions = self.KOMMA_SEPERATOR.join(corners_strs)
-        filter_str = self.POLYGON_FILTER.format(positions=positions)
-        return filter_str
-
-    def _create_interval_filter_str(self, column: str, start: int, end: int) -> str:
-        return self.INTERVAL_FILTER.format(column=column, start=start, end=end)
-
-    def _create_discrete_filter_str(self, column: str, values: List[str]) -> str:
+    def _create_polygon_predicates(self, polygons: List[PolygonRecord]) -> List[Predicate]:
+        return [PolygonPredicate(polygon) for polygon in polygons]
+
+    def _create_interval_predicate(self, column: str, start: str, end: str) -> Predicate:
+        return IntervalPredicate(column, start, end)
+
+    def _create_discrete_predicate(self, column: str, values: List[str]) -> Predicate:
         value_str = list()
         for value in values:
             if value in Column.list():
                 value_str.append(str(value))
             else:
                 value_str.append("'" + str(value) + "'")
-        return self.DISCRETE_FILTER.format(column=column, selection=self.KOMMA_SEPERATOR.join(value_str))
+        return InPredicate(column, tuple(value_str))
 
-    def _negate_filter(self, filter_str: str, negated: bool) -> str:
+    def _negate_filter(self, predicate: Predicate, negated: bool) -> Predicate:
         if not negated:
-            return filter_str
-        return f"NOT ({filter_str})"
+            return predicate
+        return NotPredicate(predicate)
@@ -6,10 +6,12 @@ from abc import ABC
 from abc import abstractmethod
 from typing import List
 from typing import Optional
+from typing import Tuple
 from uuid import UUID
 
 from src.data_transfer.record import FilterGroupRecord
 from src.data_transfer.record import FilterRecord
+from src.model.filter_structure.predicate import Predicate
 
 
 class IFilterStructure(ABC):
@@ -62,6 +64,54 @@ class IFilterStructure(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_point_predicate(self) -> Optional[Predicate]:
+        """
+        gets the predicate tree of the point filter handler, which the point sql request is generated from
+        :return: the predicate tree or None if there is no filter
+        """
+        pass
+
+    @abstractmethod
+    def get_trajectory_predicate(self) -> Optional[Predicate]:
+        """
+        gets the predicate tree of the trajectory filter handler, which the trajectory sql request is generated from
+        :return: the predicate tree or None if there is no filter
+        """
+        pass
+
+    @abstractmethod
+    def get_preview_predicates(self, parameters: FilterRecord, parent_id: Optional[UUID] = None,
+                               filter_id: Optional[UUID] = None) \
+            -> Optional[Tuple[Optional[Predicate], Optional[Predicate]]]:
+        """
+        gets the predicates the filter structure would have if the filter was added to the group with the parent
+        id or if the filter with the filter id was changed to the parameters, without changing the filter structure
+        :param parameters: the parameters of the previewed filter
+        :param parent_id: the id of the group the filter would be added to
+        :param filter_id: the id of the filter that would be changed, if the filter is not added
+        :return: the point and the trajectory predicate, which are None if there is no filter
+        """
+        pass
+
+    @abstractmethod
+    def get_point_filter_version(self) -> int:
+        """
+        gets the structural version of the point filter handler, which changes whenever one of its filter components
+        is changed, added or deleted
+        :return: the version
+        """
+        pass
+
+    @abstractmethod
+    def get_trajectory_filter_version(self) -> int:
+        """
+        gets the structural version of the trajectory filter handler, which changes whenever one of its filter
+        components is changed, added or deleted
+        :return: the version
+        """
+        pass
+
     @abstractmethod
     def get_filter_types(self) -> List[str]:
         """
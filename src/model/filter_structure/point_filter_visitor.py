@@ -23,7 +23,7 @@ class PointFilterVisitor(IVisitor):
         Visits an interval filter. Adds the fitler string to itself.
         :param interval_filter: the filter to be addet to the filter string.
         """
-        self._current_filters.append(self._create_interval_filter_str(
+        self._current_filters.append(self._create_interval_predicate(
             column=interval_filter.column.value,
             start=interval_filter.start,
             end=interval_filter.end)
@@ -35,8 +35,8 @@ class PointFilterVisitor(IVisitor):
         :param polygon_filter: the polygon filter to visit
         """
         self.start_group(LogicalOperator.AND, False)
-        for polygon_filter in self._create_polygons_filter_strs(polygon_filter.polygons):
-            self._current_filters.append(polygon_filter)
+        for polygon_predicate in self._create_polygon_predicates(polygon_filter.polygons):
+            self._current_filters.append(polygon_predicate)
         self.leave_group()
 
     def visit_discrete_filter(self, discrete_filter: 'DiscreteFilter') -> None:
@@ -44,7 +44,7 @@ class PointFilterVisitor(IVisitor):
 
         :param discrete_filter:
         """
-        self._current_filters.append(self._create_discrete_filter_str(
+        self._current_filters.append(self._create_discrete_predicate(
             column=discrete_filter.column.value,
             values=discrete_filter.selection
         ))
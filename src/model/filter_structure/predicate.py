@@ -0,0 +1,283 @@
+"""
+predicate.py contains the predicate tree the filter visitors build and the filter optimizer works on.
+"""
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+from typing import Tuple
+
+from src.data_transfer.content.logical_operator import LogicalOperator
+from src.data_transfer.content.trajectory_metric import TrajectoryMetric
+from src.data_transfer.record import PolygonRecord
+
+KOMMA_SEPERATOR = ', '
+# estimated share of datapoints a single value of a discrete selection matches
+IN_VALUE_SELECTIVITY = 0.05
+
+
+class Predicate(ABC):
+    """
+    A node of the predicate tree of a filter structure. Every node can be converted to the sql condition it stands for.
+    """
+
+    # estimated share of the rows that fulfill the predicate, used to order the predicates of a group
+    SELECTIVITY: float = 0.5
+
+    @abstractmethod
+    def to_sql(self) -> str:
+        """
+        converts the predicate to a sql condition
+        :return: the sql condition
+        """
+        pass
+
+    def selectivity(self) -> float:
+        """
+        estimates the share of the rows that fulfill the predicate
+        :return: the estimated share between 0 and 1
+        """
+        return self.SELECTIVITY
+
+
+@dataclass(frozen=True)
+class ConstantPredicate(Predicate):
+    """
+    a predicate that is always true or always false
+    """
+
+    value: bool
+
+    def to_sql(self) -> str:
+        return "TRUE" if self.value else "FALSE"
+
+    def selectivity(self) -> float:
+        return 1.0 if self.value else 0.0
+
+
+@dataclass(frozen=True)
+class IntervalPredicate(Predicate):
+    """
+    checks whether the value of a column lies in a closed interval
+    """
+
+    SQL = '({column} between {start} and {end})'
+    SELECTIVITY = 0.25
+
+    column: str
+    start: str
+    end: str
+
+    def to_sql(self) -> str:
+        return self.SQL.format(column=self.column, start=self.start, end=self.end)
+
+    def numeric_bounds(self) -> Optional[Tuple[float, float]]:
+        """
+        gets the bounds of the interval as numbers
+        :return: the bounds or None if the bounds are no plain numbers, e.g. dates
+        """
+        try:
+            return float(self.start), float(self.end)
+        except ValueError:
+            return None
+
+
+@dataclass(frozen=True)
+class InPredicate(Predicate):
+    """
+    checks whether the value of a column is one of the given values. The values are already formatted sql literals.
+    """
+
+    SQL = '({column} in ({selection}))'
+
+    column: str
+    values: Tuple[str, ...]
+
+    def to_sql(self) -> str:
+        return self.SQL.format(column=self.column, selection=KOMMA_SEPERATOR.join(self.values))
+
+    def selectivity(self) -> float:
+        return min(1.0, IN_VALUE_SELECTIVITY * len(self.values))
+
+
+@dataclass(frozen=True)
+class PolygonPredicate(Predicate):
+    """
+    checks whether the position of a datapoint lies inside a polygon. The exact containment test is preceded by a
+    test against the bounding box of the polygon on the plain latitude and longitude columns, so the point geometry
+    is only created for datapoints near the polygon. Like the geometry column of the datasets, the geometries use
+    the (longitude latitude) axis order.
+    """
+
+    SQL = '({bounding_box} and ' \
+          'ST_Contains(ST_GeomFromText(\'POLYGON(({positions}))\'), ST_POINT(longitude, latitude)))'
+    BOUNDING_BOX = '(latitude between {min_latitude} and {max_latitude}) and ' \
+                   '(longitude between {min_longitude} and {max_longitude})'
+    SELECTIVITY = 0.3
+
+    polygon: PolygonRecord
+
+    def to_sql(self) -> str:
+        corners = list(self.polygon.corners)
+        latitudes = [corner.latitude for corner in corners]
+        longitudes = [corner.longitude for corner in corners]
+        bounding_box = self.BOUNDING_BOX.format(min_latitude=min(latitudes), max_latitude=max(latitudes),
+                                                min_longitude=min(longitudes), max_longitude=max(longitudes))
+        positions = KOMMA_SEPERATOR.join(f"{corner.longitude} {corner.latitude}" for corner in corners + corners[:1])
+        return self.SQL.format(bounding_box=bounding_box, positions=positions)
+
+
+@dataclass(frozen=True)
+class AggregatePredicate(Predicate):
+    """
+    checks whether a metric of the whole trajectory of a datapoint lies in a closed interval. The metric is
+    evaluated in a grouped subquery over the dataset that does not depend on the outer query, so it is only
+    computed once per query.
+    """
+
+    SQL = '(trajectory_id in ({trajectories}))'
+    GROUPED = 'SELECT trajectory_id FROM {source} GROUP BY trajectory_id HAVING {metric} between {start} and {end}'
+    TIMESTAMP = "TO_TIMESTAMP(CAST(date AS TEXT) || ' ' || CAST(time AS TEXT), 'DD.MM.YYYY HH24:MI:SS')"
+    # haversine distance to the previous datapoint of the trajectory in meters
+    DISTANCE = "6378160.0 * 2 * ASIN(SQRT(POWER(SIN(RADIANS(latitude - LAG(latitude) OVER w) / 2), 2) + " \
+               "COS(RADIANS(latitude)) * COS(RADIANS(LAG(latitude) OVER w)) * " \
+               "POWER(SIN(RADIANS(longitude - LAG(longitude) OVER w) / 2), 2)))"
+    DISTANCES = "(SELECT trajectory_id, " + DISTANCE + " AS distance FROM {tablename} " \
+                "WINDOW w AS (PARTITION BY trajectory_id ORDER BY original_order)) AS d"
+    # the table the metric is grouped from and the aggregate of the metric
+    METRICS = {
+        TrajectoryMetric.DURATION: ("{tablename}", f"EXTRACT(EPOCH FROM MAX({TIMESTAMP}) - MIN({TIMESTAMP}))"),
+        TrajectoryMetric.LENGTH: (DISTANCES, "COALESCE(SUM(distance), 0)"),
+        TrajectoryMetric.MEAN_SPEED: ("{tablename}", "AVG(speed)"),
+        TrajectoryMetric.POINT_COUNT: ("{tablename}", "COUNT(*)"),
+    }
+
+    metric: TrajectoryMetric
+    start: str
+    end: str
+
+    def to_sql(self) -> str:
+        source, metric = self.METRICS[self.metric]
+        return self.SQL.format(trajectories=self.GROUPED.format(source=source, metric=metric,
+                                                                start=self.start, end=self.end))
+
+
+@dataclass(frozen=True)
+class SequencePredicate(Predicate):
+    """
+    checks whether the trajectory of a datapoint visits the polygons in the given order. Only the datapoints inside
+    one of the polygons are read, because leaving out the other datapoints does not change the order of the visits.
+    For every step of the sequence a window function marks the datapoints that come after a visit of all the
+    previous polygons, so the whole sequence is checked in one grouped subquery.
+    """
+
+    SQL = '(trajectory_id in ({trajectories}))'
+    VISITS = 'SELECT trajectory_id, original_order, {visits} FROM {source} WHERE {any_visit}'
+    VISIT = '{polygon} AS visit_{step}'
+    STEP = 'SELECT *, COALESCE(bool_or({reached}) OVER w, false) AS after_{step} FROM ({visits}) AS s{step} ' \
+           'WINDOW w AS (PARTITION BY trajectory_id ORDER BY original_order ' \
+           'ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)'
+    GROUPED = 'SELECT trajectory_id FROM ({steps}) AS s GROUP BY trajectory_id HAVING bool_or({reached})'
+    SELECTIVITY = 0.1
+
+    polygons: Tuple[PolygonRecord, ...]
+
+    def to_sql(self) -> str:
+        polygons = [PolygonPredicate(polygon).to_sql() for polygon in self.polygons]
+        visits = self.VISITS.format(
+            visits=KOMMA_SEPERATOR.join(self.VISIT.format(polygon=polygon, step=step)
+                                        for step, polygon in enumerate(polygons, 1)),
+            source='{tablename}',
+            any_visit=' or '.join(dict.fromkeys(polygons))
+        )
+        for step in range(2, len(polygons) + 1):
+            visits = self.STEP.format(reached=self._reached(step - 1), step=step, visits=visits)
+        return self.SQL.format(trajectories=self.GROUPED.format(steps=visits, reached=self._reached(len(polygons))))
+
+    def _reached(self, step: int) -> str:
+        """
+        gets the condition that a datapoint is a visit of the polygon of the given step after all previous steps
+        """
+        if step == 1:
+            return 'visit_1'
+        return f'(visit_{step} and after_{step})'
+
+
+@dataclass(frozen=True)
+class NotPredicate(Predicate):
+    """
+    negates a predicate
+    """
+
+    child: Predicate
+
+    def to_sql(self) -> str:
+        return f"NOT ({self.child.to_sql()})"
+
+    def selectivity(self) -> float:
+        return 1.0 - self.child.selectivity()
+
+
+@dataclass(frozen=True)
+class GroupPredicate(Predicate):
+    """
+    joins predicates with a logical operator
+    """
+
+    operator: LogicalOperator
+    children: Tuple[Predicate, ...]
+
+    def to_sql(self) -> str:
+        return self.operator.join_requests([child.to_sql() for child in self.children])
+
+    def selectivity(self) -> float:
+        if self.operator == LogicalOperator.AND:
+            selectivity = 1.0
+            for child in self.children:
+                selectivity *= child.selectivity()
+            return selectivity
+        miss = 1.0
+        for child in self.children:
+            miss *= 1.0 - child.selectivity()
+        return 1.0 - miss
+
+
+@dataclass(frozen=True)
+class ExistsPredicate(Predicate):
+    """
+    checks whether a trajectory contains at least one datapoint that fulfills the point predicate
+    """
+
+    SQL = "EXISTS(SELECT 1 FROM {{tablename}} as p WHERE {condition} AND t.trajectory_id = p.trajectory_id)"
+
+    condition: Predicate
+
+    def to_sql(self) -> str:
+        return self.SQL.format(condition=self.condition.to_sql())
+
+    def selectivity(self) -> float:
+        return min(1.0, 2 * self.condition.selectivity())
+
+
+@dataclass(frozen=True)
+class ExistsAllPredicate(Predicate):
+    """
+    checks whether a trajectory contains a datapoint for every one of the point predicates. Unlike a conjunction
+    of ExistsPredicates, the datapoints of the trajectory are only searched once.
+    """
+
+    SQL = "(SELECT {aggregates} FROM {{tablename}} AS p WHERE t.trajectory_id = p.trajectory_id)"
+    AGGREGATE = "COALESCE(bool_or({condition}), false)"
+
+    conditions: Tuple[Predicate, ...]
+
+    def to_sql(self) -> str:
+        aggregates = " AND ".join(self.AGGREGATE.format(condition=condition.to_sql())
+                                  for condition in self.conditions)
+        return self.SQL.format(aggregates=aggregates)
+
+    def selectivity(self) -> float:
+        selectivity = 1.0
+        for condition in self.conditions:
+            selectivity *= min(1.0, 2 * condition.selectivity())
+        return selectivity
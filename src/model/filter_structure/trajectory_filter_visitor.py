@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING
 
 from src.data_transfer.content.logical_operator import LogicalOperator
 from src.model.filter_structure.filter_visitor import IVisitor
+from src.model.filter_structure.predicate import ExistsPredicate
+from src.model.filter_structure.predicate import Predicate
 
 if TYPE_CHECKING:
     from src.model.filter_structure.composite.filters.interval_filter import IntervalFilter
@@ -24,7 +26,7 @@ class TrajectoryFilterVisitor(IVisitor):
         :param interval_filter: the filter to be addet to the filter string.
         """
         self._append_in_exists(self._negate_filter(
-            self._create_interval_filter_str(
+            self._create_interval_predicate(
                 column=interval_filter.column.value,
                 start=interval_filter.start,
                 end=interval_filter.end
@@ -38,8 +40,8 @@ class TrajectoryFilterVisitor(IVisitor):
         :param polygon_filter: the polygon filter to visit
         """
         self.start_group(LogicalOperator.AND, polygon_filter._negated)
-        for polygon_filter in self._create_polygons_filter_strs(polygon_filter.polygons):
-            self._append_in_exists(polygon_filter)
+        for polygon_predicate in self._create_polygon_predicates(polygon_filter.polygons):
+            self._append_in_exists(polygon_predicate)
         self.leave_group()
 
     def visit_discrete_filter(self, discrete_filter: 'DiscreteFilter') -> None:
@@ -48,13 +50,12 @@ class TrajectoryFilterVisitor(IVisitor):
         :param discrete_filter:  the discrete filter to visit
         """
         self._append_in_exists(self._negate_filter(
-            self._create_discrete_filter_str(
+            self._create_discrete_predicate(
                 column=discrete_filter.column.value,
                 values=discrete_filter.selection
             ),
             discrete_filter._negated
         ))
 
-    def _append_in_exists(self, filter_str: str) -> None:
-        self._current_filters.append(
-            "EXISTS(SELECT 1 FROM {tablename} as p WHERE " + filter_str + " AND t.trajectory_id = p.trajectory_id)")
+    def _append_in_exists(self, predicate: Predicate) -> None:
+        self._current_filters.append(ExistsPredicate(predicate))
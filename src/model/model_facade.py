@@ -1,8 +1,11 @@
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import Future
 from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 from uuid import UUID
@@ -19,6 +22,7 @@ from src.model.analysis_structure.Analysis import Analysis
 from src.model.analysis_structure.analysis_structure import AnalysisStructure
 from src.model.error_handler import ErrorHandler
 from src.model.filter_structure.filter_structure import FilterStructure
+from src.model.filter_structure.predicate import Predicate
 from src.model.i_error_handler import IErrorHandler
 from src.model.polygon_structure.polygon_structure import PolygonStructure
 from src.model.setting_structure.setting_structure import SettingStructure
@@ -129,6 +133,65 @@ class FilterFacade(IErrorHandler, ABC):
         """
         pass
 
+    @abstractmethod
+    def get_point_predicate(self) -> Optional[Predicate]:
+        """
+        Abstract method to get the predicate tree the SQL request to filter point data is generated from.
+
+        :return: The predicate tree or None if there is no point filter.
+        :rtype: Optional[Predicate]
+        """
+        pass
+
+    @abstractmethod
+    def get_trajectory_predicate(self) -> Optional[Predicate]:
+        """
+        Abstract method to get the predicate tree the SQL request to filter trajectory data is generated from.
+
+        :return: The predicate tree or None if there is no trajectory filter.
+        :rtype: Optional[Predicate]
+        """
+        pass
+
+    @abstractmethod
+    def get_preview_predicates(self, parameters: FilterRecord, parent_id: Optional[UUID] = None,
+                               filter_id: Optional[UUID] = None) \
+            -> Optional[Tuple[Optional[Predicate], Optional[Predicate]]]:
+        """
+        Abstract method to get the predicate trees the filters would have if a filter was added or changed, without
+        adding or changing it.
+
+        :param parameters: The parameters of the previewed filter.
+        :param parent_id: The ID of the filter group the filter would be added to.
+        :param filter_id: The ID of the filter that would be changed, if the filter is not added.
+        :return: The point and the trajectory predicate tree, which are None if there is no filter, or None if the
+            filter can't be previewed.
+        :rtype: Optional[Tuple[Optional[Predicate], Optional[Predicate]]]
+        """
+        pass
+
+    @abstractmethod
+    def get_point_filter_version(self) -> int:
+        """
+        Abstract method to get the version of the point filter structure. The version changes whenever a point
+        filter component is changed, added or deleted.
+
+        :return: The version of the point filter structure.
+        :rtype: int
+        """
+        pass
+
+    @abstractmethod
+    def get_trajectory_filter_version(self) -> int:
+        """
+        Abstract method to get the version of the trajectory filter structure. The version changes whenever a
+        trajectory filter component is changed, added or deleted.
+
+        :return: The version of the trajectory filter structure.
+        :rtype: int
+        """
+        pass
+
     @abstractmethod
     def get_filter_types(self) -> List[str]:
         """
@@ -468,6 +531,81 @@ class AnalysisFacade(IErrorHandler, ABC):
         """
         pass
 
+    @abstractmethod
+    def get_analysed_data_async(self, analysis_id: UUID) -> Future:
+        """
+        Start a given analysis in the background.
+
+        :param analysis_id: The UUID of the analysis to run.
+        :type analysis_id: UUID
+        :return: A future of the object containing the analysed data.
+        :rtype: Future
+        """
+        pass
+
+    @abstractmethod
+    def get_analysed_data_batch_async(self, analysis_ids: List[UUID]) -> Dict[UUID, Future]:
+        """
+        Start several analyses in the background, their data is queried only once.
+
+        :param analysis_ids: The UUIDs of the analyses to run.
+        :type analysis_ids: List[UUID]
+        :return: The futures of the objects containing the analysed data by the UUIDs of the analyses.
+        :rtype: Dict[UUID, Future]
+        """
+        pass
+
+    @abstractmethod
+    def get_analysis_progress(self, analysis_id: UUID) -> Optional[float]:
+        """
+        Get the progress of a running analysis.
+
+        :param analysis_id: The UUID of the analysis.
+        :type analysis_id: UUID
+        :return: The done part of the analysis between 0 and 1 or None if it is not known.
+        :rtype: Optional[float]
+        """
+        pass
+
+    @abstractmethod
+    def cancel_analysis(self, analysis_id: UUID) -> bool:
+        """
+        Cancel a running analysis, its future fails with AnalysisCancelled.
+
+        :param analysis_id: The UUID of the analysis.
+        :type analysis_id: UUID
+        :return: Whether the analysis was running.
+        :rtype: bool
+        """
+        pass
+
+    @abstractmethod
+    def set_analysis_cache_directory(self, directory: Optional[str]) -> None:
+        """
+        Set the directory the results of the analyses are persisted to.
+
+        :param directory: The directory or None if the results are only cached in memory.
+        :type directory: Optional[str]
+        """
+        pass
+
+    @abstractmethod
+    def shutdown_analyses(self) -> None:
+        """
+        Cancel the running analyses and stop the worker processes, e.g. when the application exits.
+        """
+        pass
+
+    @abstractmethod
+    def invalidate_analysis_cache(self, dataset_key: Optional[str] = None) -> None:
+        """
+        Remove the cached results of the analyses of a dataset.
+
+        :param dataset_key: The key of the dataset or None to remove the results of all datasets.
+        :type dataset_key: Optional[str]
+        """
+        pass
+
 
 class ModelFacade(AnalysisFacade, FilterFacade, SettingFacade, PolygonFacade, ErrorHandler):
     """
@@ -582,6 +720,23 @@ class ModelFacade(AnalysisFacade, FilterFacade, SettingFacade, PolygonFacade, Er
             return None
         return filter_str
 
+    def get_point_predicate(self) -> Optional[Predicate]:
+        return self._filter_structure.get_point_predicate()
+
+    def get_trajectory_predicate(self) -> Optional[Predicate]:
+        return self._filter_structure.get_trajectory_predicate()
+
+    def get_preview_predicates(self, parameters: FilterRecord, parent_id: Optional[UUID] = None,
+                               filter_id: Optional[UUID] = None) \
+            -> Optional[Tuple[Optional[Predicate], Optional[Predicate]]]:
+        return self._filter_structure.get_preview_predicates(parameters, parent_id, filter_id)
+
+    def get_point_filter_version(self) -> int:
+        return self._filter_structure.get_point_filter_version()
+
+    def get_trajectory_filter_version(self) -> int:
+        return self._filter_structure.get_trajectory_filter_version()
+
     def get_filter_types(self) -> [FilterType]:
 
         return self._filter_structure.get_filter_types()
@@ -703,3 +858,31 @@ class ModelFacade(AnalysisFacade, FilterFacade, SettingFacade, PolygonFacade, Er
     def get_analysed_data(self, analysis_id: UUID) -> AnalysisDataRecord:
 
         return self.__analysis_structure.get_analysed_data(analysis_id)
+
+    def get_analysed_data_async(self, analysis_id: UUID) -> Future:
+
+        return self.__analysis_structure.get_analysed_data_async(analysis_id)
+
+    def get_analysed_data_batch_async(self, analysis_ids: List[UUID]) -> Dict[UUID, Future]:
+
+        return self.__analysis_structure.get_analysed_data_batch_async(analysis_ids)
+
+    def get_analysis_progress(self, analysis_id: UUID) -> Optional[float]:
+
+        return self.__analysis_structure.get_analysis_progress(analysis_id)
+
+    def cancel_analysis(self, analysis_id: UUID) -> bool:
+
+        return self.__analysis_structure.cancel_analysis(analysis_id)
+
+    def set_analysis_cache_directory(self, directory: Optional[str]) -> None:
+
+        self.__analysis_structure.set_cache_directory(directory)
+
+    def shutdown_analyses(self) -> None:
+
+        self.__analysis_structure.shutdown()
+
+    def invalidate_analysis_cache(self, dataset_key: Optional[str] = None) -> None:
+
+        self.__analysis_structure.invalidate_cache(dataset_key)
@@ -0,0 +1,71 @@
+"""
+polygon_geometry.py contains vectorized geometry functions on polygons.
+"""
+from typing import List
+
+import numpy as np
+
+from src.data_transfer.record.polygon_record import PolygonRecord
+
+
+def points_in_polygon(latitudes: np.ndarray, longitudes: np.ndarray, polygon_record: PolygonRecord) -> np.ndarray:
+    """
+    Checks for many points at once whether they lie inside a polygon, using the even-odd rule. Points outside the
+    bounding box of the polygon are rejected before the edges are tested. It does not account for the curvature of
+    the earth.
+    :param latitudes: the latitudes of the points
+    :param longitudes: the longitudes of the points
+    :param polygon_record: the polygon that might contain the points
+    :return: a boolean array that is true for every point inside the polygon
+    """
+    latitudes = np.asarray(latitudes, dtype=float)
+    longitudes = np.asarray(longitudes, dtype=float)
+    corner_latitudes = np.array([corner.latitude for corner in polygon_record.corners], dtype=float)
+    corner_longitudes = np.array([corner.longitude for corner in polygon_record.corners], dtype=float)
+
+    inside = np.zeros(latitudes.shape, dtype=bool)
+    if len(corner_latitudes) < 3:
+        return inside
+
+    with np.errstate(invalid="ignore"):
+        candidates = np.flatnonzero((latitudes >= corner_latitudes.min()) & (latitudes <= corner_latitudes.max())
+                                    & (longitudes >= corner_longitudes.min())
+                                    & (longitudes <= corner_longitudes.max()))
+    if len(candidates) == 0:
+        return inside
+
+    y = latitudes[candidates]
+    x = longitudes[candidates]
+    crossings = np.zeros(len(candidates), dtype=bool)
+    next_latitudes = np.roll(corner_latitudes, -1)
+    next_longitudes = np.roll(corner_longitudes, -1)
+    for y1, x1, y2, x2 in zip(corner_latitudes, corner_longitudes, next_latitudes, next_longitudes):
+        if y1 == y2:
+            continue
+        # the edge crosses the horizontal ray from the point towards the east
+        spans = (y1 > y) != (y2 > y)
+        crossings ^= spans & (x < (x2 - x1) * (y - y1) / (y2 - y1) + x1)
+    inside[candidates] = crossings
+    return inside
+
+
+def assign_points_to_polygons(latitudes: np.ndarray, longitudes: np.ndarray,
+                              polygon_records: List[PolygonRecord]) -> np.ndarray:
+    """
+    Finds for many points at once the polygon they lie in. Only the points that are not in a polygon yet are tested
+    against the next polygon, so every point is tested until it is assigned and the points outside of a polygon are
+    mostly rejected by its bounding box.
+    :param latitudes: the latitudes of the points
+    :param longitudes: the longitudes of the points
+    :param polygon_records: the polygons, the first of them wins if several contain a point
+    :return: for every point the position of its polygon in the list or -1 if it is in none of them
+    """
+    latitudes = np.asarray(latitudes, dtype=float)
+    longitudes = np.asarray(longitudes, dtype=float)
+    positions = np.full(latitudes.shape, -1, dtype=np.int64)
+    for position, polygon_record in enumerate(polygon_records):
+        remaining = np.flatnonzero(positions < 0)
+        if len(remaining) == 0:
+            break
+        positions[remaining[points_in_polygon(latitudes[remaining], longitudes[remaining], polygon_record)]] = position
+    return positions
@@ -4,6 +4,7 @@ from typing import List
 from typing import Type
 
 from src.data_transfer.content.column import Column
+from src.data_transfer.content.render_mode import RenderMode
 from src.data_transfer.content.settings_enum import SettingsEnum
 from src.data_transfer.record.selection_record import SelectionRecord
 from src.data_transfer.record.settings_record import SettingsRecord
@@ -52,6 +53,11 @@ class SettingStructure(ErrorHandler, ISettingStructure):
                                                                     name="Show line segments",
                                                                     tip=SettingTips.SHOW_LINE_SEGMENTS.value)
 
+        self._render_mode: Setting = Setting.from_list(identifier=SettingsEnum.RENDER_MODE, name="Render mode",
+                                                       option_list=[mode for mode in RenderMode],
+                                                       standard=RenderMode.SINGLE_ITEMS,
+                                                       tip=SettingTips.RENDER_MODE.value)
+
         self._color: Setting = Setting.from_list(identifier=SettingsEnum.COLOR_SETTINGS, name="Trajectory Colors",
                                                  option_list=[color for color in Color], standard=Color.RANDOM,
                                                  tip=SettingTips.COLOR_SETTINGS.value)
@@ -92,6 +98,7 @@ class SettingStructure(ErrorHandler, ISettingStructure):
         trajectory_segment.add_setting(self._offset_ratio)
         trajectory_segment.add_setting(self._random)
         trajectory_segment.add_setting(self._seed)
+        trajectory_segment.add_setting(self._render_mode)
         self._pages[0].add_segment(trajectory_segment)
 
         color_segment = Segment(SettingsEnum.SEGMENT2, "Color", [])
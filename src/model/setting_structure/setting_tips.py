@@ -13,6 +13,13 @@ class SettingTips(Enum):
 
     SHOW_LINE_SEGMENTS = "Can be used to enable and disable the line segments of the trajectories"
 
+    RENDER_MODE = "Defines how the trajectories are drawn on the map. Single items draws every datapoint and line " \
+                  "segment as its own map element. Batched draws each trajectory as one polyline and only shows " \
+                  "the datapoints when zoomed in closely, which is much faster for larger samples. Raster overlay " \
+                  "draws all trajectories into one image in the background, which is meant for samples of many " \
+                  "thousand trajectories. The density layer and the mean speed layer show no trajectories, but the " \
+                  "number or the mean speed of all filtered datapoints in a fine grid over the visible map area."
+
     COLOR_SETTINGS = "Defines the colorization schema of the trajectories. If the schema is set to parameter you" \
                      "need to additionally select a parameter to colorize the trajectories " \
                      "in the trajectory param setting. If you set the schema to uni color you can additionally " \
@@ -0,0 +1,139 @@
+"""
+trajectory_kinematics.py contains vectorized functions that calculate the movement between consecutive datapoints of
+trajectories. The datapoints have to be sorted by trajectory and by their order inside the trajectories, the values
+of the first datapoint of every trajectory are NaN.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_transfer.content import Column
+
+RADIUS_EARTH = 6378160.0
+
+DISTANCE = "distance"
+TIME_DELTA = "time_delta"
+SPEED = "speed"
+HEADING = "heading"
+
+
+def trajectory_starts(trajectory_ids) -> np.ndarray:
+    """
+    Marks the first datapoint of every trajectory.
+    :param trajectory_ids: the trajectory id of every datapoint
+    :return: a boolean array that is true for every datapoint whose trajectory differs from the previous datapoint
+    """
+    trajectory_ids = np.asarray(trajectory_ids)
+    starts = np.ones(len(trajectory_ids), dtype=bool)
+    starts[1:] = trajectory_ids[1:] != trajectory_ids[:-1]
+    return starts
+
+
+def _to_starts(size: int, starts: Optional[np.ndarray]) -> np.ndarray:
+    """
+    uses only the first datapoint as start if no trajectory starts are given
+    """
+    if starts is not None:
+        return np.asarray(starts, dtype=bool)
+    starts = np.zeros(size, dtype=bool)
+    starts[:1] = True
+    return starts
+
+
+def get_distances(latitudes, longitudes, starts: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calculates the haversine distance of every datapoint to the previous datapoint of its trajectory.
+    :param latitudes: the latitudes of the datapoints in degrees
+    :param longitudes: the longitudes of the datapoints in degrees
+    :param starts: marks the first datapoint of every trajectory, all datapoints are one trajectory if not given
+    :return: the distances in meters
+    """
+    latitudes = np.radians(np.asarray(latitudes, dtype=float))
+    longitudes = np.radians(np.asarray(longitudes, dtype=float))
+    distances = np.full(len(latitudes), np.nan)
+    if len(latitudes) < 2:
+        return distances
+
+    a = np.sin((latitudes[1:] - latitudes[:-1]) / 2.0) ** 2 \
+        + np.cos(latitudes[1:]) * np.cos(latitudes[:-1]) * np.sin((longitudes[1:] - longitudes[:-1]) / 2.0) ** 2
+    distances[1:] = RADIUS_EARTH * 2 * np.arcsin(np.sqrt(a))
+    distances[_to_starts(len(distances), starts)] = np.nan
+    return distances
+
+
+def get_time_deltas(timestamps, starts: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calculates the time passed since the previous datapoint of the trajectory.
+    :param timestamps: the timestamps of the datapoints, either as datetimes or as numbers of seconds
+    :param starts: marks the first datapoint of every trajectory, all datapoints are one trajectory if not given
+    :return: the time deltas in seconds
+    """
+    timestamps = pd.Series(timestamps).reset_index(drop=True)
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        deltas = timestamps.diff().dt.total_seconds().to_numpy(dtype=float)
+    else:
+        deltas = pd.to_numeric(timestamps, errors="coerce").diff().to_numpy(dtype=float)
+    deltas[_to_starts(len(deltas), starts)] = np.nan
+    return deltas
+
+
+def get_speeds(distances: np.ndarray, time_deltas: np.ndarray) -> np.ndarray:
+    """
+    Calculates the speed between consecutive datapoints.
+    :param distances: the distances to the previous datapoints in meters
+    :param time_deltas: the time deltas to the previous datapoints in seconds
+    :return: the speeds in meters per second
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.asarray(distances, dtype=float) / np.asarray(time_deltas, dtype=float)
+
+
+def get_headings(latitudes, longitudes, starts: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calculates the initial bearing from the previous datapoint of the trajectory to every datapoint.
+    :param latitudes: the latitudes of the datapoints in degrees
+    :param longitudes: the longitudes of the datapoints in degrees
+    :param starts: marks the first datapoint of every trajectory, all datapoints are one trajectory if not given
+    :return: the headings in degrees clockwise from the north between 0 and 360
+    """
+    latitudes = np.radians(np.asarray(latitudes, dtype=float))
+    longitudes = np.radians(np.asarray(longitudes, dtype=float))
+    headings = np.full(len(latitudes), np.nan)
+    if len(latitudes) < 2:
+        return headings
+
+    longitude_difference = longitudes[1:] - longitudes[:-1]
+    y = np.sin(longitude_difference) * np.cos(latitudes[1:])
+    x = np.cos(latitudes[:-1]) * np.sin(latitudes[1:]) \
+        - np.sin(latitudes[:-1]) * np.cos(latitudes[1:]) * np.cos(longitude_difference)
+    headings[1:] = np.degrees(np.arctan2(y, x)) % 360
+    headings[_to_starts(len(headings), starts)] = np.nan
+    return headings
+
+
+def get_kinematics(frame: pd.DataFrame, timestamps: Optional[pd.Series] = None,
+                   latitude_column: str = Column.LATITUDE.value, longitude_column: str = Column.LONGITUDE.value,
+                   trajectory_column: Optional[str] = Column.TRAJECTORY_ID.value) -> pd.DataFrame:
+    """
+    Calculates the distance, time delta, speed and heading of every datapoint to the previous datapoint of its
+    trajectory in one pass over the frame.
+    :param frame: the datapoints sorted by trajectory and by their order inside the trajectories
+    :param timestamps: the timestamps of the datapoints, the time delta and speed are NaN if not given
+    :param latitude_column: the name of the latitude column
+    :param longitude_column: the name of the longitude column
+    :param trajectory_column: the name of the trajectory id column or None if the frame is a single trajectory
+    :return: a dataframe with the distance, time_delta, speed and heading columns and the index of the frame
+    """
+    starts = None if trajectory_column is None else trajectory_starts(frame[trajectory_column])
+    latitudes = pd.to_numeric(frame[latitude_column], errors="coerce").to_numpy()
+    longitudes = pd.to_numeric(frame[longitude_column], errors="coerce").to_numpy()
+
+    distances = get_distances(latitudes, longitudes, starts)
+    time_deltas = np.full(len(frame), np.nan) if timestamps is None else get_time_deltas(timestamps, starts)
+    return pd.DataFrame({
+        DISTANCE: distances,
+        TIME_DELTA: time_deltas,
+        SPEED: get_speeds(distances, time_deltas),
+        HEADING: get_headings(latitudes, longitudes, starts)
+    }, index=frame.index)
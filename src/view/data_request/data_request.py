@@ -1,5 +1,7 @@
-import time
+from concurrent.futures import Future
+from typing import Dict
 from typing import List
+from typing import Optional
 from uuid import UUID
 
 from src.controller.input_handling.request_distributor import RequestDistributor
@@ -11,8 +13,12 @@ from src.data_transfer.record import DataRecord
 from src.data_transfer.record import DatasetRecord
 from src.data_transfer.record import FilterGroupRecord
 from src.data_transfer.record import FilterRecord
+from src.data_transfer.record import MatchCountRecord
 from src.data_transfer.record import PolygonRecord
+from src.data_transfer.record import PositionRecord
 from src.data_transfer.record import SettingsRecord
+from src.data_transfer.record import TablePageQueryRecord
+from src.data_transfer.record import TablePageRecord
 from src.data_transfer.record import TrajectoryRecord
 from src.data_transfer.record.setting_record import SettingRecord
 
@@ -49,6 +55,17 @@ class DataRequest:
         """
         return self._data_request.get_rawdata(selected_column)
 
+    def get_rawdata_page(self, page_query: TablePageQueryRecord) -> Optional[TablePageRecord]:
+        """
+        Gets a page of the data, the page starts after the key of the last row of the previous page, so large
+        tables can be shown without reading them
+
+        :param page_query: the columns, order, filter and start of the page
+
+        :return: The rows of the page indexed by their keys
+        """
+        return self._data_request.get_rawdata_page(page_query)
+
     def get_polygon_ids(self) -> List[UUID]:
         """
         returns a list of all polygon ids
@@ -78,6 +95,38 @@ class DataRequest:
         """
         return self._data_request.get_analysis_data(analysis_id)
 
+    def get_analysis_data_async(self, analysis_id: UUID) -> Future:
+        """
+        starts an analysis in the background, so several analyses run at the same time
+        :param analysis_id:     the id of the analysis
+        :return:                the future of the analyzed data
+        """
+        return self._data_request.get_analysis_data_async(analysis_id)
+
+    def get_analysis_data_batch_async(self, analysis_ids: List[UUID]) -> Dict[UUID, Future]:
+        """
+        starts several analyses in the background, their data is queried only once
+        :param analysis_ids:    the ids of the analyses
+        :return:                the futures of the analyzed data by the ids of the analyses
+        """
+        return self._data_request.get_analysis_data_batch_async(analysis_ids)
+
+    def get_analysis_progress(self, analysis_id: UUID) -> Optional[float]:
+        """
+        gets the progress of a running analysis
+        :param analysis_id:     the id of the analysis
+        :return:                the done part of the analysis between 0 and 1 or None if it is not known
+        """
+        return self._data_request.get_analysis_progress(analysis_id)
+
+    def cancel_analysis(self, analysis_id: UUID) -> bool:
+        """
+        cancels a running analysis, its future fails with AnalysisCancelled
+        :param analysis_id:     the id of the analysis
+        :return:                whether the analysis was running
+        """
+        return self._data_request.cancel_analysis(analysis_id)
+
     def get_analysis_settings(self, uuid: UUID) -> AnalysisRecord:
         """
         gets the required data of an analysis type
@@ -115,11 +164,20 @@ class DataRequest:
         """
         returns the trajectories that should be displayed on the map
         """
-        start = time.time()
-        result = self._data_request.get_shown_trajectories()
-        end = time.time()
-        print("\n", end - start, "\n")
-        return result
+        return self._data_request.get_shown_trajectories()
+
+    def get_density_data(self, bin_zoom: int, upper_left: PositionRecord, lower_right: PositionRecord,
+                         value_column: Optional[Column] = None) -> DataRecord:
+        """
+        returns the number of datapoints that pass the point filter in every OSM tile of the bin zoom level
+        inside the given bounds. Only the non-empty tiles are returned.
+
+        :param bin_zoom: the zoom level whose tiles are the bins
+        :param upper_left: the north-west corner of the bounds
+        :param lower_right: the south-east corner of the bounds
+        :param value_column: optionally a column whose mean value is calculated for every bin
+        """
+        return self._data_request.get_density_data(bin_zoom, upper_left, lower_right, value_column=value_column)
 
     def get_discrete_selection_column(self, column: Column) -> SettingRecord:
         """
@@ -158,6 +216,14 @@ class DataRequest:
         """
         return self._data_request.get_filter(filter_id)
 
+    def get_match_count(self, filter_record: FilterRecord, parent_id: Optional[UUID] = None,
+                        filter_id: Optional[UUID] = None) -> Optional[MatchCountRecord]:
+        """
+        returns the number of datapoints and trajectories that would pass the filters if the filter was added to the
+        group with the parent id or if the filter with the filter id was changed to the filter record
+        """
+        return self._data_request.get_match_count(filter_record, parent_id=parent_id, filter_id=filter_id)
+
     def get_trajectory_data(self, trajectory_id: UUID):
         """
         returns the data of the trajectory with the given uuid
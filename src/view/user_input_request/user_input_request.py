@@ -1,7 +1,11 @@
+import threading
 import tkinter as tk
+from queue import Empty
+from queue import Queue
 from tkinter.messagebox import showerror
 from tkinter.messagebox import showinfo
 from tkinter.messagebox import showwarning
+from typing import Callable
 
 from src.data_transfer.record.setting_record import SettingRecord
 from src.view.user_interface.selection.selection_dialog import SelectionDialog
@@ -11,34 +15,60 @@ class UserInputRequestFacade:
     """
     This class is used by the controller to send messages to the user or to force an input by the user.
     .It uses the dialog factory from the user_interface module to create new dialogs.
+    Tkinter may only be used from the main thread, so the messages that are sent from other threads, for example
+    by the queries of the analyses or the map layers, wait until the main window shows them.
     """
 
     MESSAGE_WINDOW_WIDTH = 200
     MESSAGE_WINDOW_HEIGHT = 400
 
+    def __init__(self):
+        # the messages sent from other threads with the messagebox function that shows them
+        self._pending: Queue = Queue()
+
     def send_warning(self, message: str):
         """
         Sends a Warning which is displayed to the user. Uses the tkinter build in messagebox function
         :param message: message which is displayed in the warning window
         """
-        message = self._cut_message(message)
-        showwarning(message=message)
+        self._show(showwarning, message)
 
     def send_error(self, message: str):
         """
         Sends an Error which is displayed to the user. Uses the tkinter build in messagebox function
         :param message: message which is displayed in the error window
         """
-        message = self._cut_message(message)
-        showerror(message=message)
+        self._show(showerror, message)
 
     def send_message(self, message: str):
         """
         Sends a normal message to the user. Uses the tkinter build in messagebox function
         :param message: the message
         """
+        self._show(showinfo, message)
+
+    def show_pending_messages(self):
+        """
+        Shows the messages that were sent from other threads, it has to be called on the main thread
+        """
+        while True:
+            try:
+                show, message = self._pending.get_nowait()
+            except Empty:
+                return
+            show(message=message)
+
+    def _show(self, show: Callable, message: str):
+        """
+        Shows the message right away on the main thread and keeps it for the main thread otherwise
+        :param show: the messagebox function that shows the message
+        :param message: the message
+        """
         message = self._cut_message(message)
-        showinfo(message=message)
+        if threading.current_thread() is threading.main_thread():
+            show(message=message)
+        else:
+            self._pending.put((show, message))
 
     def ask_acceptance(self, message: str, accept_message="accept?", title: str = "") -> bool:
         """
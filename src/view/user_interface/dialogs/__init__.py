@@ -1,8 +1,10 @@
+from .create_aggregate_filter import CreateAggregateFilterDialog
 from .create_analysis import CreateAnalysisDialog
 from .create_discrete_filter import CreateDiscreteFilterDialog
 from .create_filter_group import CreateFilterGroupDialog
 from .create_interval_filter import CreateIntervalFilterDialog
 from .create_polygon_filter import CreatePolygonFilterDialog
+from .create_sequence_filter import CreateSequenceFilterDialog
 from .export_analysis import ExportAnalysisDialog
 from .import_analysis import ImportAnalysisDialog
 from .import_dataset import ImportDatasetDialog
@@ -11,6 +13,8 @@ from .open_dataset import OpenDatasetDialog
 __all__ = ["CreatePolygonFilterDialog",
            "CreateIntervalFilterDialog",
            "CreateDiscreteFilterDialog",
+           "CreateAggregateFilterDialog",
+           "CreateSequenceFilterDialog",
            "CreateAnalysisDialog",
            "CreateFilterGroupDialog",
            "ExportAnalysisDialog",
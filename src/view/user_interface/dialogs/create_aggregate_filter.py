@@ -0,0 +1,11 @@
+from src.view.user_interface.dialogs.create_interval_filter import CreateIntervalFilterDialog
+
+
+class CreateAggregateFilterDialog(CreateIntervalFilterDialog):
+    """
+    Implements a dialog that enables the user to create and edit aggregate filters. An aggregate filter is built like
+    an interval filter, but the interval is selected for a metric of the whole trajectory instead of a column.
+    """
+
+    CREATE_TITLE = "Create Aggregate Filter"
+    EDIT_TITLE = "Edit Aggregate Filter"
@@ -3,6 +3,7 @@ from tkinter.simpledialog import Dialog
 
 from src.data_transfer.record import FilterRecord
 from src.view.user_interface.dialogs.filter_creator import FilterCreator
+from src.view.user_interface.dialogs.match_count_preview import MatchCountPreview
 from src.view.user_interface.selection.selection_unit_factory import SelectionUnitFactory
 from src.view.user_interface.ui_util.texts import EnglishTexts
 
@@ -13,7 +14,7 @@ class CreateDiscreteFilterDialog(Dialog, FilterCreator):
     """
 
     def __init__(self, filter_record: FilterRecord, structure_name: str, selection_callback: callable,
-                 edit: bool = False):
+                 edit: bool = False, preview_callback: callable = None):
         """
         Creates a new dialog from an existing filter record. The filter record for a filter that should
         be created from base on is a standard filter defined by the controller.
@@ -23,6 +24,8 @@ class CreateDiscreteFilterDialog(Dialog, FilterCreator):
                                     needs to be passed as a parameter to the function
         :param edit: indicates if the filter is edited. if not a new filter is created. The title of the window
                         changes depending on the dialog usage (edit or creation)
+        :param preview_callback: callback method that counts the matches of the filters with a filter record
+                                    of the dialog. If it is None, the dialog has no preview.
         """
 
         self._name_selector = None
@@ -37,6 +40,7 @@ class CreateDiscreteFilterDialog(Dialog, FilterCreator):
         self._column_setting_record = filter_record.column
 
         self._value_selection_callback = selection_callback
+        self._preview_callback = preview_callback
 
         self._view_value_selector = None
 
@@ -69,6 +73,10 @@ class CreateDiscreteFilterDialog(Dialog, FilterCreator):
         self._view_value_selector = self._value_selector.build(master=master)
         self._view_value_selector.grid(column=0, row=2, columnspan=2)
 
+        if self._preview_callback is not None:
+            preview = MatchCountPreview(get_filter=self.preview_filter, count_callback=self._preview_callback)
+            preview.build(master=master).grid(column=0, row=4, columnspan=2, sticky="nsew")
+
     def _build_value_selection(self, master):
         """
         Resets the value selection if the column has changed.
@@ -99,9 +107,12 @@ class CreateDiscreteFilterDialog(Dialog, FilterCreator):
         """
         Sets the new Filter Record based on the user input
         """
+        self._filter = self.create_filter()
+
+    def create_filter(self) -> FilterRecord:
         new_value_setting = self._value_selector.get_chosen_setting_record()
         new_column_setting = self._column_selector.get_chosen_setting_record()
-        self._filter = FilterRecord(
+        return FilterRecord(
             _name=self._name_selector.get(),
             _structure_name=self._structure_name,
             _negated=False,
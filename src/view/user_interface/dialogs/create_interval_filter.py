@@ -3,6 +3,7 @@ from tkinter.simpledialog import Dialog
 
 from src.data_transfer.record import FilterRecord
 from src.view.user_interface.dialogs.filter_creator import FilterCreator
+from src.view.user_interface.dialogs.match_count_preview import MatchCountPreview
 from src.view.user_interface.selection.selection_unit_factory import SelectionUnitFactory
 
 
@@ -11,8 +12,11 @@ class CreateIntervalFilterDialog(Dialog, FilterCreator):
     Implements a dialog that enables the user to create and edit interval filters.
     """
 
+    CREATE_TITLE = "Create Interval Filter"
+    EDIT_TITLE = "Edit Interval Filter"
+
     def __init__(self, filter_record: FilterRecord, structure_name: str, selection_callback: callable,
-                 edit: bool = False):
+                 edit: bool = False, preview_callback: callable = None):
         """
         Creates a new dialog from an existing filter record. The filter record for a filter that should
         be created from base on is a standard filter defined by the controller.
@@ -22,10 +26,13 @@ class CreateIntervalFilterDialog(Dialog, FilterCreator):
                                     needs to be passed as a parameter to the function
         :param edit: indicates if the filter is edited. if not a new filter is created. The title of the window
                     changes depending on the dialog usage (edit or creation)
+        :param preview_callback: callback method that counts the matches of the filters with a filter record
+                                    of the dialog. If it is None, the dialog has no preview.
         """
         self._filter = filter_record
 
         self._value_selection_callback = selection_callback
+        self._preview_callback = preview_callback
         self._structure_name = structure_name
         self._is_valid = False
 
@@ -37,9 +44,9 @@ class CreateIntervalFilterDialog(Dialog, FilterCreator):
         self._name_selector = tk.StringVar(value=self._filter.name)
 
         if edit is True:
-            title = "Edit Interval Filter"
+            title = self.EDIT_TITLE
         else:
-            title = "Create Interval Filter"
+            title = self.CREATE_TITLE
 
         super().__init__(parent=None, title=title)
 
@@ -65,6 +72,10 @@ class CreateIntervalFilterDialog(Dialog, FilterCreator):
         self._view_value_selector.grid(column=0, row=0, sticky="nsew")
         self._interval_frame.grid(column=0, row=3, sticky="nsew")
 
+        if self._preview_callback is not None:
+            preview = MatchCountPreview(get_filter=self.preview_filter, count_callback=self._preview_callback)
+            preview.build(master=master).grid(column=0, row=4, columnspan=2, sticky="nsew")
+
     def _build_value_selection(self, master):
         if self._interval_frame is not None:
             self._interval_frame.destroy()
@@ -84,9 +95,12 @@ class CreateIntervalFilterDialog(Dialog, FilterCreator):
         return self._is_valid
 
     def apply(self):
+        self._filter = self.create_filter()
+
+    def create_filter(self) -> FilterRecord:
         value_settings = self._value_selector.get_chosen_setting_record()
         column_settings = self._column_selector.get_chosen_setting_record()
-        self._filter = FilterRecord(
+        return FilterRecord(
             _name=self._name_selector.get(),
             _negated=False,
             _enabled=True,
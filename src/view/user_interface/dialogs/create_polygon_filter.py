@@ -3,6 +3,7 @@ from tkinter.simpledialog import Dialog
 
 from src.data_transfer.record import FilterRecord
 from src.view.user_interface.dialogs.filter_creator import FilterCreator
+from src.view.user_interface.dialogs.match_count_preview import MatchCountPreview
 from src.view.user_interface.selection.selection_unit_factory import SelectionUnitFactory
 
 
@@ -11,23 +12,30 @@ class CreatePolygonFilterDialog(Dialog, FilterCreator):
     Implements a dialog that enables the user to create a polygon Filter.
     """
 
-    def __init__(self, filter_record: FilterRecord, structure_name: str, edit: bool = False):
+    CREATE_TITLE = "Create Polygon Filter"
+    EDIT_TITLE = "Edit Polygon Filter"
+
+    def __init__(self, filter_record: FilterRecord, structure_name: str, edit: bool = False,
+                 preview_callback: callable = None):
         """
         The dialog will be immediately displayed on the screen when the constructor is called.
+        :param preview_callback: callback method that counts the matches of the filters with a filter record
+                                    of the dialog. If it is None, the dialog has no preview.
         """
         self._name_entry = None
         self._polygon_selector = None
         self._polygon_setting_record = filter_record.polygons
         self._filter = filter_record
         self._structure_name = structure_name
+        self._preview_callback = preview_callback
         self._is_valid = False
 
         self._name_selector = tk.StringVar(value=filter_record.name)
 
         if edit:
-            title = "Edit Polygon Filter"
+            title = self.EDIT_TITLE
         else:
-            title = "Create Polygon Filter"
+            title = self.CREATE_TITLE
         super().__init__(parent=None, title=title)
 
     def body(self, master):
@@ -39,6 +47,10 @@ class CreatePolygonFilterDialog(Dialog, FilterCreator):
         self._polygon_selector = SelectionUnitFactory.create_selection_unit(setting_record=self._polygon_setting_record)
         self._polygon_selector.build(master=master).grid(column=0, row=1, columnspan=2)
 
+        if self._preview_callback is not None:
+            preview = MatchCountPreview(get_filter=self.preview_filter, count_callback=self._preview_callback)
+            preview.build(master=master).grid(column=0, row=2, columnspan=2, sticky="nsew")
+
     def validate(self) -> bool:
 
         self._is_valid = self._polygon_selector.validate()
@@ -46,8 +58,12 @@ class CreatePolygonFilterDialog(Dialog, FilterCreator):
 
     def apply(self):
 
+        self._filter = self.create_filter()
+
+    def create_filter(self) -> FilterRecord:
+
         polygon_selection_setting = self._polygon_selector.get_chosen_setting_record()
-        self._filter = FilterRecord(
+        return FilterRecord(
             _name=self._name_selector.get(),
             _enabled=True,
             _negated=False,
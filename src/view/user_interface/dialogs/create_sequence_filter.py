@@ -0,0 +1,11 @@
+from src.view.user_interface.dialogs.create_polygon_filter import CreatePolygonFilterDialog
+
+
+class CreateSequenceFilterDialog(CreatePolygonFilterDialog):
+    """
+    Implements a dialog that enables the user to create and edit sequence filters. The polygons of the sequence are
+    passed in the order they are selected in.
+    """
+
+    CREATE_TITLE = "Create Sequence Filter"
+    EDIT_TITLE = "Edit Sequence Filter"
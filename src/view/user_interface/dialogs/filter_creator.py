@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from typing import Optional
 
 from src.data_transfer.record import FilterRecord
 
@@ -24,3 +25,25 @@ class FilterCreator(ABC):
         when the is_valid method returns True.
         """
         pass
+
+    @abstractmethod
+    def create_filter(self) -> FilterRecord:
+        """
+        Creates a Filter Record from the current user input of the dialog. This method should only be called
+        when the input has been validated.
+        """
+        pass
+
+    def preview_filter(self) -> Optional[FilterRecord]:
+        """
+        Creates a Filter Record from the current user input while the dialog is still open, so the filter can be
+        previewed before it is applied.
+        :return: the filter record or None if the current input is not valid
+        """
+        try:
+            if not self.validate():
+                return None
+        except ValueError:
+            # some selections can only convert valid input
+            return None
+        return self.create_filter()
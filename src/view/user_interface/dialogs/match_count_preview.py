@@ -0,0 +1,62 @@
+import tkinter as tk
+from typing import Callable
+from typing import Optional
+
+from src.data_transfer.record import FilterRecord
+from src.data_transfer.record import MatchCountRecord
+
+
+class MatchCountPreview:
+    """
+    Implements a button and a label for the filter dialogs that show how many datapoints and trajectories would pass
+    the filters with the filter of the dialog, without applying the filter.
+    """
+
+    NO_PREVIEW = "preview the matches of the filter"
+    INVALID_INPUT = "the input is not valid"
+    NO_COUNT = "the matches could not be counted"
+
+    def __init__(self, get_filter: Callable[[], Optional[FilterRecord]],
+                 count_callback: Callable[[FilterRecord], Optional[MatchCountRecord]]):
+        """
+        Creates a new preview.
+        :param get_filter: callback method that creates the filter record from the current input of the dialog or
+                            returns None if the input is not valid
+        :param count_callback: callback method that counts the matches of the filters with the given filter record
+        """
+        self._get_filter = get_filter
+        self._count_callback = count_callback
+        self._text = None
+
+    def build(self, master: tk.Widget) -> tk.Widget:
+        """
+        builds the button and the label of the preview
+        """
+        frame = tk.Frame(master=master)
+        self._text = tk.StringVar(master=frame, value=self.NO_PREVIEW)
+        tk.Button(master=frame, text="preview", command=self.preview).grid(column=0, row=0, sticky="w")
+        tk.Label(master=frame, textvariable=self._text, anchor="w").grid(column=1, row=0, sticky="nsew")
+        return frame
+
+    def preview(self):
+        """
+        counts the matches of the filter of the dialog and shows them in the label
+        """
+        filter_record = self._get_filter()
+        if filter_record is None:
+            self._text.set(self.INVALID_INPUT)
+            return
+
+        match_count = self._count_callback(filter_record)
+        if match_count is None:
+            self._text.set(self.NO_COUNT)
+            return
+        self._text.set(format_match_count(match_count))
+
+
+def format_match_count(match_count: MatchCountRecord) -> str:
+    """
+    formats the counts of a match count record, estimated counts are marked with a tilde
+    """
+    prefix = "" if match_count.exact else "~"
+    return f"{prefix}{match_count.point_count:,} points in {prefix}{match_count.trajectory_count:,} trajectories"
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from src.view.controller_communication.controller_communication import ControllerCommunication
 from src.view.data_request.data_request import DataRequest
 from src.view.event_handler import EventHandler
@@ -27,13 +29,16 @@ class GUI:
     @staticmethod
     def initialize(data_request: DataRequest,
                    controller_communication: ControllerCommunication,
-                   event_handler: EventHandler):
+                   event_handler: EventHandler,
+                   show_pending_messages: Optional[callable] = None):
         """
         The initialize function creates the factories for the UiElement Trees and
         the root af the tress. It passes the factories to the corresponding root.
         The root cant that create further Elements. After this function is called
         all UiElements are initialized and ready to receive and process events.
         Event though the concrete Windows arent displayed on the screen yet.
+        The main window shows the messages that were sent to the user from other threads with
+        show_pending_messages.
         """
         start_window_factory = StartWindowFactory(event_handler=event_handler,
                                                   controller_communication=controller_communication,
@@ -51,7 +56,8 @@ class GUI:
         GUI.START_WINDOW = StartWindow(factory=start_window_factory,
                                        close_application=controller_communication.close_application)
         GUI.MAIN_WINDOW = MainWindow(factory=main_window_factory,
-                                     close_application=controller_communication.close_application)
+                                     close_application=controller_communication.close_application,
+                                     show_pending_messages=show_pending_messages)
         GUI.DATASET_WINDOW = DatasetWindow(factory=dataset_window_factory)
         GUI.SETTINGS_WINDOW = SettingsWindow(factory=settings_window_factory)
         GUI.MANUAL_WINDOW = ManualWindow()
@@ -49,6 +49,7 @@ class DiscreteSelectionUnit(SelectionUnit):
                 self._value_listbox.select_set(i)
 
         self._value_listbox.bind("<<ListboxSelect>>", lambda event: self.process_list_select(event))
+        self._selected_values = [value for value in default_values if value in self._options]
         self.set_selected()
 
         self._value_listbox.pack(after=context, fill="x", padx=5, expand=True)
@@ -60,8 +61,10 @@ class DiscreteSelectionUnit(SelectionUnit):
         self.execute_callbacks()
 
     def set_selected(self):
-        selected_indices = self._value_listbox.curselection()
-        self._selected_values = [self._options[i] for i in selected_indices]
+        # keeps the order in which the values were selected, e.g. for the polygons of a sequence filter
+        selected = [self._options[i] for i in self._value_listbox.curselection()]
+        self._selected_values = [value for value in self._selected_values if value in selected] \
+            + [value for value in selected if value not in self._selected_values]
 
     def destroy(self):
         self._body_frame.destroy()
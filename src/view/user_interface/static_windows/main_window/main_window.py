@@ -1,4 +1,5 @@
 import tkinter as tk
+from typing import Optional
 
 from src.view.user_interface.static_windows.main_window.main_window_factory import MainWindowFactory
 from src.view.user_interface.static_windows.ui_element import UiElement
@@ -12,13 +13,21 @@ class MainWindow(Window):
     It holds the Menubar and the MainWindowBaseFrame as its direct children
     """
 
-    def __init__(self, factory: MainWindowFactory, close_application: callable):
+    # interval in ms in which the messages sent from other threads are shown
+    MESSAGE_POLL_INTERVAL = 100
+
+    def __init__(self, factory: MainWindowFactory, close_application: callable,
+                 show_pending_messages: Optional[callable] = None):
+        """
+        :param show_pending_messages: shows the messages that were sent to the user from other threads
+        """
         super().__init__()
 
         self._factory = factory
         self._base_frame: UiElement = factory.create_main_window_base_frame()
         self._menu_bar = factory.create_menu_bar()
         self._close_application_command = close_application
+        self._show_pending_messages = show_pending_messages
 
     def run(self):
         """
@@ -37,8 +46,18 @@ class MainWindow(Window):
         self._window.columnconfigure(0, weight=1)
         self._window.rowconfigure(0, weight=1)
 
+        if self._show_pending_messages is not None:
+            self._poll_messages()
         self._window.mainloop()
 
+    def _poll_messages(self):
+        """
+        Shows the messages that were sent from other threads. This method calls itself with tk.after(), because
+        tkinter can only be used from the main thread.
+        """
+        self._show_pending_messages()
+        self._window.after(self.MESSAGE_POLL_INTERVAL, self._poll_messages)
+
     def destroy(self):
         """
         See documentation of the abstract window class
@@ -1,6 +1,10 @@
 import tkinter as tk
+from concurrent.futures import Future
 from tkinter import messagebox
+from tkinter import ttk
+from typing import Dict
 from typing import List
+from typing import Tuple
 from uuid import UUID
 
 from src.controller.output_handling.event import AnalysisAdded
@@ -8,6 +12,7 @@ from src.controller.output_handling.event import AnalysisChanged
 from src.controller.output_handling.event import AnalysisDeleted
 from src.controller.output_handling.event import AnalysisImported
 from src.controller.output_handling.event import AnalysisRefreshed
+from src.data_transfer.exception import AnalysisCancelled
 from src.data_transfer.record import AnalysisDataRecord
 from src.data_transfer.record import AnalysisRecord
 from src.data_transfer.record.setting_record import SettingRecord
@@ -29,19 +34,31 @@ from src.view.user_interface.ui_util.texts import EnglishTexts
 
 class AnalysisArea(UiElement, AnalysisEventConsumer):
     """
-    This UI Element represents the analysis area to create and manage analysis views
+    This UI Element represents the analysis area to create and manage analysis views. The analyses run in the
+    background and their views are added or refreshed as soon as each of them is finished. Analyses that are started
+    in the same event cycle are started together, so their data is queried only once. While analyses run, their
+    progress is shown in a progress bar next to a button that cancels them.
     """
 
+    # milliseconds between the checks for finished analyses
+    RESULT_POLL_DELAY = 100
+
     def __init__(self,
                  controller_communication: ControllerCommunication,
                  data_request: DataRequest,
                  event_handler: IEventHandlerSubscribe):
         super().__init__(controller_communication, data_request, event_handler)
 
-        self._notebook = AnalysisNotebook()
+        self._notebook = AnalysisNotebook(data_request)
         self._change_menu: SelectionWindow = None
         self._current_analysis_id: UUID = None
         self._analysis_view_factory = AnalysisViewFactory()
+        # the running analyses by their id and whether their view has to be added instead of refreshed
+        self._pending: Dict[UUID, Tuple[Future, bool]] = {}
+        # the analyses that are started with the next idle event by their id and whether their view has to be added
+        self._queued: Dict[UUID, bool] = {}
+        self._progress_bar: ttk.Progressbar = None
+        self._cancel_btn: tk.Button = None
         self._event_handler.subscribe_analysis_events(self)
 
     def build(self, master: tk.Widget) -> tk.Widget:
@@ -99,6 +116,14 @@ class AnalysisArea(UiElement, AnalysisEventConsumer):
         change_analysis_btn = tk.Button(master=menu_bar, text=EnglishTexts.CHANGE_ANALYSIS_BTN_NAME.value,
                                         command=self.__on_change_analysis_button)
         change_analysis_btn.grid(row=0, column=4, sticky="ne")
+        # the progress of the running analyses is only shown while they run
+        self._progress_bar = ttk.Progressbar(master=menu_bar, length=150, maximum=1.0)
+        self._progress_bar.grid(row=0, column=0, sticky="e", padx=5)
+        self._progress_bar.grid_remove()
+        self._cancel_btn = tk.Button(master=menu_bar, text=EnglishTexts.CANCEL_ANALYSIS_BTN_NAME.value,
+                                     command=self.__on_cancel_button)
+        self._cancel_btn.grid(row=0, column=5, sticky="ne")
+        self._cancel_btn.grid_remove()
         return menu_bar
 
     def process_added_analysis(self, event: AnalysisAdded):
@@ -141,24 +166,118 @@ class AnalysisArea(UiElement, AnalysisEventConsumer):
         adds a new analysis view
         :param analysis_id:     the id of the analysis to add
         """
-        analysis_data: AnalysisDataRecord = self._data_request.get_analysis_data(analysis_id)
-        self._notebook.add_analysis(analysis_data, analysis_id)
+        self.__start_analysis(analysis_id, True)
 
     def refresh(self, analysis_id: UUID):
         """
         refreshes the analysis view of the analysis with the given id
         :param analysis_id:     the analysis id
         """
-        analyzed_data = self._data_request.get_analysis_data(analysis_id)
-        self._notebook.refresh_analysis(analysis_id, analyzed_data)
+        self.__start_analysis(analysis_id, False)
 
     def delete_analysis(self, analysis_id: UUID):
         """
         deletes the analysis view of the analysis with the given id
         :param analysis_id:     the analysis id
         """
+        self._pending.pop(analysis_id, None)
+        self._queued.pop(analysis_id, None)
         self._notebook.delete_analysis(analysis_id)
 
+    def __start_analysis(self, analysis_id: UUID, is_new: bool):
+        """
+        starts an analysis in the background with the next idle event, a result of the same analysis that is still
+        running is discarded
+        :param analysis_id:     the analysis id
+        :param is_new:          whether the view of the analysis has to be added
+        """
+        if self._base_frame is None:
+            self.__show_result(analysis_id, self._data_request.get_analysis_data_async(analysis_id), is_new)
+            return
+
+        # the first queued analysis schedules the start of all analyses of this event cycle
+        if len(self._queued) == 0:
+            self._base_frame.after_idle(self.__start_queued)
+        self._queued[analysis_id] = is_new or self._queued.get(analysis_id, False)
+
+    def __start_queued(self):
+        """
+        starts the queued analyses together, so their data is queried only once
+        """
+        queued, self._queued = self._queued, {}
+        if self._base_frame is None or len(queued) == 0:
+            return
+        futures = self._data_request.get_analysis_data_batch_async(list(queued))
+        for analysis_id, future in futures.items():
+            is_new = queued[analysis_id]
+            if analysis_id in self._pending:
+                # the view of an analysis that is refreshed before it was added still has to be added
+                is_new = is_new or self._pending[analysis_id][1]
+            else:
+                # the first running analysis starts the polling
+                if len(self._pending) == 0:
+                    self._base_frame.after(self.RESULT_POLL_DELAY, self.__poll_results)
+            self._pending[analysis_id] = (future, is_new)
+        self.__update_progress()
+
+    def __poll_results(self):
+        """
+        Shows the results of finished analyses. This method calls itself with tk.after(), because tkinter
+        can only be updated from the main thread.
+        """
+        if self._base_frame is None:
+            return
+        for analysis_id, (future, is_new) in list(self._pending.items()):
+            if future.done():
+                del self._pending[analysis_id]
+                self.__show_result(analysis_id, future, is_new)
+        self.__update_progress()
+        if len(self._pending) > 0:
+            self._base_frame.after(self.RESULT_POLL_DELAY, self.__poll_results)
+
+    def __update_progress(self):
+        """
+        shows the mean progress of the running analyses, the progress bar moves back and forth while the progress
+        of an analysis is not known
+        """
+        if self._progress_bar is None:
+            return
+        if len(self._pending) == 0:
+            self._progress_bar.stop()
+            self._progress_bar.grid_remove()
+            self._cancel_btn.grid_remove()
+            return
+        self._progress_bar.grid()
+        self._cancel_btn.grid()
+        fractions = [self._data_request.get_analysis_progress(analysis_id) for analysis_id in self._pending]
+        if any(fraction is None for fraction in fractions):
+            if str(self._progress_bar.cget("mode")) != "indeterminate":
+                self._progress_bar.config(mode="indeterminate", maximum=100)
+                self._progress_bar.start()
+            return
+        self._progress_bar.stop()
+        self._progress_bar.config(mode="determinate", maximum=1.0, value=sum(fractions) / len(fractions))
+
+    def __show_result(self, analysis_id: UUID, future: Future, is_new: bool):
+        """
+        adds or refreshes the view of a finished analysis
+        """
+        try:
+            analysis_data: AnalysisDataRecord = future.result()
+        except AnalysisCancelled:
+            return
+        except Exception as error:
+            if self._base_frame is None:
+                raise
+            messagebox.showerror(title="Analysis", message=str(error))
+            return
+        if analysis_data is None:
+            return
+        if is_new:
+            self._notebook.add_analysis(analysis_data, analysis_id)
+        else:
+            self._notebook.refresh_analysis(analysis_id, analysis_data)
+
     def __on_create_analysis_button(self):
         """
         executed when the create analysis button was pressed
@@ -195,6 +314,13 @@ class AnalysisArea(UiElement, AnalysisEventConsumer):
         analysis_id = current_analysis.id
         self._controller_communication.refresh_analysis(analysis_id)
 
+    def __on_cancel_button(self):
+        """
+        executed when the cancel button was pressed, the running analyses are cancelled and their views are kept
+        """
+        for analysis_id in list(self._pending):
+            self._data_request.cancel_analysis(analysis_id)
+
     def __on_delete_button(self):
         """
         executed when the delete analysis button was pressed
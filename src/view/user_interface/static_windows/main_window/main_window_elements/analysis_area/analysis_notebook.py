@@ -8,6 +8,7 @@ from uuid import UUID
 
 from src.data_transfer.record import AnalysisDataRecord
 from src.data_transfer.record import FileRecord
+from src.view.data_request.data_request import DataRequest
 from src.view.user_interface.static_windows.main_window.main_window_elements.analysis_area.analysis_view_factory \
     import AnalysisViewFactory
 from src.view.user_interface.static_windows.main_window.main_window_elements.analysis_area.concrete_analyses. \
@@ -20,7 +21,12 @@ class AnalysisNotebook:
     This class is responsible to manage the analysis view tabs
     """
 
-    def __init__(self):
+    def __init__(self, data_request: Optional[DataRequest] = None):
+        """
+        creates a new analysis notebook
+        :param data_request:    the data request views that load their data page by page use
+        """
+        self._data_request: Optional[DataRequest] = data_request
         self._notebook: Notebook = None
         self._analysis_views: List[AnalysisView] = []
         self._analysis_view_factory = AnalysisViewFactory()
@@ -65,7 +71,7 @@ class AnalysisNotebook:
         analysis_tab = ttk.Frame(self._notebook)
         analysis_tab.columnconfigure(0, weight=1)
         analysis_tab.rowconfigure(0, weight=1)
-        analysis_view = self._analysis_view_factory.create_analysis_view(data, analysis_id)
+        analysis_view = self._analysis_view_factory.create_analysis_view(data, analysis_id, self._data_request)
         analysis_view.build(analysis_tab).pack(padx=10, pady=10, fill="both", expand=True)
         self._analysis_views.append(analysis_view)
         self._notebook.add(analysis_tab, text=data.data.name)
@@ -1,9 +1,12 @@
 from typing import List
+from typing import Tuple
 
 import numpy as np
+import pandas as pd
 from matplotlib import pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
 
 MAX_ROTATE_LABELS = 3
 MAX_LABELS = 15
@@ -14,6 +17,8 @@ DATETIME_PATTERN = "^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$"
 DATETIME_LABEL_PATTERN = "\d{2}-\d{2} \d{2}$"
 TIME_REGEX = "\d{2}:\d{2}:\d{2}$"
 TIME_FORMATTER = "%H:%M:%S"
+# the number of points that are drawn per pixel of the width of a figure
+POINTS_PER_PIXEL = 2
 
 
 def prepare_analysis_figure(master, x_name: str = "", y_name: str = "") -> FigureCanvasTkAgg:
@@ -33,6 +38,102 @@ def prepare_analysis_figure(master, x_name: str = "", y_name: str = "") -> Figur
     return figure_canvas
 
 
+def get_max_points(figure: Figure) -> int:
+    """
+    gets the number of points that can be distinguished on the width of the figure
+    :param figure:      the figure
+    :return:            the number of points
+    """
+    return int(figure.get_figwidth() * figure.dpi) * POINTS_PER_PIXEL
+
+
+def get_pixel_grid(figure: Figure) -> Tuple[int, int]:
+    """
+    gets the number of pixel columns and rows of the figure
+    :param figure:      the figure
+    :return:            the number of columns and rows
+    """
+    return int(figure.get_figwidth() * figure.dpi), int(figure.get_figheight() * figure.dpi)
+
+
+def to_positions(column: pd.Series) -> np.ndarray:
+    """
+    converts a column to the positions of its values on an axis, numbers and datetimes are placed by their value and
+    all other values are placed like categories in the order of their first occurrence
+    :param column:      the column
+    :return:            the positions, missing values are NaN
+    """
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(dtype="float64")
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return np.where(column.isna(), np.nan, column.to_numpy(dtype="datetime64[ns]").astype("int64"))
+    codes = pd.factorize(column)[0].astype("float64")
+    codes[codes < 0] = np.nan
+    return codes
+
+
+def decimate_scatter(data_frame: pd.DataFrame, x_name: str, y_name: str, columns: int, rows: int) -> pd.DataFrame:
+    """
+    reduces the points of a scatter plot to one point of every pixel, so the whole cloud is kept and only the points
+    that are drawn over each other are left out. The x- and the y-axis are split into as many cells as the figure has
+    pixel columns and rows.
+    :param data_frame:  the points
+    :param x_name:      the column of the x-values
+    :param y_name:      the column of the y-values
+    :param columns:     the number of pixel columns
+    :param rows:        the number of pixel rows
+    :return:            the first point of every occupied cell in their original order
+    """
+    if len(data_frame) <= 1:
+        return data_frame
+    x = to_positions(data_frame[x_name])
+    y = to_positions(data_frame[y_name])
+    kept = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    if len(kept) == 0:
+        return data_frame.iloc[kept]
+    cells = _to_cells(x[kept], max(columns, 1)) * max(rows, 1) + _to_cells(y[kept], max(rows, 1))
+    return data_frame.iloc[np.sort(kept[np.unique(cells, return_index=True)[1]])]
+
+
+def _to_cells(positions: np.ndarray, cell_count: int) -> np.ndarray:
+    """
+    splits the range of the positions into cells of equal width and gets the cell of every position
+    """
+    position_range = positions.max() - positions.min()
+    if position_range == 0:
+        return np.zeros(len(positions), dtype="int64")
+    return np.minimum(((positions - positions.min()) / position_range * cell_count).astype("int64"), cell_count - 1)
+
+
+def decimate_lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    reduces the points of a line with the largest triangle three buckets algorithm. The first and the last point are
+    kept, the other points are split into buckets of equal size and the point of a bucket is kept that spans the
+    largest triangle with the point kept before and the average of the next bucket.
+    :param x:           the x-positions of the points in the order of the line
+    :param y:           the y-positions of the points in the order of the line
+    :param max_points:  the maximal number of points that are kept, at least three
+    :return:            the indices of the kept points
+    """
+    point_count = len(x)
+    if point_count <= max_points or max_points < 3:
+        return np.arange(point_count)
+
+    edges = np.linspace(1, point_count - 1, max_points - 1).astype("int64")
+    kept = np.empty(max_points, dtype="int64")
+    kept[0], kept[-1] = 0, point_count - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else point_count
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
 # def prepare_columnformat(column: Series) -> Series:
 #     if re.match(TIME_REGEX, str(column[0])):
 #         return pandas.to_datetime(column, format=TIME_FORMATTER)
@@ -3,6 +3,7 @@ from typing import Optional
 
 from src.data_transfer.content.analysis_view import AnalysisViewEnum
 from src.data_transfer.record import AnalysisDataRecord
+from src.view.data_request.data_request import DataRequest
 from src.view.user_interface.static_windows.main_window.main_window_elements.analysis_area.concrete_analyses \
     .analysis_view import AnalysisView
 from src.view.user_interface.static_windows.main_window.main_window_elements.analysis_area.concrete_analyses.barcode_analysis_view import \
@@ -24,11 +25,13 @@ class AnalysisViewFactory:
     represents a factory to create analysis views
     """
 
-    def create_analysis_view(self, data: AnalysisDataRecord, analysis_id: uuid.UUID) -> Optional[AnalysisView]:
+    def create_analysis_view(self, data: AnalysisDataRecord, analysis_id: uuid.UUID,
+                             data_request: Optional[DataRequest] = None) -> Optional[AnalysisView]:
         """
         creates a new analysis view out of the given analysis data record
         :param analysis_id:     the id of the new analysis
         :param data:            the analysis data record
+        :param data_request:    the data request views that load their data page by page use
         :return:                the new analysis view
         """
         analysis_type = data.id
@@ -38,7 +41,7 @@ class AnalysisViewFactory:
         if analysis_type == AnalysisViewEnum.plot_view:
             return PlotAnalysisView(analyzed_data, analysis_id, data.data.name)
         if analysis_type == AnalysisViewEnum.table_view:
-            return TableAnalysisView(analyzed_data, analysis_id, data.data.name)
+            return TableAnalysisView(analyzed_data, analysis_id, data.data.name, data_request)
         if analysis_type == AnalysisViewEnum.heatmap_view:
             return HeatmapAnalysisView(analyzed_data, analysis_id, data.data.name)
         if analysis_type == AnalysisViewEnum.histogram_view:
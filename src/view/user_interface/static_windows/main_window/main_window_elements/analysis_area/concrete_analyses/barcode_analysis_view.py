@@ -2,6 +2,7 @@ import tkinter as tk
 from typing import List
 from uuid import UUID
 
+import numpy as np
 from matplotlib.figure import Figure
 from pandas import DataFrame
 
@@ -20,7 +21,8 @@ from src.view.user_interface.static_windows.main_window.main_window_elements.ana
 
 class BarcodeAnalysisView(AnalysisView):
     """
-    represents a plot with connected points
+    represents a plot with connected points, the lines are reduced with the largest triangle three buckets algorithm
+    before they are drawn
     """
 
     ANALYSIS_VIEW_ID: int = 4
@@ -47,7 +49,13 @@ class BarcodeAnalysisView(AnalysisView):
 
         data_frame = analysis_util.prepare_dataformats(data_frame);
 
+        # every trajectory is reduced to its share of the points that can be distinguished on the figure
+        max_points = analysis_util.get_max_points(self._figure)
         for name, group in data_frame.groupby(Column.TRAJECTORY_ID.value):
+            group_points = max(int(np.ceil(max_points * len(group) / len(data_frame))), 3)
+            kept = analysis_util.decimate_lttb(analysis_util.to_positions(group[x_name]),
+                                               analysis_util.to_positions(group[y_name]), group_points)
+            group = group.iloc[kept]
             ax.plot(group[x_name], group[y_name], color=self._PLOT_COLOR)
 
         analysis_util.optimize_axes_labels(ax)
@@ -22,7 +22,8 @@ from src.view.user_interface.static_windows.main_window.main_window_elements.ana
 
 class PlotAnalysisView(AnalysisView):
     """
-    This analysis view displays analysed data in form of a plot
+    This analysis view displays analysed data in form of a scatter plot, the points are reduced to one point of every
+    pixel before they are drawn
     """
 
     ANALYSIS_VIEW_ID: int = 0
@@ -39,6 +40,9 @@ class PlotAnalysisView(AnalysisView):
         self._figure: Figure = figure_canvas.figure
         ax: Axes = self._figure.get_axes()[0]
 
+        # the full data is kept for the csv export, only the points that can be distinguished are drawn
+        data_frame = analysis_util.decimate_scatter(data_frame, x_name, y_name,
+                                                    *analysis_util.get_pixel_grid(self._figure))
         ax.scatter(data_frame[x_name], data_frame[y_name], color=self._PLOT_COLOR)
         analysis_util.optimize_axes_labels(ax)
         return figure_canvas.get_tk_widget()
@@ -1,14 +1,23 @@
+import dataclasses
 import tkinter as tk
+from tkinter import ttk
 from typing import List
 from typing import Optional
+from typing import Tuple
 from uuid import UUID
 
 from pandas import DataFrame
 from pandastable import Table
+from pandastable import TableModel
 
+from src.data_transfer.content import Column
 from src.data_transfer.record import DataRecord
 from src.data_transfer.record import FileRecord
+from src.data_transfer.record import TablePageQueryRecord
 from src.data_transfer.record.file_record_csv import FileRecordCsv
+from src.data_transfer.record.table_page_record import PAGE_SIZE
+from src.data_transfer.record.table_page_record import get_last_key
+from src.view.data_request.data_request import DataRequest
 from src.view.user_interface.static_windows.main_window.main_window_elements.analysis_area.concrete_analyses \
     .analysis_view import \
     AnalysisView
@@ -18,22 +27,137 @@ from src.view.user_interface.static_windows.main_window.main_window_elements.ana
 
 class TableAnalysisView(AnalysisView):
     """
-    This analysis view displays analysed data in form of a table
+    This analysis view displays analysed data in form of a table. The analysed data is the first page of the table,
+    the next pages are requested when they are shown, so only one page is loaded at once. The rows can be ordered by
+    a column and restricted to some values of a column, both is done by the database.
     """
 
     ANALYSIS_VIEW_ID: int = 1
+    # the separator of the values of the filter column
+    _VALUE_SEPARATOR = ","
+    _NO_COLUMN = ""
 
-    def __init__(self, analysed_data: DataRecord, analysis_id: UUID, name: str = "Table"):
+    def __init__(self, analysed_data: DataRecord, analysis_id: UUID, name: str = "Table",
+                 data_request: Optional[DataRequest] = None):
+        """
+        creates a new table analysis view
+        :param analysed_data:   the first page of the table, its rows are indexed by their keys
+        :param analysis_id:     the id of the analysis to display
+        :param data_request:    the data request the next pages are requested with or None to only display the data
+        """
         super().__init__(analysed_data, analysis_id, name)
+        self._data_request: Optional[DataRequest] = data_request
+        self._table: Optional[Table] = None
+        self._page_label: Optional[tk.Label] = None
+        self._query: Optional[TablePageQueryRecord] = None
+        self._page: DataFrame = DataFrame()
+        # the keys the shown page and the pages before it start after, None for the first page
+        self._starts: List[Optional[Tuple]] = [None]
+        self._has_next: bool = False
 
     def _create_figure(self, master, data_frame: DataFrame) -> tk.Widget:
-        table_frame = tk.Frame(master)
-        table = Table(table_frame, dataframe=data_frame, editable=False)
-        table.show()
-        return table_frame
+        view_frame = tk.Frame(master)
+        table_frame = tk.Frame(view_frame)
+        self._page = data_frame
+        self._starts = [None]
+        self._has_next = len(data_frame) >= PAGE_SIZE
+        columns = [Column.get_column_from_str(column) for column in data_frame.columns]
+        self._query = TablePageQueryRecord(_columns=tuple(column for column in columns if column is not None))
+
+        if self._data_request is not None:
+            self._create_controls(view_frame).pack(fill="x")
+        table_frame.pack(fill="both", expand=True)
+        self._table = Table(table_frame, dataframe=data_frame.reset_index(drop=True), editable=False)
+        self._table.show()
+        self._update_page_label()
+        return view_frame
+
+    def _create_controls(self, master) -> tk.Widget:
+        """
+        creates the buttons to page through the table and the selection of the order and the filter of the rows
+        """
+        controls = tk.Frame(master)
+        column_names = [self._NO_COLUMN] + Column.val_list()
+        tk.Button(controls, text="<", command=self._show_previous_page).pack(side="left")
+        self._page_label = tk.Label(controls)
+        self._page_label.pack(side="left")
+        tk.Button(controls, text=">", command=self._show_next_page).pack(side="left")
+
+        tk.Label(controls, text="sort by").pack(side="left", padx=(10, 0))
+        self._sort_column = ttk.Combobox(controls, values=column_names, state="readonly", width=15)
+        self._sort_column.pack(side="left")
+        self._descending = tk.BooleanVar(value=False)
+        tk.Checkbutton(controls, text="descending", variable=self._descending).pack(side="left")
+
+        tk.Label(controls, text="filter").pack(side="left", padx=(10, 0))
+        self._filter_column = ttk.Combobox(controls, values=column_names, state="readonly", width=15)
+        self._filter_column.pack(side="left")
+        self._filter_values = tk.Entry(controls, width=20)
+        self._filter_values.pack(side="left")
+        tk.Button(controls, text="apply", command=self._apply_query).pack(side="left")
+        return controls
+
+    def _apply_query(self):
+        """
+        shows the first page of the table ordered and filtered as selected
+        """
+        sort_column = Column.get_column_from_str(self._sort_column.get())
+        filter_column = Column.get_column_from_str(self._filter_column.get())
+        filter_values = [value.strip() for value in self._filter_values.get().split(self._VALUE_SEPARATOR)
+                         if value.strip() != ""]
+        query = dataclasses.replace(
+            self._query,
+            _sort_columns=tuple(self._query.sort_columns) if sort_column is None else (sort_column,),
+            _descending=self._descending.get(),
+            _filter_column=filter_column,
+            _filter_values=tuple(filter_values) if filter_column is not None else ())
+        self._query = query
+        self._starts = [None]
+        self._show_page(None)
+        self._update_page_label()
+
+    def _show_next_page(self):
+        if not self._has_next:
+            return
+        last_key = get_last_key(self._page)
+        if self._show_page(last_key):
+            self._starts.append(last_key)
+            self._update_page_label()
+
+    def _show_previous_page(self):
+        if len(self._starts) <= 1:
+            return
+        if self._show_page(self._starts[-2]):
+            self._starts.pop()
+            self._update_page_label()
+
+    def _show_page(self, after: Optional[Tuple]) -> bool:
+        """
+        requests the page after the given key and shows it
+        :param after:   the key of the last row of the previous page or None for the first page
+        :return:        whether the page was shown
+        """
+        page = self._data_request.get_rawdata_page(dataclasses.replace(self._query, _after=after))
+        if page is None or (after is not None and len(page.data) == 0):
+            self._has_next = False
+            return False
+        self._page = page.data
+        self._has_next = page.has_next
+        self._table.updateModel(TableModel(page.data.reset_index(drop=True)))
+        self._table.redraw()
+        return True
+
+    def _update_page_label(self):
+        if self._page_label is not None:
+            self._page_label.config(text=f"page {len(self._starts)}")
 
     def export(self, format: str, file_name: str) -> Optional[FileRecord]:
         if format == AnalysisExportFormatEnum.CSV.value:
+            if self._data_request is not None and len(self._query.columns) > 0:
+                # the whole table is exported, not only the shown page
+                data = self._data_request.get_rawdata(self._query.columns)
+                if data is not None:
+                    return FileRecordCsv(data.data[[column.value for column in self._query.columns]], file_name)
             return FileRecordCsv(self._analysed_data.data, file_name)
         return None
 
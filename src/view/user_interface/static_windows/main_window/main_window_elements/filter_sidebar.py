@@ -1,4 +1,5 @@
 import tkinter as tk
+from functools import partial
 from tkinter import ttk
 from typing import Dict
 from typing import List
@@ -19,10 +20,12 @@ from src.view.controller_communication.controller_communication import Controlle
 from src.view.data_request.data_request import DataRequest
 from src.view.event_handler.event_consumers.filter_event_consumer import FilterEventConsumer
 from src.view.event_handler.i_event_hanlder_subscribe import IEventHandlerSubscribe
+from src.view.user_interface.dialogs import CreateAggregateFilterDialog
 from src.view.user_interface.dialogs import CreateDiscreteFilterDialog
 from src.view.user_interface.dialogs import CreateFilterGroupDialog
 from src.view.user_interface.dialogs import CreateIntervalFilterDialog
 from src.view.user_interface.dialogs import CreatePolygonFilterDialog
+from src.view.user_interface.dialogs import CreateSequenceFilterDialog
 from src.view.user_interface.dialogs.filter_creator import FilterCreator
 from src.view.user_interface.static_windows.main_window.main_window_elements.check_box_tree_view import CheckBoxTreeView
 from src.view.user_interface.static_windows.ui_element import UiElement
@@ -42,6 +45,8 @@ class FilterSidebar(UiElement, FilterEventConsumer):
     POLYGON_FILTER = "polygon filter"
     DISCRETE_FILTER = "discrete filter"
     INTERVAL_FILTER = "interval filter"
+    AGGREGATE_FILTER = "aggregate filter"
+    SEQUENCE_FILTER = "sequence filter"
 
     def __init__(self, controller_communication: ControllerCommunication,
                  data_request: DataRequest,
@@ -131,6 +136,10 @@ class FilterSidebar(UiElement, FilterEventConsumer):
                                     command=lambda: self.create_concrete_filter(self.DISCRETE_FILTER))
         add_filter_menu.add_command(label=self._polygon_filter_name,
                                     command=lambda: self.create_concrete_filter(self.POLYGON_FILTER))
+        add_filter_menu.add_command(label=self.AGGREGATE_FILTER,
+                                    command=lambda: self.create_concrete_filter(self.AGGREGATE_FILTER))
+        add_filter_menu.add_command(label=self.SEQUENCE_FILTER,
+                                    command=lambda: self.create_concrete_filter(self.SEQUENCE_FILTER))
         return add_filter_menu
 
     def destroy(self):
@@ -235,17 +244,33 @@ class FilterSidebar(UiElement, FilterEventConsumer):
         :params filter_type: the type of filter that the user wants to create
         """
         standard_filter = self._data_request.get_standard_filter(filter_type=filter_type)
+        parent_id = self._tree_id_to_uuid[self._clicked_tree_item]
+        # counts the matches as if the filter was added to the clicked group
+        preview_callback = partial(self._data_request.get_match_count, parent_id=parent_id)
         if standard_filter.type == "discrete filter":
             dialog = CreateDiscreteFilterDialog(filter_record=standard_filter,
                                                 structure_name=self._filter_structure.value,
-                                                selection_callback=self._data_request.get_discrete_selection_column)
+                                                selection_callback=self._data_request.get_discrete_selection_column,
+                                                preview_callback=preview_callback)
         if standard_filter.type == "interval filter":
             dialog = CreateIntervalFilterDialog(filter_record=standard_filter,
                                                 structure_name=self._filter_structure.value,
-                                                selection_callback=self._data_request.get_interval_selection_column)
+                                                selection_callback=self._data_request.get_interval_selection_column,
+                                                preview_callback=preview_callback)
         if standard_filter.type == "polygon filter":
             dialog = CreatePolygonFilterDialog(filter_record=standard_filter,
-                                               structure_name=self._filter_structure.value)
+                                               structure_name=self._filter_structure.value,
+                                               preview_callback=preview_callback)
+        if standard_filter.type == "sequence filter":
+            dialog = CreateSequenceFilterDialog(filter_record=standard_filter,
+                                                structure_name=self._filter_structure.value,
+                                                preview_callback=preview_callback)
+        if standard_filter.type == "aggregate filter":
+            # all metrics share the same kind of interval, so the interval does not change with the metric
+            dialog = CreateAggregateFilterDialog(filter_record=standard_filter,
+                                                 structure_name=self._filter_structure.value,
+                                                 selection_callback=lambda metric: standard_filter.intervall,
+                                                 preview_callback=preview_callback)
         self._from_filter_dialog_to_controller(dialog=dialog)
         self._clicked_tree_item = None
 
@@ -255,20 +280,36 @@ class FilterSidebar(UiElement, FilterEventConsumer):
         """
         filter_id = self._tree_id_to_uuid[self._clicked_tree_item]
         filter_record = self._data_request.get_filter(filter_id)
+        # counts the matches as if the edited filter was changed
+        preview_callback = partial(self._data_request.get_match_count, filter_id=filter_id)
         if filter_record.type == "interval filter":
             dialog = CreateIntervalFilterDialog(filter_record=filter_record,
                                                 structure_name=self._filter_structure.value,
                                                 selection_callback=self._data_request.get_interval_selection_column,
+                                                preview_callback=preview_callback,
                                                 edit=True)
         if filter_record.type == "discrete filter":
             dialog = CreateDiscreteFilterDialog(filter_record=filter_record,
                                                 structure_name=self._filter_structure.value,
                                                 selection_callback=self._data_request.get_interval_selection_column,
+                                                preview_callback=preview_callback,
                                                 edit=True)
         if filter_record.type == "polygon filter":
             dialog = CreatePolygonFilterDialog(filter_record=filter_record,
                                                structure_name=self._filter_structure.value,
+                                               preview_callback=preview_callback,
                                                edit=True)
+        if filter_record.type == "sequence filter":
+            dialog = CreateSequenceFilterDialog(filter_record=filter_record,
+                                                structure_name=self._filter_structure.value,
+                                                preview_callback=preview_callback,
+                                                edit=True)
+        if filter_record.type == "aggregate filter":
+            dialog = CreateAggregateFilterDialog(filter_record=filter_record,
+                                                 structure_name=self._filter_structure.value,
+                                                 selection_callback=lambda metric: filter_record.intervall,
+                                                 preview_callback=preview_callback,
+                                                 edit=True)
         self._from_filter_dialog_to_controller(dialog, edit=True)
         self._clicked_tree_item = None
 
@@ -0,0 +1,115 @@
+from typing import Optional
+from typing import TYPE_CHECKING
+
+import numpy as np
+from matplotlib import colormaps
+from PIL import Image
+
+from src.data_transfer.content import Column
+from src.data_transfer.record import DataRecord
+from src.data_transfer.record import PositionRecord
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    tile_to_decimal
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.raster_layer import \
+    RasterLayer
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.raster_layer import \
+    RasterView
+
+if TYPE_CHECKING:
+    from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.map import MapView
+
+
+class DensityLayer(RasterLayer):
+    """
+    Shows the number of filtered datapoints, or their mean value of a column, in a grid over the visible map area.
+    The datapoints are binned by the database into the OSM tiles of a zoom level that is BIN_ZOOM_OFFSET levels
+    deeper than the map, so only one row per non-empty bin is transferred, no matter how many datapoints there are.
+    The bins are queried on the rendering thread, which uses its own database connection. The image is passed back
+    to the main loop like any raster image and errors of the query are shown by the main window.
+    """
+
+    # a map tile has 256 pixel, so the bins of 6 levels deeper have a size of 4 pixel
+    BIN_ZOOM_OFFSET = 6
+    COUNT_COLOR_MAP = "inferno"
+    VALUE_COLOR_MAP = "RdYlGn"
+    ALPHA = 180
+
+    def __init__(self, map_widget: "MapView", get_density_data: callable, value_column: Optional[Column] = None):
+        """
+        Creates a new density layer and starts rendering it.
+        :param map_widget: the map widget on which the layer should be drawn
+        :param get_density_data: a method that takes the bin zoom level, the north-west and the south-east corner of
+        the map area and optionally a value column and returns the bins in this area
+        :param value_column: optionally a column whose mean value is shown instead of the number of datapoints
+        """
+        super().__init__(map_widget)
+        self._get_density_data = get_density_data
+        self._value_column = value_column
+        self.start_rendering()
+
+    def render(self, view: RasterView) -> Optional[Image.Image]:
+        """
+        Queries the bins of the view from the database and colors every pixel of the image with the bin it lies in
+        :param view: the state of the map widget to render the image for
+        :return: the image or None if there are no datapoints in the view
+        """
+        bin_zoom = view.zoom + self.BIN_ZOOM_OFFSET
+        bin_scale = 2 ** self.BIN_ZOOM_OFFSET
+        # the bin of the center of every pixel column and row of the view
+        pixel_columns = np.floor((view.upper_left_tile_pos[0] + (np.arange(view.width) + 0.5) *
+                                  view.widget_tile_width / view.width) * bin_scale).astype(np.int64)
+        pixel_rows = np.floor((view.upper_left_tile_pos[1] + (np.arange(view.height) + 0.5) *
+                               view.widget_tile_height / view.height) * bin_scale).astype(np.int64)
+        if len(pixel_columns) == 0 or len(pixel_rows) == 0:
+            return None
+
+        corners = np.array([[pixel_columns[0], pixel_rows[0]], [pixel_columns[-1] + 1, pixel_rows[-1] + 1]])
+        latitudes, longitudes = tile_to_decimal(corners, bin_zoom)
+        density_data: DataRecord = self._get_density_data(bin_zoom,
+                                                          PositionRecord(float(latitudes[0]), float(longitudes[0])),
+                                                          PositionRecord(float(latitudes[1]), float(longitudes[1])),
+                                                          value_column=self._value_column)
+        if density_data is None or density_data.data is None or len(density_data.data) == 0:
+            return None
+
+        bins = density_data.data
+        columns = bins["bin_x"].to_numpy(dtype=np.int64) - pixel_columns[0]
+        rows = bins["bin_y"].to_numpy(dtype=np.int64) - pixel_rows[0]
+        grid_width = pixel_columns[-1] - pixel_columns[0] + 1
+        grid_height = pixel_rows[-1] - pixel_rows[0] + 1
+        in_view = (columns >= 0) & (columns < grid_width) & (rows >= 0) & (rows < grid_height)
+
+        grid = np.zeros((grid_height, grid_width, 4), dtype=np.uint8)
+        grid[rows[in_view], columns[in_view]] = self._colorize(bins, in_view)
+        return Image.fromarray(grid[(pixel_rows - pixel_rows[0])[:, np.newaxis],
+                                    (pixel_columns - pixel_columns[0])[np.newaxis, :]], "RGBA")
+
+    def _colorize(self, bins, in_view: np.ndarray) -> np.ndarray:
+        """
+        Returns the RGBA color of every bin in the view. The number of datapoints is scaled logarithmically, the
+        mean values linearly between the smallest and the largest value in the view.
+        """
+        if self._value_column is None:
+            counts = np.log1p(bins["point_count"].to_numpy(dtype=float)[in_view])
+            values = counts / max(counts.max(), 1e-9) if len(counts) > 0 else counts
+            color_map = colormaps[self.COUNT_COLOR_MAP]
+        else:
+            means = bins["value"].to_numpy(dtype=float)[in_view]
+            if np.isnan(means).all():
+                # no bin in the view has a value, so none of them is shown
+                values = means
+            else:
+                minimum, maximum = np.nanmin(means), np.nanmax(means)
+                values = (means - minimum) / (maximum - minimum) if maximum > minimum else np.zeros_like(means)
+            color_map = colormaps[self.VALUE_COLOR_MAP]
+        colors = color_map(np.nan_to_num(values), bytes=True)
+        colors[:, 3] = np.where(np.isnan(values), 0, self.ALPHA)
+        return colors
+
+    def delete(self):
+        """
+        Deletes the layer from the map and stops the rendering thread
+        """
+        super().delete()
+        if self.map_widget.density_layer is self:
+            self.map_widget.density_layer = None
@@ -0,0 +1,188 @@
+import math
+from abc import ABC
+from abc import abstractmethod
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+
+class HitTarget(ABC):
+    """
+    Interface for the map elements whose datapoints and line segments are found by the hit index of the map widget.
+    The datapoints of a hit target are addressed by their index in the arrays of the hit target.
+    """
+
+    @abstractmethod
+    def get_tile_positions(self) -> np.ndarray:
+        """
+        Returns the tile positions of all datapoints at the current integer zoom level as an array with the
+        shape (n, 2)
+        """
+        pass
+
+    @abstractmethod
+    def get_segment_valid(self) -> np.ndarray:
+        """
+        Returns for every datapoint whether it is connected to the next one by a line segment
+        """
+        pass
+
+    @abstractmethod
+    def get_trajectory_indices(self) -> np.ndarray:
+        """
+        Returns for every datapoint the index of its trajectory within the hit target
+        """
+        pass
+
+    @abstractmethod
+    def points_shown(self) -> bool:
+        """
+        Returns whether the datapoints are currently visible on the map
+        """
+        pass
+
+    @abstractmethod
+    def segments_shown(self) -> bool:
+        """
+        Returns whether the line segments are currently visible on the map
+        """
+        pass
+
+    @abstractmethod
+    def datapoint_hit(self, event, index: int):
+        """
+        Handles a click on the datapoint with the given index
+        """
+        pass
+
+    @abstractmethod
+    def trajectory_hit(self, event, index: int):
+        """
+        Handles a click on the line segment that starts at the datapoint with the given index
+        """
+        pass
+
+    @abstractmethod
+    def highlight_hit(self, index: int):
+        """
+        Highlights the trajectory of the datapoint with the given index
+        """
+        pass
+
+    @abstractmethod
+    def lowlight_hit(self, index: int):
+        """
+        Disables the highlighting of the trajectory of the datapoint with the given index
+        """
+        pass
+
+
+class GridIndex:
+    """
+    A uniform grid over the positions of a trajectory sample that finds the nearest datapoint or line segment
+    around a position. A line segment connects a position with the next one if both belong to the same trajectory.
+    The cells are twice as large as the largest searched radius, so a search only has to look at the cell of the
+    searched position and its eight neighbours.
+    """
+
+    def __init__(self, positions: np.ndarray, segment_valid: np.ndarray, radius: float):
+        """
+        Builds the grid.
+        :param positions: the positions of all datapoints as an array with the shape (n, 2)
+        :param segment_valid: marks for every position whether it is connected to the next one by a line segment
+        :param radius: the largest radius that is searched, in the unit of the positions
+        """
+        self._positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self._cell_size = 2 * radius
+        self._origin = self._positions.min(axis=0) if len(self._positions) > 0 else np.zeros(2)
+        # the cell indices are shifted by one, so the neighbours of the outer cells are never negative
+        if len(self._positions) > 0:
+            self._rows = int(math.floor((self._positions[:, 1].max() - self._origin[1]) / self._cell_size)) + 3
+        else:
+            self._rows = 1
+
+        self._point_keys, self._point_values = self._build(self._positions, np.arange(len(self._positions)))
+
+        # the segments are sampled every half cell along their length, so every cell they cross holds them
+        segment_ids = np.flatnonzero(segment_valid[:max(len(self._positions) - 1, 0)])
+        starts = self._positions[segment_ids]
+        directions = self._positions[segment_ids + 1] - starts
+        lengths = np.hypot(directions[:, 0], directions[:, 1])
+        samples = np.ceil(lengths / (self._cell_size / 2)).astype(int) + 1
+        sample_segments = np.repeat(np.arange(len(segment_ids)), samples)
+        sample_steps = np.arange(len(sample_segments)) - np.repeat(np.cumsum(samples) - samples, samples)
+        fractions = sample_steps / np.maximum(samples[sample_segments] - 1, 1)
+        sample_positions = starts[sample_segments] + directions[sample_segments] * fractions[:, np.newaxis]
+        self._segment_keys, self._segment_values = self._build(sample_positions, segment_ids[sample_segments])
+
+    def _cell_keys(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Returns the key of the cell of each position
+        """
+        cells = np.floor((positions - self._origin) / self._cell_size).astype(np.int64) + 1
+        return cells[:, 0] * self._rows + cells[:, 1]
+
+    def _build(self, positions: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorts the values by the keys of the cells of their positions
+        """
+        keys = self._cell_keys(positions)
+        order = np.argsort(keys, kind="stable")
+        return keys[order], values[order]
+
+    def _candidates(self, keys: np.ndarray, values: np.ndarray, position: np.ndarray) -> np.ndarray:
+        """
+        Returns all values in the cell of the position and its neighbours
+        """
+        center = self._cell_keys(position.reshape(1, 2))[0]
+        neighbour_keys = [center + x_diff * self._rows + y_diff for x_diff in (-1, 0, 1) for y_diff in (-1, 0, 1)]
+        lefts = np.searchsorted(keys, neighbour_keys, side="left")
+        rights = np.searchsorted(keys, neighbour_keys, side="right")
+        return np.unique(np.concatenate([values[left:right] for left, right in zip(lefts, rights)]))
+
+    def nearest_point(self, position, radius: float, mask: np.ndarray = None) -> Optional[int]:
+        """
+        Returns the index of the nearest position within the radius or None if there is none.
+        :param position: the searched position
+        :param radius: the search radius, it must not be larger than the radius of the grid
+        :param mask: optionally marks the positions that can be found
+        """
+        position = np.asarray(position, dtype=float)
+        candidates = self._candidates(self._point_keys, self._point_values, position)
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        if len(candidates) == 0:
+            return None
+        differences = self._positions[candidates] - position
+        distances = np.hypot(differences[:, 0], differences[:, 1])
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > radius:
+            return None
+        return int(candidates[nearest])
+
+    def nearest_segment(self, position, radius: float, mask: np.ndarray = None) -> Optional[int]:
+        """
+        Returns the index of the start position of the nearest line segment within the radius or None if there is
+        none.
+        :param position: the searched position
+        :param radius: the search radius, it must not be larger than the radius of the grid
+        :param mask: optionally marks the start positions of the segments that can be found
+        """
+        position = np.asarray(position, dtype=float)
+        candidates = self._candidates(self._segment_keys, self._segment_values, position)
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        if len(candidates) == 0:
+            return None
+        starts = self._positions[candidates]
+        directions = self._positions[candidates + 1] - starts
+        lengths = np.einsum("ij,ij->i", directions, directions)
+        projections = np.einsum("ij,ij->i", position - starts, directions)
+        projections = np.clip(np.divide(projections, lengths, out=np.zeros_like(projections), where=lengths > 0), 0, 1)
+        differences = starts + directions * projections[:, np.newaxis] - position
+        distances = np.hypot(differences[:, 0], differences[:, 1])
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > radius:
+            return None
+        return int(candidates[nearest])
@@ -2,6 +2,10 @@ import math
 from queue import Queue
 from threading import Thread
 from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
 
 from tkintermapview import TkinterMapView
 from tkintermapview.canvas_path import CanvasPath
@@ -9,20 +13,45 @@ from tkintermapview.canvas_polygon import CanvasPolygon
 from tkintermapview.canvas_position_marker import CanvasPositionMarker
 from tkintermapview.canvas_tile import CanvasTile
 
+from src.data_transfer.content import Column
 from src.data_transfer.record import TrajectoryRecord
 from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.canvas_point import \
     CanvasPoint
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.density_layer import \
+    DensityLayer
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.hit_index import GridIndex
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.hit_index import HitTarget
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.raster_layer import \
+    RasterLayer
 from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.trajectory import Trajectory
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.trajectory_raster import \
+    TrajectoryRaster
 
 
 class MapView(TkinterMapView):
     """
     """
 
+    # maximal distance in pixel between the mouse and a datapoint or line segment to hit it
+    HIT_RADIUS = 5
+
     def __init__(self, *args, **kwargs):
         self.canvas_points: List[CanvasPoint] = []
         self.trajectories: List[Trajectory] = []
+        self.trajectory_raster: Optional[TrajectoryRaster] = None
+        self.density_layer: Optional[DensityLayer] = None
+        # the hit index over all trajectories, it is built on the first mouse event after a change
+        self._hit_index: Optional[GridIndex] = None
+        self._hit_zoom: Optional[int] = None
+        self._hit_targets: List[HitTarget] = []
+        self._hit_target_indices: Optional[np.ndarray] = None
+        self._hit_local_indices: Optional[np.ndarray] = None
+        self._hit_point_mask: Optional[np.ndarray] = None
+        self._hit_segment_mask: Optional[np.ndarray] = None
+        self._hovered: Optional[Tuple[HitTarget, int, int]] = None
         super().__init__(*args, **kwargs)
+        # the integer zoom level the trajectories on the canvas are currently drawn at
+        self._trajectory_zoom: int = round(self.zoom)
         self.last_upper_left_tile_pos = self.upper_left_tile_pos
         self.widget_tile_width = self.lower_right_tile_pos[0] - self.upper_left_tile_pos[0]
         self.widget_tile_height = self.lower_right_tile_pos[1] - self.upper_left_tile_pos[1]
@@ -32,6 +61,9 @@ class MapView(TkinterMapView):
         self._render_thread.daemon = True
         self._render_thread.start()
 
+        self.canvas.bind("<Motion>", self._hit_motion, add="+")
+        self.canvas.bind("<Button-1>", self._hit_clicked, add="+")
+
     def _render_loop(self):
         while True:
             task = self._render_queue.get()
@@ -55,10 +87,130 @@ class MapView(TkinterMapView):
         return point
 
     def set_trajectory(self, trajectory_data: TrajectoryRecord, **kwargs) -> Trajectory:
+        if len(self.trajectories) == 0:
+            self._trajectory_zoom = round(self.zoom)
         trajectory = Trajectory(map_widget=self, trajectory_data=trajectory_data, **kwargs)
         self.trajectories.append(trajectory)
+        self.invalidate_hit_index()
         return trajectory
 
+    def set_trajectory_raster(self, trajectories: List[TrajectoryRecord], **kwargs) -> TrajectoryRaster:
+        if self.trajectory_raster is not None:
+            self.trajectory_raster.delete()
+        self.trajectory_raster = TrajectoryRaster(map_widget=self, trajectories=trajectories, **kwargs)
+        self.invalidate_hit_index()
+        return self.trajectory_raster
+
+    def set_density_layer(self, get_density_data: callable, value_column: Optional[Column] = None) -> DensityLayer:
+        if self.density_layer is not None:
+            self.density_layer.delete()
+        self.density_layer = DensityLayer(map_widget=self, get_density_data=get_density_data,
+                                          value_column=value_column)
+        return self.density_layer
+
+    def raster_layers(self) -> List[RasterLayer]:
+        """
+        Returns all layers of the map that are drawn as one image
+        """
+        return [layer for layer in (self.trajectory_raster, self.density_layer) if layer is not None]
+
+    def invalidate_hit_index(self):
+        """
+        Discards the hit index, it is rebuilt on the next mouse event.
+        """
+        if self._hovered is not None:
+            target, _, index = self._hovered
+            self._hovered = None
+            target.lowlight_hit(index)
+        self._hit_index = None
+
+    def _get_hit_index(self) -> Optional[GridIndex]:
+        """
+        Returns the hit index of the current integer zoom level and builds it if necessary.
+        """
+        zoom = round(self.zoom)
+        if self._hit_index is not None and self._hit_zoom == zoom:
+            return self._hit_index
+
+        targets: List[HitTarget] = list(self.trajectories)
+        if self.trajectory_raster is not None:
+            targets.append(self.trajectory_raster)
+        positions = [target.get_tile_positions() for target in targets]
+        if sum(len(target_positions) for target_positions in positions) == 0:
+            self._hit_index = None
+            return None
+
+        lengths = [len(target_positions) for target_positions in positions]
+        self._hit_targets = targets
+        self._hit_target_indices = np.repeat(np.arange(len(targets)), lengths)
+        self._hit_local_indices = np.concatenate([np.arange(length) for length in lengths])
+        self._hit_point_mask = np.repeat([target.points_shown() for target in targets], lengths)
+        self._hit_segment_mask = np.repeat([target.segments_shown() for target in targets], lengths)
+        # the last datapoint of every target is not connected, so no segment crosses from one target to the next
+        segment_valid = np.concatenate([target.get_segment_valid() for target in targets])
+        self._hit_index = GridIndex(np.concatenate(positions), segment_valid, self._hit_radius())
+        self._hit_zoom = zoom
+        return self._hit_index
+
+    def _hit_radius(self) -> float:
+        """
+        Returns the hit radius in tiles of the current integer zoom level.
+        """
+        return self.HIT_RADIUS * self.widget_tile_width / self.width
+
+    def _event_tile_position(self, event) -> Tuple[float, float]:
+        return (self.upper_left_tile_pos[0] + event.x / self.width * self.widget_tile_width,
+                self.upper_left_tile_pos[1] + event.y / self.height * self.widget_tile_height)
+
+    def _find_hit(self, event) -> Optional[Tuple[int, bool]]:
+        """
+        Finds the datapoint or line segment under the mouse. Datapoints are preferred over line segments.
+        :return: the index in the hit index and whether a datapoint was hit or None if nothing was hit
+        """
+        hit_index = self._get_hit_index()
+        if hit_index is None:
+            return None
+        position = self._event_tile_position(event)
+        point = hit_index.nearest_point(position, self._hit_radius(), self._hit_point_mask)
+        if point is not None:
+            return point, True
+        segment = hit_index.nearest_segment(position, self._hit_radius(), self._hit_segment_mask)
+        if segment is not None:
+            return segment, False
+        return None
+
+    def _hit_clicked(self, event):
+        current = self.canvas.find_withtag("current")
+        if current and "button" in self.canvas.gettags(current[0]):
+            return
+        hit = self._find_hit(event)
+        if hit is None:
+            return
+        index, is_point = hit
+        target = self._hit_targets[self._hit_target_indices[index]]
+        local_index = int(self._hit_local_indices[index])
+        if is_point:
+            target.datapoint_hit(event, local_index)
+        else:
+            target.trajectory_hit(event, local_index)
+
+    def _hit_motion(self, event):
+        hit = self._find_hit(event)
+        hovered = None
+        if hit is not None:
+            index, _ = hit
+            target = self._hit_targets[self._hit_target_indices[index]]
+            local_index = int(self._hit_local_indices[index])
+            hovered = (target, int(target.get_trajectory_indices()[local_index]), local_index)
+        if (hovered is None) == (self._hovered is None) and \
+                (hovered is None or hovered[:2] == self._hovered[:2]):
+            return
+        if self._hovered is not None:
+            self._hovered[0].lowlight_hit(self._hovered[2])
+        self._hovered = hovered
+        if hovered is not None:
+            hovered[0].highlight_hit(hovered[2])
+
     def draw_move(self, called_after_zoom: bool = False):
         """
         copied the draw_move implementation from the TkinterMapView class and extend it to update the
@@ -137,11 +289,13 @@ class MapView(TkinterMapView):
 
             if not called_after_zoom:
                 self.canvas.move("trajectory", self.x_move, self.y_move)
+                self.canvas.move(RasterLayer.TAG, self.x_move, self.y_move)
+                for layer in self.raster_layers():
+                    layer.request_render()
             else:
-                self.canvas.delete("trajectory")
-                self.clear_render_queue()
-                for trajectory in self.trajectories:
-                    self._render_queue.put(trajectory.redraw)
+                self.zoom_trajectories()
+                for layer in self.raster_layers():
+                    layer.update_after_zoom()
 
             # draw other objects on canvas
             for marker in self.canvas_marker_list:
@@ -160,6 +314,30 @@ class MapView(TkinterMapView):
             self.pre_cache_position = (round((self.upper_left_tile_pos[0] + self.lower_right_tile_pos[0]) / 2),
                                        round((self.upper_left_tile_pos[1] + self.lower_right_tile_pos[1]) / 2))
 
+    def zoom_trajectories(self):
+        """
+        Transforms the drawn trajectories from the last integer zoom level to the current one. A tile position at
+        the new zoom level is the old one multiplied with 2 to the power of the zoom difference, so all line segments
+        can be scaled around the canvas origin and then moved by the difference of the upper left corners. Only the
+        points are updated by the trajectories themselves.
+        """
+        zoom = round(self.zoom)
+        if zoom == self._trajectory_zoom:
+            return
+        zoom_factor = 2.0 ** (zoom - self._trajectory_zoom)
+        x_move = ((self.last_upper_left_tile_pos[0] * zoom_factor - self.upper_left_tile_pos[0]) /
+                  self.widget_tile_width) * self.width
+        y_move = ((self.last_upper_left_tile_pos[1] * zoom_factor - self.upper_left_tile_pos[1]) /
+                  self.widget_tile_height) * self.height
+        self._trajectory_zoom = zoom
+        self.invalidate_hit_index()
+
+        self.canvas.scale("segment", 0, 0, zoom_factor, zoom_factor)
+        self.canvas.move("segment", x_move, y_move)
+        self.clear_render_queue()
+        for trajectory in self.trajectories:
+            self._render_queue.put(trajectory.update_after_zoom)
+
     def draw_initial_array(self):
         self.image_load_queue_tasks = []
 
@@ -216,13 +394,15 @@ class MapView(TkinterMapView):
                                    round((self.upper_left_tile_pos[1] + self.lower_right_tile_pos[1]) / 2))
 
     def delete(self, map_object: any):
-        if isinstance(map_object, (CanvasPath, CanvasPositionMarker, CanvasPolygon, CanvasPoint, Trajectory)):
+        if isinstance(map_object, (CanvasPath, CanvasPositionMarker, CanvasPolygon, CanvasPoint, Trajectory,
+                                   RasterLayer)):
             map_object.delete()
 
     def manage_z_order(self):
         """
         Defines the layering of the different map elements.
         """
+        self.canvas.lift(RasterLayer.TAG)
         self.canvas.lift("polygon")
         self.canvas.lift("path")
         self.canvas.lift("marker")
@@ -4,6 +4,7 @@ from tkinter.messagebox import showerror
 from tkinter.simpledialog import askstring
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 from uuid import UUID
 
@@ -17,6 +18,8 @@ from src.controller.output_handling.event import PolygonChanged
 from src.controller.output_handling.event import PolygonDeleted
 from src.controller.output_handling.event import RefreshTrajectoryData
 from src.controller.output_handling.event import SettingsChanged
+from src.data_transfer.content import Column
+from src.data_transfer.content.render_mode import RenderMode
 from src.data_transfer.content.settings_enum import SettingsEnum
 from src.data_transfer.record import TrajectoryRecord
 from src.data_transfer.record.file_record_map import FileRecordMap
@@ -28,9 +31,13 @@ from src.view.event_handler.event_consumers.trajectory_event_consumer import Tra
 from src.view.event_handler.i_event_hanlder_subscribe import IEventHandlerSubscribe
 from src.view.user_interface.dialogs.export_map import ExportMapDialog
 from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.canvas_point import CanvasPoint
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.density_layer import \
+    DensityLayer
 from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.map import MapView
 from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.map_button import MapButton
 from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.trajectory import Trajectory
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.trajectory_raster import \
+    TrajectoryRaster
 from src.view.user_interface.static_windows.main_window.main_window_factory import MainWindowFactory
 from src.view.user_interface.static_windows.ui_element import UiElement
 
@@ -48,6 +55,11 @@ class MapArea(UiElement, SettingsEventConsumer, TrajectoryEventConsumer, Polygon
     """
     """
 
+    # time in ms the map waits for further refreshes before it redraws the trajectories
+    REFRESH_DELAY = 50
+    # number of trajectories drawn before the main loop can handle other events again
+    TRAJECTORY_CHUNK_SIZE = 50
+
     def __init__(self,
                  controller_communication: ControllerCommunication,
                  data_request: DataRequest,
@@ -70,6 +82,12 @@ class MapArea(UiElement, SettingsEventConsumer, TrajectoryEventConsumer, Polygon
         self._polygons: List[UUID] = []
         self._map: MapView = None
         self._map_trajectories: List[Trajectory] = []
+        self._map_trajectory_raster: Optional[TrajectoryRaster] = None
+        self._map_density_layer: Optional[DensityLayer] = None
+        # pending after() call of a scheduled redraw
+        self._scheduled_reset: Optional[str] = None
+        # counts the redraws, so an unfinished redraw stops as soon as a newer one started
+        self._reset_generation = 0
 
         self._delete_polygon_mode: bool = False
         self._create_polygon_mode: bool = False
@@ -137,6 +155,7 @@ class MapArea(UiElement, SettingsEventConsumer, TrajectoryEventConsumer, Polygon
 
         self._reset_polygon_creation_process()
         self._polygons_on_map.clear()
+        self._cancel_scheduled_reset()
         self.delete_trajectories()
         self._zoom = self._map.zoom
         self._position = self._map.get_position()
@@ -253,24 +272,82 @@ class MapArea(UiElement, SettingsEventConsumer, TrajectoryEventConsumer, Polygon
         selections = settings.find(SettingsEnum.SHOW_LINE_SEGMENTS)
         selection = selections[0]
         show_line_segments = selection.selected[0]
+        render_mode_selections = settings.find(SettingsEnum.RENDER_MODE)
+        render_mode = RenderMode.SINGLE_ITEMS
+        if len(render_mode_selections) > 0:
+            render_mode = render_mode_selections[0].selected[0]
 
         self.delete_trajectories()
+        self._reset_generation += 1
+        if render_mode in (RenderMode.DENSITY, RenderMode.MEAN_SPEED):
+            # the layer shows all filtered datapoints, so the trajectory sample is not needed
+            value_column = Column.SPEED if render_mode == RenderMode.MEAN_SPEED else None
+            self._map_density_layer = self._map.set_density_layer(
+                get_density_data=self._data_request.get_density_data, value_column=value_column)
+            return
         trajectories = self._data_request.get_shown_trajectories()
-        for trajectory in trajectories:
+        if render_mode == RenderMode.RASTER:
+            # the raster is rendered in the background
+            self._map_trajectory_raster = self._map.set_trajectory_raster(
+                trajectories=trajectories,
+                get_trajectory_data=self._data_request.get_trajectory_data,
+                get_datapoint_data=self._data_request.get_datapoint_data,
+                show_line_segments=show_line_segments)
+            return
+        self._draw_trajectories(trajectories, 0, self._reset_generation, show_line_segments, render_mode)
+
+    def _draw_trajectories(self, trajectories: List[TrajectoryRecord], first: int, generation: int,
+                           show_line_segments: bool, render_mode: RenderMode):
+        """
+        Draws the trajectories in chunks. Between the chunks the main loop handles other events, so a newer
+        refresh can supersede the redraw, which then stops drawing its remaining trajectories.
+        """
+        if self._map is None or generation != self._reset_generation:
+            return
+        for trajectory in trajectories[first:first + self.TRAJECTORY_CHUNK_SIZE]:
             trajectory = self._map.set_trajectory(trajectory_data=trajectory,
                                                   get_trajectory_data=self._data_request.get_trajectory_data,
                                                   get_datapoint_data=self._data_request.get_datapoint_data,
-                                                  show_line_segments=show_line_segments)
+                                                  show_line_segments=show_line_segments,
+                                                  render_mode=render_mode)
             self._map_trajectories.append(trajectory)
+        first += self.TRAJECTORY_CHUNK_SIZE
+        if first < len(trajectories):
+            self._map.after(0, self._draw_trajectories, trajectories, first, generation, show_line_segments,
+                            render_mode)
+
+    def _schedule_reset(self):
+        """
+        Redraws the trajectories after a short delay. Refreshes in the meantime restart the delay, so a burst of
+        filter or settings changes only leads to one redraw.
+        """
+        self._cancel_scheduled_reset()
+        self._scheduled_reset = self._map.after(self.REFRESH_DELAY, self._scheduled_reset_trajectories)
+
+    def _scheduled_reset_trajectories(self):
+        self._scheduled_reset = None
+        if self._map is not None:
+            self.reset_trajectories()
+
+    def _cancel_scheduled_reset(self):
+        if self._scheduled_reset is not None:
+            self._map.after_cancel(self._scheduled_reset)
+            self._scheduled_reset = None
 
     def delete_trajectories(self):
         for trajectory in self._map_trajectories:
             trajectory.delete()
         self._map_trajectories = []
+        if self._map_trajectory_raster is not None:
+            self._map_trajectory_raster.delete()
+            self._map_trajectory_raster = None
+        if self._map_density_layer is not None:
+            self._map_density_layer.delete()
+            self._map_density_layer = None
 
     def process_changed_settings(self, event: SettingsChanged):
         if self._map is not None:
-            self.reset_trajectories()
+            self._schedule_reset()
 
     def process_added_polygon(self, event: PolygonAdded):
         self._polygons.append(event.id)
@@ -289,4 +366,4 @@ class MapArea(UiElement, SettingsEventConsumer, TrajectoryEventConsumer, Polygon
 
     def process_refreshed_trajectory_data(self, event: RefreshTrajectoryData):
         if self._map is not None:
-            self.reset_trajectories()
+            self._schedule_reset()
@@ -0,0 +1,69 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def decimal_to_world(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Converts arrays of decimal coordinates to OSM tile coordinates at zoom level 0. The result holds one row
+    (x, y) for every coordinate. This is the vectorized version of tkintermapview's decimal_to_osm.
+    :param latitudes: the latitudes in degree
+    :param longitudes: the longitudes in degree
+    :return: the tile coordinates at zoom level 0 as an array with the shape (n, 2)
+    """
+    latitudes_rad = np.radians(np.asarray(latitudes, dtype=float))
+    x_world = (np.asarray(longitudes, dtype=float) + 180.0) / 360.0
+    y_world = (1.0 - np.log(np.tan(latitudes_rad) + (1 / np.cos(latitudes_rad))) / np.pi) / 2.0
+    return np.column_stack((x_world, y_world))
+
+
+def world_to_tile(world_positions: np.ndarray, zoom: int) -> np.ndarray:
+    """
+    Converts tile coordinates at zoom level 0 to tile coordinates at the given zoom level
+    :param world_positions: the tile coordinates at zoom level 0
+    :param zoom: the integer zoom level
+    """
+    return world_positions * (2.0 ** zoom)
+
+
+def decimal_to_osm(latitudes: np.ndarray, longitudes: np.ndarray, zoom: int) -> np.ndarray:
+    """
+    Converts arrays of decimal coordinates to OSM tile coordinates at the given zoom level
+    :param latitudes: the latitudes in degree
+    :param longitudes: the longitudes in degree
+    :param zoom: the integer zoom level
+    :return: the tile coordinates as an array with the shape (n, 2)
+    """
+    return world_to_tile(decimal_to_world(latitudes, longitudes), zoom)
+
+
+def tile_to_canvas(tile_positions: np.ndarray, upper_left_tile_pos: Tuple[float, float],
+                   widget_tile_width: float, widget_tile_height: float,
+                   width: float, height: float) -> np.ndarray:
+    """
+    Converts tile coordinates to canvas coordinates of the map widget
+    :param tile_positions: the tile coordinates as an array with the shape (n, 2)
+    :param upper_left_tile_pos: the tile position of the upper left corner of the map widget
+    :param widget_tile_width: the number of tiles that fit in the width of the widget
+    :param widget_tile_height: the number of tiles that fit in the height of the widget
+    :param width: the width of the widget in pixel
+    :param height: the height of the widget in pixel
+    :return: the canvas coordinates as an array with the shape (n, 2)
+    """
+    offset = np.array(upper_left_tile_pos, dtype=float)
+    scale = np.array((width / widget_tile_width, height / widget_tile_height), dtype=float)
+    return (tile_positions - offset) * scale
+
+
+def tile_to_decimal(tile_positions: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts OSM tile coordinates at the given zoom level back to decimal coordinates. This is the vectorized
+    version of tkintermapview's osm_to_decimal.
+    :param tile_positions: the tile coordinates as an array with the shape (n, 2)
+    :param zoom: the integer zoom level
+    :return: the latitudes and the longitudes in degree
+    """
+    world_positions = np.asarray(tile_positions, dtype=float).reshape(-1, 2) / (2.0 ** zoom)
+    longitudes = world_positions[:, 0] * 360.0 - 180.0
+    latitudes = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * world_positions[:, 1]))))
+    return latitudes, longitudes
@@ -0,0 +1,206 @@
+import tkinter as tk
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from queue import Empty
+from queue import Queue
+from threading import Condition
+from threading import Thread
+from tkinter.messagebox import showerror
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+import numpy as np
+from PIL import Image
+from PIL import ImageTk
+
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    tile_to_canvas
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    world_to_tile
+
+if TYPE_CHECKING:
+    from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.map import MapView
+
+
+@dataclass(frozen=True)
+class RasterView:
+    """
+    snapshot of the map widget state a raster image is rendered for
+    """
+
+    zoom: int
+    upper_left_tile_pos: Tuple[float, float]
+    widget_tile_width: float
+    widget_tile_height: float
+    width: int
+    height: int
+
+    @classmethod
+    def of(cls, map_widget: "MapView") -> "RasterView":
+        """
+        creates a snapshot of the current state of the map widget
+        """
+        return cls(round(map_widget.zoom), tuple(map_widget.upper_left_tile_pos),
+                   map_widget.widget_tile_width, map_widget.widget_tile_height,
+                   int(map_widget.width), int(map_widget.height))
+
+    def to_canvas(self, world_positions: np.ndarray) -> np.ndarray:
+        """
+        projects positions at zoom level 0 to the canvas positions of this view
+        """
+        return tile_to_canvas(world_to_tile(world_positions, self.zoom), self.upper_left_tile_pos,
+                              self.widget_tile_width, self.widget_tile_height, self.width, self.height)
+
+
+class RasterLayer(ABC):
+    """
+    A map layer that is drawn as one transparent image on the map. The image is rendered on a worker thread and
+    placed as a single canvas image above the map tiles, so the map stays responsive while it is rendered. Only the
+    latest requested view is rendered, older requests are dropped. A failed rendering is reported on the main thread
+    and the layer keeps rendering the next views.
+    """
+
+    TAG = "raster"
+    # interval in ms in which the main thread checks for finished images
+    POLL_INTERVAL = 20
+
+    def __init__(self, map_widget: "MapView"):
+        """
+        Creates the layer and starts the rendering thread. Subclasses call start_rendering() once they are set up.
+        :param map_widget: the map widget on which the layer should be drawn
+        """
+        self.map_widget = map_widget
+        self._canvas_image: Optional[int] = None
+        self._photo_image: Optional[ImageTk.PhotoImage] = None
+        # canvas tag of the elements of this layer
+        self._tag = f"{self.TAG}_{id(self)}"
+
+        self._deleted = False
+        self._requested_view: Optional[RasterView] = None
+        self._request_condition = Condition()
+        # the rendered views with their image or the error with which their rendering failed
+        self._results: Queue = Queue()
+        # whether the last rendering failed, so an error that occurs in every view is only reported once
+        self._failed = False
+        self._render_thread = Thread(target=self._render_loop)
+        self._render_thread.daemon = True
+
+    def start_rendering(self):
+        """
+        Starts the rendering thread and renders the first image
+        """
+        self._render_thread.start()
+        self.request_render()
+        self._poll_results()
+
+    @abstractmethod
+    def render(self, view: RasterView) -> Optional[Image.Image]:
+        """
+        Renders the layer into a transparent image of the size of the map widget. This method is called on the
+        worker thread, so it must not access tkinter.
+        :param view: the state of the map widget to render the image for
+        :return: the image or None if nothing should be shown
+        """
+        pass
+
+    def request_render(self):
+        """
+        Requests a new image for the current state of the map widget. Requests that were not started yet are
+        replaced, so only the latest view is rendered.
+        """
+        with self._request_condition:
+            self._requested_view = RasterView.of(self.map_widget)
+            self._request_condition.notify()
+
+    def update_after_zoom(self):
+        """
+        Hides the image, because it does not match the new zoom level, and renders a new one
+        """
+        if self._canvas_image is not None:
+            self.map_widget.canvas.itemconfigure(self._canvas_image, state=tk.HIDDEN)
+        self.request_render()
+
+    def _render_loop(self):
+        """
+        Renders the requested views on the worker thread until the layer is deleted. An error of a rendering is passed
+        to the main thread, so a single failed view does not stop the layer.
+        """
+        while True:
+            with self._request_condition:
+                while self._requested_view is None and not self._deleted:
+                    self._request_condition.wait()
+                if self._deleted:
+                    return
+                view = self._requested_view
+                self._requested_view = None
+            try:
+                image = self.render(view)
+            except Exception as error:
+                self._results.put((view, None, error))
+                continue
+            self._results.put((view, image, None))
+
+    def _poll_results(self):
+        """
+        Places finished images on the canvas. This method calls itself with tk.after(), because tkinter
+        can only be updated from the main thread.
+        """
+        if self._deleted:
+            return
+        result = None
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except Empty:
+                break
+        if result is not None:
+            view, image, error = result
+            if error is not None and not self._failed:
+                showerror(title="Map", message=f"The map layer could not be rendered: {error}")
+            self._failed = error is not None
+            self._show_image(view, image)
+        self.map_widget.after(self.POLL_INTERVAL, self._poll_results)
+
+    def _show_image(self, view: RasterView, image: Optional[Image.Image]):
+        """
+        Places a rendered image on the canvas. Images of an outdated zoom level are dropped, images of an outdated
+        position are moved by the distance the map was moved since the rendering started.
+        """
+        if view.zoom != round(self.map_widget.zoom):
+            return
+        if image is None:
+            if self._canvas_image is not None:
+                self.map_widget.canvas.itemconfigure(self._canvas_image, state=tk.HIDDEN)
+            return
+        x_offset, y_offset = self._view_offset(view)
+        self._photo_image = ImageTk.PhotoImage(image)
+        if self._canvas_image is None:
+            self._canvas_image = self.map_widget.canvas.create_image(x_offset, y_offset, image=self._photo_image,
+                                                                     anchor=tk.NW, tags=[self.TAG, self._tag])
+        else:
+            self.map_widget.canvas.coords(self._canvas_image, x_offset, y_offset)
+            self.map_widget.canvas.itemconfigure(self._canvas_image, image=self._photo_image, state=tk.NORMAL)
+        self.map_widget.manage_z_order()
+
+    def _view_offset(self, view: RasterView) -> Tuple[float, float]:
+        """
+        Returns the canvas position of the upper left corner of an image that was rendered for the given view
+        """
+        x_offset = ((view.upper_left_tile_pos[0] - self.map_widget.upper_left_tile_pos[0]) /
+                    self.map_widget.widget_tile_width) * self.map_widget.width
+        y_offset = ((view.upper_left_tile_pos[1] - self.map_widget.upper_left_tile_pos[1]) /
+                    self.map_widget.widget_tile_height) * self.map_widget.height
+        return x_offset, y_offset
+
+    def delete(self):
+        """
+        Deletes the image from the map and stops the rendering thread
+        """
+        with self._request_condition:
+            self._deleted = True
+            self._request_condition.notify()
+        self.map_widget.canvas.delete(self._tag)
+        self._canvas_image = None
+        self._photo_image = None
@@ -1,15 +1,25 @@
 import tkinter as tk
+from typing import Dict
 from typing import List
 from typing import TYPE_CHECKING
 from uuid import UUID
 
+import numpy as np
 import pandas as pd
 from pandastable import Table
 from tkintermapview.utility_functions import decimal_to_osm
 
+from src.data_transfer.content.render_mode import RenderMode
 from src.data_transfer.record import DataPointRecord
 from src.data_transfer.record import DataRecord
 from src.data_transfer.record import TrajectoryRecord
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.hit_index import HitTarget
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    decimal_to_world
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    tile_to_canvas
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    world_to_tile
 
 if TYPE_CHECKING:
     from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.map import MapView
@@ -17,10 +27,11 @@ if TYPE_CHECKING:
 GREYED_OUT_COLOR = "grey"
 
 
-class Trajectory:
+class Trajectory(HitTarget):
     """
     Defines a Trajectory that is drawn on the map. The trajectory holds all data that is needed for
-    the trajectory to be displayed on the map.
+    the trajectory to be displayed on the map. Clicks and hovering are resolved by the hit index of the map widget,
+    so the canvas elements of the trajectory have no event bindings.
     """
 
     RADIUS = 3
@@ -28,10 +39,12 @@ class Trajectory:
     SEGMENT_WIDTH = 3
     POINT_HIGHLIGHT_WIDTH = 3
     SEGMENT_HIGHLIGHT_WIDTH = 5
+    # minimal zoom level at which the datapoints are drawn in the batched render mode
+    BATCHED_POINT_MIN_ZOOM = 16
 
     def __init__(self, map_widget: "MapView", trajectory_data: TrajectoryRecord,
                  get_trajectory_data: callable, get_datapoint_data: callable,
-                 show_line_segments: bool):
+                 show_line_segments: bool, render_mode: RenderMode = RenderMode.SINGLE_ITEMS):
         """
         Creates a new Trajectory based on a Trajectory Record.
         :params map_widget: the map widget on which the trajectories should be drawn
@@ -39,19 +52,27 @@ class Trajectory:
         :param get_datapoint_data: a method that takes an uuid of a datapoint and returns the raw data of the datapoint
         :param get_trajectory_data: a method tha takes an uuid of a trajectory and
         returns the raw data of the trajectory
+        :param render_mode: defines whether every element is drawn on its own or the trajectory is drawn batched
         """
         self.map_widget = map_widget
         self.trajectory_data = trajectory_data
         self._show_line_segments = show_line_segments
+        self._render_mode = render_mode
 
         self._points: List = []
         self._segments: List = []
+        # the projected positions of the datapoints at zoom level 0 and the tile positions per integer zoom level
+        self._world_positions: np.ndarray = decimal_to_world(trajectory_data.get_latitudes(),
+                                                             trajectory_data.get_longitudes())
+        self._tile_positions: Dict[int, np.ndarray] = {}
         self._get_datapoint_data = get_datapoint_data
         self._get_trajectory_data = get_trajectory_data
 
         self._trajectory_record = trajectory_data
 
         self._uuid = trajectory_data.id
+        # canvas tag that is shared by all canvas elements of this trajectory
+        self._tag = f"trajectory_{self._uuid}"
         # caches the datapoint that was clicked
         self._clicked_datapoint: UUID = None
 
@@ -68,24 +89,28 @@ class Trajectory:
         """
         This method clears all canvas elements that belong to the trajectory and then
         recreates all canvas elements that belong to the trajectory and puts them on the map.
-        This method should only be used for the zoom redraw and not for basic move operations since
-        this method is quite inefficient compared to moving all elements by the same x and y diffs.
-        For zooming this method is still used, because each element is moved by different x and y diffs in the canvas.
+        This method should neither be used for basic move operations nor for zooming, since moving and
+        scaling all elements on the canvas is much cheaper. See update_after_zoom for the zoom case.
+        """
+        if self._render_mode == RenderMode.BATCHED:
+            self.redraw_batched()
+        else:
+            self.redraw_single_items()
+
+    def redraw_single_items(self):
+        """
+        Draws every datapoint and every line segment of the trajectory as its own canvas element.
         """
         self.clear()
         datapoints = self.trajectory_data.datapoints
+        canvas_positions = self.get_canvas_positions().tolist()
         for i in range(len(datapoints) - 1):
             # in each iteration the i-th point and the i-th line segment is drawn
             start_point: DataPointRecord = datapoints[i]
             end_point: DataPointRecord = datapoints[i + 1]
 
-            start_position = start_point.get_position_as_tuple()
-            end_position = end_point.get_position_as_tuple()
-
-            start_canvas_pos = self.get_canvas_pos(start_position, self.map_widget.widget_tile_width,
-                                                   self.map_widget.widget_tile_height)
-            end_canvas_pos = self.get_canvas_pos(end_position, self.map_widget.widget_tile_width,
-                                                 self.map_widget.widget_tile_height)
+            start_canvas_pos = canvas_positions[i]
+            end_canvas_pos = canvas_positions[i + 1]
 
             start_point_color = self.convert_int_to_hex_color(start_point.visualisation)
             line_segment_color = self.convert_int_to_hex_color(
@@ -97,23 +122,18 @@ class Trajectory:
                                                               start_canvas_pos[1] + self.RADIUS,
                                                               fill=start_point_color,
                                                               width=self.POINT_WIDTH,
-                                                              tags=["trajectory", "point"])
-            self.map_widget.canvas.tag_bind(canvas_point, "<Button-1>",
-                                            lambda event: self.datapoint_clicked(event, start_point.id))
+                                                              tags=["trajectory", "point", self._tag])
             self._points.append(canvas_point)
             canvas_line = self.map_widget.canvas.create_line(start_canvas_pos[0], start_canvas_pos[1],
                                                              end_canvas_pos[0], end_canvas_pos[1],
                                                              fill=line_segment_color,
                                                              width=self.SEGMENT_WIDTH,
-                                                             tags=["trajectory", "segment"])
-            self.map_widget.canvas.tag_bind(canvas_line, "<Button-1>", self.trajectory_clicked)
+                                                             tags=["trajectory", "segment", self._tag])
             self._segments.append(canvas_line)
 
         if len(datapoints) > 0:
             last_point = datapoints[-1]
-            last_point_position = last_point.get_position_as_tuple()
-            canvas_position = self.get_canvas_pos(last_point_position, self.map_widget.widget_tile_width,
-                                                  self.map_widget.widget_tile_height)
+            canvas_position = canvas_positions[-1]
             color = self.convert_int_to_hex_color(last_point.visualisation)
             canvas_point = self.map_widget.canvas.create_oval(canvas_position[0] + self.RADIUS,
                                                               canvas_position[1] - self.RADIUS,
@@ -121,22 +141,133 @@ class Trajectory:
                                                               canvas_position[1] + self.RADIUS,
                                                               fill=color,
                                                               width=self.POINT_WIDTH,
-                                                              tags=["trajectory", "point"])
-            self.map_widget.canvas.tag_bind(canvas_point, "<Button-1>",
-                                            lambda event: self.datapoint_clicked(event, start_point.id))
+                                                              tags=["trajectory", "point", self._tag])
             self._points.append(canvas_point)
 
         if self._show_line_segments is False:
             self.turn_off_line_segments()
+        self.map_widget.canvas.lift("point")
 
-        for point in self._points:
-            self.map_widget.canvas.tag_bind(point, "<Enter>", lambda event: self.highlight_trajectory())
-            self.map_widget.canvas.tag_bind(point, "<Leave>", lambda event: self.lowlight_trajectory())
-        for segment in self._segments:
-            self.map_widget.canvas.tag_bind(segment, "<Enter>", lambda event: self.highlight_trajectory())
-            self.map_widget.canvas.tag_bind(segment, "<Leave>", lambda event: self.lowlight_trajectory())
+    def redraw_batched(self):
+        """
+        Draws the trajectory with as few canvas elements as possible. Consecutive line segments with the same color
+        are drawn as one polyline, so a trajectory with a single color is exactly one canvas line. The datapoints are
+        only drawn if the map is zoomed in far enough.
+        """
+        self.clear()
+        datapoints = self.trajectory_data.datapoints
+        if len(datapoints) == 0:
+            return
+        canvas_positions = self.get_canvas_positions()
+
+        run_start = 0
+        run_color = None
+        for i in range(len(datapoints) - 1):
+            segment_color = self.convert_int_to_hex_color(
+                round((datapoints[i].visualisation + datapoints[i + 1].visualisation) / 2))
+            if run_color is not None and segment_color != run_color:
+                self._create_polyline(canvas_positions[run_start:i + 1], run_color)
+                run_start = i
+            run_color = segment_color
+        if run_color is not None:
+            self._create_polyline(canvas_positions[run_start:], run_color)
+
+        # a trajectory with a single datapoint has no line and is only visible through its point
+        if self._batched_points_shown():
+            for datapoint, canvas_position in zip(datapoints, canvas_positions.tolist()):
+                canvas_point = self.map_widget.canvas.create_oval(canvas_position[0] + self.RADIUS,
+                                                                  canvas_position[1] - self.RADIUS,
+                                                                  canvas_position[0] - self.RADIUS,
+                                                                  canvas_position[1] + self.RADIUS,
+                                                                  fill=self.convert_int_to_hex_color(
+                                                                      datapoint.visualisation),
+                                                                  width=self.POINT_WIDTH,
+                                                                  tags=["trajectory", "point", self._tag])
+                self._points.append(canvas_point)
+
+        if self._show_line_segments is False:
+            self.turn_off_line_segments()
         self.map_widget.canvas.lift("point")
 
+    def _batched_points_shown(self) -> bool:
+        """
+        Decides if the datapoints are drawn in the batched render mode. A trajectory with a single datapoint has no
+        line and is only visible through its point.
+        """
+        return round(self.map_widget.zoom) >= self.BATCHED_POINT_MIN_ZOOM or len(self.trajectory_data.datapoints) == 1
+
+    def _create_polyline(self, canvas_positions: np.ndarray, color: str):
+        """
+        Draws one polyline through all given canvas positions
+        """
+        canvas_line = self.map_widget.canvas.create_line(*canvas_positions.ravel().tolist(),
+                                                         fill=color,
+                                                         width=self.SEGMENT_WIDTH,
+                                                         tags=["trajectory", "segment", self._tag])
+        self._segments.append(canvas_line)
+
+    def update_after_zoom(self):
+        """
+        Updates the trajectory after the map widget scaled and moved all line segments to the new integer zoom
+        level. The points are not scaled with the segments, since they keep their size, so they are moved to their
+        new canvas positions instead. A batched trajectory is redrawn if its points have to be shown or hidden.
+        """
+        if self._render_mode == RenderMode.BATCHED and self._batched_points_shown() != (len(self._points) > 0):
+            self.redraw_batched()
+            return
+        canvas_positions = self.get_canvas_positions().tolist()
+        for point, canvas_position in zip(self._points, canvas_positions):
+            self.map_widget.canvas.coords(point, canvas_position[0] + self.RADIUS,
+                                          canvas_position[1] - self.RADIUS,
+                                          canvas_position[0] - self.RADIUS,
+                                          canvas_position[1] + self.RADIUS)
+
+    def get_tile_positions(self) -> np.ndarray:
+        """
+        Returns the tile positions of all datapoints at the current integer zoom level of the map widget. The tile
+        positions are cached per zoom level.
+        """
+        zoom = round(self.map_widget.zoom)
+        if zoom not in self._tile_positions:
+            self._tile_positions[zoom] = world_to_tile(self._world_positions, zoom)
+        return self._tile_positions[zoom]
+
+    def get_segment_valid(self) -> np.ndarray:
+        segment_valid = np.ones(len(self.trajectory_data.datapoints), dtype=bool)
+        segment_valid[-1:] = False
+        return segment_valid
+
+    def get_trajectory_indices(self) -> np.ndarray:
+        return np.zeros(len(self.trajectory_data.datapoints), dtype=int)
+
+    def points_shown(self) -> bool:
+        if self._render_mode == RenderMode.BATCHED:
+            return self._batched_points_shown()
+        return True
+
+    def segments_shown(self) -> bool:
+        return self._show_line_segments
+
+    def datapoint_hit(self, event, index: int):
+        self.datapoint_clicked(event, self.trajectory_data.datapoints[index].id)
+
+    def trajectory_hit(self, event, index: int):
+        self.trajectory_clicked(event)
+
+    def highlight_hit(self, index: int):
+        self.highlight_trajectory()
+
+    def lowlight_hit(self, index: int):
+        self.lowlight_trajectory()
+
+    def get_canvas_positions(self) -> np.ndarray:
+        """
+        Returns the canvas positions of all datapoints as an array with the shape (n, 2)
+        """
+        return tile_to_canvas(self.get_tile_positions(), self.map_widget.upper_left_tile_pos,
+                              self.map_widget.widget_tile_width, self.map_widget.widget_tile_height,
+                              self.map_widget.width, self.map_widget.height)
+
     def get_canvas_pos(self, position, widget_tile_width, widget_tile_height):
         """
         Returns the canvas position for a given coordinate tuple
@@ -157,6 +288,7 @@ class Trajectory:
         for segment in self._segments:
             self.map_widget.canvas.itemconfigure(segment, state=tk.HIDDEN)
         self._show_line_segments = False
+        self.map_widget.invalidate_hit_index()
 
     def turn_on_line_segments(self):
         """
@@ -165,6 +297,7 @@ class Trajectory:
         for segment in self._segments:
             self.map_widget.canvas.itemconfigure(segment, state=tk.NORMAL)
         self._show_line_segments = True
+        self.map_widget.invalidate_hit_index()
 
     def trajectory_clicked(self, event):
         """
@@ -178,7 +311,7 @@ class Trajectory:
         """
         trajectory_data_record: DataRecord = self._get_trajectory_data(trajectory_id=self._uuid)
         data = trajectory_data_record.data
-        self._display_raw_data(data=data, title="Trajectory Data")
+        self.display_raw_data(data=data, title="Trajectory Data")
 
     def datapoint_clicked(self, event, datapoint_id: UUID):
         """
@@ -193,10 +326,11 @@ class Trajectory:
         """
         datapoint_data_record: DataRecord = self._get_datapoint_data(datapoint_id=self._clicked_datapoint)
         data = datapoint_data_record.data
-        self._display_raw_data(data=data, title="Datapoint Data")
+        self.display_raw_data(data=data, title="Datapoint Data")
         self._clicked_datapoint = None
 
-    def _display_raw_data(self, data: pd.DataFrame, title: str):
+    @staticmethod
+    def display_raw_data(data: pd.DataFrame, title: str):
         """
         Creates a new Window and displays a dataframe in the window.
         :param data: the dataframe that should be displayed
@@ -235,15 +369,13 @@ class Trajectory:
         if self in self.map_widget.trajectories:
             self.map_widget.trajectories.remove(self)
         self.clear()
+        self.map_widget.invalidate_hit_index()
 
     def clear(self):
         """
         Deletes all canvas elements of the trajectory
         """
-        for point in self._points:
-            self.map_widget.canvas.delete(point)
-        for segment in self._segments:
-            self.map_widget.canvas.delete(segment)
+        self.map_widget.canvas.delete(self._tag)
         self._points = []
         self._segments = []
 
@@ -0,0 +1,211 @@
+import tkinter as tk
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import numpy as np
+from PIL import Image
+from PIL import ImageDraw
+
+from src.data_transfer.record import DataRecord
+from src.data_transfer.record import TrajectoryRecord
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.hit_index import HitTarget
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    decimal_to_world
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    tile_to_canvas
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.projection import \
+    world_to_tile
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.raster_layer import \
+    RasterLayer
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.raster_layer import \
+    RasterView
+from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.trajectory import Trajectory
+
+if TYPE_CHECKING:
+    from src.view.user_interface.static_windows.main_window.main_window_elements.map_area.map import MapView
+
+
+class TrajectoryRaster(RasterLayer, HitTarget):
+    """
+    Draws a whole sample of trajectories as one transparent image on the map. The image is rendered with PIL on a
+    worker thread, which keeps the map responsive for samples with tens of thousands of trajectories. Clicks and
+    hovering are resolved by the hit index of the map widget.
+    """
+
+    RADIUS = Trajectory.RADIUS
+    SEGMENT_WIDTH = Trajectory.SEGMENT_WIDTH
+    SEGMENT_HIGHLIGHT_WIDTH = Trajectory.SEGMENT_HIGHLIGHT_WIDTH
+    POINT_MIN_ZOOM = Trajectory.BATCHED_POINT_MIN_ZOOM
+
+    def __init__(self, map_widget: "MapView", trajectories: List[TrajectoryRecord],
+                 get_trajectory_data: callable, get_datapoint_data: callable,
+                 show_line_segments: bool):
+        """
+        Creates a new raster of the given trajectories and starts rendering it.
+        :param map_widget: the map widget on which the trajectories should be drawn
+        :param trajectories: the trajectory data
+        :param get_trajectory_data: a method tha takes an uuid of a trajectory and returns the raw data of the
+        trajectory
+        :param get_datapoint_data: a method that takes an uuid of a datapoint and returns the raw data of the datapoint
+        :param show_line_segments: whether the line segments are drawn
+        """
+        super().__init__(map_widget)
+        self._show_line_segments = show_line_segments
+        self._get_trajectory_data = get_trajectory_data
+        self._get_datapoint_data = get_datapoint_data
+
+        self._trajectory_ids: List[UUID] = [trajectory.id for trajectory in trajectories]
+        self._datapoint_ids: List[UUID] = [datapoint.id for trajectory in trajectories
+                                           for datapoint in trajectory.datapoints]
+        lengths = np.array([len(trajectory.datapoints) for trajectory in trajectories], dtype=int)
+        # index of the first datapoint of each trajectory, the last entry is the total number of datapoints
+        self._offsets: np.ndarray = np.concatenate(([0], np.cumsum(lengths)))
+        # index of the trajectory of each datapoint
+        self._point_trajectories: np.ndarray = np.repeat(np.arange(len(trajectories)), lengths)
+        self._world_positions: np.ndarray = decimal_to_world(
+            [latitude for trajectory in trajectories for latitude in trajectory.get_latitudes()],
+            [longitude for trajectory in trajectories for longitude in trajectory.get_longitudes()])
+        self._colors: np.ndarray = np.array([datapoint.visualisation for trajectory in trajectories
+                                             for datapoint in trajectory.datapoints], dtype=np.int64)
+        # a segment connects the datapoint with the same index with the next one of the same trajectory
+        self._segment_colors: np.ndarray = np.round((self._colors[:-1] + self._colors[1:]) / 2).astype(np.int64)
+        self._segment_valid: np.ndarray = np.append(self._point_trajectories[:-1] == self._point_trajectories[1:],
+                                                    False)[:len(self._colors)]
+        self._tile_positions: Dict[int, np.ndarray] = {}
+
+        # the canvas line that highlights the trajectory under the mouse
+        self._highlight_line: Optional[int] = None
+        self._clicked_trajectory: Optional[UUID] = None
+        self._clicked_datapoint: Optional[UUID] = None
+
+        self._trajectory_click_menu = tk.Menu(master=map_widget.canvas, tearoff=0)
+        self._trajectory_click_menu.add_command(label="show trajectory data", command=self.show_trajectory_data)
+        self._datapoint_click_menu = tk.Menu(master=map_widget.canvas, tearoff=0)
+        self._datapoint_click_menu.add_command(label="show datapoint data", command=self.show_datapoint_data)
+        self._datapoint_click_menu.add_command(label="show trajectory data", command=self.show_trajectory_data)
+
+        self.start_rendering()
+
+    def render(self, view: RasterView) -> Image.Image:
+        """
+        Renders all trajectories into a transparent image of the size of the map widget.
+        :param view: the state of the map widget to render the image for
+        :return: the image
+        """
+        image = Image.new("RGBA", (view.width, view.height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        canvas_positions = view.to_canvas(self._world_positions)
+        in_view = ((canvas_positions[:, 0] >= -self.RADIUS) & (canvas_positions[:, 0] <= view.width + self.RADIUS) &
+                   (canvas_positions[:, 1] >= -self.RADIUS) & (canvas_positions[:, 1] <= view.height + self.RADIUS))
+
+        if self._show_line_segments:
+            for trajectory in range(len(self._trajectory_ids)):
+                start, end = self._offsets[trajectory], self._offsets[trajectory + 1]
+                # trajectories without a datapoint in the view are skipped, so segments that only cross it are lost
+                if end - start < 2 or not in_view[start:end].any():
+                    continue
+                self._draw_trajectory_lines(draw, canvas_positions, start, end)
+
+        if view.zoom >= self.POINT_MIN_ZOOM or not self._show_line_segments:
+            for index in np.flatnonzero(in_view):
+                x, y = canvas_positions[index]
+                draw.ellipse((x - self.RADIUS, y - self.RADIUS, x + self.RADIUS, y + self.RADIUS),
+                             fill=self.convert_int_to_rgb(self._colors[index]), outline=(0, 0, 0))
+        return image
+
+    def _draw_trajectory_lines(self, draw: ImageDraw.ImageDraw, canvas_positions: np.ndarray, start: int, end: int):
+        """
+        Draws the line segments of one trajectory. Consecutive segments with the same color are drawn as one line.
+        """
+        segment_colors = self._segment_colors[start:end - 1]
+        run_starts = np.concatenate(([0], np.flatnonzero(segment_colors[1:] != segment_colors[:-1]) + 1))
+        run_ends = np.concatenate((run_starts[1:], [len(segment_colors)]))
+        for run_start, run_end in zip(run_starts, run_ends):
+            coordinates = canvas_positions[start + run_start:start + run_end + 1].ravel().tolist()
+            draw.line(coordinates, fill=self.convert_int_to_rgb(segment_colors[run_start]),
+                      width=self.SEGMENT_WIDTH, joint="curve")
+
+    def get_tile_positions(self) -> np.ndarray:
+        zoom = round(self.map_widget.zoom)
+        if zoom not in self._tile_positions:
+            self._tile_positions[zoom] = world_to_tile(self._world_positions, zoom)
+        return self._tile_positions[zoom]
+
+    def get_segment_valid(self) -> np.ndarray:
+        return self._segment_valid
+
+    def get_trajectory_indices(self) -> np.ndarray:
+        return self._point_trajectories
+
+    def points_shown(self) -> bool:
+        return round(self.map_widget.zoom) >= self.POINT_MIN_ZOOM or not self._show_line_segments
+
+    def segments_shown(self) -> bool:
+        return self._show_line_segments
+
+    def datapoint_hit(self, event, index: int):
+        self._clicked_datapoint = self._datapoint_ids[index]
+        self._clicked_trajectory = self._trajectory_ids[self._point_trajectories[index]]
+        self._datapoint_click_menu.tk_popup(event.x_root, event.y_root)
+
+    def trajectory_hit(self, event, index: int):
+        self._clicked_trajectory = self._trajectory_ids[self._point_trajectories[index]]
+        self._trajectory_click_menu.tk_popup(event.x_root, event.y_root)
+
+    def highlight_hit(self, index: int):
+        """
+        Draws the trajectory of the datapoint as a wider canvas line over the image
+        """
+        self.lowlight_hit(index)
+        trajectory = self._point_trajectories[index]
+        start, end = self._offsets[trajectory], self._offsets[trajectory + 1]
+        if end - start < 2 or not self._show_line_segments:
+            return
+        canvas_positions = tile_to_canvas(self.get_tile_positions()[start:end], self.map_widget.upper_left_tile_pos,
+                                          self.map_widget.widget_tile_width, self.map_widget.widget_tile_height,
+                                          self.map_widget.width, self.map_widget.height)
+        self._highlight_line = self.map_widget.canvas.create_line(
+            *canvas_positions.ravel().tolist(), fill=Trajectory.convert_int_to_hex_color(self._segment_colors[start]),
+            width=self.SEGMENT_HIGHLIGHT_WIDTH, tags=["trajectory", self._tag])
+
+    def lowlight_hit(self, index: int):
+        if self._highlight_line is not None:
+            self.map_widget.canvas.delete(self._highlight_line)
+            self._highlight_line = None
+
+    def show_trajectory_data(self):
+        """
+        gets the data for the clicked trajectory and displays it in a new window
+        """
+        trajectory_data_record: DataRecord = self._get_trajectory_data(trajectory_id=self._clicked_trajectory)
+        Trajectory.display_raw_data(data=trajectory_data_record.data, title="Trajectory Data")
+
+    def show_datapoint_data(self):
+        """
+        gets the data for the clicked datapoint and displays it in a new window
+        """
+        datapoint_data_record: DataRecord = self._get_datapoint_data(datapoint_id=self._clicked_datapoint)
+        Trajectory.display_raw_data(data=datapoint_data_record.data, title="Datapoint Data")
+        self._clicked_datapoint = None
+
+    def delete(self):
+        """
+        Deletes the image from the map and stops the rendering thread
+        """
+        super().delete()
+        if self.map_widget.trajectory_raster is self:
+            self.map_widget.trajectory_raster = None
+        self.map_widget.invalidate_hit_index()
+        self._highlight_line = None
+
+    @staticmethod
+    def convert_int_to_rgb(rgb_int) -> Tuple[int, int, int]:
+        """
+        Converts an integer to a color tuple with the format (R, G, B)
+        """
+        rgb_int = int(rgb_int)
+        return (rgb_int >> 16) & 0xFF, (rgb_int >> 8) & 0xFF, rgb_int & 0xFF
@@ -26,6 +26,7 @@ class EnglishTexts(Enum):
     REFRESH_ANALYSIS_BTN_NAME = "refresh"
     DELETE_ANALYSIS_BTN_NAME = "delete"
     CHANGE_ANALYSIS_BTN_NAME = "change"
+    CANCEL_ANALYSIS_BTN_NAME = "cancel"
     IMPORT_ANALYSIS_BTN_NAME = "import analysis"
 
     ERROR_NO_ANALYSIS_VIEW_FOUND = "Error: no analysis found"
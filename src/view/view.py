@@ -41,7 +41,8 @@ class View(IView, IViewApplication):
         self._data_request = DataRequest(controller.data_request_facade)
         GUI.initialize(data_request=self._data_request,
                        controller_communication=self._controller_communication,
-                       event_handler=self._event_handler)
+                       event_handler=self._event_handler,
+                       show_pending_messages=self._user_input_request.show_pending_messages)
 
     def start(self):
         """
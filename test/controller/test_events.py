@@ -1,6 +1,7 @@
 from dataclasses import FrozenInstanceError
 from unittest import TestCase
 from unittest.mock import MagicMock
+from unittest.mock import call
 from uuid import uuid4
 
 from src.controller.output_handling.abstract_event import Event
@@ -121,3 +122,32 @@ class TestEventManager(TestCase):
         event_manager.notify(list([event1]))
         # event_handler1.notify_event.assert_called_once_with(event1)
         # event_handler2.notify_event.assert_called_once_with(event1)
+
+    def test_event_manager_coalescing(self):
+        event_manager = EventManager()
+        event_handler = EventHandler()
+        event_handler.notify_event = MagicMock()
+        event_manager.subscribe(event_handler)
+        filter_id = uuid4()
+
+        event_manager.send_events([FilterChanged(filter_id), RefreshTrajectoryData(), FilterChanged(filter_id),
+                                   RefreshTrajectoryData()])
+        event_handler.notify_event.assert_has_calls([call(FilterChanged(filter_id)), call(RefreshTrajectoryData())])
+        self.assertEqual(2, event_handler.notify_event.call_count)
+
+    def test_event_manager_transaction(self):
+        event_manager = EventManager()
+        event_handler = EventHandler()
+        event_handler.notify_event = MagicMock()
+        event_manager.subscribe(event_handler)
+
+        event_manager.begin_transaction()
+        event_manager.send_events([SettingsChanged(), RefreshTrajectoryData()])
+        event_manager.begin_transaction()
+        event_manager.send_events([RefreshTrajectoryData()])
+        event_manager.end_transaction()
+        event_handler.notify_event.assert_not_called()
+
+        event_manager.end_transaction()
+        event_handler.notify_event.assert_has_calls([call(SettingsChanged()), call(RefreshTrajectoryData())])
+        self.assertEqual(2, event_handler.notify_event.call_count)
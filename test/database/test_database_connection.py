@@ -0,0 +1,23 @@
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from src.database.database_connection import DatabaseConnection
+
+
+class TestDatabaseConnection(TestCase):
+    def setUp(self) -> None:
+        # the engine connects lazily, so no database is needed to track connections
+        self.database_connection = DatabaseConnection("localhost", "user", "password", "database", "5432")
+
+    def test_cancel_queries_of_thread(self):
+        analysis_connection, map_connection = MagicMock(), MagicMock()
+        analysis_thread = threading.Thread(target=self.database_connection.track, args=(analysis_connection,))
+        analysis_thread.start()
+        analysis_thread.join()
+        self.database_connection.track(map_connection)
+
+        # only the query of the analysis thread is cancelled
+        self.database_connection.cancel_queries(analysis_thread.ident)
+        analysis_connection.connection.dbapi_connection.cancel.assert_called_once()
+        map_connection.connection.dbapi_connection.cancel.assert_not_called()
@@ -0,0 +1,124 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from src.data_transfer.content import Column
+from src.data_transfer.content import TrajectoryMetric
+from src.data_transfer.content.logical_operator import LogicalOperator
+from src.data_transfer.record import DataRecord
+from src.data_transfer.record import MatchCountRecord
+from src.data_transfer.record import PolygonRecord
+from src.data_transfer.record import PositionRecord
+from src.data_transfer.record import TablePageQueryRecord
+from src.database.in_memory_data_facade import InMemoryDataFacade
+from src.model.filter_structure.predicate import AggregatePredicate
+from src.model.filter_structure.predicate import ExistsPredicate
+from src.model.filter_structure.predicate import GroupPredicate
+from src.model.filter_structure.predicate import InPredicate
+from src.model.filter_structure.predicate import IntervalPredicate
+from src.model.filter_structure.predicate import NotPredicate
+from src.model.filter_structure.predicate import PolygonPredicate
+from src.model.filter_structure.predicate import SequencePredicate
+
+FIRST = PolygonRecord((PositionRecord(0, 0), PositionRecord(1, 0), PositionRecord(1, 1), PositionRecord(0, 1)),
+                      "first")
+SECOND = PolygonRecord((PositionRecord(2, 2), PositionRecord(3, 2), PositionRecord(3, 3), PositionRecord(2, 3)),
+                       "second")
+
+
+class TestInMemoryDataFacade(TestCase):
+    def setUp(self):
+        self.data_facade = InMemoryDataFacade()
+        self.data_facade.set_data(DataRecord("dataset", tuple(Column.val_list()), pd.DataFrame({
+            "id": [0, 1, 2, 3, 4, 5],
+            "trajectory_id": [1, 1, 1, 2, 2, 3],
+            "latitude": [0.5, 2.5, 5.0, 2.5, 0.5, 0.5],
+            "longitude": [0.5, 2.5, 5.0, 2.5, 0.5, 0.5],
+            "speed": [10.0, 20.0, None, 30.0, 40.0, 50.0],
+            "road_type": ["primary", "primary", "secondary", None, "secondary", "primary"],
+            "original_order": [0, 1, 2, 0, 1, 0],
+        })))
+
+    def set_filter(self, predicate, negate_filter=False):
+        self.data_facade.set_point_filter(predicate.to_sql(), True, negate_filter, predicate=predicate)
+        return list(self.data_facade.get_data([Column.ID]).data["id"])
+
+    def test_interval_and_selection(self):
+        self.assertEqual([1, 3], self.set_filter(IntervalPredicate("speed", "15", "35")))
+        self.assertEqual([0, 1, 5], self.set_filter(InPredicate("road_type", ("'primary'",))))
+        self.assertEqual([1], self.set_filter(GroupPredicate(LogicalOperator.AND, (
+            IntervalPredicate("speed", "15", "35"), InPredicate("road_type", ("'primary'",))))))
+
+    def test_null_values(self):
+        # like in sql, the negation of an unknown value is unknown
+        self.assertEqual([0, 4, 5], self.set_filter(NotPredicate(IntervalPredicate("speed", "15", "35"))))
+        # but the negation of the whole filter selects every datapoint that does not fulfill it
+        self.assertEqual([0, 2, 4, 5], self.set_filter(IntervalPredicate("speed", "15", "35"), True))
+
+    def test_polygon(self):
+        self.assertEqual([0, 4, 5], self.set_filter(PolygonPredicate(FIRST)))
+
+    def test_trajectory_filters(self):
+        self.data_facade.set_trajectory_filter("filter", True, predicate=ExistsPredicate(PolygonPredicate(SECOND)))
+        self.assertEqual([1, 2], list(self.data_facade.get_trajectory_ids().data["trajectory_id"]))
+
+        predicate = SequencePredicate((FIRST, SECOND))
+        self.data_facade.set_trajectory_filter("filter", True, predicate=predicate)
+        self.assertEqual([1], list(self.data_facade.get_trajectory_ids().data["trajectory_id"]))
+
+        predicate = AggregatePredicate(TrajectoryMetric.POINT_COUNT, "2", "3")
+        self.data_facade.set_trajectory_filter("filter", True, predicate=predicate)
+        self.assertEqual([1, 2], list(self.data_facade.get_trajectory_ids().data["trajectory_id"]))
+
+    def test_can_evaluate(self):
+        self.assertTrue(self.data_facade.can_evaluate())
+        self.data_facade.set_point_filter("speed > 10", True, False)
+        self.assertFalse(self.data_facade.can_evaluate())
+        self.data_facade.set_point_filter("", False, False)
+        self.assertTrue(self.data_facade.can_evaluate())
+
+    def test_binned_data(self):
+        binned = self.data_facade.get_binned_data(0, PositionRecord(10, -10), PositionRecord(-10, 10),
+                                                  Column.SPEED).data
+        self.assertEqual(1, len(binned))
+        self.assertEqual(6, binned["point_count"][0])
+        self.assertTrue(np.isclose(30.0, binned["value"][0]))
+
+    def test_match_count(self):
+        # the current filters are not used for counting
+        self.set_filter(IntervalPredicate("speed", "15", "35"))
+        match_count = self.data_facade.get_match_count(InPredicate("road_type", ("'primary'",)),
+                                                       ExistsPredicate(PolygonPredicate(FIRST)))
+        # the second trajectory passes the trajectory filter, but none of its datapoints passes the point filter
+        self.assertEqual(MatchCountRecord(3, 2, True), match_count)
+
+        match_count = self.data_facade.get_match_count(None, ExistsPredicate(PolygonPredicate(SECOND)))
+        self.assertEqual(MatchCountRecord(5, 2, True), match_count)
+
+    def test_data_page(self):
+        query = TablePageQueryRecord((Column.ID, Column.SPEED), _page_size=4)
+        first_page = self.data_facade.get_data_page(query)
+        self.assertEqual([0, 1, 2, 3], list(first_page.data["id"]))
+        self.assertTrue(first_page.has_next)
+        self.assertEqual((2, 0, 3), first_page.last_key)
+
+        second_page = self.data_facade.get_data_page(TablePageQueryRecord((Column.ID, Column.SPEED), _page_size=4,
+                                                                          _after=first_page.last_key))
+        self.assertEqual([4, 5], list(second_page.data["id"]))
+        self.assertFalse(second_page.has_next)
+
+    def test_sorted_filtered_data_page(self):
+        self.set_filter(IntervalPredicate("speed", "15", "55"))
+        query = TablePageQueryRecord((Column.ID,), (Column.SPEED,), True, _page_size=2,
+                                     _filter_column=Column.ROAD_TYPE, _filter_values=("primary",))
+        page = self.data_facade.get_data_page(query)
+        self.assertEqual([5, 1], list(page.data["id"]))
+        self.assertEqual((20.0, 1), page.last_key)
+        self.assertFalse(page.has_next)
+
+    def test_data_chunks(self):
+        self.set_filter(IntervalPredicate("speed", "15", "45"))
+        chunks = list(self.data_facade.get_data_chunks([Column.ID, Column.SPEED], 2))
+        self.assertEqual([2, 1], [len(chunk) for chunk in chunks])
+        self.assertEqual([1, 3, 4], list(pd.concat(chunks)["id"]))
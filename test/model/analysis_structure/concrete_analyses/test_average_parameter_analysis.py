@@ -1,5 +1,7 @@
+import time
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from src.data_transfer.content import Column
@@ -10,6 +12,7 @@ from src.data_transfer.record import AnalysisRecord
 from src.data_transfer.record import DataRecord
 from src.data_transfer.record.selection_record import SelectionRecord
 from src.data_transfer.record.setting_record import SettingRecord
+from src.data_transfer.selection import BoolDiscreteOption
 from src.data_transfer.selection.discrete_option import DiscreteOption
 from src.model.analysis_structure.concrete_analysis.parameter_analysis_average import AverageParameterAnalysis
 
@@ -35,6 +38,11 @@ class TestAverageParameterAnalysis(unittest.TestCase):
                         possible_selection_range=range(1, len(Column.list()) + 1)
                     )
                 ),
+                SettingRecord(
+                    _identifier="",
+                    _context=AverageParameterAnalysis().approximate_setting_name,
+                    _selection=SelectionRecord.bool()
+                ),
             )
         )
         self.analysis = AverageParameterAnalysis()
@@ -60,6 +68,56 @@ class TestAverageParameterAnalysis(unittest.TestCase):
 
         pd.testing.assert_frame_equal(result.data.data, expected_result.data.data)
 
+    def test_analyse_approximate(self):
+        """
+        This test case tests the approximate mode, in which the averages stay exact and the modes and medians are
+        estimated with their errors. The values are few, so the estimates are exact.
+        """
+        self.analysis.set_analysis_parameters(AnalysisRecord(
+            _required_data=(self.analysis_record.required_data[0],
+                            SettingRecord(_identifier="",
+                                          _context=self.analysis.approximate_setting_name,
+                                          _selection=SelectionRecord([True], BoolDiscreteOption())))))
+        result = self.analysis.analyse(self.data_record.data).data.data \
+            .set_index(AverageParameterAnalysis.STATISTIC_COLUMN)
+
+        self.assertEqual(result[Column.SPEED.value][AverageParameterAnalysis.VALUE_ROW], 2.0)
+        self.assertEqual(result[Column.ACCELERATION.value][AverageParameterAnalysis.VALUE_ROW], 9.0)
+        self.assertEqual(result[Column.SPEED.value][AverageParameterAnalysis.MEDIAN_ROW], 2.0)
+        self.assertEqual(result[Column.TRAJECTORY_ID.value][AverageParameterAnalysis.VALUE_ROW], 'a')
+        self.assertEqual(result[Column.TRAJECTORY_ID.value][AverageParameterAnalysis.OCCURRENCES_ROW], 2)
+        self.assertEqual(result[Column.TRAJECTORY_ID.value][AverageParameterAnalysis.OCCURRENCES_ERROR_ROW], 0)
+
+    def test_approximate_is_faster(self):
+        """
+        This test case tests that the approximate mode consumes the chunks of a large input faster than the exact
+        mode, whose occurrences grow with the distinct values.
+        """
+        random = np.random.default_rng(0)
+        data = pd.DataFrame({Column.TRAJECTORY_ID.value: pd.Series(random.integers(0, 100000, 500000)).astype(str)})
+        chunks = [data.iloc[start:start + 100000] for start in range(0, len(data), 100000)]
+        durations = []
+        for approximate in [False, True]:
+            analysis = AverageParameterAnalysis()
+            analysis.set_analysis_parameters(AnalysisRecord(
+                _required_data=(SettingRecord(_identifier="",
+                                              _context=analysis.setting_name,
+                                              _selection=SelectionRecord(
+                                                  selected=[Column.TRAJECTORY_ID.value],
+                                                  option=DiscreteOption(Column.val_list()),
+                                                  possible_selection_range=range(1, len(Column.list()) + 1))),
+                                SettingRecord(_identifier="",
+                                              _context=analysis.approximate_setting_name,
+                                              _selection=SelectionRecord([approximate], BoolDiscreteOption())))))
+            start = time.perf_counter()
+            state = analysis.init_state()
+            for chunk in chunks:
+                state = analysis.consume_chunk(state, chunk)
+            analysis.finalize(state)
+            durations.append(time.perf_counter() - start)
+
+        self.assertLess(durations[1], durations[0])
+
     def test_get_required_columns(self):
         """
         This test case tests the get_required_columns method of the AverageParameterAnalysis class,
@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from src.data_transfer.content import Column
@@ -9,9 +10,24 @@ from src.data_transfer.record import AnalysisRecord
 from src.data_transfer.record.selection_record import SelectionRecord
 from src.data_transfer.record.setting_record import SettingRecord
 from src.data_transfer.selection.discrete_option import DiscreteOption
+from src.data_transfer.selection.interval_value_option import IntervalValueOption
 from src.model.analysis_structure.concrete_analysis.heatmap_analysis import HeatmapAnalysis
 
 
+def create_binned_heatmap(x_column: Column, y_column: Column, x_bins: int, y_bins: int,
+                          min_bins: int = 2) -> HeatmapAnalysis:
+    heatmap_analysis = HeatmapAnalysis()
+    settings = [SettingRecord(_context=context, _selection=SelectionRecord(selected=[column.value],
+                                                                          option=DiscreteOption(Column.val_list())))
+                for context, column in [("x axis attribute", x_column), ("y axis attribute", y_column),
+                                        ("color attribute", Column.SPEED)]]
+    settings += [SettingRecord(_context=context, _selection=SelectionRecord(selected=[bins],
+                                                                           option=IntervalValueOption(min_bins, 500)))
+                 for context, bins in [("x axis bins", x_bins), ("y axis bins", y_bins)]]
+    heatmap_analysis.set_analysis_parameters(AnalysisRecord(tuple(settings)))
+    return heatmap_analysis
+
+
 class TestHeatmapAnalysis(unittest.TestCase):
 
     def test_get_required_analysis_parameter(self):
@@ -49,6 +65,8 @@ class TestHeatmapAnalysis(unittest.TestCase):
                         option=DiscreteOption(Column.val_list())
                     )
                 ),
+                HeatmapAnalysis.create_bins_setting("x axis bins"),
+                HeatmapAnalysis.create_bins_setting("y axis bins"),
             )
         )
         self.assertTrue(heatmap_analysis.set_analysis_parameters(record))
@@ -106,6 +124,8 @@ class TestHeatmapAnalysis(unittest.TestCase):
                         option=DiscreteOption(Column.val_list())
                     )
                 ),
+                HeatmapAnalysis.create_bins_setting("x axis bins"),
+                HeatmapAnalysis.create_bins_setting("y axis bins"),
             )
         )
         heatmap_analysis = HeatmapAnalysis()
@@ -126,3 +146,62 @@ class TestHeatmapAnalysis(unittest.TestCase):
                                                      )
 
         self.assertDictEqual(expected_result.to_dict(), result.data.data.to_dict())
+
+    def test_binned_heatmap(self):
+        heatmap_analysis = create_binned_heatmap(Column.ACCELERATION, Column.TIME, 20, 10)
+        generator = np.random.default_rng(0)
+        data = pd.DataFrame({
+            Column.ACCELERATION.value: generator.uniform(-3, 3, 10000),
+            Column.TIME.value: pd.to_datetime("01.01.2023", format="%d.%m.%Y")
+            + pd.to_timedelta(generator.uniform(0, 86400, 10000), unit="s"),
+            Column.SPEED.value: generator.uniform(0, 50, 10000)
+        })
+        result: pd.DataFrame = heatmap_analysis.analyse(data).data.data
+
+        # the size is bounded by the bins and not by the distinct values
+        self.assertLessEqual(result.shape[0], 10)
+        self.assertLessEqual(result.shape[1], 20)
+        # a day is bucketed into bins of 6 hours, the accelerations into bins of 0.5
+        self.assertEqual(4, result.shape[0])
+        self.assertListEqual([-3.0, -2.5, -2.0], list(result.columns[:3]))
+
+        chunks = [data.iloc[start:start + 999] for start in range(0, len(data), 999)]
+        states = [heatmap_analysis.consume_chunk(heatmap_analysis.init_state(), chunk) for chunk in chunks]
+        chunked: pd.DataFrame = heatmap_analysis.finalize(heatmap_analysis.merge(states)).data.data
+        self.assertTrue(np.allclose(result.to_numpy(), chunked.to_numpy()))
+        self.assertTrue(result.index.equals(chunked.index))
+        self.assertTrue(result.columns.equals(chunked.columns))
+
+    def test_heatmap_of_values_around_zero(self):
+        # a single bin can not hold values on both sides of zero
+        self.assertRaises(InvalidInput, create_binned_heatmap, Column.ACCELERATION, Column.TIME, 1, 1, 1)
+        heatmap_analysis = create_binned_heatmap(Column.ACCELERATION, Column.TIME, 2, 2)
+        data = pd.DataFrame({
+            Column.ACCELERATION.value: [-1.5, 0.2, 2.0],
+            Column.TIME.value: pd.to_datetime(["01.01.2023"] * 3, format="%d.%m.%Y"),
+            Column.SPEED.value: [10.0, 20.0, 30.0]
+        })
+        result: pd.DataFrame = heatmap_analysis.analyse(data).data.data
+
+        self.assertListEqual([-5.0, 0.0], list(result.columns))
+        self.assertListEqual([10.0, 25.0], list(result.iloc[0]))
+
+    def test_heatmap_of_integers_with_missing_values(self):
+        heatmap_analysis = create_binned_heatmap(Column.SPEED_LIMIT, Column.ROAD_TYPE, 50, 50)
+        data = pd.DataFrame({
+            Column.SPEED_LIMIT.value: [30, 50, 30, 50],
+            Column.ROAD_TYPE.value: ["primary", "primary", "secondary", "secondary"],
+            Column.SPEED.value: [10.0, 20.0, 30.0, 40.0]
+        })
+        # the chunk with a missing speed limit is read as floats
+        with_missing = pd.DataFrame({
+            Column.SPEED_LIMIT.value: [30, None],
+            Column.ROAD_TYPE.value: ["primary", "primary"],
+            Column.SPEED.value: [30.0, 50.0]
+        })
+        states = [heatmap_analysis.consume_chunk(heatmap_analysis.init_state(), chunk)
+                  for chunk in [data, with_missing]]
+        result: pd.DataFrame = heatmap_analysis.finalize(heatmap_analysis.merge(states)).data.data
+
+        self.assertListEqual([30.0, 50.0], list(result.columns))
+        self.assertListEqual([20.0, 20.0], list(result.loc["primary"]))
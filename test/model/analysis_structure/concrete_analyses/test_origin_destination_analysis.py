@@ -0,0 +1,65 @@
+import unittest
+from typing import List
+from unittest.mock import Mock
+
+import pandas as pd
+
+from src.data_transfer.content import Column
+from src.data_transfer.record import PolygonRecord
+from src.data_transfer.record import PositionRecord as Point
+from src.model.analysis_structure.spatial_analysis.origin_destination_analysis import OriginDestinationAnalysis
+from src.model.polygon_structure.ipolygon_structure import IPolygonStructure
+
+
+def create_square(longitude: float, latitude: float, name: str) -> PolygonRecord:
+    """
+    Creates a square zone of a tenth of a degree with the given south-west corner.
+    """
+    return PolygonRecord((Point(_longitude=longitude, _latitude=latitude),
+                          Point(_longitude=longitude + 0.1, _latitude=latitude),
+                          Point(_longitude=longitude + 0.1, _latitude=latitude + 0.1),
+                          Point(_longitude=longitude, _latitude=latitude + 0.1)), _name=name)
+
+
+class OriginDestinationTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """
+        Sets up two zones and the points of three trajectories, the points are given as (zone, date, time).
+        """
+        self.zones = [create_square(8.0, 49.0, "a"), create_square(9.0, 49.0, "b")]
+        positions = {"a": (8.05, 49.05), "b": (9.05, 49.05), None: (8.5, 49.5)}
+        trajectories: List[List[tuple]] = [
+            # from a to b
+            [("a", "31.01.2023", "10:00:00"), (None, "31.01.2023", "10:00:05"), ("b", "31.01.2023", "10:00:10")],
+            # from b to a in more than a day
+            [("b", "31.01.2023", "10:00:00"), (None, "31.01.2023", "10:00:05"), ("a", "01.02.2023", "11:00:00")],
+            # never leaves a, so it has no travel time
+            [("a", "31.01.2023", "10:00:00"), ("a", "31.01.2023", "10:00:05")]
+        ]
+        points = [(identifier, *positions[zone], date, time) for identifier, trajectory in enumerate(trajectories)
+                  for zone, date, time in trajectory]
+        self.data_df = pd.DataFrame(points, columns=[Column.TRAJECTORY_ID.value, Column.LONGITUDE.value,
+                                                     Column.LATITUDE.value, Column.DATE.value, Column.TIME.value])
+
+    def test_analysis_origin_destination(self):
+        """
+        Tests the origin destination analysis by comparing it against the expected matrix. The travel time starts when
+        a trajectory leaves its origin and its hours are not wrapped after a day.
+        """
+        polygon_structure = Mock(IPolygonStructure)
+        polygon_structure.get_all_polygons.return_value = self.zones
+        analysis = OriginDestinationAnalysis()
+        analysis.set_polygon_structure(polygon_structure)
+        result = analysis.analyse(self.data_df)
+        expected_result = pd.DataFrame({
+            OriginDestinationAnalysis.ORIGIN_COLUMN: ['a', 'b'],
+            'a trips': [1, 1],
+            'a travel time': [float('nan'), '25:00:00'],
+            'b trips': [1, 0],
+            'b travel time': ['00:00:10', float('nan')]})
+        pd.testing.assert_frame_equal(expected_result, result.data.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,7 @@ from src.data_transfer.selection.discrete_option import DiscreteOption
 from src.model.analysis_structure.spatial_analysis.path_daytime_analysis import PathDaytimeAnalysis
 from src.model.analysis_structure.spatial_analysis.path_time_analysis import PathTimeAnalysis
 from src.model.analysis_structure.spatial_analysis.source_destination_analysis import SourceDestinationAnalysis
+from src.model.analysis_structure.spatial_analysis.start_end_analysis import StartEndAnalysis
 from src.model.polygon_structure.ipolygon_structure import IPolygonStructure
 
 
@@ -210,6 +211,17 @@ class StartEndTest(unittest.TestCase):
         })
         self.assertDictEqual(expected_result.to_dict(), result.data.data.to_dict())
 
+    def test_polygon_calculator(self):
+        """
+        Tests that the last polygon is carried forward inside a trajectory and reset for the next trajectory.
+        """
+        calculator = StartEndAnalysis.PolygonCalculator(self.start_polygon, self.end_polygon)
+        polygon_ids = calculator.get_polygon_ids(self.data_df)
+        self.assertEqual([0, 1, 1, 1, 1, 1, 1, 2,
+                          1, 1, 1, 1, 1, 1, 1, 1, 1, 2,
+                          2, 2, 1,
+                          1, 1, 1, 1, 1, 1, 1, 2], list(polygon_ids))
+
 
 class ConsumerTest(unittest.TestCase):
     def setUp(self) -> None:
@@ -8,6 +8,7 @@ from src.data_transfer.record import AnalysisRecord
 from src.data_transfer.record import DataRecord
 from src.data_transfer.record.selection_record import SelectionRecord
 from src.data_transfer.record.setting_record import SettingRecord
+from src.data_transfer.selection import BoolDiscreteOption
 from src.data_transfer.selection.discrete_option import DiscreteOption
 from src.model.analysis_structure.concrete_analysis.parameter_analysis_total import TotalParameterAnalysis
 
@@ -35,6 +36,11 @@ class TestTotalParameterAnalysis(unittest.TestCase):
                         possible_selection_range=range(1, len(Column.val_list()) + 1)
                     )
                 ),
+                SettingRecord(
+                    _identifier="",
+                    _context=TotalParameterAnalysis().approximate_setting_name,
+                    _selection=SelectionRecord.bool()
+                ),
             )
         )
 
@@ -51,6 +57,25 @@ class TestTotalParameterAnalysis(unittest.TestCase):
         self.assertEqual(result.data.data[Column.TRAJECTORY_ID.value]["Total"], 5)
         self.assertEqual(result.data.data[Column.ACCELERATION.value]["Total"], 3)
 
+    def test_analyse_approximate(self):
+        """
+        This test case tests the approximate mode, which estimates the unique values of chunks whose states are merged.
+        The values are few, so the estimates are exact.
+        """
+        self.analysis.set_analysis_parameters(AnalysisRecord(
+            _required_data=(self.analysis_record.required_data[0],
+                            SettingRecord(_identifier="",
+                                          _context=self.analysis.approximate_setting_name,
+                                          _selection=SelectionRecord([True], BoolDiscreteOption())))))
+        data = self.data.data
+        state = self.analysis.merge([self.analysis.consume_chunk(self.analysis.init_state(), data[:2]),
+                                     self.analysis.consume_chunk(self.analysis.init_state(), data[2:])])
+        result = self.analysis.finalize(state).data.data.set_index(TotalParameterAnalysis.STATISTIC_COLUMN)
+        self.assertEqual(result[Column.SPEED.value]["Total"], 4)
+        self.assertEqual(result[Column.TRAJECTORY_ID.value]["Total"], 5)
+        self.assertEqual(result[Column.ACCELERATION.value]["Total"], 3)
+        self.assertEqual(result[Column.SPEED.value]["Error"], 0)
+
     def test_get_required_columns(self):
         """
         This test case tests the get_required_columns method of the TotalParameterAnalysis class,
@@ -121,6 +121,21 @@ class TestTransmissionAnalysis(unittest.TestCase):
         result = self.analysis.analyse(self.data_record.data)
         self.assertDictEqual(result.data.data.to_dict(), self.distribution.to_dict())
 
+    def consume_chunks(self):
+        # the chunks split the first vehicle, so the time differences between the chunks have to be merged
+        data = self.data_record.data
+        states = [self.analysis.consume_chunk(self.analysis.init_state(), data.iloc[start:start + 2])
+                  for start in range(0, len(data), 2)]
+        return self.analysis.finalize(self.analysis.merge(states)).data.data
+
+    def test_chunked_average(self):
+        self.analysis.set_analysis_parameters(self._average_record)
+        self.assertDictEqual(self.consume_chunks().to_dict(), self.average.to_dict())
+
+    def test_chunked_distribution(self):
+        self.analysis.set_analysis_parameters(self._distribution_record)
+        self.assertDictEqual(self.consume_chunks().to_dict(), self.distribution.to_dict())
+
 
 if __name__ == '__main__':
     unittest.main()
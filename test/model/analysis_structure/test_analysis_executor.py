@@ -0,0 +1,69 @@
+import importlib.util
+import unittest
+
+from pandas import DataFrame
+
+from src.model.analysis_structure.analysis_executor import AnalysisExecutor
+from src.model.analysis_structure.analysis_progress import AnalysisProgress
+from src.model.analysis_structure.concrete_analysis.histrogram_analysis import HistogramAnalysis
+from test.model.analysis_structure import dummy_analysis
+from test.model.analysis_structure.dummy_analysis import DummyAnalysis
+
+
+class TestAnalysisExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = AnalysisExecutor(max_workers=2)
+        self.data = DataFrame({"id": [1, 2, 3], "speed": [10.0, 20.0, 30.0]})
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_built_in_analysis(self):
+        result = self.executor.submit(DummyAnalysis(), self.data).result(timeout=60)
+        self.assertTrue(self.data.equals(result.data))
+        self.assertEqual("Dummy Analysis", result.id)
+
+    def test_script_analysis(self):
+        # scripts are loaded the same way the file structure loads the analyses of the analysis path
+        spec = importlib.util.spec_from_file_location("module", dummy_analysis.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        futures = [self.executor.submit(module.CONSTRUCTOR(), self.data) for _ in range(3)]
+        for future in futures:
+            self.assertTrue(self.data.equals(future.result(timeout=60).data))
+
+    def test_chunked_analysis(self):
+        analysis = HistogramAnalysis()
+        data = DataFrame({"speed": [10.0, 20.0, 10.0, 30.0, 10.0, 20.0, 40.0]})
+        chunks = (data.iloc[start:start + 2] for start in range(0, len(data), 2))
+
+        result = self.executor.submit_chunks(analysis, chunks).result(timeout=60)
+        self.assertDictEqual(analysis.analyse(data).data.data.to_dict(), result.data.data.to_dict())
+
+    def test_chunk_progress(self):
+        analysis = HistogramAnalysis()
+        data = DataFrame({"speed": [10.0, 20.0, 10.0, 30.0, 10.0]})
+        chunks = (data.iloc[start:start + 2] for start in range(0, len(data), 2))
+        progress = AnalysisProgress()
+
+        self.executor.submit_chunks(analysis, chunks, progress).result(timeout=60)
+        # the three chunks are consumed before the states are merged
+        self.assertEqual(1.0, progress.get_fraction())
+
+    def test_cancelled_chunks(self):
+        analysis = HistogramAnalysis()
+        progress = AnalysisProgress()
+        read = []
+
+        def read_chunks():
+            for start in range(10):
+                read.append(start)
+                if start == 2:
+                    progress.cancel()
+                yield DataFrame({"speed": [float(start)]})
+
+        self.executor.submit_chunks(analysis, read_chunks(), progress)
+        # no chunk is read after the analysis was cancelled
+        self.assertEqual([0, 1, 2], read)
+
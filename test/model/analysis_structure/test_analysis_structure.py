@@ -1,5 +1,11 @@
+import os
+import pickle
+import tempfile
 import unittest
+from threading import Event
+from threading import get_ident
 from unittest.mock import MagicMock
+from unittest.mock import patch
 from uuid import UUID
 from uuid import uuid4
 
@@ -7,12 +13,19 @@ from pandas import DataFrame
 
 from src.controller.idata_request_facade import IDataRequestFacade
 from src.data_transfer.content import Column
+from src.data_transfer.content.analysis_view import AnalysisViewEnum
+from src.data_transfer.exception import AnalysisCancelled
 from src.data_transfer.exception import InvalidUUID
+from src.data_transfer.exception.custom_exception import QueryCancelled
 from src.data_transfer.record import AnalysisDataRecord
 from src.data_transfer.record import AnalysisRecord
 from src.data_transfer.record import AnalysisTypeRecord
 from src.data_transfer.record import DataRecord
+from src.data_transfer.record import TablePageRecord
+from src.model.analysis_structure.analysis_cache import AnalysisCache
+from src.model.analysis_structure.analysis_cache import CACHE_FILE_SUFFIX
 from src.model.analysis_structure.analysis_structure import AnalysisStructure
+from src.model.analysis_structure.concrete_analysis.table_analysis import TableAnalysis
 from src.model.analysis_structure.spatial_analysis.path_time_analysis import PathTimeAnalysis
 from src.model.polygon_structure.ipolygon_structure import IPolygonStructure
 from test.model.analysis_structure.dummy_analysis import DummyAnalysis
@@ -20,15 +33,21 @@ from test.model.analysis_structure.dummy_analysis import DummyAnalysis
 
 class TestAnalysisStructure(unittest.TestCase):
     def setUp(self):
-        data_facade_mock = MagicMock(IDataRequestFacade)
-        data_facade_mock.get_rawdata.return_value = DataRecord("id_test", tuple([Column.ID]),
-                                                               DataFrame({"ID": [uuid4()]}))
+        self.data_request = self.create_data_request()
         polygon_structure = MagicMock(IPolygonStructure)
         self.structure = AnalysisStructure()
-        self.structure.set_data_request(data_facade_mock)
+        self.structure.set_data_request(self.data_request)
         self.structure.set_polygon_structure(polygon_structure)
         self.dummy_type: AnalysisTypeRecord = self.structure.register_analysis_type(DummyAnalysis)
 
+    @staticmethod
+    def create_data_request() -> MagicMock:
+        data_facade_mock = MagicMock(IDataRequestFacade)
+        data_facade_mock.get_rawdata.return_value = DataRecord("id_test", tuple([Column.ID]),
+                                                               DataFrame({"ID": [uuid4()]}))
+        data_facade_mock.get_data_key.return_value = "dataset_filters"
+        return data_facade_mock
+
     def assert_correct_id(self, id: UUID) -> None:
         self.assertIsNotNone(id)
 
@@ -102,6 +121,166 @@ class TestAnalysisStructure(unittest.TestCase):
         self.assertEqual(result, analysis_parameter)
         analysis.get_required_analysis_parameter.assert_called()
 
+    def test_cached_analysed_data(self):
+        analysis_id: UUID = self.structure.create_analysis(self.dummy_type)
+        first_result = self.structure.get_analysed_data(analysis_id)
+        self.assertTrue(first_result.data.equals(self.structure.refresh(analysis_id).data))
+        self.data_request.get_rawdata.assert_called_once()
+
+        # the analysis runs again on other filters
+        self.data_request.get_data_key.return_value = "dataset_other_filters"
+        self.structure.get_analysed_data(analysis_id)
+        self.assertEqual(2, self.data_request.get_rawdata.call_count)
+
+        self.structure.invalidate_cache()
+        self.structure.get_analysed_data(analysis_id)
+        self.assertEqual(3, self.data_request.get_rawdata.call_count)
+
+    def test_batch_shares_query(self):
+        first_id = self.structure.create_analysis(self.dummy_type)
+        second_id = self.structure.create_analysis(self.dummy_type)
+        # the analyses require the values of their columns like the concrete analyses
+        self.structure._analysis_map[first_id]._required_parameters = [Column.ID.value]
+        self.structure._analysis_map[second_id]._required_parameters = [Column.SPEED.value, Column.ID.value]
+        data = DataFrame({"id": [1, 2, 3], "speed": [10.0, 20.0, 30.0]})
+        self.data_request.get_rawdata.return_value = DataRecord("id_test", (Column.ID, Column.SPEED), data)
+
+        futures = self.structure.get_analysed_data_batch_async([first_id, second_id])
+
+        self.assertTrue(data[["id"]].equals(futures[first_id].result(timeout=60).data))
+        self.assertTrue(data[["speed", "id"]].equals(futures[second_id].result(timeout=60).data))
+        # the data of both analyses is queried once with the union of their columns
+        self.data_request.get_rawdata.assert_called_once_with([Column.ID, Column.SPEED])
+        self.assertRaises(InvalidUUID, self.structure.get_analysed_data_batch_async, [uuid4()])
+
+    def test_paged_analysis(self):
+        table_id = self.structure.create_analysis(self.structure.register_analysis_type(TableAnalysis))
+        dummy_id = self.structure.create_analysis(self.dummy_type)
+        self.structure._analysis_map[dummy_id]._required_parameters = [Column.ID.value]
+        columns = self.structure._analysis_map[table_id].get_required_columns()
+        page = DataFrame({column: [0, 1] for column in columns + ["order"]}).set_index(["trajectory_id", "order", "id"],
+                                                                                         drop=False)
+        self.data_request.get_rawdata_page.return_value = TablePageRecord(page[columns], True)
+        self.data_request.get_rawdata.return_value = DataRecord("id_test", (Column.ID,), DataFrame({"id": [1, 2]}))
+
+        futures = self.structure.get_analysed_data_batch_async([table_id, dummy_id])
+
+        table = self.structure._analysis_map[table_id]
+        selected = table.get_columns_from_setting(table.setting_name)
+        self.assertTrue(page[selected].equals(futures[table_id].result(timeout=60).data.data))
+        futures[dummy_id].result(timeout=60)
+        # only the first page of the table is queried, its rows keep their keys
+        self.data_request.get_rawdata_page.assert_called_once()
+        self.data_request.get_rawdata.assert_called_once_with([Column.ID])
+
+    def test_cancel_analysis(self):
+        analysis_id = self.structure.create_analysis(self.dummy_type)
+        reading, release = Event(), Event()
+        reading_threads = []
+
+        def get_rawdata(columns):
+            reading_threads.append(get_ident())
+            reading.set()
+            release.wait(timeout=60)
+            return DataRecord("id_test", (Column.ID,), DataFrame({"id": [1]}))
+
+        self.data_request.get_rawdata.side_effect = get_rawdata
+        future = self.structure.get_analysed_data_async(analysis_id)
+        self.assertTrue(reading.wait(timeout=60))
+        self.assertIsNone(self.structure.get_analysis_progress(analysis_id))
+
+        # the future fails right away and only the query of the analysis is cancelled in the database
+        self.assertTrue(self.structure.cancel_analysis(analysis_id))
+        self.assertRaises(AnalysisCancelled, future.result, timeout=60)
+        self.data_request.cancel_queries.assert_called_once_with(reading_threads[0])
+        release.set()
+        self.assertFalse(self.structure.cancel_analysis(analysis_id))
+
+    def test_cancelled_query(self):
+        analysis_id = self.structure.create_analysis(self.dummy_type)
+        self.data_request.get_rawdata.side_effect = QueryCancelled("canceling statement due to user request")
+        # a query that was cancelled in the database cancels the analysis instead of failing it
+        self.assertRaises(AnalysisCancelled, self.structure.get_analysed_data_async(analysis_id).result, timeout=60)
+
+    def test_shutdown(self):
+        first_id = self.structure.create_analysis(self.dummy_type)
+        second_id = self.structure.create_analysis(self.dummy_type)
+        reading, release = Event(), Event()
+
+        def get_rawdata(columns):
+            reading.set()
+            release.wait(timeout=60)
+            return DataRecord("id_test", (Column.ID,), DataFrame({"id": [1]}))
+
+        self.data_request.get_rawdata.side_effect = get_rawdata
+        first = self.structure.get_analysed_data_async(first_id)
+        second = self.structure.get_analysed_data_async(second_id)
+        self.assertTrue(reading.wait(timeout=60))
+
+        # the running and the waiting analysis are cancelled
+        self.structure.shutdown()
+        self.assertRaises(AnalysisCancelled, first.result, timeout=60)
+        self.assertRaises(AnalysisCancelled, second.result, timeout=60)
+        release.set()
+
+    def test_persisted_analysed_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.structure.set_cache_directory(directory)
+            self.structure.get_analysed_data(self.structure.create_analysis(self.dummy_type))
+
+            # a new session reuses the persisted result
+            data_request = self.create_data_request()
+            structure = AnalysisStructure()
+            structure.set_data_request(data_request)
+            structure.set_cache_directory(directory)
+            analysis_id = structure.create_analysis(structure.register_analysis_type(DummyAnalysis))
+            self.assertIsInstance(structure.get_analysed_data(analysis_id), AnalysisDataRecord)
+            data_request.get_rawdata.assert_not_called()
+
+    def test_persisted_analysed_data_of_edited_analysis(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.structure.set_cache_directory(directory)
+            self.structure.get_analysed_data(self.structure.create_analysis(self.dummy_type))
+
+            # the result of an analysis is not reused after its code was edited
+            data_request = self.create_data_request()
+            structure = AnalysisStructure()
+            structure.set_data_request(data_request)
+            structure.set_cache_directory(directory)
+            analysis_id = structure.create_analysis(structure.register_analysis_type(DummyAnalysis))
+            with patch("src.model.analysis_structure.analysis_structure.get_code_digest", return_value="edited"):
+                self.assertIsInstance(structure.get_analysed_data(analysis_id), AnalysisDataRecord)
+            data_request.get_rawdata.assert_called_once()
+
+    def test_invalidate_persisted_analysed_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.structure.set_cache_directory(directory)
+            analysis_id = self.structure.create_analysis(self.dummy_type)
+            self.structure.get_analysed_data(analysis_id)
+
+            # only the results of the invalidated dataset are removed
+            self.structure.invalidate_cache("data")
+            self.assertEqual(1, len(os.listdir(directory)))
+            self.structure.invalidate_cache("dataset")
+            self.assertEqual(0, len(os.listdir(directory)))
+            self.structure.get_analysed_data(analysis_id)
+            self.assertEqual(2, self.data_request.get_rawdata.call_count)
+
+    def test_pruned_cache_directory(self):
+        record = AnalysisDataRecord(DataRecord("id_test", ("id",), DataFrame({"id": range(100)})),
+                                    AnalysisViewEnum.table_view)
+        size = len(pickle.dumps(record))
+        with tempfile.TemporaryDirectory() as directory:
+            cache = AnalysisCache(directory=directory, max_directory_size=2 * size)
+            cache.put(("first", "analysis"), record)
+            cache.put(("second", "analysis"), record)
+            os.utime(os.path.join(directory, "first_analysis" + CACHE_FILE_SUFFIX), (0, 0))
+
+            # the least recently used result is removed from the directory
+            cache.put(("third", "analysis"), record)
+            self.assertEqual(["second_analysis" + CACHE_FILE_SUFFIX, "third_analysis" + CACHE_FILE_SUFFIX],
+                             sorted(os.listdir(directory)))
+
     def test_start_end_analysis_requires_polygon(self):
         path_time_type_record = [analysis_type for analysis_type in self.structure.get_analysis_types()
                                  if analysis_type.name == PathTimeAnalysis().get_name()]
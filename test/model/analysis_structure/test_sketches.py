@@ -0,0 +1,73 @@
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.model.analysis_structure.sketches import CountMinSketch
+from src.model.analysis_structure.sketches import HyperLogLog
+from src.model.analysis_structure.sketches import TDigest
+
+
+class TestSketches(unittest.TestCase):
+    """
+    Tests that the sketches estimate within their error bounds and that sketches of parts of the data merge into the
+    sketch of all of it, also after being sent to another process.
+    """
+
+    def setUp(self):
+        self.random = np.random.default_rng(0)
+
+    def _split(self, values: pd.Series, parts: int = 4):
+        return [values[i::parts] for i in range(parts)]
+
+    def test_hyper_log_log(self):
+        values = pd.Series(self.random.integers(0, 50000, 200000))
+        sketches = []
+        for part in self._split(values):
+            sketch = HyperLogLog()
+            sketch.add(part)
+            sketches.append(pickle.loads(pickle.dumps(sketch)))
+        merged = HyperLogLog.merge(sketches)
+
+        self.assertLess(abs(merged.count() - values.nunique()), 3 * merged.relative_error() * values.nunique())
+
+    def test_hyper_log_log_few_values(self):
+        sketch = HyperLogLog()
+        sketch.add(pd.Series(["a", "b", "c", "c", None]))
+        self.assertEqual(round(sketch.count()), 3)
+
+    def test_count_min_sketch(self):
+        values = pd.Series(self.random.zipf(1.5, 100000)).astype(str)
+        sketches = []
+        for part in self._split(values):
+            sketch = CountMinSketch()
+            sketch.add(part)
+            sketches.append(pickle.loads(pickle.dumps(sketch)))
+        merged = CountMinSketch.merge(sketches)
+        mode, occurrences = merged.mode()
+
+        self.assertEqual(mode, values.mode()[0])
+        self.assertGreaterEqual(occurrences, values.value_counts()[mode])
+        self.assertLessEqual(occurrences, values.value_counts()[mode] + merged.error_bound())
+        # the bound is meaningful, it is smaller than the estimate
+        self.assertLess(merged.error_bound(), occurrences)
+
+    def test_t_digest(self):
+        values = pd.Series(self.random.normal(10, 3, 100000))
+        digests = []
+        for part in self._split(values):
+            digest = TDigest()
+            digest.add(part)
+            digests.append(pickle.loads(pickle.dumps(digest)))
+        merged = TDigest.merge(digests)
+
+        for q in [0.01, 0.5, 0.99]:
+            with self.subTest(q=q):
+                rank = (values < merged.quantile(q)).mean()
+                self.assertLessEqual(abs(rank - q), merged.rank_error(q))
+        self.assertLessEqual(len(merged.means), merged.compression)
+
+
+if __name__ == '__main__':
+    unittest.main()
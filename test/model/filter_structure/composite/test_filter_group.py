@@ -54,3 +54,30 @@ class FilterGroupTest(TestCase):
         filter_group_change = FilterGroupRecord('hi_change', 'arr', True, False, (), LogicalOperator.OR.name)
         filter_group.change(filter_group_change, list(), list())
         self.assertEqual(filter_group._logical_operator, LogicalOperator.OR)
+
+    def test_version(self):
+        filter_group = FilterGroup(LogicalOperator.AND, uuid.uuid1(), 'group')
+        sub_group = FilterGroup(LogicalOperator.OR, uuid.uuid1(), 'sub group')
+        polygon_filter = PolygonFilter(uuid.uuid1(), 'filter', None, [uuid.uuid1()])
+
+        # add
+        version = filter_group.get_version()
+        filter_group.add(sub_group, filter_group.get_id())
+        self.assertGreater(filter_group.get_version(), version)
+        version = filter_group.get_version()
+        filter_group.add(polygon_filter, sub_group.get_id())
+        self.assertGreater(filter_group.get_version(), version)
+
+        # unchanged
+        version = filter_group.get_version()
+        filter_group.add(polygon_filter, uuid.uuid1())
+        self.assertEqual(filter_group.get_version(), version)
+
+        # change enabled of a child
+        polygon_filter.change_enabled(False, list(), list())
+        self.assertGreater(filter_group.get_version(), version)
+
+        # delete
+        version = filter_group.get_version()
+        filter_group.delete(polygon_filter.get_id())
+        self.assertGreater(filter_group.get_version(), version)
@@ -9,6 +9,7 @@ from src.data_transfer.record import PositionRecord
 from src.model.filter_structure.composite.filter_group import FilterGroup
 from src.model.filter_structure.composite.filters.polygon_filter import PolygonFilter
 from src.model.filter_structure.filter_structure import FilterStructure
+from src.model.filter_structure.predicate import PolygonPredicate
 from src.model.polygon_structure.polygon_structure import PolygonStructure
 
 
@@ -109,3 +110,34 @@ class FilterFacadeTest(TestCase):
                          FilterGroupRecord('group_1', 'point filters', True, False, (filter1_id,),
                                            LogicalOperator.AND.name))
         self.assertEqual(filter_facade1.get_filter(filter1_id), filter1_record)
+
+    def test_preview_predicates(self):
+        polygon_facade = PolygonStructure()
+        filter_facade = FilterStructure(polygon_facade)
+        polygon_facade.set_filter_facade(filter_facade)
+
+        root_id = filter_facade.get_point_filter_root_id()
+        polygon1 = polygon_facade.add_polygon(
+            PolygonRecord((PositionRecord(0, 9), PositionRecord(9, 9), PositionRecord(9, 0)), "poly"))
+        polygon2 = polygon_facade.add_polygon(
+            PolygonRecord((PositionRecord(0, 2), PositionRecord(2, 9), PositionRecord(9, 1)), "poly2"))
+        filter1 = PolygonFilter(filter_id=uuid.uuid1(), name='hi', polygon_structure=polygon_facade,
+                                polygon_ids=[polygon1]).to_record('point filters')
+        filter2 = PolygonFilter(filter_id=uuid.uuid1(), name='hi', polygon_structure=polygon_facade,
+                                polygon_ids=[polygon2]).to_record('point filters')
+
+        # previewing an addition does not add the filter
+        point_predicate, trajectory_predicate = filter_facade.get_preview_predicates(filter1, parent_id=root_id)
+        self.assertEqual(PolygonPredicate(polygon_facade.get_polygon(polygon1)), point_predicate)
+        self.assertIsNone(trajectory_predicate)
+        self.assertEqual("", filter_facade.get_point_sql_request())
+
+        # previewing a change does not change the filter
+        filter1_id = filter_facade.add_filter(root_id, filter1)
+        sql_request = filter_facade.get_point_sql_request()
+        point_predicate, _ = filter_facade.get_preview_predicates(filter2, filter_id=filter1_id)
+        self.assertEqual(PolygonPredicate(polygon_facade.get_polygon(polygon2)), point_predicate)
+        self.assertEqual(filter1, filter_facade.get_filter(filter1_id))
+        self.assertEqual(sql_request, filter_facade.get_point_sql_request())
+
+        self.assertIsNone(filter_facade.get_preview_predicates(filter2, filter_id=uuid.uuid1()))
@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+from src.data_transfer.content.logical_operator import LogicalOperator
+from src.data_transfer.record import PolygonRecord
+from src.data_transfer.record import PositionRecord
+from src.model.filter_structure.filter_optimizer import FilterOptimizer
+from src.model.filter_structure.predicate import ConstantPredicate
+from src.model.filter_structure.predicate import ExistsAllPredicate
+from src.model.filter_structure.predicate import ExistsPredicate
+from src.model.filter_structure.predicate import GroupPredicate
+from src.model.filter_structure.predicate import InPredicate
+from src.model.filter_structure.predicate import IntervalPredicate
+from src.model.filter_structure.predicate import NotPredicate
+from src.model.filter_structure.predicate import PolygonPredicate
+
+
+def group(operator, *children):
+    return GroupPredicate(operator, tuple(children))
+
+
+class TestFilterOptimizer(TestCase):
+    def setUp(self):
+        self.optimizer = FilterOptimizer()
+        self.polygon = PolygonPredicate(
+            PolygonRecord((PositionRecord(0, 0), PositionRecord(1, 0), PositionRecord(0, 1)), "polygon"))
+
+    def test_flatten(self):
+        speed = IntervalPredicate("speed", "1", "2")
+        predicate = group(LogicalOperator.AND, group(LogicalOperator.AND, self.polygon, group(LogicalOperator.AND,
+                                                                                                speed)))
+        self.assertEqual(group(LogicalOperator.AND, speed, self.polygon), self.optimizer.optimize(predicate))
+
+    def test_merge_intervals(self):
+        predicate = group(LogicalOperator.AND, IntervalPredicate("speed", "25", "39"),
+                          IntervalPredicate("speed", "30", "50"))
+        self.assertEqual(IntervalPredicate("speed", "30", "39"), self.optimizer.optimize(predicate))
+
+        predicate = group(LogicalOperator.OR, IntervalPredicate("speed", "25", "39"),
+                          IntervalPredicate("speed", "60", "70"), IntervalPredicate("speed", "30", "50"))
+        self.assertEqual(group(LogicalOperator.OR, IntervalPredicate("speed", "25", "50"),
+                               IntervalPredicate("speed", "60", "70")), self.optimizer.optimize(predicate))
+
+        dates = IntervalPredicate("date", "'2020-01-01'", "'2020-02-01'")
+        predicate = group(LogicalOperator.AND, dates, IntervalPredicate("date", "'2020-01-15'", "'2020-03-01'"))
+        self.assertEqual(predicate, self.optimizer.optimize(predicate))
+
+    def test_fold_equalities(self):
+        predicate = group(LogicalOperator.OR, InPredicate("one_way_street", ("'false'",)),
+                          InPredicate("one_way_street", ("'true'", "'false'")))
+        self.assertEqual(InPredicate("one_way_street", ("'false'", "'true'")), self.optimizer.optimize(predicate))
+
+    def test_contradiction(self):
+        predicate = group(LogicalOperator.AND, self.polygon, IntervalPredicate("speed", "1", "2"),
+                          IntervalPredicate("speed", "3", "4"))
+        self.assertEqual(ConstantPredicate(False), self.optimizer.optimize(predicate))
+
+        predicate = group(LogicalOperator.AND, self.polygon, NotPredicate(self.polygon))
+        self.assertEqual(ConstantPredicate(False), self.optimizer.optimize(predicate))
+
+        # inside a negation NULL and false differ, so the contradiction must not be folded
+        predicate = NotPredicate(group(LogicalOperator.AND, InPredicate("one_way_street", ("'true'",)),
+                                       InPredicate("one_way_street", ("'false'",))))
+        self.assertEqual(predicate, self.optimizer.optimize(predicate))
+
+    def test_tautology(self):
+        predicate = group(LogicalOperator.OR, self.polygon, NotPredicate(group(LogicalOperator.OR)))
+        self.assertEqual(ConstantPredicate(True), self.optimizer.optimize(predicate))
+
+    def test_merge_exists(self):
+        speed = IntervalPredicate("speed", "1", "2")
+        predicate = group(LogicalOperator.OR, ExistsPredicate(self.polygon), ExistsPredicate(speed))
+        self.assertEqual(ExistsPredicate(group(LogicalOperator.OR, self.polygon, speed)),
+                         self.optimizer.optimize(predicate))
+
+        predicate = group(LogicalOperator.AND, ExistsPredicate(self.polygon), ExistsPredicate(speed))
+        optimized = self.optimizer.optimize(predicate)
+        self.assertEqual(ExistsAllPredicate((self.polygon, speed)), optimized)
+        self.assertNotIn("{tablename}", optimized.to_sql().replace("{tablename}", "", 1))
+
+    def test_selectivity_order(self):
+        selection = InPredicate("one_way_street", ("'true'",))
+        predicate = group(LogicalOperator.AND, self.polygon, IntervalPredicate("speed", "1", "2"), selection)
+        self.assertEqual(selection, self.optimizer.optimize(predicate).children[0])
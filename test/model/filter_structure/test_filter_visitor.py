@@ -2,14 +2,17 @@ from unittest import TestCase
 from uuid import uuid4
 
 from src.data_transfer.content import Column
+from src.data_transfer.content import TrajectoryMetric
 from src.data_transfer.content.logical_operator import LogicalOperator
 from src.data_transfer.record import FilterGroupRecord
 from src.data_transfer.record import PolygonRecord
 from src.data_transfer.record import PositionRecord
 from src.model.filter_structure.composite.filter_group import FilterGroup
+from src.model.filter_structure.composite.filters.aggregate_filter import AggregateFilter
 from src.model.filter_structure.composite.filters.discrete_filter import DiscreteFilter
 from src.model.filter_structure.composite.filters.interval_filter import IntervalFilter
 from src.model.filter_structure.composite.filters.polygon_filter import PolygonFilter
+from src.model.filter_structure.composite.filters.sequence_filter import SequenceFilter
 from src.model.filter_structure.filter_factory import FilterFactory
 from src.model.filter_structure.filter_handler import FilterHandler
 from src.model.filter_structure.point_filter_visitor import PointFilterVisitor
@@ -34,13 +37,13 @@ class TestPointFilterVisitor(TestCase):
                              filter_structure.get_root_id())
         filter_structure.accept_visitor(self.filter_visitor)
         self.assertEqual(
-            "((ST_Contains(ST_MakePolygon(ST_GeomFromText('LINESTRING(0 0, 1 0, 0 1, 0 0)')), ST_POINT(latitude, longitude))))",
+            "((((latitude between 0 and 1) and (longitude between 0 and 1) and ST_Contains(ST_GeomFromText('POLYGON((0 0, 0 1, 1 0, 0 0))'), ST_POINT(longitude, latitude)))))",
             self.filter_visitor.get_sql_request())
         self.klammertest()
 
         filter_structure.add(IntervalFilter(uuid4(), "b", Column.SPEED, 25, 39), filter_structure.get_root_id())
         self.assertEqual(
-            "((ST_Contains(ST_MakePolygon(ST_GeomFromText('LINESTRING(0 0, 1 0, 0 1, 0 0)')), ST_POINT(latitude, longitude))))",
+            "((((latitude between 0 and 1) and (longitude between 0 and 1) and ST_Contains(ST_GeomFromText('POLYGON((0 0, 0 1, 1 0, 0 0))'), ST_POINT(longitude, latitude)))))",
             self.filter_visitor.get_sql_request())
         self.klammertest()
 
@@ -58,7 +61,7 @@ class TestPointFilterVisitor(TestCase):
         filter_structure.add(IntervalFilter(uuid4(), "b", Column.SPEED, 25, 39), filter_structure.get_root_id())
         filter_structure.accept_visitor(self.filter_visitor)
         self.assertEqual(
-            "((ST_Contains(ST_MakePolygon(ST_GeomFromText('LINESTRING(0 0, 1 0, 0 1, 0 0)')), ST_POINT(latitude, longitude))) and (speed between 25 and 39))",
+            "((((latitude between 0 and 1) and (longitude between 0 and 1) and ST_Contains(ST_GeomFromText('POLYGON((0 0, 0 1, 1 0, 0 0))'), ST_POINT(longitude, latitude)))) and (speed between 25 and 39))",
             self.filter_visitor.get_sql_request())
         self.klammertest()
 
@@ -67,7 +70,7 @@ class TestPointFilterVisitor(TestCase):
         self.filter_visitor = PointFilterVisitor()
         filter_structure.accept_visitor(self.filter_visitor)
         self.assertEqual(
-            "((ST_Contains(ST_MakePolygon(ST_GeomFromText('LINESTRING(0 0, 1 0, 0 1, 0 0)')), ST_POINT(latitude, longitude))) and (speed between 25 and 39))",
+            "((((latitude between 0 and 1) and (longitude between 0 and 1) and ST_Contains(ST_GeomFromText('POLYGON((0 0, 0 1, 1 0, 0 0))'), ST_POINT(longitude, latitude)))) and (speed between 25 and 39))",
             self.filter_visitor.get_sql_request())
         self.klammertest()
 
@@ -75,7 +78,7 @@ class TestPointFilterVisitor(TestCase):
         self.filter_visitor = PointFilterVisitor()
         filter_structure.accept_visitor(self.filter_visitor)
         self.assertEqual(
-            "((ST_Contains(ST_MakePolygon(ST_GeomFromText('LINESTRING(0 0, 1 0, 0 1, 0 0)')), ST_POINT(latitude, longitude))) and (speed between 25 and 39) and ((one_way_street in ('false'))))",
+            "((((latitude between 0 and 1) and (longitude between 0 and 1) and ST_Contains(ST_GeomFromText('POLYGON((0 0, 0 1, 1 0, 0 0))'), ST_POINT(longitude, latitude)))) and (speed between 25 and 39) and ((one_way_street in ('false'))))",
             self.filter_visitor.get_sql_request())
         self.klammertest()
 
@@ -84,10 +87,42 @@ class TestPointFilterVisitor(TestCase):
         self.filter_visitor = PointFilterVisitor()
         filter_structure.accept_visitor(self.filter_visitor)
         self.assertEqual(
-            "((ST_Contains(ST_MakePolygon(ST_GeomFromText('LINESTRING(0 0, 1 0, 0 1, 0 0)')), ST_POINT(latitude, longitude))) and (speed between 25 and 39) and ((one_way_street in ('false')) or (ST_Contains(ST_MakePolygon(ST_GeomFromText('LINESTRING(0 0, 1 0, 0 1, 0 0)')), ST_POINT(latitude, longitude)) and ST_Contains(ST_MakePolygon(ST_GeomFromText('LINESTRING(1 1, 2 1, 1 2, 1 1)')), ST_POINT(latitude, longitude)))))",
+            "((((latitude between 0 and 1) and (longitude between 0 and 1) and ST_Contains(ST_GeomFromText('POLYGON((0 0, 0 1, 1 0, 0 0))'), ST_POINT(longitude, latitude)))) and (speed between 25 and 39) and ((one_way_street in ('false')) or (((latitude between 0 and 1) and (longitude between 0 and 1) and ST_Contains(ST_GeomFromText('POLYGON((0 0, 0 1, 1 0, 0 0))'), ST_POINT(longitude, latitude))) and ((latitude between 1 and 2) and (longitude between 1 and 2) and ST_Contains(ST_GeomFromText('POLYGON((1 1, 1 2, 2 1, 1 1))'), ST_POINT(longitude, latitude))))))",
             self.filter_visitor.get_sql_request())
         self.klammertest()
 
+    def test_aggregate_filter(self):
+        filter_factory = FilterFactory(PolygonStructure())
+        filter_structure = FilterHandler(filter_factory.create_group(
+            FilterGroupRecord("aal123", "lol", True, False, (), "AND")), 'lol')
+        filter_structure.add(AggregateFilter(uuid4(), "a", TrajectoryMetric.POINT_COUNT, 10, 20),
+                             filter_structure.get_root_id())
+        filter_structure.accept_visitor(self.filter_visitor)
+        self.assertEqual(
+            "((trajectory_id in (SELECT trajectory_id FROM {tablename} GROUP BY trajectory_id "
+            "HAVING COUNT(*) between 10 and 20)))",
+            self.filter_visitor.get_sql_request())
+        self.klammertest()
+
+    def test_sequence_filter(self):
+        polygon_structure = PolygonStructure()
+        filter_factory = FilterFactory(polygon_structure)
+        filter_structure = FilterHandler(filter_factory.create_group(
+            FilterGroupRecord("aal123", "lol", True, False, (), "AND")), 'lol')
+        uuid_polygon1 = polygon_structure.add_polygon(
+            PolygonRecord((PositionRecord(0, 0), PositionRecord(1, 0), PositionRecord(0, 1)), "poly das polygon"))
+        uuid_polygon2 = polygon_structure.add_polygon(
+            PolygonRecord((PositionRecord(1, 1), PositionRecord(2, 1), PositionRecord(1, 2)), "poly das polygon"))
+        filter_structure.add(SequenceFilter(uuid4(), "a", polygon_structure, [uuid_polygon2, uuid_polygon1]),
+                             filter_structure.get_root_id())
+        filter_structure.accept_visitor(self.filter_visitor)
+        sql_request = self.filter_visitor.get_sql_request()
+        self.assertTrue(sql_request.startswith("((trajectory_id in (SELECT trajectory_id FROM (SELECT *, "
+                                               "COALESCE(bool_or(visit_1) OVER w, false) AS after_2"))
+        self.assertTrue(sql_request.endswith("HAVING bool_or((visit_2 and after_2)))))"))
+        self.assertLess(sql_request.index("POLYGON((1 1"), sql_request.index("POLYGON((0 0"))
+        self.klammertest()
+
     def klammertest(self):
         klammerausdruck = self.filter_visitor.get_sql_request()
         i = 0
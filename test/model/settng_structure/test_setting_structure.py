@@ -1,5 +1,6 @@
 import unittest
 
+from src.data_transfer.content.render_mode import RenderMode
 from src.data_transfer.content.settings_enum import SettingsEnum
 from src.data_transfer.record.settings_record import SettingsRecord
 from src.model.setting_structure.page import Page
@@ -56,6 +57,17 @@ class SettingStructureTest(unittest.TestCase):
         settings_record = settings_record.change(SettingsEnum.TRAJECTORY_SAMPLE_SIZE, selection_record)
         assert (structure.update_settings(settings_record))
 
+    def test_render_mode(self):
+        structure = SettingStructure()
+        settings_record = structure.get_settings_record()
+        selection_record = settings_record.find(SettingsEnum.RENDER_MODE)[0]
+        self.assertEqual(selection_record.selected, [RenderMode.SINGLE_ITEMS])
+        selection_record = selection_record.set_selected([RenderMode.BATCHED])
+        settings_record = settings_record.change(SettingsEnum.RENDER_MODE, selection_record)
+        self.assertTrue(structure.update_settings(settings_record))
+        self.assertEqual(structure.get_settings_record().find(SettingsEnum.RENDER_MODE)[0].selected,
+                         [RenderMode.BATCHED])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from src.data_transfer.content import Column
+from src.model.trajectory_kinematics import get_kinematics
+
+
+class TestTrajectoryKinematics(TestCase):
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            Column.TRAJECTORY_ID.value: [1, 1, 1, 2, 2],
+            Column.LATITUDE.value: [0.0, 0.0, 0.001, 0.0, 0.0],
+            Column.LONGITUDE.value: [0.0, 0.001, 0.001, 0.0, -0.001],
+        })
+        self.timestamps = pd.to_datetime(["01.01.2023 10:00:00", "01.01.2023 10:00:10", "01.01.2023 10:00:30",
+                                          "01.01.2023 12:00:00", "01.01.2023 12:00:05"], format="%d.%m.%Y %H:%M:%S")
+
+    def test_kinematics(self):
+        kinematics = get_kinematics(self.frame, pd.Series(self.timestamps))
+        # one thousandth of a degree on the equator
+        step = 6378160.0 * np.radians(0.001)
+
+        self.assertTrue(np.allclose([step, step, step], kinematics["distance"][[1, 2, 4]]))
+        self.assertEqual([10.0, 20.0, 5.0], list(kinematics["time_delta"][[1, 2, 4]]))
+        self.assertTrue(np.allclose([step / 10, step / 20, step / 5], kinematics["speed"][[1, 2, 4]]))
+        self.assertTrue(np.allclose([90.0, 0.0, 270.0], kinematics["heading"][[1, 2, 4]]))
+
+        # the first datapoints of the trajectories have no previous datapoint
+        self.assertTrue(kinematics.loc[[0, 3]].isna().all().all())
+
+    def test_single_trajectory(self):
+        kinematics = get_kinematics(self.frame, trajectory_column=None)
+        self.assertEqual(1, kinematics["distance"].isna().sum())
+        self.assertTrue(kinematics["time_delta"].isna().all())
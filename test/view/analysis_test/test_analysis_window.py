@@ -1,6 +1,7 @@
 import tkinter
 import tkinter as tk
 import uuid
+from concurrent.futures import Future
 
 from pandas import DataFrame
 
@@ -62,6 +63,20 @@ class DataRequestStub:
     def get_analysis_data(self, id: uuid.UUID):
         return AnalysisDataRecord(data, AnalysisViewEnum.histogram_view)
 
+    def get_analysis_data_async(self, id: uuid.UUID):
+        future = Future()
+        future.set_result(self.get_analysis_data(id))
+        return future
+
+    def get_analysis_data_batch_async(self, ids):
+        return {id: self.get_analysis_data_async(id) for id in ids}
+
+    def get_analysis_progress(self, id: uuid.UUID):
+        return None
+
+    def cancel_analysis(self, id: uuid.UUID):
+        return False
+
     def get_analysis_settings(self, id: uuid.UUID):
         return AnalysisRecord(
             (SettingRecord("the first string context", SelectionRecord(["aaa"], StringOption("a*"), range(0, 4))),))
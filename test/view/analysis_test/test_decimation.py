@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.view.user_interface.static_windows.main_window.main_window_elements.analysis_area import analysis_util
+
+
+class TestDecimation(unittest.TestCase):
+    def setUp(self):
+        x = np.linspace(0, 100, 100000)
+        y = np.sin(x)
+        # a single spike has to survive the decimation
+        y[54321] = 10
+        self.data = pd.DataFrame({"time": x, "speed": y})
+
+    def test_scatter(self):
+        generator = np.random.default_rng(0)
+        data = pd.DataFrame({"speed": generator.integers(0, 100, 100000),
+                             "acceleration": generator.integers(0, 50, 100000)})
+        decimated = analysis_util.decimate_scatter(data, "speed", "acceleration", 100, 50)
+        # every occupied pixel keeps one point, also in the interior of the cloud
+        self.assertEqual(len(data.drop_duplicates()), len(decimated))
+        self.assertTrue(decimated.drop_duplicates().equals(decimated))
+        self.assertTrue(decimated.index.is_monotonic_increasing)
+
+    def test_lttb(self):
+        kept = analysis_util.decimate_lttb(self.data["time"].to_numpy(), self.data["speed"].to_numpy(), 500)
+        self.assertEqual(500, len(kept))
+        self.assertIn(54321, kept)
+        self.assertEqual(0, kept[0])
+        self.assertEqual(len(self.data) - 1, kept[-1])
+        self.assertTrue(np.all(np.diff(kept) > 0))
+
+    def test_small_data_is_kept(self):
+        data = self.data.iloc[:10]
+        self.assertEqual(10, len(analysis_util.decimate_lttb(data["time"].to_numpy(), data["speed"].to_numpy(), 100)))
@@ -0,0 +1,31 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from src.view.user_input_request.user_input_request import UserInputRequestFacade
+
+
+class TestUserInputRequest(unittest.TestCase):
+    """
+    Tests that messages sent from other threads are shown on the main thread.
+    """
+
+    @patch("src.view.user_input_request.user_input_request.showerror")
+    def test_error_from_worker_thread(self, showerror):
+        user_input_request = UserInputRequestFacade()
+        worker = threading.Thread(target=user_input_request.send_error, args=["query failed"])
+        worker.start()
+        worker.join()
+        showerror.assert_not_called()
+
+        user_input_request.show_pending_messages()
+        showerror.assert_called_once_with(message="query failed")
+
+    @patch("src.view.user_input_request.user_input_request.showerror")
+    def test_error_from_main_thread(self, showerror):
+        UserInputRequestFacade().send_error("query failed")
+        showerror.assert_called_once_with(message="query failed")
+
+
+if __name__ == '__main__':
+    unittest.main()